@@ -0,0 +1,53 @@
+"""Aggregate markov relations by day
+
+Revision ID: d81f3b6a0c27
+Revises: c5e1a7d2f934
+Create Date: 2026-10-16 21:05:12.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3b6a0c27'
+down_revision: Union[str, Sequence[str], None] = 'c5e1a7d2f934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('markov_relation', sa.Column('count', sa.Integer(), server_default='1', nullable=False))
+    # Collapse the one-row-per-occurrence history into per-day counts before the
+    # unique constraint goes on. Day buckets are UTC midnights, matching relation_day()
+    op.execute(
+        "CREATE TEMPORARY TABLE markov_relation_daily AS "
+        "SELECT channel_id, leader_word, follower_word, "
+        "(date_trunc('day', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC') AS created_at, "
+        "count(*) AS count, min(id) AS first_id "
+        "FROM markov_relation GROUP BY 1, 2, 3, 4"
+    )
+    op.execute('DELETE FROM markov_relation')
+    # first_id keeps the original ids, so first-seen ordering survives the rewrite
+    op.execute(
+        'INSERT INTO markov_relation (id, channel_id, leader_word, follower_word, created_at, count) '
+        'SELECT first_id, channel_id, leader_word, follower_word, created_at, count FROM markov_relation_daily'
+    )
+    op.execute('DROP TABLE markov_relation_daily')
+    op.create_unique_constraint('_unique_markov_relation_day', 'markov_relation',
+                                ['channel_id', 'leader_word', 'follower_word', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('_unique_markov_relation_day', 'markov_relation', type_='unique')
+    # Expand each counted row back into one row per occurrence
+    op.execute(
+        'INSERT INTO markov_relation (channel_id, leader_word, follower_word, created_at, count) '
+        'SELECT channel_id, leader_word, follower_word, created_at, 1 '
+        'FROM markov_relation, generate_series(2, markov_relation.count)'
+    )
+    op.drop_column('markov_relation', 'count')
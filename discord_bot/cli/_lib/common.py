@@ -7,6 +7,7 @@ import signal
 import sys
 from typing import Callable, Iterator
 
+from aiohttp import TraceConfig
 from pyaml_env import parse_config
 from discord import Intents
 from discord.ext.commands import Bot, when_mentioned_or
@@ -312,8 +313,42 @@ def register_on_ready(bot: Bot, general_config: GeneralConfig, logger) -> None:
             logger.info(f'Main :: Bot associated with guild {guild.id} with name "{guild.name}"')
 
 
-def build_bot(general_config: GeneralConfig) -> Bot:
-    '''Construct and return the Bot instance.'''
+def register_channel_event_forwarding(bot: Bot, dispatcher) -> None:
+    '''
+    Forward guild message creates and deletes to the dispatcher's channel tail
+    tracker, so its sticky checks can skip the channel history fetch.
+
+    add_listener adds to the Bot's own on_message (command processing) rather
+    than replacing it.  Deletes use the raw events, which fire for messages
+    outside the gateway cache too.
+    '''
+    async def on_message(message):
+        if message.guild is None:
+            return
+        dispatcher.record_channel_event(message.guild.id, message.channel.id, added=[message.id])
+
+    async def on_raw_message_delete(payload):
+        if payload.guild_id is None:
+            return
+        dispatcher.record_channel_event(payload.guild_id, payload.channel_id, deleted=[payload.message_id])
+
+    async def on_raw_bulk_message_delete(payload):
+        if payload.guild_id is None:
+            return
+        dispatcher.record_channel_event(payload.guild_id, payload.channel_id, deleted=list(payload.message_ids))
+
+    bot.add_listener(on_message)
+    bot.add_listener(on_raw_message_delete)
+    bot.add_listener(on_raw_bulk_message_delete)
+
+
+def build_bot(general_config: GeneralConfig, http_trace: TraceConfig | None = None) -> Bot:
+    '''
+    Construct and return the Bot instance.
+
+    http_trace is handed to discord.py's HTTP session, e.g. so the dispatcher's
+    rate limiter sees every response.
+    '''
     logger = logging.getLogger('main')
     logger.debug('Main :: Generating Intents')
     intents = Intents.default()
@@ -325,6 +360,7 @@ def build_bot(general_config: GeneralConfig) -> Bot:
         command_prefix=when_mentioned_or('!'),
         description='Discord bot',
         intents=intents,
+        http_trace=http_trace,
     )
 
 
@@ -20,7 +20,7 @@ from discord_bot.utils.common import GeneralConfig
 
 from discord_bot.cli._lib.common import (
     build_bot, bot_lifecycle, load_cogs, run_loop,
-    setup_observability, register_on_ready,
+    setup_observability, register_on_ready, register_channel_event_forwarding,
     parse_and_validate_config, require_discord_token,
 )
 from discord_bot.cli._lib.cog_registry import POSSIBLE_COGS
@@ -64,6 +64,7 @@ def run(settings: dict, general_config: GeneralConfig):
         cog_list += load_cogs(bot, POSSIBLE_COGS, settings, db_engine, http_dispatcher)
 
         register_on_ready(bot, general_config, logger)
+        register_channel_event_forwarding(bot, http_dispatcher)
         run_bot(general_config, bot, cog_list,
                 health_server=setup_health_server(
                     bot, general_config,
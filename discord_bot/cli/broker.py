@@ -20,6 +20,9 @@ Configure with:
     music.general.message_delete_after — seconds before Discord auto-expires the
                                     bundle summary / failure summary messages this
                                     process sends (default 300)
+    music.general.bundle_render_interval_seconds — minimum spacing of one
+                                    bundle's message renders (default 1.0, 0 renders
+                                    every event)
 '''
 import asyncio
 import logging
@@ -38,6 +41,7 @@ from discord_bot.servers.broker_server import BrokerHttpServer
 from discord_bot.utils.common import GeneralConfig
 from discord_bot.workers.broker_metrics import BrokerMetrics
 from discord_bot.workers.broker_registry import RedisBrokerRegistry
+from discord_bot.workers.bundle_render_throttle import BUNDLE_RENDER_INTERVAL_SECONDS_DEFAULT
 from discord_bot.workers.redis_broker import RedisBroker
 from discord_bot.workers.redis_queues import RedisDownloadResultQueue, RedisSearchResultQueue
 
@@ -85,9 +89,14 @@ def _build_video_cache(cache_cfg: dict, db_engine, bucket_name: str | None):
 
 
 async def main_loop(broker_server: BrokerHttpServer, health_server, redis_manager: RedisManager,
-                    broker_metrics: BrokerMetrics):
+                    broker_metrics: BrokerMetrics, registry: RedisBrokerRegistry | None = None,
+                    broker: RedisBroker | None = None):
     '''Run the broker until SIGTERM/SIGINT, then drain the HTTP server and Redis.'''
     await redis_manager.start()
+    if registry is not None:
+        # Index anything a pre-index build wrote before serving indexed lookups.
+        indexed = await registry.rebuild_indexes()
+        logger.info('Main :: Indexed %d broker registry records', indexed)
     stop_event = asyncio.Event()
     loop = asyncio.get_running_loop()
 
@@ -108,14 +117,20 @@ async def main_loop(broker_server: BrokerHttpServer, health_server, redis_manage
     finally:
         logger.info('Main :: Draining broker server...')
         await broker_server.drain_and_stop()
+        if broker is not None:
+            # Bundle renders the throttle is still holding back; run them while
+            # Redis is up so the last events reach Discord.
+            await broker.flush_bundle_renders()
         await redis_manager.close()
         logger.info('Main :: Shutdown complete')
 
 
 def run_broker(broker_server: BrokerHttpServer, health_server, redis_manager: RedisManager,
-               broker_metrics: BrokerMetrics):
+               broker_metrics: BrokerMetrics, registry: RedisBrokerRegistry | None = None,
+               broker: RedisBroker | None = None):
     '''Schedule main_loop on an event loop.'''
-    run_loop(main_loop(broker_server, health_server, redis_manager, broker_metrics))
+    run_loop(main_loop(broker_server, health_server, redis_manager, broker_metrics,
+                       registry=registry, broker=broker))
 
 
 def run(settings: dict, general_config: GeneralConfig):
@@ -168,6 +183,9 @@ def run(settings: dict, general_config: GeneralConfig):
             message_delete_after=int(
                 music_general_cfg.get('message_delete_after', DEFAULT_MESSAGE_DELETE_AFTER)
             ),
+            bundle_render_interval_seconds=float(
+                music_general_cfg.get('bundle_render_interval_seconds', BUNDLE_RENDER_INTERVAL_SECONDS_DEFAULT)
+            ),
         )
 
         # Redis-backed bot-ready queues so multiple broker pods share them and a
@@ -195,4 +213,4 @@ def run(settings: dict, general_config: GeneralConfig):
                 bind_address=general_config.monitoring.health_server.bind_address,
             )
 
-        run_broker(broker_server, health_server, redis_manager, broker_metrics)
+        run_broker(broker_server, health_server, redis_manager, broker_metrics, registry=registry, broker=broker)
@@ -10,7 +10,8 @@ import click
 from discord.ext.commands import Bot
 
 from discord_bot.clients.redis_client import RedisManager
-from discord_bot.workers.redis_queues import RedisBundleStore, RedisWorkQueue
+from discord_bot.workers.discord_rate_limits import DiscordRateLimiter
+from discord_bot.workers.redis_queues import RedisBundleStore, RedisChannelTailStore, RedisWorkQueue
 from discord_bot.workers.message_dispatcher import MessageDispatcher
 from discord_bot.exceptions import DiscordBotException
 from discord_bot.servers.dispatch_server import DispatchHttpServer
@@ -83,8 +84,11 @@ def run(settings: dict, general_config: GeneralConfig):
     process_id = settings.get('general', {}).get('dispatch_process_id') or str(uuid.uuid4())
     work_queue = RedisWorkQueue(redis_manager, shard_id, process_id)
 
-    bot = build_bot(general_config)
-    dispatcher = MessageDispatcher(bot, settings, bundle_store=bundle_store, work_queue=work_queue)
+    rate_limiter = DiscordRateLimiter()
+    bot = build_bot(general_config, http_trace=rate_limiter.trace_config())
+    dispatcher = MessageDispatcher(bot, settings, bundle_store=bundle_store, work_queue=work_queue,
+                                   channel_tails=RedisChannelTailStore(redis_manager),
+                                   rate_limiter=rate_limiter)
 
     cfg = settings.get('general', {}).get('dispatch_server', {})
     # bandit B104: '0.0.0.0' default is intentional — bot pods reach the dispatcher across the docker/k8s network; override via dispatch_server.host config
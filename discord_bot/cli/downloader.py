@@ -40,6 +40,7 @@ from discord_bot.clients.http_broker_client import HttpBrokerClient
 from discord_bot.clients.redis_client import RedisManager
 from discord_bot.interfaces.download_protocols import RETRY_BACKOFF_SECONDS_MINIMUM
 from discord_bot.servers.download_server import DownloadHttpServer
+from discord_bot.utils.audio import AudioFormat
 from discord_bot.utils.common import GeneralConfig
 from discord_bot.utils.loop_health import LoopHealth
 from discord_bot.utils.integrations.egress_probe import build_exit_probe, ExitProbe
@@ -172,6 +173,7 @@ def run(settings: dict, general_config: GeneralConfig):
         download_dir,
         redis_manager=redis_manager,
         youtube_egress_key=download_cfg.get('youtube_egress_key', 'default'),
+        scripted_pop=bool(download_cfg.get('redis_scripted_pop', True)),
         extra_ytdlp_options=download_cfg.get('extra_ytdlp_options'),
         max_video_length=download_cfg.get('max_video_length'),
         banned_video_list=download_cfg.get('banned_videos_list'),
@@ -179,6 +181,7 @@ def run(settings: dict, general_config: GeneralConfig):
         wait_period_max_variance=int(download_cfg.get('youtube_wait_period_max_variance', 10)),
         bucket_name=bucket_name,
         normalize_audio=bool(download_cfg.get('normalize_audio', False)),
+        audio_format=AudioFormat(download_cfg.get('audio_format', AudioFormat.PCM.value)),
         broker=broker_client,
         max_retries=int(download_cfg.get('max_download_retries', 3)),
         retry_backoff_seconds_minimum=int(download_cfg.get(
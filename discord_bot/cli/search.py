@@ -36,6 +36,9 @@ Configure with:
     music.download.failure_tracking_max_size / _max_age_seconds — failure queue
     music.download.server_queue_priority — [{server_id, priority}] used when a
                                          retried request is re-enqueued
+    music.download.search_cache_ttl_seconds / _negative_ttl_seconds / _max_entries
+                                       — shared search resolution cache; a TTL
+                                         of 0 turns it off
 '''
 import asyncio
 import logging
@@ -51,6 +54,10 @@ from discord_bot.utils.integrations.youtube_music import YoutubeMusicClient
 from discord_bot.utils.loop_health import LoopHealth
 from discord_bot.workers.redis_youtube_music_search_worker import RedisYoutubeMusicSearchWorker
 from discord_bot.workers.search_metrics import SearchMetrics
+from discord_bot.workers.search_resolution_cache import (
+    RedisSearchResolutionCache, SEARCH_CACHE_MAX_ENTRIES_DEFAULT,
+    SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT, SEARCH_CACHE_TTL_SECONDS_DEFAULT,
+)
 from discord_bot.workers.youtube_music_search_driver import YoutubeMusicSearchDriver
 
 from discord_bot.cli._lib.common import parse_and_validate_config, run_loop, setup_observability
@@ -145,6 +152,16 @@ def run(settings: dict, general_config: GeneralConfig):
     broker_client = HttpBrokerClient(require_broker_url(settings, 'search'))
 
     download_cfg = settings.get('music', {}).get('download', {})
+    # Shared across pods through Redis, with a per-pod in-memory front.
+    resolution_cache = None
+    cache_ttl = int(download_cfg.get('search_cache_ttl_seconds', SEARCH_CACHE_TTL_SECONDS_DEFAULT))
+    if cache_ttl:
+        resolution_cache = RedisSearchResolutionCache(
+            cache_ttl,
+            int(download_cfg.get('search_cache_negative_ttl_seconds', SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT)),
+            int(download_cfg.get('search_cache_max_entries', SEARCH_CACHE_MAX_ENTRIES_DEFAULT)),
+            redis_manager=redis_manager,
+        )
     # Reuse the already-validated LoggingConfig off general_config — the same
     # object the cog passes as self.logging_config; get_logger tolerates None.
     worker = RedisYoutubeMusicSearchWorker(
@@ -156,7 +173,9 @@ def run(settings: dict, general_config: GeneralConfig):
         ),
         int(download_cfg.get('youtube_wait_period_minimum', 30)),
         int(download_cfg.get('youtube_wait_period_max_variance', 10)),
+        resolution_cache=resolution_cache,
         redis_manager=redis_manager,
+        scripted_pop=bool(download_cfg.get('redis_scripted_pop', True)),
     )
 
     # Guild priorities are the same config the cog reads, so a request re-enqueued
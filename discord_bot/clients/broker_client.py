@@ -44,7 +44,7 @@ class InMemoryBrokerClient: #pylint:disable=too-many-public-methods
     BrokerClient backed by a local MediaBroker instance.  Used when all
     components run in the same process.
 
-    Wide by design: it implements the full BrokerClient Protocol (~19 methods)
+    Wide by design: it implements the full BrokerClient Protocol (~25 methods)
     plus the result_queue / search_result_queue / local_broker accessors tests
     read to reach the engine directly — so it trips too-many-public-methods,
     disabled here as on the Music cog.
@@ -93,6 +93,14 @@ class InMemoryBrokerClient: #pylint:disable=too-many-public-methods
         '''Delegate to broker.update_request_status.'''
         await self._broker.update_request_status(uuid, update)
 
+    async def register_requests(self, media_requests: list) -> None:
+        '''Delegate to broker.register_requests.'''
+        await self._broker.register_requests(media_requests)
+
+    async def update_status_many(self, updates: list[tuple[str, LifecycleStatusUpdate]]) -> None:
+        '''Delegate to broker.update_status_many.'''
+        await self._broker.update_status_many(updates)
+
     async def register_download_result(self, result: DownloadResult) -> MediaDownload | None:
         '''Persist a successful DownloadResult on the local broker (zone=AVAILABLE)
         and push the raw result onto the bot-ready queue for next_result.
@@ -109,6 +117,10 @@ class InMemoryBrokerClient: #pylint:disable=too-many-public-methods
         '''Pop the next ready DownloadResult; returns None if the queue is empty.'''
         return await self._result_queue.get_nowait()
 
+    async def next_results(self, max_results: int, wait_seconds: float) -> list[DownloadResult]:
+        '''Wait up to wait_seconds for ready DownloadResults; up to max_results.'''
+        return await self._result_queue.get_batch(max_results, wait_seconds)
+
     async def register_search_result(self, resolution: SearchResolution) -> None:
         '''Push a resolved search onto the local bot-ready queue for
         next_search_result.  No broker-engine call — search is passthrough.'''
@@ -118,6 +130,10 @@ class InMemoryBrokerClient: #pylint:disable=too-many-public-methods
         '''Pop the next ready SearchResolution; None if the queue is empty.'''
         return await self._search_result_queue.get_nowait()
 
+    async def next_search_results(self, max_results: int, wait_seconds: float) -> list[SearchResolution]:
+        '''Wait up to wait_seconds for ready SearchResolutions; up to max_results.'''
+        return await self._search_result_queue.get_batch(max_results, wait_seconds)
+
     async def checkout(self, uuid: str, guild_id: int, guild_path: str | None = None) -> CheckoutResult | None:
         '''Delegate to broker.checkout, which already returns a CheckoutResult.'''
         return await self._broker.checkout(uuid, guild_id, Path(guild_path) if guild_path else None)
@@ -142,6 +158,10 @@ class InMemoryBrokerClient: #pylint:disable=too-many-public-methods
         '''Delegate to broker.check_cache.'''
         return await self._broker.check_cache(media_request)
 
+    async def check_cache_many(self, media_requests: list) -> list[MediaDownload | None]:
+        '''Delegate to broker.check_cache_many.'''
+        return await self._broker.check_cache_many(media_requests)
+
     async def cache_cleanup(self) -> bool:
         '''Delegate to broker.cache_cleanup.'''
         return await self._broker.cache_cleanup()
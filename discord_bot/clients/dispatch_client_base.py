@@ -11,6 +11,7 @@ import logging
 from opentelemetry import trace
 
 from discord_bot.types.dispatch_request import (
+    BulkDeleteRequest,
     DeleteRequest,
     FetchChannelHistoryRequest,
     FetchGuildEmojisRequest,
@@ -112,6 +113,8 @@ class DispatchClientBase:
             self._handle_send(request)
         elif isinstance(request, DeleteRequest):
             self._handle_delete(request)
+        elif isinstance(request, BulkDeleteRequest):
+            self._handle_bulk_delete(request)
         elif isinstance(request, FetchChannelHistoryRequest):
             asyncio.create_task(self._submit_history_request(request))
         elif isinstance(request, FetchGuildEmojisRequest):
@@ -125,6 +128,10 @@ class DispatchClientBase:
         '''Dispatch a DeleteRequest; subclasses implement the transport.'''
         raise NotImplementedError
 
+    def _handle_bulk_delete(self, request: BulkDeleteRequest) -> None:
+        '''Dispatch a BulkDeleteRequest; subclasses implement the transport.'''
+        raise NotImplementedError
+
     async def _do_fetch_history(self, params: dict) -> dict:
         '''Perform the fetch_history transport call; return raw payload or raise DispatchRemoteError.'''
         raise NotImplementedError
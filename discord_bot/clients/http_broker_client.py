@@ -14,6 +14,7 @@ Re-exported from clients/broker_client.py, so `from
 discord_bot.clients.broker_client import HttpBrokerClient` keeps working.
 '''
 import logging
+from asyncio import sleep
 from pathlib import Path
 
 import aiohttp
@@ -27,6 +28,7 @@ from discord_bot.types.media_download import MediaDownload
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.utils.otel import async_otel_span_wrapper
+from discord_bot.utils.wire_format import compact_dump, from_json_text
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +36,17 @@ logger = logging.getLogger(__name__)
 # existed — the two pods roll independently, so this is an expected (and
 # self-resolving) window during a deploy, not a client error.
 _PEER_ROUTE_MISSING_STATUS = 404
+# Cadence of the fallback to the one-at-a-time routes while the broker predates
+# the batch routes — the 1 Hz the bot polled at before the long-poll existed.
+_LEGACY_POLL_INTERVAL_SECONDS = 1.0
+# Slack on top of the requested wait before a long-poll request is given up on.
+_LONG_POLL_TIMEOUT_MARGIN_SECONDS = 10.0
 
 
 def _media_download_to_dict(media_download: MediaDownload) -> dict:
     '''Serialise a MediaDownload + its MediaRequest to a wire-friendly dict.'''
     return {
-        'request': media_download.media_request.model_dump(mode='json'),
+        'request': compact_dump(media_download.media_request),
         'file_path': str(media_download.file_path) if media_download.file_path else None,
         'file_size_bytes': media_download.file_size_bytes,
         'cache_hit': media_download.cache_hit,
@@ -63,7 +70,7 @@ def _media_download_from_dict(data: dict, media_request: MediaRequest) -> MediaD
     return md
 
 
-class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
+class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin): #pylint:disable=too-many-public-methods
     '''
     BrokerClient that forwards calls to a remote BrokerHttpServer over HTTP.
     Used when the broker runs in a separate process.
@@ -71,8 +78,12 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
     In HA mode checkout returns a CheckoutResult with s3_key set; the caller
     (MusicPlayer) downloads the file from S3 before playback.
 
-    next_result polls the remote broker for the next bot-ready DownloadResult,
-    replacing the local-queue side-channel used in single-process mode.
+    next_results long-polls the remote broker for bot-ready DownloadResults,
+    replacing the local-queue side-channel used in single-process mode: the
+    broker holds the request until a result is registered and returns every
+    ready result (up to a limit) in one response.  next_result is the older
+    one-per-request poll, kept as the fallback for a broker without the batch
+    route.
     '''
     def __init__(self, base_url: str, bucket_name: str | None = None,
                  session: aiohttp.ClientSession | None = None):
@@ -87,7 +98,7 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
             attributes={'music.media_request.uuid': str(media_request.uuid)},
         ):
             await self._http('POST', f'{self._base_url}/requests/{media_request.uuid}',
-                             media_request.model_dump(mode='json'))
+                             compact_dump(media_request))
 
     async def update_request_status(self, uuid: str, update: LifecycleStatusUpdate) -> None:
         '''PUT /requests/{uuid}/status.'''
@@ -97,11 +108,57 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
         ):
             await self._http('PUT', f'{self._base_url}/requests/{uuid}/status', update.model_dump())
 
+    async def _send_batch(self, method: str, route: str, body: dict) -> tuple[bool, dict | None]:
+        '''
+        Send one /batch request.  Returns (served, payload).
+
+        served is False when the broker 404s the route: it predates the batch
+        routes (mid-rolling-deploy), and the caller falls back to its
+        one-at-a-time calls.  Any other error is raised as usual.
+        '''
+        try:
+            return True, await self._http(method, f'{self._base_url}{route}', body)
+        except aiohttp.ClientResponseError as error:
+            if error.status != _PEER_ROUTE_MISSING_STATUS:
+                raise
+        logger.warning('Broker has no %s route yet (peer not upgraded); sending one request at a time', route)
+        return False, None
+
+    async def register_requests(self, media_requests: list[MediaRequest]) -> None:
+        '''POST /batch/requests — register a page of MediaRequests in one round trip.'''
+        if not media_requests:
+            return
+        async with async_otel_span_wrapper(
+            'broker.register_requests', kind=SpanKind.CLIENT,
+            attributes={'broker.batch_size': len(media_requests)},
+        ):
+            served, _ = await self._send_batch(
+                'POST', '/batch/requests',
+                {'requests': [compact_dump(media_request) for media_request in media_requests]})
+            if not served:
+                for media_request in media_requests:
+                    await self.register_request(media_request)
+
+    async def update_status_many(self, updates: list[tuple[str, LifecycleStatusUpdate]]) -> None:
+        '''PUT /batch/status — apply (uuid, update) pairs in order, in one round trip.'''
+        if not updates:
+            return
+        async with async_otel_span_wrapper(
+            'broker.update_status_many', kind=SpanKind.CLIENT,
+            attributes={'broker.batch_size': len(updates)},
+        ):
+            served, _ = await self._send_batch(
+                'PUT', '/batch/status',
+                {'updates': [{'uuid': uuid, 'update': update.model_dump()} for uuid, update in updates]})
+            if not served:
+                for uuid, update in updates:
+                    await self.update_request_status(uuid, update)
+
     async def register_download_result(self, result: DownloadResult) -> MediaDownload | None:
         '''POST /downloads — the broker stores success entries and pushes every
         result onto its bot-ready queue.  Consumers fetch via next_result.'''
         async with async_otel_span_wrapper('broker.register_download', kind=SpanKind.CLIENT):
-            await self._http('POST', f'{self._base_url}/downloads', result.model_dump(mode='json'))
+            await self._http('POST', f'{self._base_url}/downloads', compact_dump(result))
         return None
 
     def _log_missing_route(self, status: int, route: str) -> None:
@@ -132,10 +189,49 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
                 self._log_missing_route(resp.status, '/results/next')
                 return None
             resp.raise_for_status()
-            payload = await resp.json()
+            payload = await resp.json(loads=from_json_text)
             async with async_otel_span_wrapper('broker.next_result', kind=SpanKind.CLIENT):
                 return DownloadResult.model_validate(payload)
 
+    async def _next_batch(self, route: str, legacy_next, model, span_name: str,
+                          max_results: int, wait_seconds: float) -> list:
+        '''
+        GET a long-poll batch route and decode its results.
+
+        The broker holds the request for up to wait_seconds, so the request
+        timeout is set a margin past that rather than left to the session's.  A 404 means the broker predates the
+        route (mid-rolling-deploy): fall back to one legacy_next call, pacing
+        an empty answer at the old poll interval so the caller's loop does not
+        spin against the older broker.  As with next_result, no span is opened
+        unless there is something to parse.
+        '''
+        session = self._get_session()
+        timeout = aiohttp.ClientTimeout(total=wait_seconds + _LONG_POLL_TIMEOUT_MARGIN_SECONDS)
+        async with session.get(f'{self._base_url}{route}',
+                               params={'max': str(max_results), 'wait': str(wait_seconds)},
+                               headers=self._trace_headers(), timeout=timeout) as resp:
+            if resp.status == 204:
+                return []
+            if resp.status == _PEER_ROUTE_MISSING_STATUS:
+                self._log_missing_route(resp.status, route)
+                item = await legacy_next()
+                if item is None:
+                    await sleep(min(wait_seconds, _LEGACY_POLL_INTERVAL_SECONDS))
+                    return []
+                return [item]
+            resp.raise_for_status()
+            payload = await resp.json(loads=from_json_text)
+            async with async_otel_span_wrapper(span_name, kind=SpanKind.CLIENT):
+                return [model.model_validate(item) for item in payload['results']]
+
+    async def next_results(self, max_results: int, wait_seconds: float) -> list[DownloadResult]:
+        '''GET /results/batch — long-poll for up to max_results DownloadResults.
+
+        Returns as soon as the broker has at least one, with whatever else is
+        already queued; an empty list once wait_seconds pass with none.'''
+        return await self._next_batch('/results/batch', self.next_result,
+                                      DownloadResult, 'broker.next_results', max_results, wait_seconds)
+
     async def register_search_result(self, resolution: SearchResolution) -> None:
         '''POST /search-results — the broker pushes the resolution onto its
         bot-ready search-result queue.  Consumers fetch via next_search_result.
@@ -145,7 +241,7 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
         async with async_otel_span_wrapper('broker.register_search_result', kind=SpanKind.CLIENT):
             try:
                 await self._http('POST', f'{self._base_url}/search-results',
-                                 resolution.model_dump(mode='json'))
+                                 compact_dump(resolution))
             except aiohttp.ClientResponseError as error:
                 if error.status != _PEER_ROUTE_MISSING_STATUS:
                     raise
@@ -174,10 +270,16 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
                 self._log_missing_route(resp.status, '/search-results/next')
                 return None
             resp.raise_for_status()
-            payload = await resp.json()
+            payload = await resp.json(loads=from_json_text)
             async with async_otel_span_wrapper('broker.next_search_result', kind=SpanKind.CLIENT):
                 return SearchResolution.model_validate(payload)
 
+    async def next_search_results(self, max_results: int, wait_seconds: float) -> list[SearchResolution]:
+        '''GET /search-results/batch — long-poll for up to max_results
+        SearchResolutions.  Same contract as next_results.'''
+        return await self._next_batch('/search-results/batch', self.next_search_result,
+                                      SearchResolution, 'broker.next_search_results', max_results, wait_seconds)
+
     async def checkout(self, uuid: str, guild_id: int, guild_path: str | None = None) -> CheckoutResult | None:
         '''
         POST /requests/{uuid}/checkout — returns a CheckoutResult or None.
@@ -250,12 +352,33 @@ class HttpBrokerClient(HttpClientMixin, HttpPlayerSessionMixin):
         ):
             payload = await self._http(
                 'POST', f'{self._base_url}/cache/check',
-                media_request.model_dump(mode='json'),
+                compact_dump(media_request),
             )
+        return self._cache_hit_from_payload(payload, media_request)
+
+    @staticmethod
+    def _cache_hit_from_payload(payload: dict | None, media_request) -> MediaDownload | None:
+        '''Decode one /cache/check answer, bound to the media_request that asked.'''
         if not payload or not payload.get('hit'):
             return None
         return _media_download_from_dict(payload['download'], media_request)
 
+    async def check_cache_many(self, media_requests: list) -> list[MediaDownload | None]:
+        '''POST /batch/cache/check — check_cache for a page of requests in one round trip.'''
+        if not media_requests:
+            return []
+        async with async_otel_span_wrapper(
+            'broker.check_cache_many', kind=SpanKind.CLIENT,
+            attributes={'broker.batch_size': len(media_requests)},
+        ):
+            served, payload = await self._send_batch(
+                'POST', '/batch/cache/check',
+                {'requests': [compact_dump(media_request) for media_request in media_requests]})
+            if not served:
+                return [await self.check_cache(media_request) for media_request in media_requests]
+        return [self._cache_hit_from_payload(item, media_request)
+                for item, media_request in zip(payload['results'], media_requests)]
+
     async def cache_cleanup(self) -> bool:
         '''POST /cache/cleanup — broker evicts stale cache entries.'''
         async with async_otel_span_wrapper('broker.cache_cleanup', kind=SpanKind.CLIENT):
@@ -3,6 +3,7 @@ import aiohttp
 from opentelemetry.propagate import inject
 
 from discord_bot.utils.discord_retry import async_retry_broker_command
+from discord_bot.utils.wire_format import from_json_text, to_json_text
 
 
 class HttpClientMixin:
@@ -12,7 +13,7 @@ class HttpClientMixin:
     def _get_session(self) -> aiohttp.ClientSession:
         '''Return the shared session, creating it lazily on first use.'''
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(json_serialize=to_json_text)
         return self._session
 
     async def close(self) -> None:
@@ -41,6 +42,6 @@ class HttpClientMixin:
             ) as resp:
                 resp.raise_for_status()
                 if resp.content_type == 'application/json':
-                    return await resp.json()
+                    return await resp.json(loads=from_json_text)
                 return None
         return await async_retry_broker_command(_call, traced=traced)
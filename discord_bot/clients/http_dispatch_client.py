@@ -1,17 +1,19 @@
 '''HTTP client for cross-process dispatch via DispatchHttpServer (HA mode).'''
 import asyncio
 import logging
+from typing import Callable
 
 import aiohttp
 from opentelemetry import trace
 
 from discord_bot.types.dispatch_request import (
+    BulkDeleteRequest,
     DeleteRequest,
     SendRequest,
 )
 from discord_bot.clients.dispatch_client_base import DispatchClientBase, DispatchRemoteError
-from discord_bot.utils.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError
-from discord_bot.utils.dispatch_queue import dispatch_request_id
+from discord_bot.utils.circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitState
+from discord_bot.utils.dispatch_queue import dispatch_request_id, next_mutable_seq
 from discord_bot.utils.discord_retry import async_retry_broker_command
 from discord_bot.clients.http_client_base import HttpClientMixin
 from discord_bot.utils.otel import DispatchNaming, METER_PROVIDER
@@ -22,6 +24,11 @@ _POLL_INTERVAL_BASE = 0.5   # seconds — first poll delay
 _POLL_INTERVAL_MAX = 10.0   # seconds — cap for exponential backoff
 _POLL_TIMEOUT = 300.0       # seconds — give up after this long
 
+# A dispatcher that 404s /dispatch/channel_event predates the channel tail
+# tracker (the pods roll independently); events are not forwarded for this long
+# before the route is tried again.
+_CHANNEL_EVENT_ROUTE_RETRY_SECONDS = 300.0
+
 _BREAKER_FAILURE_THRESHOLD = 5
 _BREAKER_RECOVERY_TIMEOUT = 30.0  # seconds
 
@@ -57,6 +64,7 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
         self._base_url = base_url.rstrip('/')
         self._session = session
         self._cog_queues: dict[str, asyncio.Queue] = {}
+        self._channel_events_paused_until = 0.0
 
     async def start(self) -> None:
         '''No-op — no background poller needed (polling happens per-request).'''
@@ -81,6 +89,18 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
             'message_id': request.message_id, 'span_context': request.span_context,
         }))
 
+    def _handle_bulk_delete(self, request: BulkDeleteRequest) -> None:
+        # A dispatcher that 404s the route predates bulk deletes (the pods
+        # roll independently); the messages go through /dispatch/delete.
+        def _delete_singly():
+            for message_id in request.message_ids:
+                self._handle_delete(DeleteRequest(guild_id=request.guild_id, channel_id=request.channel_id,
+                                                  message_id=message_id, span_context=request.span_context))
+        asyncio.create_task(self._post('/dispatch/bulk_delete', {
+            'guild_id': request.guild_id, 'channel_id': request.channel_id,
+            'message_ids': list(request.message_ids), 'span_context': request.span_context,
+        }, on_not_found=_delete_singly))
+
     # ------------------------------------------------------------------
     # Fire-and-forget methods
     # ------------------------------------------------------------------
@@ -94,9 +114,12 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
         req_id = dispatch_request_id({'key': key, 'guild_id': guild_id, 't': str(asyncio.get_running_loop().time())})
         trace.get_current_span().set_attribute(DispatchNaming.REQUEST_ID.value, req_id)
         logger.debug('update_mutable: key=%s dispatch.request_id=%s', key, req_id)
+        # Sequenced here, where the content was rendered: concurrent POSTs can
+        # reach the dispatcher in any order, and the seq keeps the newest.
         asyncio.create_task(self._post('/dispatch/update_mutable', {
             'key': key, 'guild_id': guild_id, 'content': content,
             'channel_id': channel_id, 'sticky': sticky, 'delete_after': delete_after,
+            'seq': next_mutable_seq(),
         }))
         return req_id
 
@@ -128,6 +151,29 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
             'message_id': message_id, 'span_context': span_context,
         }))
 
+    def record_channel_event(self, guild_id: int, channel_id: int,
+                             added: list[int] | None = None, deleted: list[int] | None = None):
+        '''
+        Fire-and-forget: POST /dispatch/channel_event.
+
+        Sent for every guild message create and delete the gateway delivers,
+        so it skips the per-call span and does not count against the breaker:
+        a dispatcher predating the route answers 404, which pauses forwarding
+        instead of opening the breaker shared with sends and mutable updates.
+        A dropped event only leaves the dispatcher's tracker stale until it
+        expires.
+        '''
+        if not (added or deleted):
+            return
+        if asyncio.get_running_loop().time() < self._channel_events_paused_until:
+            return
+        if _BREAKER.state is CircuitState.OPEN:
+            return
+        asyncio.create_task(self._post_channel_event({
+            'guild_id': guild_id, 'channel_id': channel_id,
+            'added': list(added or []), 'deleted': list(deleted or []),
+        }))
+
     # ------------------------------------------------------------------
     # Transport implementations for DispatchClientBase
     # ------------------------------------------------------------------
@@ -150,8 +196,13 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
     # HTTP helpers
     # ------------------------------------------------------------------
 
-    async def _post(self, path: str, body: dict) -> None:
-        '''POST *body* to *path* with retry+breaker; logs and swallows errors so callers are fire-and-forget.'''
+    async def _post(self, path: str, body: dict, on_not_found: Callable[[], None] | None = None) -> None:
+        '''
+        POST *body* to *path* with retry+breaker; logs and swallows errors so callers are fire-and-forget.
+
+        With on_not_found, a 404 calls it instead of failing, and does not
+        count against the breaker: the dispatcher is up, just without the route.
+        '''
         session = self._get_session()
         async def _call():
             async with session.post(
@@ -159,9 +210,16 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
                 headers=self._trace_headers(),
                 json=body,
             ) as resp:
+                if resp.status == 404 and on_not_found is not None:
+                    return False
                 resp.raise_for_status()
+                return True
         try:
-            await _BREAKER.call(lambda: async_retry_broker_command(_call))
+            accepted = await _BREAKER.call(lambda: async_retry_broker_command(_call))
+            if not accepted:
+                _REQUEST_COUNTER.add(1, {'result': 'not_found', 'path': path})
+                on_not_found()
+                return
             _REQUEST_COUNTER.add(1, {'result': 'success', 'path': path})
         except CircuitBreakerOpenError:
             _REQUEST_COUNTER.add(1, {'result': 'breaker_open', 'path': path})
@@ -170,6 +228,28 @@ class HttpDispatchClient(HttpClientMixin, DispatchClientBase):
             _REQUEST_COUNTER.add(1, {'result': 'failure', 'path': path})
             logger.error('HttpDispatchClient :: POST %s failed: %s', path, exc)
 
+    async def _post_channel_event(self, body: dict) -> None:
+        '''POST a channel event outside the breaker; a 404 pauses forwarding.'''
+        session = self._get_session()
+        path = '/dispatch/channel_event'
+        async def _call():
+            async with session.post(f'{self._base_url}{path}', json=body) as resp:
+                resp.raise_for_status()
+        try:
+            await async_retry_broker_command(_call, max_retries=1, traced=False)
+            _REQUEST_COUNTER.add(1, {'result': 'success', 'path': path})
+        except aiohttp.ClientResponseError as exc:
+            _REQUEST_COUNTER.add(1, {'result': 'failure', 'path': path})
+            if exc.status != 404:
+                logger.error('HttpDispatchClient :: POST %s failed: %s', path, exc)
+                return
+            self._channel_events_paused_until = asyncio.get_running_loop().time() + _CHANNEL_EVENT_ROUTE_RETRY_SECONDS
+            logger.warning('HttpDispatchClient :: dispatcher has no %s route yet (peer not upgraded); '
+                           'pausing channel events for %ss', path, _CHANNEL_EVENT_ROUTE_RETRY_SECONDS)
+        except Exception as exc:
+            _REQUEST_COUNTER.add(1, {'result': 'failure', 'path': path})
+            logger.error('HttpDispatchClient :: POST %s failed: %s', path, exc)
+
     async def _submit_fetch(self, path: str, params: dict) -> str:
         '''POST *params* to *path* and return the request_id from the 202 response.'''
         session = self._get_session()
@@ -14,6 +14,7 @@ from opentelemetry.trace import SpanKind
 
 from discord_bot.types.player_session import PlayerSession
 from discord_bot.utils.otel import async_otel_span_wrapper
+from discord_bot.utils.wire_format import compact_dump
 
 # A broker that 404s a session route is running a build from before the route
 # existed.  The bot and broker pods roll independently, so this is an expected
@@ -37,7 +38,7 @@ class HttpPlayerSessionMixin:
         ):
             try:
                 await self._http('PUT', f'{self._base_url}/sessions/{session.guild_id}',
-                                 session.model_dump(mode='json'))
+                                 compact_dump(session))
             except aiohttp.ClientResponseError as error:
                 if error.status != PEER_ROUTE_MISSING_STATUS:
                     raise
@@ -3,9 +3,10 @@ Shared bot-side HTTP client for the pod-hosted queue workers.
 
 The mirror image of servers/queue_worker_server.py: HttpDownloadClient and
 HttpYoutubeMusicSearchClient talk to structurally identical pods, so the producer
-surface (submit / block_guild / clear_guild_queue) and the cached read surface
-(queue_size / failure_summary / backoff_seconds_remaining, refreshed by a
-background status poller) live here once, parameterised by route + span prefix.
+surface (submit / submit_many / block_guild / clear_guild_queue) and the cached
+read surface (queue_size / failure_summary / backoff_seconds_remaining,
+refreshed by a background status poller) live here once, parameterised by
+route + span prefix.
 Two copies would trip pylint's duplicate-code check (R0801); sharing rather than
 disabling follows the call made for workers/redis_guild_queue.py.
 
@@ -33,12 +34,15 @@ from discord_bot.clients.http_client_base import HttpClientMixin
 from discord_bot.types.clear_guild_result import ClearGuildResult
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.playlist_add_request import parse_media_request
-from discord_bot.types.queue import SUBMIT_REJECTION_BY_STATUS
+from discord_bot.types.queue import SUBMIT_REJECTION_BY_NAME, SUBMIT_REJECTION_BY_STATUS, submit_in_order
 from discord_bot.utils.otel import async_otel_span_wrapper, AttributeNaming
+from discord_bot.utils.wire_format import compact_dump
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_FAILURE_SUMMARY = '0 failures in queue'
+# A worker pod that 404s the batch route is running a build from before it.
+_PEER_ROUTE_MISSING_STATUS = 404
 
 
 class HttpQueueWorkerClient(HttpClientMixin):
@@ -82,7 +86,7 @@ class HttpQueueWorkerClient(HttpClientMixin):
         return {
             'guild_id': guild_id,
             'priority': priority,
-            'media_request': media_request.model_dump(mode='json'),
+            'media_request': compact_dump(media_request),
         }
 
     async def submit(self, guild_id: int, media_request: MediaRequest,
@@ -112,6 +116,40 @@ class HttpQueueWorkerClient(HttpClientMixin):
         if rejection is not None:
             raise rejection
 
+    async def submit_many(self, guild_id: int, media_requests: list[MediaRequest],
+                          priority: int | None = None) -> list[Exception | None]:
+        '''POST {prefix}/batch — enqueue a page of requests in one round trip.
+
+        The pod answers with one outcome per request: null once queued, else
+        the name of the rejection, decoded back to the PutsBlocked / QueueFull
+        that submit would have raised.  A pod from before the batch route 404s
+        it; then the requests go one submit at a time instead.
+        '''
+        if not media_requests:
+            return []
+        body = {
+            'guild_id': guild_id,
+            'priority': priority,
+            'media_requests': [compact_dump(media_request) for media_request in media_requests],
+        }
+        async with async_otel_span_wrapper(f'{self.SPAN_PREFIX}.submit_many', kind=SpanKind.CLIENT,
+                                           attributes={'queue.batch_size': len(media_requests)}):
+            try:
+                resp = await self._http('POST', f'{self._submit_url}/batch', body)
+            except ClientResponseError as exc:
+                if exc.status != _PEER_ROUTE_MISSING_STATUS:
+                    raise
+                resp = None
+        if resp is None:
+            logger.warning('%s worker has no batch submit route yet (peer not upgraded); '
+                           'submitting one request at a time', self.SPAN_PREFIX)
+            return await submit_in_order(self.submit, guild_id, media_requests, priority=priority)
+        return [
+            None if name is None else SUBMIT_REJECTION_BY_NAME[name](
+                f'{name} for guild {guild_id} from the {self.SPAN_PREFIX} worker')
+            for name in resp['results']
+        ]
+
     async def block_guild(self, guild_id: int) -> bool:
         '''POST {prefix}/block — refuse subsequent submits for this guild.'''
         async with async_otel_span_wrapper(f'{self.SPAN_PREFIX}.block', kind=SpanKind.CLIENT):
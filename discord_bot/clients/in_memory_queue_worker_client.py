@@ -3,7 +3,7 @@ Shared single-process client for the queue workers.
 
 The in-process counterpart to http_queue_worker_client.py: InMemoryDownloadClient
 and InMemoryYoutubeMusicSearchClient both wrap a worker engine and forward the
-same submit / block / clear / queue_size / failure_summary / backoff surface to
+same submit / submit_many / block / clear / queue_size / failure_summary / backoff surface to
 it, so that forwarding lives here once and each subclass adds only the half that
 is specific to its engine (the download consumer loop; the search pop/resolve
 calls).  Two copies would trip pylint's duplicate-code check.
@@ -33,6 +33,11 @@ class InMemoryQueueWorkerClient:
         '''Enqueue a MediaRequest on the worker's input queue.'''
         await self._worker.submit(guild_id, media_request, priority=priority)
 
+    async def submit_many(self, guild_id: int, media_requests: list[MediaRequest],
+                          priority: int | None = None) -> list[Exception | None]:
+        '''Enqueue a batch on the worker's input queue; one outcome per request.'''
+        return await self._worker.submit_many(guild_id, media_requests, priority=priority)
+
     async def block_guild(self, guild_id: int) -> bool:
         '''Block new submissions for a guild (used during shutdown/cleanup).'''
         return await self._worker.block_guild(guild_id)
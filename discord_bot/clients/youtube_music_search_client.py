@@ -49,6 +49,14 @@ class InMemoryYoutubeMusicSearchClient(InMemoryQueueWorkerClient):
         '''Pop the next pending search request, raising asyncio.QueueEmpty if none.'''
         return await self._worker.get_input_nowait()
 
+    async def get_cached_nowait(self) -> tuple[MediaRequest, str | None]:
+        '''Pop the next request answered from the resolution cache, raising asyncio.QueueEmpty if none.'''
+        return await self._worker.get_cached_nowait()
+
+    async def wait_for_work(self, timeout: float) -> None:
+        '''Block until a search is queued or cached, or timeout seconds pass.'''
+        await self._worker.wait_for_work(timeout)
+
     async def resolve(self, media_request: MediaRequest) -> str | None:
         '''Resolve a request to a videoId (or None); re-raises on a 429.'''
         return await self._worker.resolve(media_request)
@@ -75,14 +83,15 @@ class HttpYoutubeMusicSearchClient(HttpQueueWorkerClient):
     only the route and span prefixes differ from the downloader's client.
 
     **Deliberately narrower than the Protocol**: no resolve / get_input_nowait /
-    backoff_wait / set_wait_timestamp.  Those four belong to whoever drives the
-    search loop, and that is the search pod: it owns the ytmusicapi client, the
-    queue it pops from, and the shared 429 window.  The bot receives resolutions
-    back through the broker's search-result queue, not through this client, and
-    registers no search loop at all — the cog used to run one itself when no
-    search url was configured, and that in-process shape is gone
-    (projects/discord-bot-ha-only).  Calling one of the four here is a programming error,
-    not a runtime fallback, so they are absent rather than raising stubs.
+    get_cached_nowait / wait_for_work / backoff_wait / set_wait_timestamp.  Those belong to
+    whoever drives the search loop, and that is the search pod: it owns the
+    ytmusicapi client, the queue it pops from, and the shared 429 window.  The bot
+    receives resolutions back through the broker's search-result queue, not
+    through this client, and registers no search loop at all — the cog used to
+    run one itself when no search url was configured, and that in-process shape
+    is gone (projects/discord-bot-ha-only).  Calling one of them here is a
+    programming error, not a runtime fallback, so they are absent rather than
+    raising stubs.
     '''
 
     ROUTE_PREFIX: ClassVar[str] = '/search/ytmusic'
@@ -12,6 +12,7 @@ from discord_bot.types.dispatch_request import (
     FetchGuildEmojisRequest,
     SendRequest,
     DeleteRequest,
+    BulkDeleteRequest,
 )
 
 _UNSET = object()
@@ -158,3 +159,17 @@ class CogHelperBase(Cog):
             message_id=message_id,
             span_context=capture_span_context(),
         ))
+
+    async def dispatch_bulk_delete(self, guild_id: int, channel_id: int, message_ids: list[int]) -> None:
+        '''
+        Delete up to 100 messages of one channel in a single API call through
+        the dispatcher (NORMAL priority).  Discord rejects bulk deletes of
+        messages older than 14 days; the caller sends those through
+        dispatch_delete.
+        '''
+        await self.dispatcher.submit_request(BulkDeleteRequest(
+            guild_id=guild_id,
+            channel_id=channel_id,
+            message_ids=list(message_ids),
+            span_context=capture_span_context(),
+        ))
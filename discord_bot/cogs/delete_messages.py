@@ -11,6 +11,7 @@ from sqlalchemy.engine.base import Engine
 
 from discord_bot.cogs.cog_helper import CogHelper
 from discord_bot.exceptions import CogMissingRequiredArg
+from discord_bot.types.dispatch_request import BULK_DELETE_MAX_AGE, BULK_DELETE_MAX_MESSAGES
 from discord_bot.types.dispatch_result import ChannelHistoryResult
 from discord_bot.utils.common import return_loop_runner
 from discord_bot.utils.loop_health import LOOP_HEALTH, health_aware_queue_get
@@ -23,6 +24,10 @@ DELETE_AFTER_DEFAULT = 7
 # Default for how to wait between each loop
 LOOP_SLEEP_INTERVAL_DEFAULT = 300
 
+# Messages this close to the bulk delete age limit are deleted one at a time,
+# so the queue wait before the dispatcher runs the bulk delete cannot push them over.
+BULK_DELETE_AGE_MARGIN = timedelta(hours=1)
+
 # Background-loop names: LoopHealth registry keys and heartbeat background_job values
 LOOP_DELETE_MESSAGE_CHECK = 'delete_message_check'
 LOOP_DELETE_MESSAGE_RESULT = 'delete_message_result'
@@ -139,14 +144,27 @@ class DeleteMessages(CogHelper):
             return
         channel_config = self._get_channel_config(result.channel_id)
         delete_after = channel_config.get('delete_after', DELETE_AFTER_DEFAULT)
-        cutoff_period = (datetime.now(timezone.utc) - timedelta(days=delete_after))
+        now = datetime.now(timezone.utc)
+        cutoff_period = now - timedelta(days=delete_after)
+        bulk_cutoff = now - BULK_DELETE_MAX_AGE + BULK_DELETE_AGE_MARGIN
+        recent_ids = []
+        old_ids = []
         for message in result.messages:
             if message.created_at < cutoff_period:
                 self.logger.info(
                     f'Deleting message id {message.id}, in channel {result.channel_id}, '
                     f'in server {result.guild_id}'
                 )
-                await self.dispatch_delete(result.guild_id, result.channel_id, message.id)
+                (recent_ids if message.created_at > bulk_cutoff else old_ids).append(message.id)
+        for start in range(0, len(recent_ids), BULK_DELETE_MAX_MESSAGES):
+            chunk = recent_ids[start:start + BULK_DELETE_MAX_MESSAGES]
+            if len(chunk) == 1:
+                old_ids.extend(chunk)
+                continue
+            await self.dispatch_bulk_delete(result.guild_id, result.channel_id, chunk)
+        # Too old for a bulk delete, or the lone message of a chunk.
+        for message_id in old_ids:
+            await self.dispatch_delete(result.guild_id, result.channel_id, message_id)
 
     async def _delete_result_loop(self) -> None:
         '''Consumer loop: read channel history results and delete old messages.'''
@@ -1,7 +1,9 @@
 from asyncio import sleep
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from functools import partial
-from random import choice
+from random import random
+from time import monotonic
 from re import match, sub, MULTILINE
 from typing import Optional, List
 
@@ -12,11 +14,14 @@ from discord.errors import DiscordServerError
 from opentelemetry.trace import SpanKind
 from opentelemetry.metrics import Observation
 from pydantic import BaseModel, Field
-from sqlalchemy import delete as sa_delete, select
+from sqlalchemy import delete as sa_delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from discord_bot.common import DISCORD_MAX_MESSAGE_LENGTH
 from discord_bot.cogs.cog_helper import CogHelper
+from discord_bot.cogs.markov_helpers.markov_model import MarkovModel, MarkovModelCache, MODEL_BUILD_HISTOGRAM
+from discord_bot.cogs.markov_helpers.retention import RelationPruner, RETENTION_BATCH_SIZE_DEFAULT
 from discord_bot.database import MarkovChannel, MarkovRelation
 from discord_bot.exceptions import CogMissingRequiredArg
 from discord_bot.types.dispatch_result import ChannelHistoryResult, GuildEmojisResult, is_not_found_error
@@ -46,6 +51,12 @@ class MarkovConfig(BaseModel):
     message_check_limit: int = 16
     history_retention_days: int = 365
     server_reject_list: list[int] = Field(default_factory=list)
+    # Compiled speak models kept in memory, least recently used evicted first
+    model_cache_max_guilds: int = Field(default=32, ge=0)
+    # Budget across all cached models, in distinct (leader, follower) pairs
+    model_cache_max_transitions: int = Field(default=500000, ge=0)
+    # Rows deleted per retention transaction
+    retention_batch_size: int = Field(default=RETENTION_BATCH_SIZE_DEFAULT, ge=1)
 
 def clean_message(content: str, emojis: List[dict]):
     '''
@@ -112,6 +123,28 @@ async def get_markov_channel_by_ids(db_session: AsyncSession, guild_id: int, cha
         .where(MarkovChannel.server_id == guild_id)
     )).scalars().first()
 
+def relation_day(timestamp: datetime) -> datetime:
+    '''
+    UTC midnight of the day a message was sent, the bucket its relations are counted in
+    '''
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+async def get_guild_transitions(db_session: AsyncSession, guild_id: int):
+    '''
+    Every (leader, follower, count) for a guild, summed across its channels and days
+
+    Ordered by first appearance, so models built from it draw deterministically
+    '''
+    return (await db_session.execute(
+        select(MarkovRelation.leader_word, MarkovRelation.follower_word, func.sum(MarkovRelation.count))
+        .join(MarkovChannel, MarkovChannel.id == MarkovRelation.channel_id)
+        .where(MarkovChannel.server_id == guild_id)
+        .group_by(MarkovRelation.leader_word, MarkovRelation.follower_word)
+        .order_by(func.min(MarkovRelation.id))
+    )).all()
+
 class Markov(CogHelper):
     '''
     Save markov relations to a database periodically
@@ -136,6 +169,9 @@ class Markov(CogHelper):
         self._task = None
         self._result_task = None
         self._emoji_cache: dict[int, list] = {}
+        self.model_cache = MarkovModelCache(self.config.model_cache_max_guilds,
+                                            self.config.model_cache_max_transitions)
+        self.relation_pruner = RelationPruner(self.logger, self.config.retention_batch_size)
         self._init_task = None
         # Heartbeats read LoopHealth (successful iterations), the same bit the
         # health server's probe uses — see utils/loop_health.
@@ -186,12 +222,14 @@ class Markov(CogHelper):
             self._result_task.cancel()
 
     # https://srome.github.io/Making-A-Markov-Chain-Twitter-Bot-In-Python/
-    async def build_and_save_relations(self, corpus: List[str], markov_channel_id: str, message_timestamp: datetime):
+    def build_relations(self, corpus: List[str], markov_channel_id: int, message_timestamp: datetime) -> List[dict]:
         '''
-        Build and save relations to db
+        Build relation rows for a message, without touching the db
         corpus : List of strings from message, after cleaning
         markov_channel_id : Markov Channel ID (ID from DB)
         message_timestamp: Timestamp for db
+
+        Returns one MarkovRelation column dict per pair, bucketed by day
         '''
         def ensure_word(word):
             if len(word) >= 255:
@@ -199,6 +237,7 @@ class Markov(CogHelper):
                 return None
             return word
 
+        relations = []
         for (k, word) in enumerate(corpus):
             if k != len(corpus) - 1: # Deal with last word
                 next_word = corpus[k+1]
@@ -210,13 +249,71 @@ class Markov(CogHelper):
             follower_word = ensure_word(next_word)
             if follower_word is None:
                 continue
-            new_relation = MarkovRelation(channel_id=markov_channel_id,
-                                          leader_word=leader_word,
-                                          follower_word=follower_word,
-                                          created_at=message_timestamp)
-            async with self.with_db_session() as db_session:
-                db_session.add(new_relation)
-                await async_retry_database_commands(db_session, db_session.commit)
+            relations.append({
+                'channel_id': markov_channel_id,
+                'leader_word': leader_word,
+                'follower_word': follower_word,
+                'created_at': relation_day(message_timestamp),
+            })
+        return relations
+
+    async def save_relations(self, db_session: AsyncSession, markov_channel_id: int,
+                             relations: List[dict], last_message_id: int):
+        '''
+        Add a batch of relations to the day counts and advance the channel's last_message_id in one transaction
+
+        db_session : Sqlalchemy async db_session
+        markov_channel_id : Markov Channel ID (DB ID)
+        relations : Rows from build_relations
+        last_message_id : Newest message covered by the batch
+        '''
+        # Collapse repeats first: a single upsert statement may not touch the same row twice
+        counts = Counter((r['channel_id'], r['leader_word'], r['follower_word'], r['created_at']) for r in relations)
+        rows = [
+            {'channel_id': key[0], 'leader_word': key[1], 'follower_word': key[2], 'created_at': key[3], 'count': value}
+            for key, value in counts.items()
+        ]
+        stmt = pg_insert(MarkovRelation)
+        stmt = stmt.on_conflict_do_update(
+            constraint='_unique_markov_relation_day',
+            set_={'count': MarkovRelation.count + stmt.excluded['count']},
+        )
+
+        async def write_batch():
+            # A list of dicts makes this an executemany, which SQLAlchemy sends as
+            # multi-row INSERT ... VALUES statements rather than one per relation
+            if rows:
+                await db_session.execute(stmt, rows)
+            await db_session.execute(
+                update(MarkovChannel)
+                .where(MarkovChannel.id == markov_channel_id)
+                .values(last_message_id=last_message_id)
+            )
+            await db_session.commit()
+
+        # The retry rolls back and replays the whole batch, so the relations and
+        # the message cursor always land together
+        await async_retry_database_commands(db_session, write_batch)
+
+    async def get_markov_model(self, guild_id: int) -> MarkovModel:
+        '''
+        Compiled model for guild, built from the database on a cache miss
+
+        guild_id : Guild to load relations for, across all of its markov channels
+        '''
+        model = self.model_cache.get(guild_id)
+        if model:
+            return model
+        version = self.model_cache.version(guild_id)
+        build_started = monotonic()
+        async with self.with_db_session() as db_session:
+            rows = await async_retry_database_commands(db_session, lambda: get_guild_transitions(db_session, guild_id))
+        model = MarkovModel()
+        for leader_word, follower_word, count in rows:
+            model.add(leader_word, follower_word, count)
+        MODEL_BUILD_HISTOGRAM.record(monotonic() - build_started)
+        self.model_cache.put(guild_id, model, version)
+        return model
 
     async def delete_channel_relations(self, db_session: AsyncSession, channel_id: str):
         '''
@@ -265,17 +362,12 @@ class Markov(CogHelper):
                             after_message_id=markov_channel.last_message_id,
                         )
 
-        # Delete old records
+        # Delete old records, in batches and only once a new day bucket has expired
         async with async_otel_span_wrapper('markov.message_delete', kind=SpanKind.INTERNAL):
-            async with self.with_db_session() as db_session:
-                await async_retry_database_commands(
-                    db_session,
-                    lambda: db_session.execute(
-                        sa_delete(MarkovRelation).where(MarkovRelation.created_at < retention_cutoff)
-                    )
-                )
-                await db_session.commit()
-            self.logger.debug('Deleted expired/old markov relations')
+            pruned = await self.relation_pruner.prune(self.with_db_session, retention_cutoff)
+            # Counts went down, which cached models cannot apply incrementally
+            if pruned:
+                self.model_cache.invalidate()
 
     async def _markov_result_loop(self):
         '''
@@ -356,6 +448,7 @@ class Markov(CogHelper):
                         await self.delete_channel_relations(db_session, markov_channel.id)
                         markov_channel.last_message_id = None
                         await self.retry_commit(db_session)
+                        self.model_cache.invalidate(guild_id)
             else:
                 self.logger.error(
                     f'Markov :: Failed to fetch history for channel {channel_id} '
@@ -377,6 +470,8 @@ class Markov(CogHelper):
                 self.logger.debug(f'Markov channel {channel_id} not found in DB, skipping')
                 return
 
+            # Build the whole batch in memory, then write it in a single transaction
+            relations = []
             for message in result.messages:
                 self.logger.debug(f'Gathering message {message.id} '
                                   f'for channel {channel_id}')
@@ -391,10 +486,11 @@ class Markov(CogHelper):
                 if corpus:
                     self.logger.info(f'Attempting to add corpus "{corpus}" '
                                      f'to channel {channel_id}')
-                    await self.build_and_save_relations(corpus, markov_channel.id, message.created_at)
-                markov_channel.last_message_id = message.id
-                await self.retry_commit(db_session)
-            self.logger.debug(f'Done with channel {channel_id}')
+                    relations.extend(self.build_relations(corpus, markov_channel.id, message.created_at))
+            await self.save_relations(db_session, markov_channel.id, relations, result.messages[-1].id)
+            # A guild already compiled for speak picks the batch up without a rebuild
+            self.model_cache.add_relations(guild_id, relations)
+            self.logger.debug(f'Done with channel {channel_id}, added {len(relations)} relations')
 
     @group(name='markov', invoke_without_command=False)
     async def markov(self, ctx: Context):
@@ -448,6 +544,7 @@ class Markov(CogHelper):
             await self.delete_channel_relations(db_session, markov_channel.id)
             await db_session.delete(markov_channel)
             await async_retry_database_commands(db_session, db_session.commit)
+            self.model_cache.invalidate(ctx.guild.id)
             return await self.dispatch_message(ctx.guild.id, ctx.channel.id,'Markov turned off for channel')
 
     @markov.command(name='list-channels')
@@ -505,38 +602,25 @@ class Markov(CogHelper):
                 all_words.append(start_words.lower())
             first = starting_words[-1].lower()
 
-        async with self.with_db_session() as db_session:
-            async def get_possible_words(first=None):
-                stmt = (
-                    select(MarkovRelation.id)
-                    .join(MarkovChannel, MarkovChannel.id == MarkovRelation.channel_id)
-                    .where(MarkovChannel.server_id == ctx.guild.id)
-                )
-                if first:
-                    stmt = stmt.where(MarkovRelation.leader_word == first)
-                return (await db_session.execute(stmt)).scalars().all()
-
-            possible_words = await async_retry_database_commands(db_session, lambda: get_possible_words(first))
-
-            if len(possible_words) == 0:
-                if first_word:
-                    return await self.dispatch_message(ctx.guild.id, ctx.channel.id,f'No markov word matching "{first_word}"')
-                return await self.dispatch_message(ctx.guild.id, ctx.channel.id,'No markov words to pick from')
-
-            async def get_leader_word():
-                # bandit B311: Markov chain word selection, not security-sensitive
-                return (await db_session.get(MarkovRelation, choice(possible_words))).leader_word  # nosec B311
-
-            async def get_follower_word(word_ids):
-                # bandit B311: Markov chain word selection, not security-sensitive
-                return (await db_session.get(MarkovRelation, choice(word_ids))).follower_word  # nosec B311
-
-            word = await async_retry_database_commands(db_session, get_leader_word)
+        # The walk itself is in memory; only a cache miss touches the database
+        model = await self.get_markov_model(ctx.guild.id)
+        if first:
+            word = first if model.has_leader(first) else None
+        else:
+            # bandit B311: Markov chain word selection, not security-sensitive
+            word = model.random_leader(random())  # nosec B311
+
+        if word is None:
+            if first_word:
+                return await self.dispatch_message(ctx.guild.id, ctx.channel.id,f'No markov word matching "{first_word}"')
+            return await self.dispatch_message(ctx.guild.id, ctx.channel.id,'No markov words to pick from')
+        all_words.append(word)
+
+        remaining_word_num = sentence_length - len(all_words)
+        for _ in range(remaining_word_num):
+            # bandit B311: Markov chain word selection, not security-sensitive
+            word = model.next_word(word, random())  # nosec B311
+            if word is None:
+                break
             all_words.append(word)
-
-            remaining_word_num = sentence_length - len(all_words)
-            for _ in range(remaining_word_num):
-                relation_ids = await async_retry_database_commands(db_session, lambda w=word: get_possible_words(w))
-                word = await async_retry_database_commands(db_session, lambda r=relation_ids: get_follower_word(r))
-                all_words.append(word)
-            return await self.dispatch_message(ctx.guild.id, ctx.channel.id,' '.join(markov_word for markov_word in all_words))
+        return await self.dispatch_message(ctx.guild.id, ctx.channel.id,' '.join(markov_word for markov_word in all_words))
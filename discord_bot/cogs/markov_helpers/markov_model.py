@@ -0,0 +1,180 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Iterable, List, Tuple
+
+from discord_bot.utils.otel import AttributeNaming, MetricNaming, METER_PROVIDER
+
+# Counts model lookups by outcome: 'hit' when speak found the guild's model
+# compiled, 'miss' when it had to be built from the database first.
+MODEL_CACHE_COUNTER = METER_PROVIDER.create_counter(
+    name=MetricNaming.MARKOV_MODEL_CACHE.value,
+    description='Markov model cache lookups (hit / miss)',
+    unit='1',
+)
+# Time to load and compile a guild's transitions on a miss
+MODEL_BUILD_HISTOGRAM = METER_PROVIDER.create_histogram(
+    name=MetricNaming.MARKOV_MODEL_BUILD.value,
+    description='Time to build a guild markov model from the database',
+    unit='s',
+)
+
+
+class MarkovModel():
+    '''
+    Compiled markov transitions for one guild.
+
+    Holds leader -> follower -> count, and compiles each leader's followers into
+    a (words, cumulative weights) pair on first use so a draw is one bisect.
+    Words keep the order they were first seen in, which is the order the
+    database hands them back in, so a draw of 0 is deterministic.
+    '''
+
+    def __init__(self):
+        self._transitions: dict[str, dict[str, int]] = {}
+        self._leader_weights: dict[str, int] = {}
+        self._compiled: dict[str, Tuple[List[str], List[int]]] = {}
+        self._compiled_leaders: Tuple[List[str], List[int]] | None = None
+        # Number of distinct (leader, follower) pairs, what the cache budgets on
+        self.size = 0
+
+    def add(self, leader_word: str, follower_word: str, count: int = 1):
+        '''
+        Add count occurrences of leader_word -> follower_word
+        '''
+        followers = self._transitions.setdefault(leader_word, {})
+        if follower_word not in followers:
+            followers[follower_word] = 0
+            self.size += 1
+        followers[follower_word] += count
+        self._leader_weights[leader_word] = self._leader_weights.get(leader_word, 0) + count
+        # Only this leader's followers and the leader table change
+        self._compiled.pop(leader_word, None)
+        self._compiled_leaders = None
+
+    @staticmethod
+    def _compile(weights: dict[str, int]) -> Tuple[List[str], List[int]]:
+        return list(weights), list(accumulate(weights.values()))
+
+    @staticmethod
+    def _draw(compiled: Tuple[List[str], List[int]], draw: float) -> str:
+        words, cumulative = compiled
+        # First word whose running total passes draw * total
+        return words[bisect_right(cumulative, draw * cumulative[-1])]
+
+    def has_leader(self, word: str) -> bool:
+        '''
+        Whether word has any followers
+        '''
+        return word in self._transitions
+
+    def random_leader(self, draw: float) -> str | None:
+        '''
+        Leader word weighted by how often it was seen; draw is in [0, 1)
+        '''
+        if not self._leader_weights:
+            return None
+        if self._compiled_leaders is None:
+            self._compiled_leaders = self._compile(self._leader_weights)
+        return self._draw(self._compiled_leaders, draw)
+
+    def next_word(self, leader_word: str, draw: float) -> str | None:
+        '''
+        Follower of leader_word weighted by how often it followed; draw is in [0, 1)
+        '''
+        if leader_word not in self._transitions:
+            return None
+        compiled = self._compiled.get(leader_word)
+        if compiled is None:
+            compiled = self._compiled[leader_word] = self._compile(self._transitions[leader_word])
+        return self._draw(compiled, draw)
+
+
+class MarkovModelCache():
+    '''
+    LRU of compiled MarkovModels by guild, bounded by guild count and total transitions.
+    A single guild over the transition budget is still kept, alone.
+
+    Models are built lazily by the caller on a miss and updated in place as new
+    relations are ingested. Each guild carries a version bumped on every update
+    or invalidation; put() drops a model whose build started before the latest
+    bump, so a batch ingested mid-build is never lost from the cache.
+    '''
+
+    def __init__(self, max_guilds: int, max_transitions: int):
+        self.max_guilds = max_guilds
+        self.max_transitions = max_transitions
+        self._models: OrderedDict[int, MarkovModel] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        # Bumped by invalidate() with no guild, which covers builds for any guild
+        self._epoch = 0
+        self.transitions = 0
+
+    def get(self, guild_id: int) -> MarkovModel | None:
+        '''
+        Cached model for guild, marking it recently used
+        '''
+        model = self._models.get(guild_id)
+        MODEL_CACHE_COUNTER.add(1, {AttributeNaming.OUTCOME.value: 'hit' if model else 'miss'})
+        if model:
+            self._models.move_to_end(guild_id)
+        return model
+
+    def version(self, guild_id: int) -> Tuple[int, int]:
+        '''
+        Current version for guild, captured before a build starts
+        '''
+        return self._epoch, self._versions.get(guild_id, 0)
+
+    def put(self, guild_id: int, model: MarkovModel, version: Tuple[int, int]) -> bool:
+        '''
+        Cache a freshly built model, then evict least recently used models past the budget
+
+        Returns False if the guild changed since version, in which case nothing is cached
+        '''
+        if version != self.version(guild_id):
+            return False
+        self._drop(guild_id)
+        self._models[guild_id] = model
+        self.transitions += model.size
+        self._evict()
+        return True
+
+    def add_relations(self, guild_id: int, relations: Iterable[dict]):
+        '''
+        Apply newly ingested relations to the guild's model, if it is cached
+        '''
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+        model = self._models.get(guild_id)
+        if not model:
+            return
+        before = model.size
+        for relation in relations:
+            model.add(relation['leader_word'], relation['follower_word'], relation.get('count', 1))
+        self.transitions += model.size - before
+        self._evict()
+
+    def invalidate(self, guild_id: int | None = None):
+        '''
+        Drop the guild's model, or every model if guild_id is None, so the next use rebuilds it
+        '''
+        if guild_id is None:
+            self._epoch += 1
+            self._models.clear()
+            self.transitions = 0
+            return
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+        self._drop(guild_id)
+
+    def _drop(self, guild_id: int):
+        model = self._models.pop(guild_id, None)
+        if model:
+            self.transitions -= model.size
+
+    def _evict(self):
+        # The most recently used model stays even when it alone is over the
+        # transition budget; dropping it would rebuild it on every use.
+        while self._models and (len(self._models) > self.max_guilds
+                                or (len(self._models) > 1 and self.transitions > self.max_transitions)):
+            _, model = self._models.popitem(last=False)
+            self.transitions -= model.size
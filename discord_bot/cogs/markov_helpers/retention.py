@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from logging import Logger
+from time import monotonic
+from typing import AsyncContextManager, Callable
+
+from sqlalchemy import delete as sa_delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from discord_bot.database import MarkovRelation
+from discord_bot.utils.otel import MetricNaming, METER_PROVIDER
+from discord_bot.utils.sql_retry import async_retry_database_commands
+
+# Rows deleted per transaction, small enough that no single DELETE holds its locks for long
+RETENTION_BATCH_SIZE_DEFAULT = 5000
+
+RETENTION_PRUNED_COUNTER = METER_PROVIDER.create_counter(
+    name=MetricNaming.MARKOV_RETENTION_PRUNED.value,
+    description='Markov relation rows deleted by retention pruning',
+    unit='1',
+)
+RETENTION_DURATION_HISTOGRAM = METER_PROVIDER.create_histogram(
+    name=MetricNaming.MARKOV_RETENTION_DURATION.value,
+    description='Time spent on a markov retention pruning pass that ran',
+    unit='s',
+)
+
+
+def next_day_boundary(timestamp: datetime) -> datetime:
+    '''
+    First midnight at or after timestamp, in timestamp's timezone
+    '''
+    midnight = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight if midnight == timestamp else midnight + timedelta(days=1)
+
+
+class RelationPruner():
+    '''
+    Deletes markov relations older than the retention cutoff in bounded batches.
+
+    Relations are bucketed by day (see relation_day), so new rows only expire when
+    the cutoff crosses a midnight. The pruner keeps the cutoff of its last pass as
+    a watermark and skips passes until the cutoff has moved past the next day
+    boundary, instead of issuing a DELETE every loop. When a pass does run, each
+    batch deletes up to batch_size rows picked through the created_at index and
+    commits on its own, so no single statement scans or locks the whole table.
+
+    The watermark lives in memory; after a restart the first pass runs
+    unconditionally and catches up on anything that expired while down.
+    '''
+
+    def __init__(self, logger: Logger, batch_size: int = RETENTION_BATCH_SIZE_DEFAULT):
+        self.logger = logger
+        self.batch_size = batch_size
+        self.watermark: datetime | None = None
+
+    def due(self, cutoff: datetime) -> bool:
+        '''
+        Whether any day bucket expired between the last pass and cutoff
+        '''
+        return self.watermark is None or cutoff > next_day_boundary(self.watermark)
+
+    async def prune(self, session_factory: Callable[[], AsyncContextManager[AsyncSession]], cutoff: datetime) -> int:
+        '''
+        Delete relations created before cutoff, if a pass is due
+
+        session_factory : Yields an async db session, such as CogHelper.with_db_session
+        cutoff : Retention cutoff, rows with created_at before it are deleted
+
+        Returns number of rows deleted
+        '''
+        if not self.due(cutoff):
+            return 0
+        started = monotonic()
+        expired_ids = (
+            select(MarkovRelation.id)
+            .where(MarkovRelation.created_at < cutoff)
+            .limit(self.batch_size)
+            .scalar_subquery()
+        )
+        pruned = 0
+        async with session_factory() as db_session:
+            async def delete_batch():
+                result = await db_session.execute(
+                    sa_delete(MarkovRelation).where(MarkovRelation.id.in_(expired_ids))
+                )
+                await db_session.commit()
+                return result.rowcount
+
+            while True:
+                deleted = await async_retry_database_commands(db_session, delete_batch)
+                pruned += deleted
+                if deleted < self.batch_size:
+                    break
+        self.watermark = cutoff
+        elapsed = monotonic() - started
+        RETENTION_PRUNED_COUNTER.add(pruned)
+        RETENTION_DURATION_HISTOGRAM.record(elapsed)
+        self.logger.debug(f'Markov :: Pruned {pruned} relations older than {cutoff} in {elapsed:.2f}s')
+        return pruned
@@ -4,6 +4,7 @@
 import asyncio
 from asyncio import sleep
 from asyncio import QueueEmpty, QueueFull, TimeoutError as async_timeout
+from contextlib import aclosing
 from datetime import datetime, timezone
 from functools import partial
 from pathlib import Path
@@ -11,7 +12,7 @@ import random
 from shutil import disk_usage
 from tempfile import TemporaryDirectory
 from time import time
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Optional
 
 from dappertable import shorten_string, DapperTable, Columns, Column, PaginationLength
 from discord.ext.commands import Bot, Context, group, command
@@ -31,12 +32,13 @@ from discord_bot.interfaces.download_client_protocol import (
     DownloadClient, RETRY_BACKOFF_SECONDS_MINIMUM,
 )
 from discord_bot.types.cleanup_reason import CleanupReason
-from discord_bot.types.download import LifecycleEvent, LifecycleStatusUpdate, is_rejection
+from discord_bot.types.download import DownloadResult, LifecycleEvent, LifecycleStatusUpdate, is_rejection
 from discord_bot.clients.http_broker_client import HttpBrokerClient
 from discord_bot.interfaces.broker_client_protocol import BrokerClient
 from discord_bot.cogs.music_helpers.music_player import MusicPlayer
 from discord_bot.cogs.music_helpers.search_client import SearchClient, SearchException, check_youtube_video
 from discord_bot.types.search import SearchResult
+from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.types.media_request import MediaRequest, media_request_attributes
 from discord_bot.types.player_session import PlayerSession
 from discord_bot.types.playlist_add_request import PlaylistAddRequest
@@ -48,6 +50,7 @@ from discord_bot.cogs.music_helpers import database_functions
 
 from discord_bot.database import PlaylistItem, Playlist
 from discord_bot.exceptions import CogMissingRequiredArg, DiscordBotException, ExitEarlyException
+from discord_bot.utils.audio import AudioFormat
 from discord_bot.utils.common import rm_tree, return_loop_runner
 from discord_bot.types.queue import PutsBlocked
 from discord_bot.utils.integrations.spotify import SpotifyClient
@@ -57,6 +60,10 @@ from discord_bot.clients.youtube_music_search_client import (
 )
 from discord_bot.utils.sql_retry import async_retry_database_commands
 from discord_bot.types.queue import Queue
+from discord_bot.workers.bundle_render_throttle import BUNDLE_RENDER_INTERVAL_SECONDS_DEFAULT
+from discord_bot.workers.search_resolution_cache import (
+    SEARCH_CACHE_MAX_ENTRIES_DEFAULT, SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT, SEARCH_CACHE_TTL_SECONDS_DEFAULT,
+)
 from discord_bot.utils.loop_health import LOOP_HEALTH
 from discord_bot.utils.otel import async_otel_span_wrapper, capture_span_context, command_wrapper, MetricNaming, DiscordContextNaming, METER_PROVIDER, create_observable_gauge, loop_heartbeat_observations, span_links_from_context
 from discord_bot.clients.dispatch_client_base import DispatchClientBase
@@ -72,6 +79,9 @@ NUMBER_REGEX = r'.*(?P<number>[0-9]+).*'
 class MusicGeneralConfig(BaseModel):
     '''General music configuration'''
     message_delete_after: int = 300
+    # Minimum spacing, per bundle, of the broker's request-bundle message
+    # renders; events inside it are merged into one render. 0 renders every event.
+    bundle_render_interval_seconds: float = Field(default=BUNDLE_RENDER_INTERVAL_SECONDS_DEFAULT, ge=0)
 
 class MusicPlayerConfig(BaseModel):
     '''Music player configuration'''
@@ -98,6 +108,9 @@ class MusicStorageConfig(BaseModel):
     '''Music storage backend configuration'''
     bucket_name: str
     prefetch_limit: int = Field(default=5, ge=0)
+    # Start playback once the first seconds of an S3-staged track are on disk and
+    # stream the rest in behind the player, instead of waiting for the whole file
+    progressive_staging: bool = False
 
 class MusicDownloadConfig(BaseModel):
     '''Music download configuration'''
@@ -117,17 +130,29 @@ class MusicDownloadConfig(BaseModel):
     # Per-egress bucket for the shared YouTube backoff/failure keys. Pods behind
     # distinct egress IPs should use distinct keys so their rate-limits don't couple.
     youtube_egress_key: str = 'default'
+    # Pop the Redis download / search queues with one server-side script instead
+    # of the SET NX pop-lock. Falls back to the lock on its own where Redis has no
+    # scripting; set False to always use the lock.
+    redis_scripted_pop: bool = True
     spotify_credentials: Optional[SpotifyCredentialsConfig] = None
     youtube_api_key: Optional[str] = None
     server_queue_priority: list[ServerQueuePriorityConfig] = Field(default_factory=list)
     cache: MusicCacheConfig = Field(default_factory=MusicCacheConfig)
     storage: Optional[MusicStorageConfig] = None
     normalize_audio: bool = False
+    # Format downloads are converted to and cached as. opus stores pre-encoded
+    # packets at ~1/12 the size of raw pcm and skips encoding on the bot pod.
+    audio_format: AudioFormat = AudioFormat.PCM
     max_download_retries: int = Field(default=3, ge=1)
     # Hold-off before a failed YouTube download is retried, doubling per attempt.
     # 0 restores the immediate requeue (see RETRY_BACKOFF_SECONDS_MINIMUM).
     retry_backoff_seconds_minimum: int = Field(default=RETRY_BACKOFF_SECONDS_MINIMUM, ge=0)
     max_youtube_music_search_retries: int = Field(default=3, ge=1)
+    # Search string -> videoId cache on the search pod; 0 disables it. Searches
+    # that matched nothing are cached for the shorter negative TTL.
+    search_cache_ttl_seconds: int = Field(default=SEARCH_CACHE_TTL_SECONDS_DEFAULT, ge=0)
+    search_cache_negative_ttl_seconds: int = Field(default=SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT, ge=1)
+    search_cache_max_entries: int = Field(default=SEARCH_CACHE_MAX_ENTRIES_DEFAULT, ge=1)
     # Mostly to keep a cap on the queue to avoid issues
     failure_tracking_max_size: int = Field(default=100, ge=1)
     # Recommended to be at least an hour
@@ -154,6 +179,10 @@ class BrokerClientConfig(BaseModel):
     via cli/broker.py (general.broker_server), and that key is the one that has
     been in use since the broker cutover on 2026-07-01.'''
     url: str
+    # Long-poll for finished results: up to result_batch_size come back per
+    # request, and an idle request is held open for result_wait_seconds.
+    result_batch_size: int = Field(default=16, ge=1, le=64)
+    result_wait_seconds: float = Field(default=10.0, gt=0, le=20)
 
 class DownloadClientConfig(BaseModel):
     '''Config for connecting to the downloader pod's HTTP server.
@@ -203,9 +232,6 @@ class PlaylistMaxLength(Exception):
     '''
 
 OTEL_SPAN_PREFIX = 'music'
-# Idle backoff for process_download_results when the broker has no finished
-# result ready — in HA this paces the remote GET /results/next poll.
-_BROKER_POLL_INTERVAL_SECONDS = 1.0
 # Idle backoff for the post_play_processing / process_search_results loops when
 # their queue is empty. Sleeping ONLY on the empty path (not every iteration)
 # keeps busy work back-to-back while cutting idle allocation churn (OOM fix).
@@ -576,6 +602,14 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
             LifecycleStatusUpdate(event=event, **details),
         )
 
+    async def _push_states(self, media_requests: List[MediaRequest], event: LifecycleEvent) -> None:
+        '''_push_state for several requests in one broker call.'''
+        if media_requests:
+            await self.broker_client.update_status_many([
+                (str(media_request.uuid), LifecycleStatusUpdate(event=event))
+                for media_request in media_requests
+            ])
+
     async def _cleanup_orphaned_voice_clients(self):
         '''
         Disconnect any voice client that has no backing MusicPlayer in
@@ -700,22 +734,29 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
             # teardown.  add_source_to_player and the SEARCH caller (below) re-push
             # COMPLETED on the same request; the transitions are idempotent.
             await self._push_state(media_download.media_request, LifecycleEvent.COMPLETED)
-            if isinstance(media_request, PlaylistAddRequest):
-                playlist_result = PlaylistAddResult(
-                    webpage_url=media_download.webpage_url or '',
-                    title=media_download.title,
-                    uploader=media_download.uploader,
-                )
-                await self.__add_playlist_item(media_request, playlist_result)
-                return True
-            if not player:
-                player = await self.get_player(media_request.guild_id, create_player=False)
-            if player:
-                self.logger.debug(f'Search "{str(media_request)}" found in cache, placing in player queue')
-                await self.add_source_to_player(media_download, player)
+            await self._place_cached_download(media_request, media_download, player=player)
             return True
         return False
 
+    async def _place_cached_download(self, media_request: MediaRequest, media_download: MediaDownload,
+                                     player: MusicPlayer = None):
+        '''
+        Hand a cache hit to its playlist or player, once COMPLETED has been pushed.
+        '''
+        if isinstance(media_request, PlaylistAddRequest):
+            playlist_result = PlaylistAddResult(
+                webpage_url=media_download.webpage_url or '',
+                title=media_download.title,
+                uploader=media_download.uploader,
+            )
+            await self.__add_playlist_item(media_request, playlist_result)
+            return
+        if not player:
+            player = await self.get_player(media_request.guild_id, create_player=False)
+        if player:
+            self.logger.debug(f'Search "{str(media_request)}" found in cache, placing in player queue')
+            await self.add_source_to_player(media_download, player)
+
     async def process_search_results(self):
         '''
         Search-result consumer: routes resolved searches into the download
@@ -727,14 +768,37 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
         if self.bot_shutdown_event.is_set():
             raise ExitEarlyException('Bot shutdown called, exiting early')
 
-        resolution = await self.broker_client.next_search_result()
-        if resolution is None:
-            # Idle — no resolved search ready right now.  Sleep before the loop
-            # runner re-calls so we don't busy-spin the broker (in HA a remote
-            # GET /search-results/next poll).
-            await sleep(_BROKER_POLL_INTERVAL_SECONDS)
-            return
+        # Long-poll: the broker holds the request until a resolution lands (so
+        # an idle loop makes one request per result_wait_seconds, not one a
+        # second) and hands back a burst in one round trip.
+        resolutions = await self.broker_client.next_search_results(self.config.broker_client.result_batch_size,
+                                                                   self.config.broker_client.result_wait_seconds)
+        await self.__route_batch(resolutions, self.__route_search_result)
+
+    async def __route_batch(self, items: list, route: Callable[[Any], Awaitable[None]]):
+        '''
+        Route every item of a fetched batch, even if one of them raises.
+
+        The batch is already off the broker's queue, so giving up at the first
+        failure would drop the rest.  The first exception is re-raised once the
+        batch is done, so the loop runner still logs it and records the error;
+        any later ones are logged here.
+        '''
+        first_error = None
+        for item in items:
+            try:
+                await route(item)
+            except Exception as exc:  # pylint:disable=broad-exception-caught
+                if first_error is not None:
+                    self.logger.exception(f'Error routing broker result, uuid: {item.media_request.uuid}')
+                first_error = first_error or exc
+        if first_error is not None:
+            raise first_error
 
+    async def __route_search_result(self, resolution: SearchResolution):
+        '''
+        Cache-check then download-submit one resolved search.
+        '''
         media_request = resolution.media_request
         async with async_otel_span_wrapper(f'{OTEL_SPAN_PREFIX}.process_search_results', kind=SpanKind.CONSUMER,
                                            attributes=media_request_attributes(media_request),
@@ -773,14 +837,16 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
         if self.bot_shutdown_event.is_set():
             raise ExitEarlyException('Bot shutdown called, exiting early')
 
-        result = await self.broker_client.next_result()
-        if result is None:
-            # Idle — the broker has no finished result for us right now.  Sleep
-            # before the loop runner re-calls so we don't busy-spin the broker
-            # (in HA this is a remote GET /results/next poll).
-            await sleep(_BROKER_POLL_INTERVAL_SECONDS)
-            return
+        # Long-poll, as in process_search_results: a result reaches the player
+        # as soon as the broker registers it rather than on the next 1 s tick.
+        results = await self.broker_client.next_results(self.config.broker_client.result_batch_size,
+                                                        self.config.broker_client.result_wait_seconds)
+        await self.__route_batch(results, self.__route_download_result)
 
+    async def __route_download_result(self, result: DownloadResult):
+        '''
+        Route one finished DownloadResult to its player or playlist.
+        '''
         media_request = result.media_request
         is_playlist_add = isinstance(media_request, PlaylistAddRequest)
         attributes = media_request_attributes(media_request)
@@ -1156,7 +1222,9 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
                                      guild_path, self.dispatcher,
                                      history_playlist_id, self.history_playlist_queue,
                                      broker=self.broker_client,
-                                     prefetch_limit=self.config.download.storage.prefetch_limit if self.config.download.storage else 0)
+                                     prefetch_limit=self.config.download.storage.prefetch_limit if self.config.download.storage else 0,
+                                     progressive_staging=bool(self.config.download.storage
+                                                              and self.config.download.storage.progressive_staging))
                 await player.start_tasks()
                 self.players[guild_id] = player
             if check_voice_client_active:
@@ -1239,52 +1307,88 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
 
         Returns true if all items added, false if some were not.
         '''
+        if not (await self._submit_media_requests(ctx, entries, bundle_uuid, player=player))[0]:
+            return False
+        # Lock pagination on the bundle and trigger a final render.
+        await self.broker_client.finalize_bundle(bundle_uuid)
+        return True
+
+    async def _submit_media_requests(self, ctx: Context, entries: List[MediaRequest],
+                                     bundle_uuid: str, player: MusicPlayer = None) -> tuple[bool, bool]:
+        '''
+        Register and route entries without finalizing the bundle, so a streamed
+        collection can submit one page at a time.
+
+        Each step goes to the broker or worker pod as one batch call for the
+        whole page (register, cache check, submit, lifecycle pushes), so a page
+        costs the same handful of round trips whatever its length.
+
+        Returns (not_blocked, has_room).  not_blocked is false when puts were
+        blocked, in which case the bundle has already been deleted; has_room is
+        false once a queue filled up, in which case the entries it refused are
+        discarded.
+        '''
         ctx_span_context = capture_span_context()
         for media_request in entries:
             if media_request.span_context is None:
                 media_request.span_context = ctx_span_context
             media_request.bundle_uuid = bundle_uuid
-            await self.broker_client.register_request(media_request)
             self.logger.debug(f'Running enqueue for media request "{str(media_request)}, uuid: {media_request.uuid}, bundle: {bundle_uuid}')
-            # Unless a direct or youtube url, pass into the search queue
-            if media_request.search_result.search_type not in [SearchType.DIRECT, SearchType.YOUTUBE]:
-                try:
-                    await self.youtube_music_search_client.submit(media_request.guild_id, media_request, priority=self.server_queue_priority.get(media_request.guild_id, None))
-                except PutsBlocked:
-                    self.logger.info(f'Puts to search queue in guild {ctx.guild.id} are currently blocked, assuming shutdown')
-                    await self.delete_bundle(ctx.guild.id, bundle_uuid)
-                    return False
-                except QueueFull:
-                    self.logger.info(f'Search Queue full in guild {ctx.guild.id}, cannot add more media requests')
-                    await self._push_state(media_request, LifecycleEvent.DISCARDED)
-                    break
-                continue
-            # Else directly add to download queue
-            if await self._enqueue_media_download_from_cache(media_request, player=player):
-                # Cache hit: mark the current request completed (broker bundle counts it)
-                await self._push_state(media_request, LifecycleEvent.COMPLETED)
-                continue
-            try:
-                await self.download_client.submit(media_request.guild_id, media_request)
-                await self._push_state(media_request, LifecycleEvent.QUEUED)
-            except PutsBlocked:
-                await self.delete_bundle(ctx.guild.id, bundle_uuid)
-                self.logger.info(f'Puts to download queue in guild {ctx.guild.id} are currently blocked, assuming shutdown')
-                return False
-            except QueueFull:
-                self.logger.info(f'Download Queue full in guild {ctx.guild.id}, cannot add more media requests')
-                await self._push_state(media_request, LifecycleEvent.DISCARDED)
-                break
+        await self.broker_client.register_requests(entries)
+        # Unless a direct or youtube url, pass into the search queue
+        search_requests = [media_request for media_request in entries
+                           if media_request.search_result.search_type not in [SearchType.DIRECT, SearchType.YOUTUBE]]
+        download_requests = [media_request for media_request in entries
+                             if media_request.search_result.search_type in [SearchType.DIRECT, SearchType.YOUTUBE]]
+        refused: List[MediaRequest] = []
+
+        outcomes = await self.youtube_music_search_client.submit_many(
+            ctx.guild.id, search_requests, priority=self.server_queue_priority.get(ctx.guild.id, None))
+        if any(isinstance(outcome, PutsBlocked) for outcome in outcomes):
+            self.logger.info(f'Puts to search queue in guild {ctx.guild.id} are currently blocked, assuming shutdown')
+            await self.delete_bundle(ctx.guild.id, bundle_uuid)
+            return False, False
+        if any(isinstance(outcome, QueueFull) for outcome in outcomes):
+            self.logger.info(f'Search Queue full in guild {ctx.guild.id}, cannot add more media requests')
+        refused += [media_request for media_request, outcome in zip(search_requests, outcomes) if outcome is not None]
+
+        # Else directly add to download queue, unless already cached
+        cached = await self.broker_client.check_cache_many(download_requests)
+        hits = [(media_request, media_download)
+                for media_request, media_download in zip(download_requests, cached) if media_download]
+        misses = [media_request for media_request, media_download in zip(download_requests, cached)
+                  if not media_download]
+        # Cache hit: mark the request completed (broker bundle counts it) before
+        # it reaches the player, as _enqueue_media_download_from_cache does
+        await self._push_states([media_request for media_request, _ in hits], LifecycleEvent.COMPLETED)
+        for media_request, media_download in hits:
+            await self._place_cached_download(media_request, media_download, player=player)
+
+        # QUEUED goes out before the submit, so a worker that picks a request up
+        # straight away cannot have its IN_PROGRESS overwritten by a late QUEUED;
+        # a refused request is moved on to DISCARDED below.
+        await self._push_states(misses, LifecycleEvent.QUEUED)
+        outcomes = await self.download_client.submit_many(ctx.guild.id, misses)
+        if any(isinstance(outcome, PutsBlocked) for outcome in outcomes):
+            await self.delete_bundle(ctx.guild.id, bundle_uuid)
+            self.logger.info(f'Puts to download queue in guild {ctx.guild.id} are currently blocked, assuming shutdown')
+            return False, False
+        if any(isinstance(outcome, QueueFull) for outcome in outcomes):
+            self.logger.info(f'Download Queue full in guild {ctx.guild.id}, cannot add more media requests')
+        refused += [media_request for media_request, outcome in zip(misses, outcomes) if outcome is not None]
 
-        # Lock pagination on the bundle and trigger a final render.
-        await self.broker_client.finalize_bundle(bundle_uuid)
-        return True
+        await self._push_states(refused, LifecycleEvent.DISCARDED)
+        return True, not refused
 
     async def _generate_media_requests_from_search(self, ctx: Context, search: str, player: MusicPlayer = None,
                                                    add_to_playlist: int = None):
         '''
         Generate media requests and a broker-owned bundle from a search input.
 
+        Playlists and albums arrive one catalog page at a time; each page is
+        queued as soon as it lands, so the first tracks start downloading while
+        the rest of the catalog is still being fetched.
+
         ctx: Discord Context
         search: Original Search string
         player: MusicPlayer to pass into
@@ -1295,36 +1399,57 @@ class Music(CogHelper): #pylint:disable=too-many-public-methods
             ctx.guild.id, ctx.channel.id, input_string=search,
         )
 
-        try:
-            collection = await self.search_client.check_source(search, self.bot.loop,
-                                                                   self.config.player.queue_max_size)
-        except SearchException as exc:
-            self.logger.info(f'Received download client exception for search "{search}", {str(exc)}')
-            await self.delete_bundle(ctx.guild.id, bundle_uuid)
-            self.dispatcher.send_message(ctx.guild.id, ctx.channel.id,
-                f'Error searching input "{search}", message: {str(exc.user_message)}',
-                delete_after=self.config.general.message_delete_after)
-            return
+        collections = self.search_client.stream_source(search, self.bot.loop,
+                                                       self.config.player.queue_max_size)
+        async with aclosing(collections):
+            try:
+                collection = await anext(collections)
+            except SearchException as exc:
+                self.logger.info(f'Received download client exception for search "{search}", {str(exc)}')
+                await self.delete_bundle(ctx.guild.id, bundle_uuid)
+                self.dispatcher.send_message(ctx.guild.id, ctx.channel.id,
+                    f'Error searching input "{search}", message: {str(exc.user_message)}',
+                    delete_after=self.config.general.message_delete_after)
+                return
 
-        # Multi-item collection — drop the single-search bundle and create a
-        # multi-track bundle whose banner persists across renders.
-        if collection.collection_name:
-            await self.delete_bundle(ctx.guild.id, bundle_uuid)
-            bundle_uuid = await self.create_bundle(
-                ctx.guild.id, ctx.channel.id,
-                input_string=collection.collection_name, has_search_banner=True,
-            )
+            # Multi-item collection — drop the single-search bundle and create a
+            # multi-track bundle whose banner persists across renders.
+            if collection.collection_name:
+                await self.delete_bundle(ctx.guild.id, bundle_uuid)
+                bundle_uuid = await self.create_bundle(
+                    ctx.guild.id, ctx.channel.id,
+                    input_string=collection.collection_name, has_search_banner=True,
+                )
 
-        media_requests = []
-        for search_result in collection.search_results:
-            if add_to_playlist:
-                mr = PlaylistAddRequest(guild_id=ctx.guild.id, channel_id=ctx.channel.id, requester_name=ctx.author.display_name, requester_id=ctx.author.id,
-                                        search_result=search_result, playlist_id=add_to_playlist)
-            else:
-                mr = MediaRequest(guild_id=ctx.guild.id, channel_id=ctx.channel.id, requester_name=ctx.author.display_name, requester_id=ctx.author.id,
-                                  search_result=search_result)
-            media_requests.append(mr)
-        await self.enqueue_media_requests(ctx, media_requests, bundle_uuid, player=player)
+            while True:
+                media_requests = []
+                for search_result in collection.search_results:
+                    if add_to_playlist:
+                        mr = PlaylistAddRequest(guild_id=ctx.guild.id, channel_id=ctx.channel.id, requester_name=ctx.author.display_name, requester_id=ctx.author.id,
+                                                search_result=search_result, playlist_id=add_to_playlist)
+                    else:
+                        mr = MediaRequest(guild_id=ctx.guild.id, channel_id=ctx.channel.id, requester_name=ctx.author.display_name, requester_id=ctx.author.id,
+                                          search_result=search_result)
+                    media_requests.append(mr)
+                not_blocked, has_room = await self._submit_media_requests(ctx, media_requests, bundle_uuid, player=player)
+                if not not_blocked:
+                    return
+                if not has_room:
+                    break
+                try:
+                    collection = await anext(collections)
+                except StopAsyncIteration:
+                    break
+                except SearchException as exc:
+                    # Earlier pages are already queued, keep them and report the rest as lost
+                    self.logger.info(f'Received download client exception on later page for search "{search}", {str(exc)}')
+                    self.dispatcher.send_message(ctx.guild.id, ctx.channel.id,
+                        f'Error fetching the rest of "{search}", message: {str(exc.user_message)}',
+                        delete_after=self.config.general.message_delete_after)
+                    break
+
+        # Lock pagination on the bundle and trigger a final render.
+        await self.broker_client.finalize_bundle(bundle_uuid)
 
     @command(name='play')
     @command_wrapper
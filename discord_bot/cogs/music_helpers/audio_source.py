@@ -0,0 +1,191 @@
+from pathlib import Path
+from threading import Lock
+from typing import BinaryIO, Callable
+
+from discord import AudioSource, PCMAudio
+from discord.oggparse import OggError, OggStream
+from discord.opus import Encoder as OpusEncoder
+
+# s16le / 48 kHz / stereo, which is what utils/audio writes for every download
+PCM_BYTES_PER_SECOND = OpusEncoder.SAMPLING_RATE * OpusEncoder.CHANNELS * 2
+
+# RFC 7845 header packets that open every Ogg/Opus stream; they carry no audio
+OPUS_HEADER_PREFIXES = (b'OpusHead', b'OpusTags')
+
+
+class StagingFileReader():
+    '''
+    Read-only handle over a file that another thread is still writing.
+
+    With progressive staging the player starts on a track once its first few
+    seconds are on disk while the rest is still arriving from S3. Each read()
+    first asks wait_for_bytes() to block until the file holds everything up to
+    the end of the read; a plain handle would see a short read and end the track
+    early. wait_for_bytes() returning False means the bytes will never arrive,
+    and the read comes back empty so playback ends at the point the data stops.
+    '''
+
+    def __init__(self, file_path: Path, wait_for_bytes: Callable[[float], bool]):
+        self._wait_for_bytes = wait_for_bytes
+        self._file: BinaryIO = open(file_path, 'rb')  # pylint: disable=consider-using-with
+
+    def read(self, size: int = -1) -> bytes:
+        '''
+        Read up to *size* bytes once they have been written (everything, for size < 0)
+        '''
+        end = self._file.tell() + size if size >= 0 else float('inf')
+        if not self._wait_for_bytes(end):
+            return b''
+        return self._file.read(size)
+
+    def tell(self) -> int:
+        '''
+        Current offset
+        '''
+        return self._file.tell()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        '''
+        Move the read cursor
+        '''
+        return self._file.seek(offset, whence)
+
+    @property
+    def closed(self) -> bool:
+        '''
+        Whether the handle is closed
+        '''
+        return self._file.closed
+
+    def close(self) -> None:
+        '''
+        Close the handle
+        '''
+        self._file.close()
+
+
+def open_staged_file(file_path: Path, wait_for_bytes: Callable[[float], bool] | None = None):
+    '''
+    Open a staged track, through StagingFileReader if it is still being written
+    '''
+    if wait_for_bytes is None:
+        return open(file_path, 'rb')  # pylint: disable=consider-using-with
+    return StagingFileReader(file_path, wait_for_bytes)
+
+
+class FileBackedPCMAudio(PCMAudio):
+    '''
+    Raw PCM audio source that reads 20ms frames straight off the staged file.
+
+    The player used to hand PCMAudio a BytesIO holding the whole track, so every
+    playing guild kept the full decoded file resident — roughly 11 MB a minute,
+    hundreds of MB for a long mix. Reading frame by frame from an open handle
+    keeps per-player memory at one buffered read regardless of track length.
+
+    read() runs on discord.py's audio thread while seek() is called from the
+    event loop, so both go through a lock to keep a seek from landing mid-frame.
+
+    Pass wait_for_bytes when the file is still being staged (see StagingFileReader).
+    '''
+
+    def __init__(self, file_path: Path, wait_for_bytes: Callable[[float], bool] | None = None):
+        self.file_path: Path = Path(file_path)
+        self._lock = Lock()
+        # Closed in cleanup(), which the player calls once the track ends or is skipped
+        super().__init__(open_staged_file(self.file_path, wait_for_bytes))
+
+    def read(self) -> bytes:
+        '''
+        Read the next 20ms frame, or b'' once the file is exhausted (or closed)
+        '''
+        with self._lock:
+            if self.stream.closed:
+                return b''
+            return super().read()
+
+    @property
+    def position(self) -> float:
+        '''
+        Current playback offset in seconds
+        '''
+        with self._lock:
+            if self.stream.closed:
+                return 0.0
+            return self.stream.tell() / PCM_BYTES_PER_SECOND
+
+    def seek(self, seconds: float) -> float:
+        '''
+        Move the read cursor to the frame containing *seconds*.
+
+        The offset is clamped to the file and aligned down to a whole frame so
+        the next read() stays sample-aligned. Returns the offset actually used.
+        '''
+        total_frames = self.file_path.stat().st_size // OpusEncoder.FRAME_SIZE
+        frame = min(max(int(seconds * 1000) // OpusEncoder.FRAME_LENGTH, 0), total_frames)
+        with self._lock:
+            if self.stream.closed:
+                return 0.0
+            self.stream.seek(frame * OpusEncoder.FRAME_SIZE)
+        return frame * OpusEncoder.FRAME_LENGTH / 1000
+
+    def cleanup(self) -> None:
+        '''
+        Close the underlying file handle; safe to call more than once
+        '''
+        # AudioSource.__del__ also lands here, including for a source whose open() failed
+        stream = getattr(self, 'stream', None)
+        if stream is None:
+            return
+        with self._lock:
+            stream.close()
+
+
+class OggOpusAudio(AudioSource):
+    '''
+    Pre-encoded audio source that replays the Opus packets of a cached .opus file.
+
+    is_opus() tells discord.py to send each packet as-is, so a track cached in the
+    Opus format skips per-frame encoding on the bot entirely. Packets are pulled
+    off the Ogg pages on demand, so like FileBackedPCMAudio only one page is ever
+    held in memory. The files are written with 20ms frames, matching what the
+    voice client expects per read().
+    '''
+
+    def __init__(self, file_path: Path, wait_for_bytes: Callable[[float], bool] | None = None):
+        self.file_path: Path = Path(file_path)
+        self._lock = Lock()
+        self.stream = None
+        # Closed in cleanup(), which the player calls once the track ends or is skipped
+        self.stream = open_staged_file(self.file_path, wait_for_bytes)
+        self._packets = OggStream(self.stream).iter_packets()
+
+    def read(self) -> bytes:
+        '''
+        Return the next Opus packet, or b'' once the stream is exhausted (or closed)
+        '''
+        with self._lock:
+            if self.stream.closed:
+                return b''
+            try:
+                for packet in self._packets:
+                    if not packet.startswith(OPUS_HEADER_PREFIXES):
+                        return packet
+            except OggError:
+                # A staged file whose download stopped mid-page; end the track there
+                return b''
+            return b''
+
+    def is_opus(self) -> bool:
+        '''
+        Packets are already Opus encoded
+        '''
+        return True
+
+    def cleanup(self) -> None:
+        '''
+        Close the underlying file handle; safe to call more than once
+        '''
+        if self.stream is None:
+            return
+        with self._lock:
+            self.stream.close()
@@ -1,7 +1,6 @@
 import asyncio
 from asyncio import Event, QueueEmpty, QueueFull, TimeoutError as async_timeout, Task
 from datetime import timedelta
-from io import BytesIO
 from pathlib import Path
 from re import sub
 from time import time, monotonic
@@ -9,11 +8,12 @@ from typing import List
 
 from async_timeout import timeout
 from dappertable import DapperTable, Column, Columns, PaginationLength
-from discord import PCMAudio
+from discord import AudioSource
 from discord.errors import ClientException
 from opentelemetry.trace import SpanKind
 
 from discord_bot.common import DISCORD_MAX_MESSAGE_LENGTH
+from discord_bot.cogs.music_helpers.audio_source import FileBackedPCMAudio, OggOpusAudio
 from discord_bot.cogs.music_helpers.common import MultipleMutableType
 from discord_bot.exceptions import ExitEarlyException
 from discord_bot.types.cleanup_reason import CleanupReason
@@ -22,9 +22,10 @@ from discord_bot.types.media_download import MediaDownload, media_download_attri
 from discord_bot.interfaces.broker_client_protocol import BrokerClient
 from discord_bot.types.checkout_result import CheckoutResult
 from discord_bot.types.queue import Queue
+from discord_bot.utils.audio import AudioFormat, audio_format_from_path
 from discord_bot.utils.common import return_loop_runner
 from discord_bot.utils.common import get_logger, LoggingConfig
-from discord_bot.utils.integrations.s3 import get_file
+from discord_bot.utils.integrations.s3 import ObjectStorageException, ProgressiveDownload, get_file
 from discord_bot.utils.otel import async_otel_span_wrapper, DiscordContextNaming, span_links_from_context
 
 
@@ -36,7 +37,7 @@ PLAY_STAGING_SLOW_SECONDS = 5.0
 
 
 
-def cleanup_source(audio_source: PCMAudio):
+def cleanup_source(audio_source: AudioSource):
     '''
     Cleanup audio source
     '''
@@ -64,7 +65,8 @@ class MusicPlayer:
                  history_playlist_id: int,
                  history_playlist_queue: Queue,
                  broker: BrokerClient | None = None,
-                 prefetch_limit: int = 5):
+                 prefetch_limit: int = 5,
+                 progressive_staging: bool = False):
         '''
         Music Player to sit in voice chat
 
@@ -93,10 +95,11 @@ class MusicPlayer:
         # Tasks
         self._player_task: Task | None = None
         self._prefetch_task: Task | None = None
+        self._staging_task: Task | None = None
 
         # Random things to store
         self.current_media_download: MediaDownload | None = None
-        self.current_audio_source: PCMAudio | None = None
+        self.current_audio_source: AudioSource | None = None
         self.np_message: str = ''
         self.video_skipped: bool = False
         self.queue_messages: list[str] = [] # Show current queue
@@ -107,6 +110,8 @@ class MusicPlayer:
         self.inactive_timestamp: int | None = None
         self.broker: BrokerClient | None = broker
         self.prefetch_limit: int = prefetch_limit
+        self.progressive_staging: bool = progressive_staging
+        self.current_staging: ProgressiveDownload | None = None
 
     async def start_tasks(self):
         '''
@@ -163,12 +168,18 @@ class MusicPlayer:
                 local_path = self.file_dir / f'{media_download.media_request.uuid}{extension}'
                 self.file_dir.mkdir(exist_ok=True)
                 s3_fetch_started = monotonic()
-                await asyncio.to_thread(get_file, checkout_result.bucket_name, checkout_result.s3_key, local_path)
+                if self.progressive_staging:
+                    # Only the head of the track is fetched before playback; the
+                    # rest streams in behind the read cursor until the track ends
+                    await self._start_progressive_staging(checkout_result, local_path)
+                else:
+                    await asyncio.to_thread(get_file, checkout_result.bucket_name, checkout_result.s3_key, local_path)
                 s3_fetch_seconds = monotonic() - s3_fetch_started
                 file_path = local_path
             # Surface how long staging this track took: broker checkout + (in HA) the
             # S3 fetch sit between the track leaving the play queue and audio starting,
-            # so a slow broker or S3 GET reads as dead air. DEBUG normally; escalated
+            # so a slow broker or S3 GET reads as dead air (with progressive staging
+            # the S3 figure covers only the head range GET). DEBUG normally; escalated
             # to WARNING past PLAY_STAGING_SLOW_SECONDS so a prod stall is visible
             # without DEBUG logging, and splits the two phases to say which was slow.
             staging_seconds = checkout_seconds + s3_fetch_seconds
@@ -188,13 +199,20 @@ class MusicPlayer:
                     f'No playable file for "{media_download.webpage_url}" in guild {self.guild.id} '
                     f'(resolved path {str(file_path)!r} does not exist); skipping track'
                 )
+                await self._stop_progressive_staging()
                 if self.broker:
                     await self.broker.release(str(media_download.media_request.uuid))
                 return
             self.logger.debug(f'Gathered new file to play {str(file_path)}')
-            with open(file_path, 'rb') as f:
-                audio_data = BytesIO(f.read())
-            audio_source = PCMAudio(audio_data)
+            # Stream frames off disk rather than buffering the whole track, so a
+            # playing guild holds one read buffer instead of the full decoded file.
+            # Opus-format cache entries go to the voice client pre-encoded; PCM is
+            # still encoded per frame here. Both formats coexist in the cache.
+            wait_for_bytes = self.current_staging.wait_for_bytes if self.current_staging else None
+            if audio_format_from_path(file_path) == AudioFormat.OPUS:
+                audio_source = OggOpusAudio(file_path, wait_for_bytes=wait_for_bytes)
+            else:
+                audio_source = FileBackedPCMAudio(file_path, wait_for_bytes=wait_for_bytes)
             self.current_audio_source = audio_source
             self.video_skipped = False
             try:
@@ -206,6 +224,7 @@ class MusicPlayer:
                 )
                 self.np_message = ''
                 cleanup_source(audio_source)
+                await self._stop_progressive_staging()
                 if self.broker:
                     await self.broker.release(str(media_download.media_request.uuid))
                 if not self.shutdown_called:
@@ -223,6 +242,7 @@ class MusicPlayer:
         await self.next.wait()
         self.np_message = ''
         cleanup_source(audio_source)
+        await self._stop_progressive_staging()
         if self.broker:
             await self.broker.release(str(media_download.media_request.uuid))
 
@@ -367,6 +387,34 @@ class MusicPlayer:
                 return True
         return False
 
+    async def _start_progressive_staging(self, checkout_result: CheckoutResult, local_path: Path):
+        '''
+        Fetch the head of an S3-staged track, then stream the rest in the background
+        '''
+        staging = ProgressiveDownload(checkout_result.bucket_name, checkout_result.s3_key, local_path)
+        await asyncio.to_thread(staging.fetch_head)
+        self.current_staging = staging
+        self._staging_task = asyncio.create_task(asyncio.to_thread(staging.fetch_remainder))
+
+    async def _stop_progressive_staging(self):
+        '''
+        Stop the current track's background fetch, if any, and wait for its thread to exit
+
+        A skip mid-track would otherwise leave the thread writing a file the broker
+        is about to release. A failed fetch already cut playback short at the point
+        the data stopped, so it is logged here rather than raised.
+        '''
+        staging, task = self.current_staging, self._staging_task
+        self.current_staging = None
+        self._staging_task = None
+        if not staging:
+            return
+        staging.cancel()
+        try:
+            await task
+        except ObjectStorageException as exc:
+            self.logger.warning(f'Progressive staging failed in guild {self.guild.id}: {exc}')
+
     def _on_prefetch_done(self, task: asyncio.Task):
         if not task.cancelled() and (exc := task.exception()):
             self.logger.warning(f'Prefetch failed in guild {self.guild.id}: {exc}')
@@ -491,6 +539,9 @@ class MusicPlayer:
         if self._prefetch_task and not self._prefetch_task.done():
             self._prefetch_task.cancel()
             self._prefetch_task = None
+        # The player task is cancelled below, so stop its background fetch here
+        if self.current_staging:
+            self.current_staging.cancel()
         if self._player_task:
             self._player_task.cancel()
             self._player_task = None
@@ -1,9 +1,11 @@
-from asyncio import AbstractEventLoop
+from asyncio import AbstractEventLoop, Semaphore, ensure_future, gather
+from contextlib import aclosing
 from functools import partial
 from itertools import islice
 from re import match
 import random
 from time import time
+from typing import AsyncIterator, Callable
 
 from googleapiclient.errors import HttpError
 from opentelemetry.trace import SpanKind
@@ -13,7 +15,7 @@ from discord_bot.cogs.music_helpers.common import SearchType
 from discord_bot.utils.integrations.common import YOUTUBE_SHORT_PREFIX, YOUTUBE_VIDEO_PREFIX
 from discord_bot.utils.integrations.spotify import SpotifyClient
 from discord_bot.utils.integrations.youtube import YoutubeClient
-from discord_bot.types.catalog import CatalogResponse
+from discord_bot.types.catalog import CatalogPage
 from discord_bot.types.search import SearchResult, SearchCollection
 from discord_bot.utils.otel import async_otel_span_wrapper, MediaRequestNaming
 
@@ -46,6 +48,9 @@ class InvalidSearchURL(SearchException):
 
 OTEL_SPAN_PREFIX = 'music.search_client'
 
+# Catalog pages fetched at once, once the first page has said how many there are
+CATALOG_PAGE_CONCURRENCY = 4
+
 def check_youtube_video(search: str) -> bool:
     '''
     Check if search is a youtube video
@@ -69,9 +74,10 @@ class SearchClient():
         self.spotify_client: SpotifyClient | None = spotify_client
         self.youtube_client: YoutubeClient | None = youtube_client
 
-    def __check_spotify_source(self, playlist_id: str = None, album_id: str = None, track_id: str = None) -> CatalogResponse:
+    def __spotify_page_fetcher(self, playlist_id: str = None, album_id: str = None,
+                               track_id: str = None) -> Callable[[int], CatalogPage]:
         '''
-        Get search strings from spotify
+        Get the page fetch function for a spotify source
 
         playlist_id : Playlist id
         album_id : Album id
@@ -81,53 +87,119 @@ class SearchClient():
             raise ValueError('Playlist, album, or track id must be passed')
 
         if playlist_id:
-            return self.spotify_client.playlist_get(playlist_id)
+            return partial(self.spotify_client.playlist_page, playlist_id)
         if album_id:
-            return self.spotify_client.album_get(album_id)
-        if track_id:
-            return self.spotify_client.track_get(track_id)
-        return None
+            return partial(self.spotify_client.album_page, album_id)
+        # A single track is one page with nothing after it
+        return lambda _offset: CatalogPage(items=self.spotify_client.track_get(track_id).items)
+
+    async def __stream_pages(self, fetch_page: Callable[[int | str | None], CatalogPage], first_cursor: int | str | None,
+                             loop: AbstractEventLoop, max_results: int | None) -> AsyncIterator[CatalogPage]:
+        '''
+        Yield catalog pages in order, the first one as soon as it arrives
+
+        When the first page reports a total and the API pages by offset, every
+        remaining offset is known up front, so those pages are fetched
+        concurrently (at most CATALOG_PAGE_CONCURRENCY at once) and yielded in
+        order as they land. Token-paged APIs can only be walked one page at a time.
+
+        fetch_page : Blocking call returning the page at a cursor
+        first_cursor : Cursor of the first page
+        loop : Bot event loop
+        max_results : Stop fetching once this many items have been fetched
+        '''
+        page = await loop.run_in_executor(None, fetch_page, first_cursor)
+        yield page
+        if page.next_cursor is None:
+            return
+        if isinstance(page.next_cursor, int) and page.total is not None:
+            step = page.next_cursor - (first_cursor or 0)
+            end = page.total if max_results is None else min(page.total, max_results)
+            semaphore = Semaphore(CATALOG_PAGE_CONCURRENCY)
+
+            async def fetch(offset: int) -> CatalogPage:
+                async with semaphore:
+                    return await loop.run_in_executor(None, fetch_page, offset)
+
+            tasks = [ensure_future(fetch(offset)) for offset in range(page.next_cursor, end, step)]
+            try:
+                for task in tasks:
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await gather(*tasks, return_exceptions=True)
+            return
+        fetched = len(page.items)
+        while page.next_cursor is not None and (max_results is None or fetched < max_results):
+            page = await loop.run_in_executor(None, fetch_page, page.next_cursor)
+            fetched += len(page.items)
+            yield page
 
-    def __check_youtube_source(self, playlist_id: str) -> CatalogResponse:
+    async def __stream_catalog(self, fetch_page: Callable[[int | str | None], CatalogPage], first_cursor: int | str | None,
+                               loop: AbstractEventLoop, max_results: int | None, should_shuffle: bool) -> AsyncIterator[CatalogPage]:
         '''
-        Generate youtube sources
+        Stream catalog pages, or gather them into one shuffled page when should_shuffle
 
-        playlist_id : ID of youtube playlist
+        A shuffle has to see every item first, so it only gains from the concurrent fetch.
         '''
-        return self.youtube_client.playlist_get(playlist_id)
+        pages = self.__stream_pages(fetch_page, first_cursor, loop, max_results if not should_shuffle else None)
+        async with aclosing(pages):
+            if not should_shuffle:
+                async for page in pages:
+                    yield page
+                return
+            shuffled = None
+            async for page in pages:
+                if shuffled is None:
+                    shuffled = page
+                else:
+                    shuffled.items += page.items
+            # https://stackoverflow.com/a/51295230
+            random.seed(time())
+            random.shuffle(shuffled.items)
+            yield shuffled
 
-    async def __check_source_types(self, search: str, loop: AbstractEventLoop) -> SearchCollection:
+    async def __stream_source_types(self, search: str, loop: AbstractEventLoop,
+                                    max_results: int | None) -> AsyncIterator[SearchCollection]:
         '''
-        Create source types
+        Create source types, one collection per catalog page
 
         search : Original search string
         loop: Bot event loop
+        max_results : Max results, bounds how many catalog pages are fetched
         '''
-        async with async_otel_span_wrapper(f'{OTEL_SPAN_PREFIX}.check_source', kind=SpanKind.CLIENT, attributes={MediaRequestNaming.SEARCH_STRING.value: search}):
-            spotify_playlist_matcher = match(SPOTIFY_PLAYLIST_REGEX, search)
-            spotify_album_matcher = match(SPOTIFY_ALBUM_REGEX, search)
-            spotify_track_matcher = match(SPOTIFY_TRACK_REGEX, search)
-            youtube_playlist_matcher = match(YOUTUBE_PLAYLIST_REGEX, search)
-            youtube_short_match = match(YOUTUBE_SHORT_REGEX, search)
-            youtube_video_match = match(YOUTUBE_VIDEO_REGEX, search)
-
-            if spotify_playlist_matcher or spotify_album_matcher or spotify_track_matcher:
-                if not self.spotify_client:
-                    raise InvalidSearchURL('Missing spotify creds', user_message='Spotify URLs invalid, no spotify credentials available to bot')
-                spotify_args = {}
-                should_shuffle = False
-                if spotify_album_matcher:
-                    spotify_args['album_id'] = spotify_album_matcher.group('album_id')
-                    should_shuffle = spotify_album_matcher.group('shuffle') != ''
-                if spotify_playlist_matcher:
-                    spotify_args['playlist_id'] = spotify_playlist_matcher.group('playlist_id')
-                    should_shuffle = spotify_playlist_matcher.group('shuffle') != ''
-                if spotify_track_matcher:
-                    spotify_args['track_id'] = spotify_track_matcher.group('track_id')
-
-                to_run = partial(self.__check_spotify_source, **spotify_args)
+        spotify_playlist_matcher = match(SPOTIFY_PLAYLIST_REGEX, search)
+        spotify_album_matcher = match(SPOTIFY_ALBUM_REGEX, search)
+        spotify_track_matcher = match(SPOTIFY_TRACK_REGEX, search)
+        youtube_playlist_matcher = match(YOUTUBE_PLAYLIST_REGEX, search)
+        youtube_short_match = match(YOUTUBE_SHORT_REGEX, search)
+        youtube_video_match = match(YOUTUBE_VIDEO_REGEX, search)
+
+        if spotify_playlist_matcher or spotify_album_matcher or spotify_track_matcher:
+            if not self.spotify_client:
+                raise InvalidSearchURL('Missing spotify creds', user_message='Spotify URLs invalid, no spotify credentials available to bot')
+            spotify_args = {}
+            should_shuffle = False
+            if spotify_album_matcher:
+                spotify_args['album_id'] = spotify_album_matcher.group('album_id')
+                should_shuffle = spotify_album_matcher.group('shuffle') != ''
+            if spotify_playlist_matcher:
+                spotify_args['playlist_id'] = spotify_playlist_matcher.group('playlist_id')
+                should_shuffle = spotify_playlist_matcher.group('shuffle') != ''
+            if spotify_track_matcher:
+                spotify_args['track_id'] = spotify_track_matcher.group('track_id')
+
+            pages = self.__stream_catalog(self.__spotify_page_fetcher(**spotify_args), 0, loop, max_results, should_shuffle)
+            collection_name = None
+            async with aclosing(pages):
                 try:
-                    catalog_result = await loop.run_in_executor(None, to_run)
+                    async for page in pages:
+                        collection_name = collection_name or page.collection_name or search.replace(' shuffle', '')
+                        results = []
+                        for item in page.items:
+                            results.append(SearchResult(search_type=SearchType.SEARCH, raw_search_string=item.search_string, proper_name=item.title))
+                        yield SearchCollection(search_results=results, collection_name=collection_name)
                 except SpotifyOauthError as e:
                     message = 'Issue gathering info from spotify, credentials seem invalid'
                     raise ThirdPartyException('Issue fetching spotify info', user_message=message) from e
@@ -136,47 +208,72 @@ class SearchClient():
                     if e.http_status == 404:
                         message = f'Unable to find url "{search}" via Spotify API\nIf this is an official Spotify playlist, [it might not be available via the api](https://developer.spotify.com/blog/2024-11-27-changes-to-the-web-api)'
                     raise ThirdPartyException('Issue fetching spotify info', user_message=message) from e
-                if should_shuffle:
-                    # https://stackoverflow.com/a/51295230
-                    random.seed(time())
-                    random.shuffle(catalog_result.items)
-                collection_name = catalog_result.collection_name or search.replace(' shuffle', '')
-                results = []
-                for item in catalog_result.items:
-                    results.append(SearchResult(search_type=SearchType.SEARCH, raw_search_string=item.search_string, proper_name=item.title))
-                return SearchCollection(search_results=results, collection_name=collection_name)
-
-            if youtube_playlist_matcher:
-                if not self.youtube_client:
-                    raise InvalidSearchURL('Missing youtube creds', user_message='Youtube Playlist URLs invalid, no youtube api credentials given to bot')
-
-                should_shuffle = youtube_playlist_matcher.group('shuffle') != ''
-                to_run = partial(self.__check_youtube_source, youtube_playlist_matcher.group('playlist_id'))
+            return
+
+        if youtube_playlist_matcher:
+            if not self.youtube_client:
+                raise InvalidSearchURL('Missing youtube creds', user_message='Youtube Playlist URLs invalid, no youtube api credentials given to bot')
+
+            should_shuffle = youtube_playlist_matcher.group('shuffle') != ''
+            fetch_page = partial(self.youtube_client.playlist_page, youtube_playlist_matcher.group('playlist_id'))
+            pages = self.__stream_catalog(fetch_page, None, loop, max_results, should_shuffle)
+            collection_name = None
+            async with aclosing(pages):
                 try:
-                    catalog_result = await loop.run_in_executor(None, to_run)
+                    async for page in pages:
+                        collection_name = collection_name or page.collection_name
+                        results = []
+                        for item in page.items:
+                            results.append(SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=item.search_string, proper_name=item.title))
+                        yield SearchCollection(search_results=results, collection_name=collection_name)
                 except HttpError as e:
                     raise ThirdPartyException('Issue fetching youtube info', user_message=f'Issue gathering info from youtube url "{search}"') from e
-                if should_shuffle:
-                    # https://stackoverflow.com/a/51295230
-                    random.seed(time())
-                    random.shuffle(catalog_result.items)
-                results = []
-                for item in catalog_result.items:
-                    results.append(SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=item.search_string, proper_name=item.title))
-                return SearchCollection(search_results=results, collection_name=catalog_result.collection_name)
+            return
+
+        if youtube_short_match:
+            yield SearchCollection(search_results=[SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=f'{YOUTUBE_SHORT_PREFIX}{youtube_short_match.group("video_id")}')])
+            return
+
+        if youtube_video_match:
+            yield SearchCollection(search_results=[SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=f'{YOUTUBE_VIDEO_PREFIX}{youtube_video_match.group("video_id")}')])
+            return
+
+        # If we have https:// in url, assume its a direct
+        if search.startswith('https://'):
+            yield SearchCollection(search_results=[SearchResult(search_type=SearchType.DIRECT, raw_search_string=search)])
+            return
 
-            if youtube_short_match:
-                return SearchCollection(search_results=[SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=f'{YOUTUBE_SHORT_PREFIX}{youtube_short_match.group("video_id")}')])
+        # Else assume this was a search message to put into youtube music
+        yield SearchCollection(search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string=search)])
 
-            if youtube_video_match:
-                return SearchCollection(search_results=[SearchResult(search_type=SearchType.YOUTUBE, raw_search_string=f'{YOUTUBE_VIDEO_PREFIX}{youtube_video_match.group("video_id")}')])
+    async def stream_source(self, search: str, loop: AbstractEventLoop,
+                            max_results: int) -> AsyncIterator[SearchCollection]:
+        '''
+        Generate sources from input, one collection per catalog page
 
-            # If we have https:// in url, assume its a direct
-            if search.startswith('https://'):
-                return SearchCollection(search_results=[SearchResult(search_type=SearchType.DIRECT, raw_search_string=search)])
+        The first collection is yielded as soon as the first page arrives, so the
+        caller can queue it while the rest are fetched. Every collection carries
+        the same collection_name, and at least one is always yielded.
 
-            # Else assume this was a search message to put into youtube music
-            return SearchCollection(search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string=search)])
+        search : Search string
+        max_results : Max results of items, across all collections
+        '''
+        remaining = max_results
+        collections = self.__stream_source_types(search, loop, max_results)
+        async with aclosing(collections):
+            async with async_otel_span_wrapper(f'{OTEL_SPAN_PREFIX}.check_source', kind=SpanKind.CLIENT, attributes={MediaRequestNaming.SEARCH_STRING.value: search}):
+                collection = await anext(collections)
+            while True:
+                if remaining is not None:
+                    collection.search_results = list(islice(collection.search_results, remaining))
+                    remaining -= len(collection.search_results)
+                yield collection
+                if remaining == 0:
+                    return
+                try:
+                    collection = await anext(collections)
+                except StopAsyncIteration:
+                    return
 
     async def check_source(self, search: str, loop: AbstractEventLoop,
                            max_results: int) -> SearchCollection:
@@ -186,8 +283,10 @@ class SearchClient():
         search : Search string
         max_results : Max results of items
         '''
-        collection = await self.__check_source_types(search, loop)
-        if max_results is not None:
-            collection.search_results = list(islice(collection.search_results, max_results))
-
+        collection = None
+        async for page in self.stream_source(search, loop, max_results):
+            if collection is None:
+                collection = page
+            else:
+                collection.search_results += page.search_results
         return collection
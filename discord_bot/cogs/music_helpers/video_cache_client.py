@@ -10,6 +10,7 @@ from discord_bot.database import VideoCache
 from discord_bot.types.media_download import MediaDownload, media_download_attributes
 from discord_bot.types.media_request import MediaRequest, media_request_attributes
 from discord_bot.cogs.music_helpers import database_functions
+from discord_bot.utils.audio import audio_format_from_path
 from discord_bot.utils.sql_retry import async_retry_database_commands
 from discord_bot.utils.otel import async_otel_span_wrapper, MusicVideoCacheNaming
 
@@ -59,6 +60,10 @@ class VideoCacheClient():
                         # base_path and storage_type to match the freshly downloaded file.
                         video_cache.base_path = str(media_download.file_path)
                         video_cache.storage_type = self.storage_type
+                    # Stamp the format of whatever file the row points at, which also
+                    # backfills rows cached before the column existed. PCM and Opus
+                    # entries coexist, so a format switch never invalidates a hit.
+                    video_cache.audio_format = audio_format_from_path(video_cache.base_path).value
                     video_cache.count += 1
                     video_cache.last_iterated_at = now
                     video_cache.ready_for_deletion = False
@@ -75,6 +80,7 @@ class VideoCacheClient():
                     created_at=now,
                     base_path=str(media_download.file_path),
                     storage_type=self.storage_type,
+                    audio_format=audio_format_from_path(media_download.file_path).value,
                     count=1,
                     ready_for_deletion=False,
                     file_size_bytes=media_download.file_size_bytes,
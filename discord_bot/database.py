@@ -25,13 +25,24 @@ class MarkovChannel(BASE):
 class MarkovRelation(BASE):
     '''
     Markov Relation
+
+    One row per (channel, leader, follower, day), with count holding how many
+    times the pair was seen that day. created_at is the UTC midnight of the day
+    bucket, so retention deletes still work on it. The unique constraint leads
+    with (channel_id, leader_word), so its index also serves the follower lookups.
     '''
     __tablename__ = 'markov_relation'
+    __table_args__ = (
+        UniqueConstraint('channel_id', 'leader_word', 'follower_word', 'created_at',
+                         name='_unique_markov_relation_day'),
+    )
     id = Column(Integer, primary_key=True)
     channel_id = Column(Integer, ForeignKey('markov_channel.id'))  # FK to markov_channel.id (int32)
     leader_word = Column(String(255))
     follower_word = Column(String(255))
-    created_at = Column(DateTime(timezone=True))
+    # Indexed so retention pruning is a range scan over the expired rows only
+    created_at = Column(DateTime(timezone=True), index=True)
+    count = Column(Integer, nullable=False, default=1, server_default='1')
 
 #
 # Music Tables
@@ -93,6 +104,8 @@ class VideoCache(BASE):
     # File paths
     base_path = Column(String(2048))
     storage_type = Column(String(16), nullable=True)  # 's3' or 'local'
+    # AudioFormat value of the cached file ('pcm' or 'opus'); NULL rows predate the column and are PCM
+    audio_format = Column(String(16), nullable=True)
 
 
 class VideoCacheBackup(BASE):
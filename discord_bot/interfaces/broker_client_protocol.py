@@ -23,7 +23,7 @@ from discord_bot.types.search_resolution import SearchResolution
 __all__ = ['BrokerClient']
 
 
-class BrokerClient(PlayerSessionClient, Protocol):
+class BrokerClient(PlayerSessionClient, Protocol): #pylint:disable=too-many-public-methods
     '''
     Cog-facing handle for the MediaBroker.  Two implementations exist:
 
@@ -41,6 +41,10 @@ class BrokerClient(PlayerSessionClient, Protocol):
         '''Register a new MediaRequest entering the pipeline.'''
     async def update_request_status(self, uuid: str, update: LifecycleStatusUpdate) -> None:
         '''Apply a lifecycle status update from the download worker.'''
+    async def register_requests(self, media_requests: list) -> None:
+        '''Register several MediaRequests in one call, in order.'''
+    async def update_status_many(self, updates: list[tuple[str, LifecycleStatusUpdate]]) -> None:
+        '''Apply several (uuid, update) lifecycle updates in one call, in order.'''
     async def register_download(self, media_download: MediaDownload) -> None:
         '''Persist a downloaded MediaDownload on the broker (zone=AVAILABLE).'''
     async def register_download_result(self, result: DownloadResult) -> MediaDownload | None:
@@ -51,6 +55,10 @@ class BrokerClient(PlayerSessionClient, Protocol):
     async def next_result(self) -> DownloadResult | None:
         '''Pop the next bot-ready DownloadResult, or None if nothing is ready.
         Non-blocking — callers poll on their own cadence.'''
+    async def next_results(self, max_results: int, wait_seconds: float) -> list[DownloadResult]:
+        '''Pop up to max_results bot-ready DownloadResults, oldest first.
+        Long-poll — waits up to wait_seconds for the first one to arrive, and
+        returns an empty list if none did.'''
     async def register_search_result(self, resolution: SearchResolution) -> None:
         '''Push a resolved search onto the bot-ready search-result queue served
         by next_search_result.  Pure passthrough — the broker engine is not
@@ -58,6 +66,9 @@ class BrokerClient(PlayerSessionClient, Protocol):
     async def next_search_result(self) -> SearchResolution | None:
         '''Pop the next bot-ready SearchResolution, or None if nothing is ready.
         Non-blocking — callers poll on their own cadence.'''
+    async def next_search_results(self, max_results: int, wait_seconds: float) -> list[SearchResolution]:
+        '''Pop up to max_results bot-ready SearchResolutions, oldest first.
+        Long-poll, like next_results.'''
     async def checkout(self, uuid: str, guild_id: int, guild_path: str | None = None) -> CheckoutResult | None:
         '''Mark a request CHECKED_OUT; returns a CheckoutResult with local_path or s3_key set.'''
     async def release(self, uuid: str) -> None:
@@ -71,6 +82,8 @@ class BrokerClient(PlayerSessionClient, Protocol):
         '''Pre-stage the next limit items from the queue to local disk.'''
     async def check_cache(self, media_request) -> MediaDownload | None:
         '''Look up a cached MediaDownload by webpage URL; returns None on miss.'''
+    async def check_cache_many(self, media_requests: list) -> list[MediaDownload | None]:
+        '''check_cache for several requests in one call; one result per request, in order.'''
     async def cache_cleanup(self) -> bool:
         '''Evict stale cache entries.  Returns True if at least one was removed.'''
     async def get_cache_count(self) -> int:
@@ -13,6 +13,7 @@ BrokerClient — config picks which impl is wired in.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -25,15 +26,24 @@ from discord_bot.interfaces.broker_client_protocol import BrokerClient
 from discord_bot.types.checkout_result import CheckoutResult
 from discord_bot.interfaces.player_session_store import PlayerSessionStore
 from discord_bot.interfaces.result_queue import DownloadResultQueue, SearchResultQueue
-from discord_bot.types.download import DownloadResult, LifecycleStatusUpdate
+from discord_bot.types.download import DownloadResult, LifecycleEvent, LifecycleStatusUpdate
 from discord_bot.types.media_download import MediaDownload
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.utils.integrations.s3 import delete_file
 from discord_bot.utils.otel import async_otel_span_wrapper
+from discord_bot.workers.bundle_render_throttle import BundleRenderThrottle
 from discord_bot.workers.media_bundle import BundleRenderer, BundleState
 
 logger = logging.getLogger(__name__)
 
+# Lifecycle events that leave a request in a terminal stage; a bundle whose
+# outstanding requests have all seen one renders without waiting out the
+# render interval.
+TERMINAL_LIFECYCLE_EVENTS = frozenset({LifecycleEvent.COMPLETED, LifecycleEvent.FAILED, LifecycleEvent.DISCARDED})
+
+# Bundle renderers kept between renders, least recently rendered evicted first.
+BUNDLE_RENDERER_CACHE_SIZE = 256
+
 # Re-exported so callers that already import DownloadResultQueue from
 # broker_protocols keep working.  The canonical home is interfaces/result_queue.py
 # — kept separate to avoid dragging the broker engine's deps (sqlalchemy via
@@ -87,7 +97,7 @@ class BrokerEntry:
     guild_file_path: Path | None = None
 
 
-class MediaBrokerBase(PlayerSessionStore, ABC):
+class MediaBrokerBase(PlayerSessionStore, ABC): #pylint:disable=too-many-public-methods
     '''
     Abstract base for media broker implementations.
 
@@ -115,6 +125,10 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
             return None
         return await self.video_cache.get_webpage_url_item(media_request)
 
+    async def check_cache_many(self, media_requests: List[MediaRequest]) -> List[MediaDownload | None]:
+        '''check_cache for each request, in order.'''
+        return [await self.check_cache(media_request) for media_request in media_requests]
+
     async def _get_evictable_entries(self) -> list:
         return [
             vc
@@ -149,6 +163,25 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
     async def update_request_status(self, request_uuid: str, update: LifecycleStatusUpdate) -> None:
         '''Apply a lifecycle status update from the download worker.'''
 
+    # ------------------------------------------------------------------
+    # Batch variants
+    #
+    # Playlist enqueue registers and updates a page of requests at a time.  The
+    # defaults apply them one by one, which is all an in-process engine needs;
+    # RedisBroker overrides them to pipeline the entry writes and touch each
+    # bundle once per batch instead of once per request.
+    # ------------------------------------------------------------------
+
+    async def register_requests(self, media_requests: List[MediaRequest]) -> None:
+        '''register_request for each request, in order.'''
+        for media_request in media_requests:
+            await self.register_request(media_request)
+
+    async def update_status_many(self, updates: List[tuple[str, LifecycleStatusUpdate]]) -> None:
+        '''update_request_status for each (request_uuid, update) pair, in order.'''
+        for request_uuid, update in updates:
+            await self.update_request_status(request_uuid, update)
+
     @abstractmethod
     async def register_download_result(self, result: DownloadResult) -> MediaDownload:
         '''Create a MediaDownload from a completed DownloadResult and register it.'''
@@ -220,7 +253,8 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
                  dispatcher: 'BundleDispatchSink | None' = None,
                  download_max_retries: int = 3,
                  search_max_retries: int = 3,
-                 message_delete_after: int | None = None):
+                 message_delete_after: int | None = None,
+                 bundle_render_interval_seconds: float = 0.0):
         '''Common construction for all broker impls.
 
         dispatcher: pushes bundle-UI updates to Discord.  None disables UI
@@ -233,6 +267,10 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
         message_delete_after: seconds after which Discord auto-expires a
         finished bundle's "Completed N/N" summary (and the failure/retry
         summaries).  None leaves them until manually removed.
+
+        bundle_render_interval_seconds: minimum spacing of event-driven
+        renders of one bundle (see BundleRenderThrottle).  0 renders on every
+        event.
         '''
         self.video_cache = video_cache
         self.bucket_name = bucket_name
@@ -248,6 +286,12 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
         # RedisBroker override switches to a redis-backed lock so the
         # serialisation works across multiple broker pods in HA.
         self._bundle_locks: dict[str, asyncio.Lock] = {}
+        self._render_throttle = BundleRenderThrottle(
+            bundle_render_interval_seconds, self._render_and_dispatch_bundle)
+        # Renderers kept between renders of a bundle, so a lifecycle push
+        # edits one row and re-formats one page instead of rebuilding the
+        # whole table; see _bundle_renderer.
+        self._renderers: OrderedDict[str, BundleRenderer] = OrderedDict()
 
     def _bundle_lock(self, bundle_uuid: str):
         '''Return an async context manager serializing mutations to bundle_uuid.
@@ -297,15 +341,41 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
         async with self._bundle_lock(bundle_uuid):
             await self._render_and_dispatch_bundle_locked(bundle_uuid)
 
+    def _bundle_renderer(self, state: BundleState) -> BundleRenderer:
+        '''The renderer from this bundle's last render if it still renders
+        state, else a fresh one rebuilt from it.
+
+        _load_bundle hands back the same state object while nothing else has
+        written the bundle (the dict entry in AsyncioBroker, the revision-
+        checked cache in RedisBroker), so between lifecycle pushes the renderer
+        survives and only re-renders what changed.
+        '''
+        renderer = self._renderers.pop(state.uuid, None)
+        if renderer is None or not renderer.renders(state):
+            renderer = BundleRenderer(state)
+        self._renderers[state.uuid] = renderer
+        while len(self._renderers) > BUNDLE_RENDERER_CACHE_SIZE:
+            self._renderers.popitem(last=False)
+        return renderer
+
+    def _forget_bundle_render(self, bundle_uuid: str) -> None:
+        '''Drop the render throttle's bookkeeping and the kept renderer for a
+        bundle that is gone or shut down.'''
+        self._render_throttle.forget(bundle_uuid)
+        self._renderers.pop(bundle_uuid, None)
+
     async def _render_and_dispatch_bundle_locked(self, bundle_uuid: str) -> None:
         '''Body of _render_and_dispatch_bundle, expected to be called with the
         per-bundle lock already held.  Helpers that already hold the lock
         (register_request etc.) call this directly to avoid re-entry.'''
         state = await self._load_bundle(bundle_uuid)
         if state is None or state.is_shutdown:
+            self._forget_bundle_render(bundle_uuid)
             return
-        renderer = BundleRenderer(state)
+        renderer = self._bundle_renderer(state)
         renderer.update_request_status()
+        self._render_throttle.rendered(
+            bundle_uuid, renderer.outstanding if state.all_requests_enqueued else None)
         # Persist counter / stored_status updates regardless of dispatcher —
         # tests and HA-mode consumers may inspect state without a dispatcher
         # ever firing.
@@ -385,13 +455,21 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
         # tracked (queryable) until then.
         if not content and renderer.finished:
             self.dispatcher.remove_mutable(f'request_bundle-{bundle_uuid}')
+            self._forget_bundle_render(bundle_uuid)
             await self._drop_bundle(bundle_uuid)
 
-    async def _maybe_render_bundle(self, media_request: MediaRequest | None) -> None:
-        '''Render the request's bundle if it has one.'''
+    async def _maybe_render_bundle(self, media_request: MediaRequest | None,
+                                   terminal_events: int = 0) -> None:
+        '''Render the request's bundle if it has one, unless the render
+        throttle merges this event into a later render.'''
         if media_request is None or not media_request.bundle_uuid:
             return
-        await self._render_and_dispatch_bundle(media_request.bundle_uuid)
+        if self._render_throttle.render_due(media_request.bundle_uuid, terminal_events):
+            await self._render_and_dispatch_bundle(media_request.bundle_uuid)
+
+    async def flush_bundle_renders(self) -> None:
+        '''Run every render the throttle is holding back, e.g. on shutdown.'''
+        await self._render_throttle.flush_all()
 
     async def create_bundle(self, guild_id: int, channel_id: int,
                             input_string: str | None = None,
@@ -446,4 +524,5 @@ class MediaBrokerBase(PlayerSessionStore, ABC):
                         if req.retry_message_outstanding:
                             self.dispatcher.remove_mutable(
                                 f'request_retry-{bundle_uuid}-{req.media_request.uuid}')
+            self._forget_bundle_render(bundle_uuid)
             await self._drop_bundle(bundle_uuid)
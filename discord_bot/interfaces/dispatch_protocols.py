@@ -1,11 +1,15 @@
 '''
 Abstract base classes for the MessageDispatcher service.
 
-BundleStore and WorkQueue define the interface that both in-process
-(asyncio) and Redis-backed implementations must satisfy.
+BundleStore, WorkQueue and ChannelTailStore define the interface that both
+in-process (asyncio) and Redis-backed implementations must satisfy.
 '''
 from abc import ABC, abstractmethod
 
+# Newest message ids kept per channel by a ChannelTailStore.  Bundles with more
+# messages than this always take the history fetch for their sticky check.
+CHANNEL_TAIL_SIZE = 50
+
 
 class BundleStore(ABC):
     '''Async interface for persisting mutable-bundle state.'''
@@ -43,7 +47,11 @@ class WorkQueue(ABC):
         payload is replaced so the newest content wins. When False (used by the
         lock-retry re-enqueue path, which may be carrying an already-stale payload)
         the payload is only written if none is currently stored — so a newer update
-        that arrived between dequeue and re-enqueue is never clobbered.'''
+        that arrived between dequeue and re-enqueue is never clobbered.
+
+        A payload carrying a sequence number (a mutable update's ``seq``) never
+        replaces a stored payload with a higher one, whatever order the two
+        arrive in.'''
 
     @abstractmethod
     async def dequeue(self, timeout: float = 1.0) -> tuple[str, dict] | None:
@@ -64,3 +72,30 @@ class WorkQueue(ABC):
     @abstractmethod
     async def get_result(self, request_id: str) -> dict | None:
         '''Return the stored result dict, or None if not yet ready.'''
+
+
+class ChannelTailStore(ABC):
+    '''
+    Async interface for the newest message ids seen in each channel.
+
+    Fed by gateway message create / delete events and by the dispatcher's own
+    sends and deletes, so the sticky check can tell whether a bundle is still
+    at the bottom of its channel without fetching channel history.  Discord
+    message ids are snowflakes, so ordering by id is ordering by time.
+    '''
+
+    @abstractmethod
+    async def add(self, channel_id: int, message_ids: list[int]) -> None:
+        '''Record *message_ids* as posted in *channel_id*.'''
+
+    @abstractmethod
+    async def discard(self, channel_id: int, message_ids: list[int]) -> None:
+        '''Forget *message_ids*, deleted from *channel_id*.'''
+
+    @abstractmethod
+    async def newest(self, channel_id: int, message_ids: list[int]) -> list[int] | None:
+        '''Return the newest len(message_ids) ids in *channel_id*, newest first.
+
+        Returns None while the tail is cold: when any of *message_ids* is not
+        tracked, nothing can be said about what sits between them, and the
+        caller falls back to a history fetch.'''
@@ -43,16 +43,21 @@ class DownloadClient(Protocol):
     '''
     Cog-facing handle for the download pipeline.
 
-    The producer surface (submit / block_guild / clear_guild_queue /
-    queue_size) is async so a Redis-backed client can do its I/O inline; the
-    cog drives the consumer via run() as a background loop.  failure_summary /
-    backoff_seconds_remaining stay synchronous — they read cached backoff state
-    the run() loop refreshes — for logging and metrics.
+    The producer surface (submit / submit_many / block_guild /
+    clear_guild_queue / queue_size) is async so a Redis-backed client can do
+    its I/O inline; the cog drives the consumer via run() as a background loop.
+    failure_summary / backoff_seconds_remaining stay synchronous — they read
+    cached backoff state the run() loop refreshes — for logging and metrics.
     '''
     async def submit(self, guild_id: int, media_request: MediaRequest,
                      priority: int | None = None) -> None:
         '''Enqueue a MediaRequest for download; results are reported to the broker.'''
 
+    async def submit_many(self, guild_id: int, media_requests: list[MediaRequest],
+                          priority: int | None = None) -> list[Exception | None]:
+        '''Enqueue several MediaRequests in order.  Returns one outcome per request:
+        None if queued, else the PutsBlocked / QueueFull that refused it.'''
+
     async def block_guild(self, guild_id: int) -> bool:
         '''Block new submissions for a guild (used during shutdown/cleanup).'''
 
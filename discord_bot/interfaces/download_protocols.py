@@ -49,9 +49,10 @@ from discord_bot.types.clear_guild_result import ClearGuildResult
 # via integrations/s3). Re-exported here so existing imports keep working —
 # same move, same reason, as BrokerClient before them.
 __all__ = ['DownloadClient', 'RETRY_BACKOFF_SECONDS_MINIMUM', 'ClearGuildResult']
-from discord_bot.utils.audio import edit_audio_file, AudioProcessingError
+from discord_bot.utils.audio import edit_audio_file, AudioFormat, AudioProcessingError
 from discord_bot.cogs.music_helpers.common import SearchType
 from discord_bot.types.media_request import MediaRequest, media_request_attributes
+from discord_bot.types.queue import submit_in_order
 from discord_bot.types.download import (
     DownloadErrorType, LifecycleEvent, DownloadResult, DownloadStatus, LifecycleStatusUpdate,
 )
@@ -154,18 +155,16 @@ class BotDownloadFlagged(RetryableException):
     '''
 
 OTEL_SPAN_PREFIX = 'music.download_client'
-# Idle backoff for the run() consumer loop when no request is pending. Sleeping
-# ONLY on the empty path (not before a successful dequeue) keeps back-to-back
-# downloads at full throughput while cutting idle allocation churn (OOM fix).
-#
-# Also paces create_source's NO_EXIT_AVAILABLE yield, where every exit is leased or
+# Paces create_source's NO_EXIT_AVAILABLE yield, where every exit is leased or
 # backed off and the item goes straight back on the queue.
-#
-# Every idle poll costs redis work per driver, and pool mode runs one driver per
-# worker_count, so the pod's floor traffic is this rate times the driver count. The
-# trade is pickup latency: a request queued just after a poll waits up to this long
-# before any driver sees it, on a path where the download itself then takes seconds.
 _IDLE_POLL_BACKOFF_SECONDS = 1.0
+# Longest one idle run() iteration blocks in _wait_for_work. An empty queue no
+# longer re-polls on a timer: the worker blocks until an enqueue signals it, so
+# pickup latency is the signal's, not a poll interval's, and an idle pod issues a
+# handful of commands per this interval rather than several per second per driver.
+# The cap keeps iterations returning, for loop health and for the shutdown check
+# in the loop runner.
+IDLE_WAIT_SECONDS = 5.0
 YTDLP_OUTPUT_TEMPLATE = '%(extractor)s.%(id)s.%(ext)s'
 # bandit B104: yt-dlp's source-address config, not a server bind; '0.0.0.0' lets the OS pick (avoids ipv6 issues)
 YTDLP_SOURCE_ADDRESS = '0.0.0.0'  # nosec B104
@@ -217,6 +216,7 @@ class DownloadWorkerBase(ABC):
         wait_period_max_variance: int = 10,
         bucket_name: str | None = None,
         normalize_audio: bool = False,
+        audio_format: AudioFormat = AudioFormat.PCM,
         broker: BrokerClient | None = None,
         max_retries: int = 3,
         retry_backoff_seconds_minimum: int = RETRY_BACKOFF_SECONDS_MINIMUM,
@@ -233,6 +233,8 @@ class DownloadWorkerBase(ABC):
         bucket_name : S3 bucket to upload to immediately after download;
                       when set the local file is deleted and DownloadResult.file_name
                       holds the S3 object key instead of a local path
+        audio_format : Format downloads are converted to and cached as; raw PCM by
+                       default, Opus to cache pre-encoded packets at ~1/12 the size
         broker : MediaBroker for lifecycle status updates; optional for backwards compatibility
         max_retries : Maximum download retries before returning RETRY_LIMIT_EXCEEDED
         retry_backoff_seconds_minimum : First retry's hold-off; doubles per attempt.
@@ -281,6 +283,7 @@ class DownloadWorkerBase(ABC):
         self._wait_timestamp: float | None = None
         self.bucket_name: str | None = bucket_name
         self.normalize_audio: bool = normalize_audio
+        self.audio_format: AudioFormat = audio_format
         self.logger = get_logger('download_client', logging_config)
         self.logging_config = logging_config
         # Optional ExitProbe, wired by the downloader entrypoint; None on the
@@ -474,6 +477,24 @@ class DownloadWorkerBase(ABC):
         ready_at = datetime.now(timezone.utc).timestamp() + delay_seconds
         await self._enqueue_deferred_request(media_request.guild_id, media_request, ready_at)
 
+    @abstractmethod
+    async def _wait_for_work(self, timeout: float) -> None:
+        '''Block until an enqueue signals new work, or for at most timeout seconds.
+
+        Called by run() when the queue is empty.  Implementations also return by
+        the time the earliest deferred retry is due, since that becomes work on
+        the clock rather than on an enqueue.  Returning early is harmless — run()
+        just polls again — but returning late delays pickup.
+        '''
+
+    def _idle_wait_seconds(self) -> float:
+        '''How long an idle run() iteration may wait: IDLE_WAIT_SECONDS, or less
+        when a backoff window ends sooner and queued items become poppable.'''
+        if self._wait_timestamp is None:
+            return IDLE_WAIT_SECONDS
+        remaining = self._wait_timestamp - datetime.now(timezone.utc).timestamp()
+        return min(IDLE_WAIT_SECONDS, remaining) if remaining > 0 else IDLE_WAIT_SECONDS
+
     @abstractmethod
     async def block_guild(self, guild_id: int) -> bool:
         '''Block new submissions for a guild (used during shutdown).'''
@@ -516,6 +537,11 @@ class DownloadWorkerBase(ABC):
             media_request.span_context = capture_span_context()
         await self._enqueue_request(guild_id, media_request, priority=priority)
 
+    async def submit_many(self, guild_id: int, media_requests: List[MediaRequest],
+                          priority: int | None = None) -> List[Exception | None]:
+        '''Submit a batch in order; one outcome per request (see submit_in_order).'''
+        return await submit_in_order(self.submit, guild_id, media_requests, priority=priority)
+
     async def get_input_nowait(self) -> MediaRequest:
         '''Return the next pending MediaRequest, raising QueueEmpty if none available.'''
         return await self._merged_get_nowait()
@@ -524,11 +550,12 @@ class DownloadWorkerBase(ABC):
         '''
         Poll for the next MediaRequest with client instrumentation suppressed.
 
-        run() polls every _IDLE_POLL_BACKOFF_SECONDS whether or not work exists, so
-        the redis spans this emits are almost entirely idle noise — with a driver per
-        egress exit they were ~98% of the downloader's span volume, at a rate set by
-        the poll interval rather than by anything happening.  Suppressing them keeps
-        the trace backend describing real work instead of an empty queue.
+        run() polls whenever it wakes, whether or not work exists, so the redis
+        spans this emits are mostly idle noise — with a driver per egress exit they
+        were ~98% of the downloader's span volume under the old fixed-interval poll,
+        at a rate set by the poll interval rather than by anything happening.
+        Suppressing them keeps the trace backend describing real work instead of an
+        empty queue.
 
         The suppression is scoped to the peek alone, so every span that describes a
         download survives: create_source, submit, the audio/upload spans, and the
@@ -573,17 +600,17 @@ class DownloadWorkerBase(ABC):
                     try:
                         media_request = await self._peek_next_request()
                     except QueueEmpty:
-                        # Idle: nothing ready after backoff — back off before the
-                        # loop runner re-calls rather than busy-spinning.
-                        await sleep(_IDLE_POLL_BACKOFF_SECONDS)
+                        # Idle: nothing ready after backoff — wait for an enqueue
+                        # before the loop runner re-calls rather than busy-spinning.
+                        await self._wait_for_work(self._idle_wait_seconds())
                         return
         else:
             try:
                 media_request = await self._peek_next_request()
             except QueueEmpty:
-                # Idle: no pending request — back off before re-poll instead of
+                # Idle: no pending request — wait for an enqueue instead of
                 # busy-spinning every ~10ms (which throttled busy downloads too).
-                await sleep(_IDLE_POLL_BACKOFF_SECONDS)
+                await self._wait_for_work(self._idle_wait_seconds())
                 return
 
         request_uuid = str(media_request.uuid)
@@ -807,7 +834,7 @@ class DownloadWorkerBase(ABC):
     async def _create_source(self, media_request: MediaRequest, max_retries: int, egress: DownloadEgress) -> DownloadResult:
         '''
         Download through an acquired egress + post-process. Calls update_tracking on
-        the result; PCM conversion runs after it so the backoff timer reflects
+        the result; audio conversion runs after it so the backoff timer reflects
         download time only.
         '''
         loop = asyncio.get_running_loop()
@@ -829,7 +856,8 @@ class DownloadWorkerBase(ABC):
             await self.update_tracking(result, egress.exit_name)
             if result.status.success and result.file_name is not None:
                 try:
-                    pcm_path = await loop.run_in_executor(None, edit_audio_file, result.file_name, self.normalize_audio, self.logging_config)
+                    pcm_path = await loop.run_in_executor(None, edit_audio_file, result.file_name, self.normalize_audio,
+                                                          self.logging_config, self.audio_format)
                     post_process_timestamp = datetime.now(timezone.utc)
                     self.logger.info(
                         'Audio post-processing complete: file=%s download_ts=%s post_process_ts=%s',
@@ -837,9 +865,9 @@ class DownloadWorkerBase(ABC):
                     )
                     result = result.model_copy(update={
                         'file_name': pcm_path,
-                        # The PCM is what gets uploaded and cached, so the cache
-                        # must size THAT, not the compressed download it came
-                        # from. s16le/48k stereo runs ~12x the size of a 128 kbps
+                        # The converted file is what gets uploaded and cached, so
+                        # the cache must size THAT, not the download it came from.
+                        # s16le/48k stereo runs ~12x the size of a 128 kbps
                         # source; leaving the pre-conversion size here made
                         # max_cache_size_mb evict against a number an order of
                         # magnitude too small, so the bucket ran ~12x its cap.
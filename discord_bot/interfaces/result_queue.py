@@ -9,15 +9,55 @@ which the dispatcher pod doesn't ship).
 
 Single-process deployments use AsyncioDownloadResultQueue (in-memory);
 HA deployments use RedisDownloadResultQueue so any broker pod can answer
-GET /results/next, and broker-pod restarts don't lose work.
+GET /results/batch (and the older GET /results/next), and broker-pod restarts
+don't lose work.  get_batch is what the long-poll route waits on.
 '''
+import asyncio
 from abc import ABC, abstractmethod
 
 from discord_bot.types.download import DownloadResult
 from discord_bot.types.search_resolution import SearchResolution
 
+# How often the default get_batch re-checks an empty queue while it waits.
+# Both concrete queues block natively and never reach the poll.
+BATCH_POLL_INTERVAL_SECONDS = 0.1
 
-class DownloadResultQueue(ABC):
+
+class _BatchingResultQueue(ABC):
+    '''get_batch on top of get_nowait, shared by both result-queue ABCs.'''
+
+    @abstractmethod
+    async def get_nowait(self):
+        '''Pop the oldest item, or None if the queue is empty.'''
+
+    async def get_batch(self, max_items: int, timeout: float) -> list:
+        '''Pop up to max_items of the oldest items, oldest first.
+
+        Waits up to timeout seconds for the first item when the queue is empty,
+        then takes whatever else is already queued without waiting again.
+        Returns an empty list if nothing arrived in time.  This default polls
+        get_nowait; implementations that can block on their backing store
+        override it.'''
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            first = await self.get_nowait()
+            if first is not None:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            await asyncio.sleep(min(BATCH_POLL_INTERVAL_SECONDS, remaining))
+        batch = [first]
+        while len(batch) < max_items:
+            item = await self.get_nowait()
+            if item is None:
+                break
+            batch.append(item)
+        return batch
+
+
+class DownloadResultQueue(_BatchingResultQueue):
     '''Abstract bot-ready DownloadResult queue.'''
 
     @abstractmethod
@@ -33,7 +73,7 @@ class DownloadResultQueue(ABC):
         '''Return the number of results currently waiting in the queue.'''
 
 
-class SearchResultQueue(ABC):
+class SearchResultQueue(_BatchingResultQueue):
     '''Abstract bot-ready SearchResolution queue.
 
     Sibling of DownloadResultQueue: carries resolved searches from the search
@@ -23,6 +23,8 @@ time in single-process mode.
 '''
 import asyncio
 from abc import ABC, abstractmethod
+from asyncio import QueueEmpty
+from collections import deque
 from datetime import datetime, timezone
 from functools import partial
 from random import randint, seed
@@ -32,8 +34,12 @@ from typing import TYPE_CHECKING, Callable, Protocol, runtime_checkable
 from discord_bot.exceptions import ExitEarlyException, YoutubeMusicRetryException
 from discord_bot.types.clear_guild_result import ClearGuildResult
 from discord_bot.types.media_request import MediaRequest
+from discord_bot.types.queue import submit_in_order
 from discord_bot.utils.common import LoggingConfig, get_logger
 from discord_bot.utils.failure_queue import FailureQueue, FailureStatus
+from discord_bot.workers.search_resolution_cache import (
+    SearchResolutionCache, normalize_search_string, record_cache_outcome,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
     # Annotation only — importing it for real would pull ytmusicapi into every
@@ -59,6 +65,7 @@ class YoutubeMusicSearchWorkerBase(ABC):
         failure_queue: FailureQueue,
         wait_period_minimum: int,
         wait_period_max_variance: int,
+        resolution_cache: SearchResolutionCache | None = None,
     ):
         '''
         Init search engine.
@@ -69,8 +76,17 @@ class YoutubeMusicSearchWorkerBase(ABC):
         failure_queue : FailureQueue tracking recent 429s for backoff scaling.
         wait_period_minimum : Minimum backoff wait time in seconds.
         wait_period_max_variance : Maximum extra random variance in seconds.
+        resolution_cache : Optional search-string -> videoId cache.  When set,
+                 a submit that hits it skips the input queue, and resolve
+                 consults it before calling ytmusicapi.
         '''
         self._client = client
+        self._resolution_cache = resolution_cache
+        # Submissions answered from the cache, waiting for the loop to hand them
+        # back to the broker: (request, videoId or None)
+        self._cached_resolutions: deque[tuple[MediaRequest, str | None]] = deque()
+        # Normalized search string -> future of the search already running for it
+        self._inflight: dict[str, asyncio.Future] = {}
         self._failure_queue = failure_queue
         self._wait_period_minimum = wait_period_minimum
         self._wait_period_max_variance = wait_period_max_variance
@@ -80,9 +96,51 @@ class YoutubeMusicSearchWorkerBase(ABC):
 
     async def submit(self, guild_id: int, media_request: MediaRequest,
                      priority: int | None = None) -> None:
-        '''Enqueue a search request; resolution happens on the search loop.'''
+        '''
+        Enqueue a search request; resolution happens on the search loop.
+
+        A request whose search string is already cached never enters the queue:
+        it is parked with its resolution for get_cached_nowait, which the loop
+        drains ahead of the queue and of any 429 backoff window.
+        '''
+        if self._resolution_cache is not None:
+            cached = await self._resolution_cache.get(media_request.search_result.raw_search_string)
+            if cached is not None:
+                self._cached_resolutions.append((media_request, cached.video_id))
+                await self._notify_cached_resolution()
+                return
         await self._enqueue(guild_id, media_request, priority=priority)
 
+    async def submit_many(self, guild_id: int, media_requests: list[MediaRequest],
+                          priority: int | None = None) -> list[Exception | None]:
+        '''Submit a batch in order; one outcome per request (see submit_in_order).'''
+        return await submit_in_order(self.submit, guild_id, media_requests, priority=priority)
+
+    async def get_cached_nowait(self) -> tuple[MediaRequest, str | None]:
+        '''Pop the next request answered from the cache, raising asyncio.QueueEmpty if none.'''
+        if not self._cached_resolutions:
+            raise QueueEmpty('No cached search resolutions')
+        return self._cached_resolutions.popleft()
+
+    def _drop_cached_resolutions(self, guild_id: int,
+                                 preserve_predicate: Callable[[MediaRequest], bool] | None = None,
+                                 ) -> list[MediaRequest]:
+        '''
+        Drop a guild's requests still waiting in the cached-resolution lane.
+
+        Called by the subclasses' clear_guild_queue, so a clear covers requests
+        that skipped the queue as well as the queued ones.
+        '''
+        dropped = []
+        kept = deque()
+        for media_request, video_id in self._cached_resolutions:
+            if media_request.guild_id == guild_id and not (preserve_predicate and preserve_predicate(media_request)):
+                dropped.append(media_request)
+            else:
+                kept.append((media_request, video_id))
+        self._cached_resolutions = kept
+        return dropped
+
     async def resolve(self, media_request: MediaRequest) -> str | None:
         '''
         Resolve a search request to a YouTube videoId (or None if nothing
@@ -95,11 +153,69 @@ class YoutubeMusicSearchWorkerBase(ABC):
         failure/success bookkeeping is factored into _record_search_success /
         _record_search_failure hooks so a Redis-backed subclass can share both
         the failure count and the backoff window across pods.
+
+        With a resolution cache, a cached answer (including a cached no-result)
+        is returned without a search, and concurrent resolves of the same
+        normalized string share one search: the first runs it, the rest await
+        its outcome, 429 included.
+        '''
+        search_string = media_request.search_result.raw_search_string
+        if self._resolution_cache is None:
+            return await self._search(search_string)
+        # submit() already counted this lookup; only re-check here.
+        cached = await self._resolution_cache.get(search_string, record=False)
+        if cached is not None:
+            return cached.video_id
+        key = normalize_search_string(search_string)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            record_cache_outcome('coalesced')
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        # Mark the outcome retrieved even when nobody joined, so a 429 is not
+        # reported as a never-retrieved future exception.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            video_id = await self._search_and_cache(search_string)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        future.set_result(video_id)
+        return video_id
+
+    async def _search_and_cache(self, search_string: str) -> str | None:
+        '''
+        Search under the cache's in-flight claim and cache the outcome.
+
+        Another process holding the claim is given the chance to finish first;
+        if it caches nothing in time this process searches anyway.  A 429 caches
+        nothing, so the retry searches again.
         '''
+        token = await self._resolution_cache.claim(search_string)
+        if token is None:
+            cached = await self._resolution_cache.wait_for_peer(search_string)
+            if cached is not None:
+                return cached.video_id
+        try:
+            video_id = await self._search(search_string)
+            await self._resolution_cache.set(search_string, video_id)
+        finally:
+            if token is not None:
+                await self._resolution_cache.release(search_string, token)
+        return video_id
+
+    async def _search(self, search_string: str) -> str | None:
+        '''Run the ytmusicapi search in an executor, recording the 429 outcome.'''
         loop = asyncio.get_running_loop()
         try:
             video_id = await loop.run_in_executor(
-                None, partial(self._client.search, media_request.search_result.raw_search_string))
+                None, partial(self._client.search, search_string))
         except YoutubeMusicRetryException as error:
             await self._record_search_failure(error)
             raise
@@ -198,6 +314,18 @@ class YoutubeMusicSearchWorkerBase(ABC):
         do its pop I/O inline, mirroring DownloadWorkerBase.get_input_nowait.
         '''
 
+    @abstractmethod
+    async def wait_for_work(self, timeout: float) -> None:
+        '''
+        Block until a request is queued or answered from the cache, or timeout
+        seconds pass.  Returns without saying which: the search loop re-polls
+        either way, so a spurious wakeup only costs one empty poll.
+        '''
+
+    @abstractmethod
+    async def _notify_cached_resolution(self) -> None:
+        '''Wake wait_for_work after submit parked a request in the cached lane.'''
+
     @abstractmethod
     async def block_guild(self, guild_id: int) -> bool:
         '''Block new submissions for a guild (used during shutdown/cleanup).'''
@@ -224,9 +352,19 @@ class YoutubeMusicSearchClient(Protocol):
                      priority: int | None = None) -> None:
         '''Enqueue a search request.'''
 
+    async def submit_many(self, guild_id: int, media_requests: list[MediaRequest],
+                          priority: int | None = None) -> list[Exception | None]:
+        '''Enqueue several search requests; None per queued request, else its rejection.'''
+
     async def get_input_nowait(self) -> MediaRequest:
         '''Pop the next pending request, raising asyncio.QueueEmpty if none.'''
 
+    async def get_cached_nowait(self) -> tuple[MediaRequest, str | None]:
+        '''Pop the next request answered from the resolution cache, raising asyncio.QueueEmpty if none.'''
+
+    async def wait_for_work(self, timeout: float) -> None:
+        '''Block until a request is queued or cached, or timeout seconds pass.'''
+
     async def resolve(self, media_request: MediaRequest) -> str | None:
         '''Resolve a request to a videoId (or None); re-raises on 429.'''
 
@@ -7,6 +7,7 @@ from opentelemetry.metrics import Observation
 from opentelemetry.propagate import extract
 
 from discord_bot.utils.otel import AttributeNaming
+from discord_bot.utils.wire_format import from_json_text
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +36,7 @@ class AiohttpServerBase:
         duplicate-code (R0801) check compares those modules pairwise.'''
         ctx = extract(request.headers)
         try:
-            body = await request.json()
+            body = await request.json(loads=from_json_text)
         except Exception as exc:
             raise web.HTTPUnprocessableEntity() from exc
         return ctx, body
@@ -20,6 +20,7 @@ from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.utils.otel import (otel_span_wrapper, create_observable_gauge, METER_PROVIDER,
                                      MetricNaming, AttributeNaming)
+from discord_bot.utils.wire_format import compact_dump, to_json_text
 from discord_bot.workers.asyncio_queues import AsyncioDownloadResultQueue, AsyncioSearchResultQueue
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,15 @@ _SEARCH_RESULT_FETCH_COUNTER = METER_PROVIDER.create_counter(
     description='GET /search-results/next outcomes (hit / empty)',
     unit='1',
 )
+# The long-poll batch routes count into the same two counters: 'hit' once per
+# result handed over (so a batch of 8 adds 8), 'empty' once per request that
+# waited out its window with nothing to return.
+
+# Upper bounds on the batch routes' ?max= and ?wait=.  The wait cap keeps a
+# held request well inside drain_and_stop's 30 s drain window, so a rolling
+# broker is never stuck waiting on an idle bot's long-poll.
+RESULT_BATCH_MAX_ITEMS = 64
+RESULT_BATCH_MAX_WAIT_SECONDS = 20.0
 
 
 @dataclass
@@ -64,11 +74,16 @@ class BrokerHttpServer(AiohttpServerBase):
     Routes:
         POST   /requests/{uuid}           register_request
         PUT    /requests/{uuid}/status    update_request_status
+        POST   /batch/requests            register_requests
+        PUT    /batch/status              update_status_many
+        POST   /batch/cache/check         check_cache_many
         POST   /downloads                 register_download_result (worker)
         POST   /downloads/register        register_download (MediaDownload)
         GET    /results/next              next_result (204 when empty)
+        GET    /results/batch?max=&wait=  next_results (long-poll, 204 when empty)
         POST   /search-results            register_search_result (search worker)
         GET    /search-results/next       next_search_result (204 when empty)
+        GET    /search-results/batch      next_search_results (long-poll, 204 when empty)
         POST   /requests/{uuid}/checkout  checkout
         POST   /requests/{uuid}/release   release
         POST   /requests/{uuid}/remove    remove
@@ -82,6 +97,13 @@ class BrokerHttpServer(AiohttpServerBase):
         POST   /bundles/{uuid}/finalize   finalize_bundle
         DELETE /bundles/{uuid}            delete_bundle
 
+    The /batch routes take a list and answer for all of it in one round trip,
+    so a playlist page costs a fixed number of requests rather than a few per
+    track.  They live under their own prefix because a broker from before them
+    would read POST /requests/batch as register_request for uuid "batch" and
+    answer 422; an unknown /batch path is a clean 404 the client can fall back
+    on.
+
     checkout serialises whatever the engine returns: an in-process AsyncioBroker
     stages the file and yields CheckoutResult(local_path) -> guild_file_path; an
     HA RedisBroker yields CheckoutResult(s3_key) -> s3_key (the bot fetches it).
@@ -129,11 +151,16 @@ class BrokerHttpServer(AiohttpServerBase):
         app = web.Application(middlewares=[self._get_drain_middleware()])
         app.router.add_post('/requests/{uuid}', self._handle_register_request)
         app.router.add_put('/requests/{uuid}/status', self._handle_update_status)
+        app.router.add_post('/batch/requests', self._handle_register_requests)
+        app.router.add_put('/batch/status', self._handle_update_status_many)
+        app.router.add_post('/batch/cache/check', self._handle_check_cache_many)
         app.router.add_post('/downloads', self._handle_register_download)
         app.router.add_post('/downloads/register', self._handle_register_download_direct)
         app.router.add_get('/results/next', self._handle_next_result)
+        app.router.add_get('/results/batch', self._handle_next_results)
         app.router.add_post('/search-results', self._handle_register_search_result)
         app.router.add_get('/search-results/next', self._handle_next_search_result)
+        app.router.add_get('/search-results/batch', self._handle_next_search_results)
         app.router.add_post('/requests/{uuid}/checkout', self._handle_checkout)
         app.router.add_post('/requests/{uuid}/release', self._handle_release)
         app.router.add_post('/requests/{uuid}/remove', self._handle_remove)
@@ -176,6 +203,31 @@ class BrokerHttpServer(AiohttpServerBase):
             await self._broker.update_request_status(uuid, update)
         return web.json_response({'status': 'ok'})
 
+    async def _handle_register_requests(self, request: web.Request) -> web.Response:
+        '''POST /batch/requests — body {requests: [MediaRequest, ...]}.'''
+        ctx, body = await self._read_body(request)
+        try:
+            media_requests = [parse_media_request(item) for item in body['requests']]
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        with otel_span_wrapper('broker.register_requests', context=ctx, kind=SpanKind.SERVER,
+                               attributes={'broker.batch_size': len(media_requests)}):
+            await self._broker.register_requests(media_requests)
+        return web.json_response({'status': 'ok'}, status=201)
+
+    async def _handle_update_status_many(self, request: web.Request) -> web.Response:
+        '''PUT /batch/status — body {updates: [{uuid, update}, ...]}, applied in order.'''
+        ctx, body = await self._read_body(request)
+        try:
+            updates = [(str(item['uuid']), LifecycleStatusUpdate.model_validate(item['update']))
+                       for item in body['updates']]
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        with otel_span_wrapper('broker.update_status_many', context=ctx, kind=SpanKind.SERVER,
+                               attributes={'broker.batch_size': len(updates)}):
+            await self._broker.update_status_many(updates)
+        return web.json_response({'status': 'ok'})
+
     async def _handle_register_download(self, request: web.Request) -> web.Response:
         ctx, body = await self._read_body(request)
         try:
@@ -217,7 +269,43 @@ class BrokerHttpServer(AiohttpServerBase):
             _RESULT_FETCH_COUNTER.add(1, {AttributeNaming.OUTCOME.value: 'empty'})
             return web.Response(status=204)
         _RESULT_FETCH_COUNTER.add(1, {AttributeNaming.OUTCOME.value: 'hit'})
-        return web.json_response(result.model_dump(mode='json'))
+        return web.json_response(compact_dump(result), dumps=to_json_text)
+
+    @staticmethod
+    def _batch_params(request: web.Request) -> tuple[int, float]:
+        '''Parse and clamp ?max= and ?wait= for the long-poll batch routes.'''
+        try:
+            max_items = int(request.query.get('max', 1))
+            wait_seconds = float(request.query.get('wait', 0))
+        except ValueError as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        return (min(max(max_items, 1), RESULT_BATCH_MAX_ITEMS),
+                min(max(wait_seconds, 0.0), RESULT_BATCH_MAX_WAIT_SECONDS))
+
+    @staticmethod
+    async def _long_poll(request: web.Request, queue, span_name: str, counter) -> web.Response:
+        '''
+        Shared body of the two batch routes.
+
+        Holds the request until the queue has something or the wait runs out,
+        then hands back everything up to ?max= in one response.  The wait
+        happens outside the span, so an idle long-poll records nothing — the
+        same reason the HTTP client opens no span on an empty poll.
+        '''
+        max_items, wait_seconds = BrokerHttpServer._batch_params(request)
+        items = await queue.get_batch(max_items, wait_seconds)
+        if not items:
+            counter.add(1, {AttributeNaming.OUTCOME.value: 'empty'})
+            return web.Response(status=204)
+        with otel_span_wrapper(span_name, context=extract(request.headers), kind=SpanKind.SERVER,
+                               attributes={'broker.batch_size': len(items)}):
+            counter.add(len(items), {AttributeNaming.OUTCOME.value: 'hit'})
+            return web.json_response({'results': [compact_dump(item) for item in items]}, dumps=to_json_text)
+
+    async def _handle_next_results(self, request: web.Request) -> web.Response:
+        '''GET /results/batch — long-poll for up to ?max= DownloadResults.'''
+        return await self._long_poll(request, self._result_queue, 'broker.next_results',
+                                     _RESULT_FETCH_COUNTER)
 
     async def _handle_register_search_result(self, request: web.Request) -> web.Response:
         '''POST /search-results — push a resolved search onto the bot-ready queue.'''
@@ -239,7 +327,12 @@ class BrokerHttpServer(AiohttpServerBase):
             _SEARCH_RESULT_FETCH_COUNTER.add(1, {AttributeNaming.OUTCOME.value: 'empty'})
             return web.Response(status=204)
         _SEARCH_RESULT_FETCH_COUNTER.add(1, {AttributeNaming.OUTCOME.value: 'hit'})
-        return web.json_response(resolution.model_dump(mode='json'))
+        return web.json_response(compact_dump(resolution), dumps=to_json_text)
+
+    async def _handle_next_search_results(self, request: web.Request) -> web.Response:
+        '''GET /search-results/batch — long-poll for up to ?max= SearchResolutions.'''
+        return await self._long_poll(request, self._search_result_queue, 'broker.next_search_results',
+                                     _SEARCH_RESULT_FETCH_COUNTER)
 
     async def _handle_checkout(self, request: web.Request) -> web.Response:
         ctx, body = await self._read_body(request)
@@ -292,20 +385,15 @@ class BrokerHttpServer(AiohttpServerBase):
             await self._broker.prefetch(items, guild_id, Path(guild_path) if guild_path else None, limit)
         return web.json_response({'status': 'ok'})
 
-    async def _handle_check_cache(self, request: web.Request) -> web.Response:
-        ctx, body = await self._read_body(request)
-        try:
-            media_request = parse_media_request(body)
-        except Exception as exc:
-            raise web.HTTPUnprocessableEntity() from exc
-        with otel_span_wrapper('broker.check_cache', context=ctx, kind=SpanKind.SERVER):
-            cached = await self._broker.check_cache(media_request)
+    @staticmethod
+    def _cache_check_payload(cached: MediaDownload | None) -> dict:
+        '''Response body for one cache lookup: {hit: false} or {hit: true, download}.'''
         if cached is None:
-            return web.json_response({'hit': False})
-        return web.json_response({
+            return {'hit': False}
+        return {
             'hit': True,
             'download': {
-                'request': cached.media_request.model_dump(mode='json'),
+                'request': compact_dump(cached.media_request),
                 'file_path': str(cached.file_path) if cached.file_path else None,
                 'file_size_bytes': cached.file_size_bytes,
                 'cache_hit': cached.cache_hit,
@@ -315,7 +403,29 @@ class BrokerHttpServer(AiohttpServerBase):
                     'duration': cached.duration, 'extractor': cached.extractor,
                 },
             },
-        })
+        }
+
+    async def _handle_check_cache(self, request: web.Request) -> web.Response:
+        ctx, body = await self._read_body(request)
+        try:
+            media_request = parse_media_request(body)
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        with otel_span_wrapper('broker.check_cache', context=ctx, kind=SpanKind.SERVER):
+            cached = await self._broker.check_cache(media_request)
+        return web.json_response(self._cache_check_payload(cached))
+
+    async def _handle_check_cache_many(self, request: web.Request) -> web.Response:
+        '''POST /batch/cache/check — body {requests: [...]}; one lookup per request, in order.'''
+        ctx, body = await self._read_body(request)
+        try:
+            media_requests = [parse_media_request(item) for item in body['requests']]
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        with otel_span_wrapper('broker.check_cache_many', context=ctx, kind=SpanKind.SERVER,
+                               attributes={'broker.batch_size': len(media_requests)}):
+            cached = await self._broker.check_cache_many(media_requests)
+        return web.json_response({'results': [self._cache_check_payload(item) for item in cached]})
 
     async def _handle_cache_cleanup(self, request: web.Request) -> web.Response:
         ctx = extract(request.headers)
@@ -363,7 +473,7 @@ class BrokerHttpServer(AiohttpServerBase):
         ctx = extract(request.headers)
         with otel_span_wrapper('broker.list_player_sessions', context=ctx, kind=SpanKind.SERVER):
             sessions = await self._broker.list_player_sessions()
-        return web.json_response({'sessions': [s.model_dump(mode='json') for s in sessions]})
+        return web.json_response({'sessions': [compact_dump(s) for s in sessions]})
 
     async def _handle_save_player_session(self, request: web.Request) -> web.Response:
         ctx, body = await self._read_body(request)
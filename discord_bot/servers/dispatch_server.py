@@ -5,9 +5,11 @@ Schedule with asyncio.create_task(server.serve()).
 Fire-and-forget endpoints (POST → 202):
     /dispatch/send
     /dispatch/delete
+    /dispatch/bulk_delete
     /dispatch/update_mutable
     /dispatch/remove_mutable
     /dispatch/update_mutable_channel
+    /dispatch/channel_event
 
 Awaitable fetch endpoints (POST → 202 with request_id, GET → 200 result | 202 pending):
     /dispatch/fetch_history
@@ -22,6 +24,7 @@ from opentelemetry.trace import SpanKind
 
 from discord_bot.interfaces.dispatch_protocols import WorkQueue
 from discord_bot.servers.base import AiohttpServerBase
+from discord_bot.types.dispatch_request import BULK_DELETE_MAX_MESSAGES
 from discord_bot.utils.dispatch_queue import dispatch_request_id
 from discord_bot.utils.otel import otel_span_wrapper
 
@@ -52,9 +55,11 @@ class DispatchHttpServer(AiohttpServerBase):
         app = web.Application(middlewares=[self._get_drain_middleware()])
         app.router.add_post('/dispatch/send', self._handle_send)
         app.router.add_post('/dispatch/delete', self._handle_delete)
+        app.router.add_post('/dispatch/bulk_delete', self._handle_bulk_delete)
         app.router.add_post('/dispatch/update_mutable', self._handle_update_mutable)
         app.router.add_post('/dispatch/remove_mutable', self._handle_remove_mutable)
         app.router.add_post('/dispatch/update_mutable_channel', self._handle_update_mutable_channel)
+        app.router.add_post('/dispatch/channel_event', self._handle_channel_event)
         app.router.add_post('/dispatch/fetch_history', self._handle_fetch_history)
         app.router.add_post('/dispatch/fetch_emojis', self._handle_fetch_emojis)
         app.router.add_get('/dispatch/results/{request_id}', self._handle_get_result)
@@ -97,6 +102,23 @@ class DispatchHttpServer(AiohttpServerBase):
                                             span_context=span_context)
         return web.json_response({'status': 'ok'}, status=202)
 
+    async def _handle_bulk_delete(self, request: web.Request) -> web.Response:
+        ctx = extract(request.headers)
+        try:
+            body = await request.json()
+            guild_id = int(body['guild_id'])
+            channel_id = int(body['channel_id'])
+            message_ids = [int(message_id) for message_id in body['message_ids']]
+            span_context = body.get('span_context')
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        if not 0 < len(message_ids) <= BULK_DELETE_MAX_MESSAGES:
+            raise web.HTTPUnprocessableEntity()
+        with otel_span_wrapper('dispatch.bulk_delete', context=ctx, kind=SpanKind.SERVER):
+            self._dispatcher.bulk_delete_messages(guild_id, channel_id, message_ids,
+                                                  span_context=span_context)
+        return web.json_response({'status': 'ok'}, status=202)
+
     async def _handle_update_mutable(self, request: web.Request) -> web.Response:
         ctx = extract(request.headers)
         try:
@@ -107,11 +129,13 @@ class DispatchHttpServer(AiohttpServerBase):
             channel_id = int(body['channel_id']) if body.get('channel_id') is not None else None
             sticky = bool(body.get('sticky', True))
             delete_after = body.get('delete_after')
+            # Absent from clients that predate sequencing; the dispatcher takes one.
+            seq = int(body['seq']) if body.get('seq') is not None else None
         except Exception as exc:
             raise web.HTTPUnprocessableEntity() from exc
         with otel_span_wrapper('dispatch.update_mutable', context=ctx, kind=SpanKind.SERVER):
             self._dispatcher.update_mutable(key, guild_id, content, channel_id,
-                                            sticky=sticky, delete_after=delete_after)
+                                            sticky=sticky, delete_after=delete_after, seq=seq)
         return web.json_response({'status': 'ok'}, status=202)
 
     async def _handle_remove_mutable(self, request: web.Request) -> web.Response:
@@ -138,6 +162,20 @@ class DispatchHttpServer(AiohttpServerBase):
             self._dispatcher.update_mutable_channel(key, guild_id, new_channel_id)
         return web.json_response({'status': 'ok'}, status=202)
 
+    async def _handle_channel_event(self, request: web.Request) -> web.Response:
+        # Untraced: one per guild message the bot sees, and the 202 is all the
+        # bot pod waits for.
+        try:
+            body = await request.json()
+            guild_id = int(body['guild_id'])
+            channel_id = int(body['channel_id'])
+            added = [int(message_id) for message_id in body.get('added') or []]
+            deleted = [int(message_id) for message_id in body.get('deleted') or []]
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        self._dispatcher.record_channel_event(guild_id, channel_id, added=added, deleted=deleted)
+        return web.json_response({'status': 'ok'}, status=202)
+
     # ------------------------------------------------------------------
     # Awaitable fetch handlers
     # ------------------------------------------------------------------
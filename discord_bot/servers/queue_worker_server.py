@@ -27,6 +27,7 @@ from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.types.queue import PutsBlocked, QueueFull, submit_rejection_status
 from discord_bot.utils.otel import (otel_span_wrapper, create_observable_gauge, METER_PROVIDER,
                                      MetricNaming, AttributeNaming)
+from discord_bot.utils.wire_format import compact_dump
 
 logger = logging.getLogger(__name__)
 
@@ -37,11 +38,12 @@ class QueueWorkerHttpServer(AiohttpServerBase):
 
     Routes (all relative to ROUTE_PREFIX):
         POST {prefix}          submit
+        POST {prefix}/batch    submit_many (one outcome per request)
         POST {prefix}/clear    clear_guild_queue (preserve_playlist_adds flag)
         POST {prefix}/block    block_guild
         GET  {prefix}/status   queue_size + failure_summary + backoff snapshot
 
-    submit / clear / block mutate the shared Redis queue; status is a read
+    submit / submit_many / clear / block mutate the shared Redis queue; status is a read
     surface the bot pod's HTTP client polls (the bot pod can't read Redis).
     '''
 
@@ -79,6 +81,7 @@ class QueueWorkerHttpServer(AiohttpServerBase):
         '''Build and return the aiohttp Application. Exposed for testing.'''
         app = web.Application(middlewares=[self._get_drain_middleware()])
         app.router.add_post(self.ROUTE_PREFIX, self._handle_submit)
+        app.router.add_post(f'{self.ROUTE_PREFIX}/batch', self._handle_submit_many)
         app.router.add_post(f'{self.ROUTE_PREFIX}/clear', self._handle_clear)
         app.router.add_post(f'{self.ROUTE_PREFIX}/block', self._handle_block)
         app.router.add_get(f'{self.ROUTE_PREFIX}/status', self._handle_status)
@@ -117,6 +120,31 @@ class QueueWorkerHttpServer(AiohttpServerBase):
                 status=submit_rejection_status(rejection))
         return web.json_response({'status': 'ok'}, status=202)
 
+    async def _handle_submit_many(self, request: web.Request) -> web.Response:
+        '''POST {prefix}/batch — enqueue a list of MediaRequests in order.
+
+        Body: {guild_id, priority, media_requests}.  One response covers many
+        requests, so a rejection cannot be a status code as in _handle_submit;
+        results carries one entry per request instead, null once queued or the
+        rejection's name, and the request itself answers 200.
+        '''
+        ctx, body = await self._read_body(request)
+        try:
+            guild_id = int(body['guild_id'])
+            priority = body.get('priority')
+            media_requests = [parse_media_request(item) for item in body['media_requests']]
+        except Exception as exc:
+            raise web.HTTPUnprocessableEntity() from exc
+        with otel_span_wrapper(f'{self.SPAN_PREFIX}.submit_many', context=ctx, kind=SpanKind.SERVER,
+                               attributes={'queue.batch_size': len(media_requests)}) as span:
+            outcomes = await self._worker.submit_many(guild_id, media_requests, priority=priority)
+            rejection = next((outcome for outcome in outcomes if outcome is not None), None)
+            if rejection is not None:
+                span.set_attributes({AttributeNaming.SUBMIT_REJECTION.value: type(rejection).__name__})
+        return web.json_response(
+            {'results': [None if outcome is None else type(outcome).__name__ for outcome in outcomes]},
+            status=200)
+
     async def _handle_clear(self, request: web.Request) -> web.Response:
         '''POST {prefix}/clear — drop pending requests for a guild.
 
@@ -148,7 +176,7 @@ class QueueWorkerHttpServer(AiohttpServerBase):
             dropped = await self._worker.clear_guild_queue(guild_id, preserve_predicate=preserve)
         return web.json_response(
             {
-                'dropped': [mr.model_dump(mode='json') for mr in dropped],
+                'dropped': [compact_dump(mr) for mr in dropped],
                 'preserved_bundle_uuids': sorted(preserved_bundle_uuids),
             },
             status=200,
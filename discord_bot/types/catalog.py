@@ -10,3 +10,13 @@ class CatalogResponse(BaseModel):
     '''Response from 3rd Party Catalog'''
     items: list[CatalogItem] = Field(default_factory=list)
     collection_name: str | None = None
+
+class CatalogPage(BaseModel):
+    '''One page of a paginated 3rd Party Catalog'''
+    items: list[CatalogItem] = Field(default_factory=list)
+    # Only set on the first page
+    collection_name: str | None = None
+    # Total items across all pages, when the API reports it
+    total: int | None = None
+    # Where the next page starts: an offset (Spotify) or a page token (Youtube), None on the last page
+    next_cursor: int | str | None = None
@@ -1,8 +1,12 @@
 import dataclasses
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
+# Discord's limits on one bulk delete: at most this many messages, none older than this.
+BULK_DELETE_MAX_MESSAGES = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
 
 @dataclass
 class FetchChannelHistoryRequest:
@@ -53,6 +57,17 @@ class DeleteRequest:
     type: str = field(default='delete', init=False)
 
 
+@dataclass
+class BulkDeleteRequest:
+    '''Request to delete up to BULK_DELETE_MAX_MESSAGES messages of one channel, all younger than BULK_DELETE_MAX_AGE, in one API call.'''
+
+    guild_id: int
+    channel_id: int
+    message_ids: list[int]
+    span_context: Optional[dict] = None
+    type: str = field(default='bulk_delete', init=False)
+
+
 def to_dict(request):
     '''Serialize a request dataclass to a plain dict (for JSON transport in Phase 2).'''
     return dataclasses.asdict(request)
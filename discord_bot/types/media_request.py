@@ -1,7 +1,7 @@
 from typing import Any, Literal
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_serializer
 
 from discord_bot.cogs.music_helpers.common import MediaRequestLifecycleStage
 from discord_bot.types.search import SearchResult
@@ -89,6 +89,15 @@ class MediaRequest(BaseModel):
         '''Attach state machine after Pydantic initializes all fields.'''
         self._state_machine = MediaRequestStateMachine(self)
 
+    @model_serializer(mode='wrap')
+    def _keep_download_file(self, handler):
+        '''Always write download_file.  It is the AnyMediaRequest discriminator,
+        so a compact dump (exclude_defaults, see utils/wire_format) must not drop
+        it for being at its default.'''
+        data = handler(self)
+        data['download_file'] = self.download_file
+        return data
+
     @property
     def state_machine(self) -> 'MediaRequestStateMachine':
         '''State machine managing lifecycle transitions for this request.'''
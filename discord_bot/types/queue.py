@@ -1,7 +1,7 @@
 from asyncio import Queue as asyncio_queue, QueueFull
 import random
 from time import time
-from typing import Generic, TypeVar
+from typing import Awaitable, Callable, Generic, TypeVar
 
 T = TypeVar('T')
 
@@ -40,6 +40,36 @@ def submit_rejection_status(exception: Exception) -> int | None:
             return status
     return None
 
+# Names a batch submit uses for the same rejections, since a batch answers
+# for many requests at once and cannot carry one status per request.
+SUBMIT_REJECTION_BY_NAME: dict[str, type[Exception]] = {
+    exception.__name__: exception for exception in SUBMIT_REJECTION_STATUS
+}
+
+
+async def submit_in_order(submit: Callable[..., Awaitable[None]], guild_id: int, media_requests: list,
+                          priority: int | None = None) -> list[Exception | None]:
+    '''
+    Submit media_requests one at a time and return one outcome per request:
+    None if it was queued, else the PutsBlocked / QueueFull that refused it.
+
+    The first refusal ends the run and stands as the outcome of every request
+    after it -- a blocked guild or a full queue stays that way for the rest of
+    the batch, which is where the one-at-a-time callers stopped too.
+
+    submit : A submit(guild_id, media_request, priority=...) coroutine
+    '''
+    outcomes: list[Exception | None] = []
+    for media_request in media_requests:
+        try:
+            await submit(guild_id, media_request, priority=priority)
+        except (PutsBlocked, QueueFull) as rejection:
+            outcomes.extend([rejection] * (len(media_requests) - len(outcomes)))
+            break
+        outcomes.append(None)
+    return outcomes
+
+
 class Queue(asyncio_queue[T], Generic[T]):
     '''
     Custom implementation of asyncio Queue
@@ -1,5 +1,6 @@
 # bandit B404: subprocess is required to invoke ffmpeg; no shell, args passed as a list
 import subprocess  # nosec B404
+from enum import Enum
 from pathlib import Path
 
 from opentelemetry.trace.status import StatusCode
@@ -7,42 +8,80 @@ from opentelemetry.trace.status import StatusCode
 from discord_bot.utils.otel import otel_span_wrapper
 from discord_bot.utils.common import get_logger, LoggingConfig
 
+# Bitrate for the Opus cache format; matches discord.py's FFmpegOpusAudio default
+OPUS_BITRATE = '128k'
+
 class AudioProcessingError(Exception):
     '''Raised when audio conversion to PCM fails'''
 
-def get_finished_path(path: Path) -> Path:
+class AudioFormat(Enum):
+    '''
+    Playback-ready formats a download can be converted to and cached as.
+
+    The value doubles as the file suffix, which is how every later stage (S3 key,
+    broker checkout, player) tells the two apart without extra plumbing.
+    '''
+    PCM = 'pcm' # Raw s16le / 48 kHz stereo, encoded to Opus per frame on the bot
+    OPUS = 'opus' # Ogg/Opus, sent to Discord as-is with no encoding on the bot
+
+def audio_format_from_path(path: Path) -> AudioFormat:
+    '''
+    Format of a converted file, from its suffix; anything but .opus is PCM
+
+    path : Path (or S3 key) of converted file
+    '''
+    if Path(path).suffix == f'.{AudioFormat.OPUS.value}':
+        return AudioFormat.OPUS
+    return AudioFormat.PCM
+
+def get_finished_path(path: Path, audio_format: AudioFormat = AudioFormat.PCM) -> Path:
     '''
     Get 'editing path' for editing files
 
     path : Path of original file
+    audio_format : Format the file is converted to
     '''
-    return path.parent / (path.stem + '.pcm')
+    return path.parent / (path.stem + f'.{audio_format.value}')
 
-def get_editing_path(path: Path) -> Path:
+def get_editing_path(path: Path, audio_format: AudioFormat = AudioFormat.PCM) -> Path:
     '''
     Get 'editing path' for editing files
 
     path: Path of original file
+    audio_format : Format the file is converted to
     '''
-    return path.parent / (path.stem + '.edited.pcm')
+    return path.parent / (path.stem + f'.edited.{audio_format.value}')
 
-def edit_audio_file(file_path: Path, normalize_audio: bool, logging_config: LoggingConfig) -> Path:
+def edit_audio_file(file_path: Path, normalize_audio: bool, logging_config: LoggingConfig,
+                    audio_format: AudioFormat = AudioFormat.PCM) -> Path:
     '''
-    Normalize audio for file and convert to PCM.
+    Normalize audio for file and convert to a playback-ready format.
 
     Uses ffmpeg with the loudnorm filter (EBU R128) to normalise loudness,
-    then writes raw s16le stereo PCM at 48 kHz suitable for Discord playback.
+    then writes either raw s16le stereo PCM at 48 kHz or Ogg/Opus in 20ms
+    packets, both suitable for Discord playback.
 
     file_path: Audio file to edit
+    audio_format: Output format, raw PCM by default
     '''
     logger = get_logger('audio_editing', logging_config)
-    finished_path = get_finished_path(file_path)
-    editing_path = get_editing_path(file_path)
+    finished_path = get_finished_path(file_path, audio_format)
+    editing_path = get_editing_path(file_path, audio_format)
     with otel_span_wrapper('audio.edit_file', attributes={'file_path': str(file_path)}) as span:
+        if audio_format == AudioFormat.OPUS:
+            output_args = [
+                '-c:a', 'libopus',
+                '-b:a', OPUS_BITRATE,
+                '-frame_duration', '20',
+                '-map_metadata', '-1',
+                '-f', 'opus',
+            ]
+        else:
+            output_args = ['-f', 's16le']
         ffmpeg_args = [
             'ffmpeg', '-y',
             '-i', str(file_path),
-            '-f', 's16le',
+            *output_args,
             '-ar', '48000',
             '-ac', '2',
             str(editing_path),
@@ -69,7 +108,7 @@ def edit_audio_file(file_path: Path, normalize_audio: bool, logging_config: Logg
         actual_size = editing_path.stat().st_size
         if actual_size == 0:
             raise AudioProcessingError(f'Audio conversion produced empty output for {file_path}')
-        if actual_size % 4 != 0:
+        if audio_format == AudioFormat.PCM and actual_size % 4 != 0:
             raise AudioProcessingError(
                 f'PCM output {editing_path} size {actual_size} is not divisible by 4, file is corrupt'
             )
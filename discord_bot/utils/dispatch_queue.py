@@ -9,6 +9,7 @@ import json
 import time
 
 import redis.asyncio as aioredis
+from redis.exceptions import WatchError
 
 _PREFIX = 'discord_bot:dispatch'
 
@@ -19,6 +20,35 @@ def dispatch_request_id(params: dict) -> str:
     return hashlib.sha256(canonical.encode()).hexdigest()
 
 
+# Payload field holding a mutable update's sequence number (next_mutable_seq).
+MUTABLE_SEQ_FIELD = 'seq'
+
+_last_mutable_seq = 0
+
+
+def next_mutable_seq() -> int:
+    '''
+    Sequence number for a mutable bundle update: microseconds since the epoch,
+    bumped so it strictly increases within this process.
+
+    Wall-clock based so updates for one key from different pods still order
+    by when they were rendered.  Microseconds keep it exact as a double, so
+    it survives a JSON round trip through any decoder.
+    '''
+    global _last_mutable_seq  # pylint: disable=global-statement
+    _last_mutable_seq = max(time.time_ns() // 1000, _last_mutable_seq + 1)
+    return _last_mutable_seq
+
+
+def payload_supersedes(payload: dict, stored: dict) -> bool:
+    '''
+    True when *payload* may replace the pending *stored* payload of the same
+    member: unless both carry a sequence number and *stored*'s is higher.
+    '''
+    seq, stored_seq = payload.get(MUTABLE_SEQ_FIELD), stored.get(MUTABLE_SEQ_FIELD)
+    return seq is None or stored_seq is None or seq >= stored_seq
+
+
 _PAYLOAD_TTL = 86400  # 1 day — fallback expiry for orphaned payloads
 _RESULT_TTL = 86400   # 1 day — fallback expiry for orphaned fetch results
 _LOCK_TTL = 30        # seconds — execution lock for mutable bundle updates
@@ -85,12 +115,43 @@ class RedisDispatchQueue:
           already stale (a newer update can land between ``dequeue`` deleting the
           payload and this re-enqueue). ``SET NX`` only restores the payload when
           none is stored, so a newer update is never clobbered.
+
+        A fresh payload carrying a sequence number (``MUTABLE_SEQ_FIELD``) goes
+        through _enqueue_sequenced instead and never replaces a pending payload
+        with a higher one: two updates arriving out of order leave the later
+        render queued.
         '''
+        if overwrite and payload.get(MUTABLE_SEQ_FIELD) is not None:
+            await self._enqueue_sequenced(member, payload, priority)
+            return
         pipe = self._redis.pipeline()
         pipe.set(self.payload_key(member), json.dumps(payload), ex=_PAYLOAD_TTL, nx=not overwrite)
         pipe.zadd(self._queue_key, {member: self._score(priority)}, nx=True)
         await pipe.execute()
 
+    async def _enqueue_sequenced(self, member: str, payload: dict, priority: int) -> None:
+        '''Write payload unless the pending one supersedes it, then ZADD NX the member, in one MULTI.
+
+        The payload key is WATCHed while the pending payload is read, so an
+        update landing between the read and the EXEC retries the comparison
+        rather than being overwritten by an older render.
+        '''
+        key = self.payload_key(member)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    stored = json.loads(raw) if raw else None
+                    pipe.multi()
+                    if not isinstance(stored, dict) or payload_supersedes(payload, stored):
+                        pipe.set(key, json.dumps(payload), ex=_PAYLOAD_TTL)
+                    pipe.zadd(self._queue_key, {member: self._score(priority)}, nx=True)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
     async def enqueue(self, member: str, payload: dict, priority: int) -> None:
         '''
         Store payload and ZADD — always adds a new entry.
@@ -2,38 +2,131 @@ import base64
 import hashlib
 import logging
 from pathlib import Path
+from threading import Condition, Lock
 
 from boto3 import client
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 logger = logging.getLogger(__name__)
 
+# Objects at or above this size go up as a multipart upload, one part in memory at a time
+MULTIPART_THRESHOLD_BYTES = 64 * 1024 * 1024
+# S3 requires every part but the last to be at least 5 MiB
+MULTIPART_PART_BYTES = 16 * 1024 * 1024
+# Size of each read when hashing, uploading a single-part body, or streaming a download
+TRANSFER_CHUNK_BYTES = 1024 * 1024
+# Worker threads (downloader uploads, player/prefetch staging) share one client, so
+# give its connection pool room for them instead of botocore's default of 10
+MAX_POOL_CONNECTIONS = 32
+# Progressive staging fetches this much before playback starts: five seconds of
+# s16le/48k stereo PCM, and well over that for the much smaller Opus files
+PROGRESSIVE_HEAD_BYTES = 5 * 192000
+# A progressive reader gives up once the download has made no progress for this long
+PROGRESSIVE_STALL_SECONDS = 30.0
+
+_client_lock = Lock()
+_s3_client = None
+
 class ObjectStorageException(Exception):
     '''
     Object Storage exceptions
     '''
 
+def get_client():
+    '''
+    Return the process-wide S3 client, building it on first use.
+
+    Every helper used to call client('s3') per operation, which re-resolves
+    credentials and endpoints and opens a fresh connection pool each time.
+    boto3 clients are thread-safe once built, so one pooled client is shared
+    across the to_thread() callers; only construction needs the lock.
+    '''
+    global _s3_client # pylint: disable=global-statement
+    with _client_lock:
+        if _s3_client is None:
+            _s3_client = client('s3', config=Config(max_pool_connections=MAX_POOL_CONNECTIONS))
+        return _s3_client
+
+def reset_client() -> None:
+    '''
+    Drop the cached client so the next call builds a new one (tests, credential rotation)
+    '''
+    global _s3_client # pylint: disable=global-statement
+    with _client_lock:
+        _s3_client = None
+
+def _file_md5(file_path: Path) -> bytes:
+    '''
+    MD5 digest of a file, read in TRANSFER_CHUNK_BYTES pieces
+    '''
+    # bandit B324: MD5 is mandated by the S3 Content-MD5 protocol header, not used for security
+    md5 = hashlib.md5(usedforsecurity=False)
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(TRANSFER_CHUNK_BYTES):
+            md5.update(chunk)
+    return md5.digest()
+
+def _upload_multipart(s3_client, bucket_name: str, file_path: Path, object_name: str) -> None:
+    '''
+    Upload in MULTIPART_PART_BYTES parts, aborting the upload if any part fails
+    so S3 does not keep billing for orphaned parts
+    '''
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket_name, Key=object_name)['UploadId']
+    parts = []
+    try:
+        with open(file_path, 'rb') as f:
+            while data := f.read(MULTIPART_PART_BYTES):
+                # bandit B324: MD5 is mandated by the S3 Content-MD5 protocol header, not used for security
+                md5_base64 = base64.b64encode(hashlib.md5(data, usedforsecurity=False).digest()).decode('utf-8')
+                response = s3_client.upload_part(
+                    Bucket=bucket_name,
+                    Key=object_name,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=data,
+                    ContentMD5=md5_base64,
+                )
+                parts.append({'PartNumber': len(parts) + 1, 'ETag': response['ETag']})
+        s3_client.complete_multipart_upload(
+            Bucket=bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': parts},
+        )
+    except (BotoCoreError, ClientError):
+        try:
+            s3_client.abort_multipart_upload(Bucket=bucket_name, Key=object_name, UploadId=upload_id)
+        except (BotoCoreError, ClientError) as abort_error:
+            logger.warning('S3 failed to abort multipart upload: key=%s upload_id=%s error=%s',
+                           object_name, upload_id, str(abort_error))
+        raise
+
 def upload_file(bucket_name: str, file_path: Path, object_name: str = None) -> bool:
     '''
     Upload a file to s3 using boto
+
+    The file is never read into memory whole: small files stream from the open
+    handle as a single put_object, large files go up as a multipart upload.
     '''
     file_path = Path(file_path) # Double check its a path
-    s3_client = client('s3')
     object_name = object_name or str(file_path)
     if not file_path.exists() or not file_path.is_file():
         raise ObjectStorageException(f'Invalid file path {str(file_path)}')
 
-    data = file_path.read_bytes()
-    # bandit B324: MD5 is mandated by the S3 Content-MD5 protocol header, not used for security
-    md5_digest = hashlib.md5(data, usedforsecurity=False).digest()
-    md5_base64 = base64.b64encode(md5_digest).decode('utf-8')
+    s3_client = get_client()
     try:
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=object_name,
-            Body=data,
-            ContentMD5=md5_base64,
-        )
+        if file_path.stat().st_size >= MULTIPART_THRESHOLD_BYTES:
+            _upload_multipart(s3_client, bucket_name, file_path, object_name)
+            return True
+        md5_base64 = base64.b64encode(_file_md5(file_path)).decode('utf-8')
+        with open(file_path, 'rb') as f:
+            s3_client.put_object(
+                Bucket=bucket_name,
+                Key=object_name,
+                Body=f,
+                ContentMD5=md5_base64,
+            )
         return True
     except (BotoCoreError, ClientError) as e:
         raise ObjectStorageException('Error uploading file') from e
@@ -41,38 +134,187 @@ def upload_file(bucket_name: str, file_path: Path, object_name: str = None) -> b
 def get_file(bucket_name: str, object_name: str, file_path: Path) -> bool:
     '''
     Download client to path
+
+    The body is streamed to a sibling .part file in TRANSFER_CHUNK_BYTES pieces
+    with the MD5 updated as it goes, then renamed into place, so a failed
+    download never leaves a truncated file at file_path.
     '''
     file_path = Path(file_path) # Double check its a path
-    s3_client = client('s3')
+    s3_client = get_client()
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = file_path.with_name(f'{file_path.name}.part')
+    # bandit B324: comparing against S3 ETag (MD5 is dictated by S3 protocol), not used for security
+    md5 = hashlib.md5(usedforsecurity=False)
     try:
         # Download the object
         response = s3_client.get_object(
             Bucket=bucket_name,
             Key=object_name,
         )
-        # Read the body stream
-        data = response['Body'].read()
-        # bandit B324: comparing against S3 ETag (MD5 is dictated by S3 protocol), not used for security
-        computed_md5 = hashlib.md5(data, usedforsecurity=False).hexdigest()
-        etag = response.get('ETag', '').strip('"')
-        # ETag from multi-part upload has '-N' suffix — skip check if so
-        if etag and '-' not in etag and etag != computed_md5:
-            logger.warning('S3 checksum mismatch: etag=%s computed=%s key=%s', etag, computed_md5, object_name)
+        with open(part_path, 'wb') as f:
+            for chunk in response['Body'].iter_chunks(TRANSFER_CHUNK_BYTES):
+                md5.update(chunk)
+                f.write(chunk)
     except (BotoCoreError, ClientError) as e:
+        part_path.unlink(missing_ok=True)
         raise ObjectStorageException('Error downloading file') from e
 
-    # Write to destination file
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_bytes(data)
+    computed_md5 = md5.hexdigest()
+    etag = response.get('ETag', '').strip('"')
+    # ETag from multi-part upload has '-N' suffix — skip check if so
+    if etag and '-' not in etag and etag != computed_md5:
+        logger.warning('S3 checksum mismatch: etag=%s computed=%s key=%s', etag, computed_md5, object_name)
 
+    part_path.replace(file_path)
     return True
 
+class ProgressiveDownload():
+    '''
+    S3 object staged into file_path while a reader is already playing it.
+
+    get_file() has to land the whole object before the player can open it, which
+    for a long PCM track is several seconds of dead air. fetch_head() range-GETs
+    only the first head_bytes and returns once they are on disk, so playback can
+    start after a single round trip; fetch_remainder() then streams the rest onto
+    the end of the same file from a worker thread. Readers on other threads call
+    wait_for_bytes() before reading past what has landed.
+    '''
+
+    def __init__(self, bucket_name: str, object_name: str, file_path: Path,
+                 head_bytes: int = PROGRESSIVE_HEAD_BYTES, stall_seconds: float = PROGRESSIVE_STALL_SECONDS):
+        self.bucket_name = bucket_name
+        self.object_name = object_name
+        self.file_path = Path(file_path)
+        self.head_bytes = head_bytes
+        self.stall_seconds = stall_seconds
+        self.total_bytes: int | None = None
+        self.bytes_written = 0
+        self.finished = False
+        self.failed = False
+        self._cancelled = False
+        self._condition = Condition()
+        self._etag = ''
+        # bandit B324: comparing against S3 ETag (MD5 is dictated by S3 protocol), not used for security
+        self._md5 = hashlib.md5(usedforsecurity=False)
+
+    def _append(self, f, chunk: bytes) -> None:
+        f.write(chunk)
+        # Flush before publishing the new length so a reader never sees it early
+        f.flush()
+        self._md5.update(chunk)
+        with self._condition:
+            self.bytes_written += len(chunk)
+            self._condition.notify_all()
+
+    def _finish(self, failed: bool = False) -> None:
+        with self._condition:
+            self.finished = True
+            self.failed = failed
+            self._condition.notify_all()
+
+    def fetch_head(self) -> None:
+        '''
+        Range-GET the first head_bytes into file_path; the whole object if it is that small
+        '''
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        s3_client = get_client()
+        try:
+            response = s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self.object_name,
+                Range=f'bytes=0-{self.head_bytes - 1}',
+            )
+        except ClientError as e:
+            # S3 rejects any range on an empty object
+            if e.response.get('Error', {}).get('Code') != 'InvalidRange':
+                raise ObjectStorageException('Error downloading file') from e
+            self.file_path.write_bytes(b'')
+            self.total_bytes = 0
+            self._finish()
+            return
+        except BotoCoreError as e:
+            raise ObjectStorageException('Error downloading file') from e
+
+        self._etag = response.get('ETag', '').strip('"')
+        try:
+            with open(self.file_path, 'wb') as f:
+                for chunk in response['Body'].iter_chunks(TRANSFER_CHUNK_BYTES):
+                    self._append(f, chunk)
+        except (BotoCoreError, ClientError) as e:
+            self.file_path.unlink(missing_ok=True)
+            raise ObjectStorageException('Error downloading file') from e
+        # ContentRange is "bytes 0-N/TOTAL"; without it the server sent the whole object
+        content_range = response.get('ContentRange')
+        self.total_bytes = int(content_range.rsplit('/', 1)[1]) if content_range else self.bytes_written
+        if self.bytes_written >= self.total_bytes:
+            self._finish()
+            self._check_md5()
+
+    def fetch_remainder(self) -> None:
+        '''
+        Stream everything after the head onto the end of file_path.
+
+        Stops early, leaving the download marked failed, if cancel() is called.
+        '''
+        if self.finished:
+            return
+        s3_client = get_client()
+        try:
+            response = s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=self.object_name,
+                Range=f'bytes={self.bytes_written}-',
+            )
+            with open(self.file_path, 'ab') as f:
+                for chunk in response['Body'].iter_chunks(TRANSFER_CHUNK_BYTES):
+                    if self._cancelled:
+                        break
+                    self._append(f, chunk)
+        except (BotoCoreError, ClientError) as e:
+            self._finish(failed=True)
+            raise ObjectStorageException('Error downloading file') from e
+        self._finish(failed=self._cancelled)
+        if not self._cancelled:
+            self._check_md5()
+
+    def _check_md5(self) -> None:
+        computed_md5 = self._md5.hexdigest()
+        # ETag from multi-part upload has '-N' suffix — skip check if so
+        if self._etag and '-' not in self._etag and self._etag != computed_md5:
+            logger.warning('S3 checksum mismatch: etag=%s computed=%s key=%s',
+                           self._etag, computed_md5, self.object_name)
+
+    def cancel(self) -> None:
+        '''
+        Stop fetch_remainder() at its next chunk and release any waiting reader
+        '''
+        self._cancelled = True
+        with self._condition:
+            self._condition.notify_all()
+
+    def wait_for_bytes(self, offset: float) -> bool:
+        '''
+        Block until the file holds *offset* bytes or the download is over.
+
+        Returns False if those bytes will never arrive: the download failed or was
+        cancelled short of them, or it made no progress for stall_seconds.
+        '''
+        with self._condition:
+            while self.bytes_written < offset and not self.finished and not self._cancelled:
+                written = self.bytes_written
+                self._condition.wait(self.stall_seconds)
+                if self.bytes_written == written and not self.finished and not self._cancelled:
+                    logger.warning('S3 progressive download stalled: key=%s bytes=%s/%s',
+                                   self.object_name, self.bytes_written, self.total_bytes)
+                    return False
+            return self.bytes_written >= offset or not (self.failed or self._cancelled)
+
 def list_objects(bucket_name: str, prefix: str) -> list[dict]:
     '''
     List objects in an S3 bucket with the given prefix, sorted by last_modified descending.
     Returns [{'key': ..., 'last_modified': ...}] or [] if no objects found.
     '''
-    s3_client = client('s3')
+    s3_client = get_client()
     results = []
     kwargs = {'Bucket': bucket_name, 'Prefix': prefix}
     try:
@@ -93,7 +335,7 @@ def delete_file(bucket_name: str, object_name: str) -> bool:
     '''
     Delete files in object storage
     '''
-    s3_client = client('s3')
+    s3_client = get_client()
     try:
         s3_client.delete_object(Bucket=bucket_name, Key=object_name)
         return True
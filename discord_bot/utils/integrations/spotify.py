@@ -1,4 +1,5 @@
-from typing import List
+from functools import partial
+from typing import Callable, List
 
 from opentelemetry.trace import SpanKind
 from opentelemetry.trace.status import StatusCode
@@ -7,7 +8,7 @@ from spotipy.cache_handler import MemoryCacheHandler
 from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyClientCredentials
 
-from discord_bot.types.catalog import CatalogResponse, CatalogItem
+from discord_bot.types.catalog import CatalogPage, CatalogResponse, CatalogItem
 from discord_bot.utils.otel import otel_span_wrapper, ThirdPartyNaming
 
 class SpotifyClient():
@@ -39,6 +40,68 @@ class SpotifyClient():
         return items
 
 
+    @staticmethod
+    def __call(span, method, *args, **kwargs) -> dict:
+        '''
+        Call a spotify API method, keeping the span OK on a 404
+
+        A 404 is an unknown or unavailable id, which the caller reports to the user
+        '''
+        try:
+            return method(*args, **kwargs)
+        except SpotifyException as exc:
+            if exc.http_status in [404]:
+                span.set_status(StatusCode.OK)
+            raise exc
+
+    def __build_page(self, resp: dict, offset: int, pagination_limit: int,
+                     collection_name: str | None = None) -> CatalogPage:
+        '''
+        Build a catalog page from a tracks response
+
+        resp : Response from a *_tracks call
+        offset : Offset the page was requested at
+        pagination_limit : Limit the page was requested with
+        collection_name : Name of the playlist or album, for the first page
+        '''
+        next_cursor = offset + pagination_limit if resp.get('next') else None
+        return CatalogPage(items=self.__get_response_items(resp['items']), collection_name=collection_name,
+                           total=resp.get('total'), next_cursor=next_cursor)
+
+    @staticmethod
+    def __collect_pages(fetch_page: Callable[[int], CatalogPage]) -> CatalogResponse:
+        '''
+        Fetch every page in order and merge them
+
+        fetch_page : Returns the page at a given offset
+        '''
+        page = fetch_page(0)
+        collection_name = page.collection_name
+        items = list(page.items)
+        while page.next_cursor is not None:
+            page = fetch_page(page.next_cursor)
+            items += page.items
+        return CatalogResponse(items=items, collection_name=collection_name)
+
+    def playlist_page(self, playlist_id: str, offset: int = 0,
+                      pagination_limit: int = 50) -> CatalogPage:
+        '''
+        Get one page of playlist tracks
+
+        The first page also carries the playlist name and the total track count,
+        which lets the caller fetch the remaining offsets concurrently.
+
+        playlist_id : Playlist id from spotify
+        offset : Offset of the first track in the page
+        pagination_limit : Limit of the API call
+        '''
+        with otel_span_wrapper('spotify.playlist_page', attributes={ThirdPartyNaming.SPOTIFY_PLAYLIST.value: playlist_id}, kind=SpanKind.CLIENT) as span:
+            playlist_name = None
+            if offset == 0:
+                playlist_name = self.__call(span, self.client.playlist, playlist_id)['name']
+            resp = self.__call(span, self.client.playlist_tracks, playlist_id, limit=pagination_limit, offset=offset)
+            return self.__build_page(resp, offset, pagination_limit, collection_name=playlist_name)
+
     def playlist_get(self, playlist_id: str,
                      pagination_limit: int = 50) -> CatalogResponse:
         '''
@@ -48,30 +111,27 @@ class SpotifyClient():
         pagination_limit : Limit of each API call
         '''
         with otel_span_wrapper('spotify.playlist_get', attributes={ThirdPartyNaming.SPOTIFY_PLAYLIST.value: playlist_id}, kind=SpanKind.CLIENT) as span:
-            offset = 0
-            items = []
-            # Get playlist id info
-            try:
-                resp = self.client.playlist(playlist_id)
-            except SpotifyException as exc:
-                if exc.http_status in [404]:
-                    span.set_status(StatusCode.OK)
-                raise exc
-            playlist_name = resp['name']
-            while True:
-                try:
-                    resp = self.client.playlist_tracks(playlist_id, limit=pagination_limit, offset=offset)
-                except SpotifyException as exc:
-                    if exc.http_status in [404]:
-                        span.set_status(StatusCode.OK)
-                    raise exc
-                items += self.__get_response_items(resp['items'])
-                try:
-                    if not resp['next']:
-                        return CatalogResponse(items=items, collection_name=playlist_name)
-                except KeyError:
-                    return CatalogResponse(items=items, collection_name=playlist_name)
-                offset += pagination_limit
+            return self.__call(span, self.__collect_pages,
+                               partial(self.playlist_page, playlist_id, pagination_limit=pagination_limit))
+
+    def album_page(self, album_id: str, offset: int = 0,
+                   pagination_limit: int = 50) -> CatalogPage:
+        '''
+        Get one page of album tracks
+
+        The first page also carries the album name and the total track count.
+
+        album_id : Album id from spotify
+        offset : Offset of the first track in the page
+        pagination_limit : Limit of the API call
+        '''
+        with otel_span_wrapper('spotify.album_page', attributes={ThirdPartyNaming.SPOTIFY_ALBUM.value: album_id}, kind=SpanKind.CLIENT) as span:
+            album_name = None
+            if offset == 0:
+                resp = self.__call(span, self.client.album, album_id)
+                album_name = f'{",".join(i["name"] for i in resp["artists"])} - {resp["name"]}'
+            resp = self.__call(span, self.client.album_tracks, album_id, limit=pagination_limit, offset=offset)
+            return self.__build_page(resp, offset, pagination_limit, collection_name=album_name)
 
     def album_get(self, album_id: str,
                   pagination_limit: int = 50) -> CatalogResponse:
@@ -82,26 +142,8 @@ class SpotifyClient():
         pagination_limit : Limit of each API call
         '''
         with otel_span_wrapper('spotify.album_get', attributes={ThirdPartyNaming.SPOTIFY_ALBUM.value: album_id}, kind=SpanKind.CLIENT) as span:
-            offset = 0
-            items = []
-            try:
-                resp = self.client.album(album_id)
-            except SpotifyException as exc:
-                if exc.http_status in [404]:
-                    span.set_status(StatusCode.OK)
-                raise exc
-            album_name = f'{",".join(i["name"] for i in resp["artists"])} - {resp["name"]}'
-            while True:
-                try:
-                    resp = self.client.album_tracks(album_id, limit=pagination_limit, offset=offset)
-                except SpotifyException as exc:
-                    if exc.http_status in [404]:
-                        span.set_status(StatusCode.OK)
-                    raise exc
-                items += self.__get_response_items(resp['items'])
-                if not resp['next']:
-                    return CatalogResponse(items=items, collection_name=album_name)
-                offset += pagination_limit
+            return self.__call(span, self.__collect_pages,
+                               partial(self.album_page, album_id, pagination_limit=pagination_limit))
 
     def track_get(self, track_id: str) -> CatalogResponse:
         '''
@@ -2,7 +2,7 @@
 from googleapiclient.discovery import build
 from opentelemetry.trace import SpanKind
 
-from discord_bot.types.catalog import CatalogResponse, CatalogItem
+from discord_bot.types.catalog import CatalogPage, CatalogResponse, CatalogItem
 from discord_bot.utils.integrations.common import YOUTUBE_VIDEO_PREFIX
 from discord_bot.utils.otel import otel_span_wrapper, ThirdPartyNaming
 
@@ -14,6 +14,42 @@ class YoutubeClient():
         self.google_api_token = google_api_token
         self.client = build('youtube', 'v3', developerKey=self.google_api_token)
 
+    def playlist_page(self, playlist_id: str, page_token: str | None = None,
+                      pagination_limit: int = 50) -> CatalogPage:
+        '''
+        Youtube Playlist Page Get
+
+        Pages are chained by token, so unlike Spotify they can only be fetched in
+        order. The first page also carries the playlist title.
+
+        playlist_id : ID of youtube playlist
+        page_token : Token of the page to get, None for the first page
+        pagination_limit : Pagination limit for the API call
+        '''
+        with otel_span_wrapper('youtube.playlist_page', attributes={ThirdPartyNaming.YOUTUBE_PLAYLIST.value: playlist_id}, kind=SpanKind.CLIENT):
+            playlist_title = None
+            if page_token is None:
+                playlist_request = self.client.playlists().list( #pylint:disable=no-member
+                    part="snippet",
+                    id=playlist_id
+                )
+                playlist_response = playlist_request.execute()
+                playlist_title = playlist_response["items"][0]["snippet"]["title"]
+
+            data_inputs = {
+                'part': 'snippet',
+                'playlistId': playlist_id,
+                'maxResults': pagination_limit,
+                'pageToken': page_token
+            }
+            req = self.client.playlistItems().list(**data_inputs).execute() #pylint:disable=no-member
+            items = []
+            for item in req['items']:
+                items.append(CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}{item["snippet"]["resourceId"]["videoId"]}', title=item['snippet']['title']))
+            return CatalogPage(items=items, collection_name=playlist_title,
+                               total=req.get('pageInfo', {}).get('totalResults'),
+                               next_cursor=req.get('nextPageToken'))
+
     def playlist_get(self, playlist_id: str, pagination_limit: int = 50) -> CatalogResponse:
         '''
         Youtube Playlist Get
@@ -22,29 +58,10 @@ class YoutubeClient():
         pagination_limit : Pagination limit for each API call
         '''
         with otel_span_wrapper('youtube.playlist_get', attributes={ThirdPartyNaming.YOUTUBE_PLAYLIST.value: playlist_id}, kind=SpanKind.CLIENT):
-            items = []
-            page_token = None
-
-            playlist_request = self.client.playlists().list( #pylint:disable=no-member
-                part="snippet",
-                id=playlist_id
-            )
-            playlist_response = playlist_request.execute()
-            playlist_title = playlist_response["items"][0]["snippet"]["title"]
-
-            while True:
-                data_inputs = {
-                    'part': 'snippet',
-                    'playlistId': playlist_id,
-                    'maxResults': pagination_limit,
-                    'pageToken': page_token 
-                }
-                req = self.client.playlistItems().list(**data_inputs).execute() #pylint:disable=no-member
-                for item in req['items']:
-                    items.append(CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}{item["snippet"]["resourceId"]["videoId"]}', title=item['snippet']['title']))
-                try:
-                    if req['nextPageToken'] is None:
-                        return CatalogResponse(items=items, collection_name=playlist_title)
-                    page_token = req['nextPageToken']
-                except KeyError:
-                    return CatalogResponse(items=items, collection_name=playlist_title)
+            page = self.playlist_page(playlist_id, pagination_limit=pagination_limit)
+            playlist_title = page.collection_name
+            items = list(page.items)
+            while page.next_cursor is not None:
+                page = self.playlist_page(playlist_id, page_token=page.next_cursor, pagination_limit=pagination_limit)
+                items += page.items
+            return CatalogResponse(items=items, collection_name=playlist_title)
@@ -23,6 +23,8 @@ class MetricNaming(Enum):
     CACHE_FILESYSTEM_USED = 'cache_filesystem_used'
     DISPATCHER_QUEUE_DEPTH = 'message_dispatcher_queue_depth'
     DISPATCHER_READY_CHECK = 'dispatcher_ready_check'
+    DISPATCHER_PARKED = 'message_dispatcher.parked'
+    DISPATCHER_MESSAGES_DELETED = 'message_dispatcher.messages_deleted_per_call'
     DISPATCH_RESULT_QUEUE_DEPTH = 'dispatch_result_queue_depth'
     DOWNLOAD_RESULT_QUEUE_DEPTH = 'music.download_result_queue_depth'
     SEARCH_RESULT_QUEUE_DEPTH = 'music.search_result_queue_depth'
@@ -32,11 +34,16 @@ class MetricNaming(Enum):
     SEARCH_QUEUE_DEPTH = 'search_queue_depth'
     SEARCH_YOUTUBE_BACKOFF = 'search_youtube_backoff_seconds'
     SEARCH_FAILURE_COUNT = 'search_failure_count'
+    SEARCH_RESOLUTION_CACHE = 'search.resolution_cache'
     BROKER_ENTRIES = 'broker.entries'
     BROKER_BUNDLES = 'broker.bundles'
     BROKER_RESULT_FETCH = 'broker.result_fetch'
     BROKER_SEARCH_RESULT_FETCH = 'broker.search_result_fetch'
     BROKER_READY_CHECK = 'broker.ready_check'
+    MARKOV_MODEL_CACHE = 'markov.model_cache'
+    MARKOV_MODEL_BUILD = 'markov.model_build_seconds'
+    MARKOV_RETENTION_PRUNED = 'markov.retention_rows_pruned'
+    MARKOV_RETENTION_DURATION = 'markov.retention_prune_seconds'
 
 class AttributeNaming(Enum):
     '''
@@ -141,6 +148,7 @@ class DispatchNaming(Enum):
     '''
     REQUEST_ID = 'dispatch.request_id'
     PROCESS_ID = 'dispatch.process_id'
+    ROUTE = 'dispatch.route'
 
 def command_wrapper(function):
     '''
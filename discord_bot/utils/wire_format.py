@@ -0,0 +1,87 @@
+'''
+Compact encoding for payloads crossing the Redis and HTTP seams.
+
+Every hop used to serialize with ``json.dumps(model.model_dump(mode='json'))``
+and read back with ``json.loads`` followed by a second pydantic validation
+pass, writing out every field including the ones still at their default.  The
+wire stays JSON -- Redis values remain readable from redis-cli and the HTTP
+seam stays plain ``application/json`` -- but:
+
+  * encoding and decoding go through pydantic-core's Rust JSON, already a
+    dependency via pydantic.  orjson was the other candidate, but it rejects
+    integers past 64 bits and span_context carries 128-bit trace ids;
+  * fields still at their default are omitted (``exclude_defaults``), which
+    roughly halves a MediaRequest.  The reader's default then stands in for an
+    omitted field, so changing a model default changes what already-stored
+    payloads mean -- bump WIRE_FORMAT_VERSION alongside such a change;
+  * Redis values carry a leading version byte, so a stored value says which
+    format wrote it.  Version 1's byte is a tab: JSON allows leading
+    whitespace, so a pod still running plain ``json.loads`` reads the new
+    values, and pods sharing a Redis can be rolled one at a time.  A value
+    with no version byte is plain JSON from an older pod and still decodes.
+    A later version can use a control byte below tab (0x01-0x08), which
+    payload() already rejects rather than misreading.
+
+The HTTP seam has no version byte: its bodies are ordinary JSON documents, and
+omitted defaults are filled in by the receiving model like any missing field.
+'''
+from typing import Any
+
+import pydantic_core
+from pydantic import BaseModel
+
+WIRE_FORMAT_VERSION = 1
+# Whitespace to a legacy JSON reader; see the module docstring.
+_VERSION_PREFIX = '\t'
+# JSON text can only open with whitespace (tab is the lowest, 0x09) or a
+# printable character, so anything below tab is a version byte from a newer
+# format.
+_LOWEST_JSON_START = '\t'
+
+
+def compact_dump(model: BaseModel) -> dict:
+    '''JSON-safe dict of model, leaving out fields still at their default.'''
+    return model.model_dump(mode='json', exclude_defaults=True)
+
+
+def to_json_text(data: Any) -> str:
+    '''Compact JSON text for data.  A drop-in for json.dumps where one is
+    expected, e.g. aiohttp's json_serialize / json_response(dumps=...).'''
+    return pydantic_core.to_json(data).decode('utf-8')
+
+
+def from_json_text(text: str | bytes) -> Any:
+    '''Parse JSON text.  A drop-in for json.loads, e.g. aiohttp's json(loads=...).'''
+    return pydantic_core.from_json(text)
+
+
+def encode(value: BaseModel | Any) -> str:
+    '''Versioned compact JSON for a Redis value: a model (defaults omitted) or plain JSON-safe data.'''
+    if isinstance(value, BaseModel):
+        body = value.model_dump_json(exclude_defaults=True)
+    else:
+        body = to_json_text(value)
+    return _VERSION_PREFIX + body
+
+
+def payload(raw: str | bytes) -> str:
+    '''
+    The JSON text inside a Redis value written by encode(), or by plain
+    json.dumps before the version byte existed.
+
+    For model_validate_json / TypeAdapter.validate_json, which parse and
+    validate in one pass.  Raises ValueError for a version this build does not
+    know.
+    '''
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    if raw[:1] == _VERSION_PREFIX:
+        return raw[1:]
+    if raw[:1] and raw[0] < _LOWEST_JSON_START:
+        raise ValueError(f'Unsupported wire format version {ord(raw[0])}')
+    return raw
+
+
+def decode(raw: str | bytes) -> Any:
+    '''Parse a Redis value written by encode() (or legacy plain JSON) back into Python data.'''
+    return pydantic_core.from_json(payload(raw))
@@ -10,7 +10,9 @@ from typing import List
 
 from opentelemetry.trace import SpanKind
 
-from discord_bot.interfaces.broker_protocols import BrokerEntry, CheckoutResult, MediaBrokerBase, Zone
+from discord_bot.interfaces.broker_protocols import (
+    TERMINAL_LIFECYCLE_EVENTS, BrokerEntry, CheckoutResult, MediaBrokerBase, Zone,
+)
 from discord_bot.types.download import LifecycleEvent, DownloadResult, LifecycleStatusUpdate
 from discord_bot.types.media_download import MediaDownload, media_download_attributes
 from discord_bot.types.media_request import MediaRequest
@@ -105,12 +107,14 @@ class AsyncioBroker(MediaBrokerBase):
         # finished, so the message is never cleared.  Syncing here makes the
         # render reflect the lifecycle stage we just applied, alias or not.
         bundle_uuid = entry.request.bundle_uuid
+        terminal_events = 1 if update.event in TERMINAL_LIFECYCLE_EVENTS else 0
         if bundle_uuid:
             async with self._bundle_lock(bundle_uuid):
                 await self._sync_request_into_bundle(entry.request)
-                await self._render_and_dispatch_bundle_locked(bundle_uuid)
+                if self._render_throttle.render_due(bundle_uuid, terminal_events):
+                    await self._render_and_dispatch_bundle_locked(bundle_uuid)
         else:
-            await self._maybe_render_bundle(entry.request)
+            await self._maybe_render_bundle(entry.request, terminal_events)
 
     async def _sync_request_into_bundle(self, media_request: MediaRequest) -> None:
         '''Re-attach the registry's authoritative request into its bundle.
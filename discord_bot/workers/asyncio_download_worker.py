@@ -29,7 +29,8 @@ class AsyncioDownloadWorker(DownloadWorkerBase):
     Owns the input queues and runs the download worker loop (via the inherited
     run()) in the same process as the cog.  The regular and DIRECT queues are
     plain in-memory DistributedQueues; _direct_available wakes backoff_wait when
-    a DIRECT item arrives so it can bypass an active backoff period.
+    a DIRECT item arrives so it can bypass an active backoff period, and
+    _work_ready wakes an idle run() when anything is queued.
     '''
     def __init__(self, *args, queue_max_size: int = 100, **kwargs):
         '''
@@ -42,6 +43,8 @@ class AsyncioDownloadWorker(DownloadWorkerBase):
         self._input_queue: DistributedQueue[MediaRequest] = DistributedQueue(queue_max_size)
         self._direct_input_queue: DistributedQueue[MediaRequest] = DistributedQueue(queue_max_size)
         self._direct_available: asyncio.Event = asyncio.Event()
+        # Notified on every enqueue; an idle run() waits on it instead of polling.
+        self._work_ready: asyncio.Condition = asyncio.Condition()
         # Retries waiting out their hold-off, as (ready_at, guild_id, request).
         # In-process is the whole storage story here: this worker's input queues
         # are memory too, so a restart loses a deferred retry exactly as it loses
@@ -101,6 +104,25 @@ class AsyncioDownloadWorker(DownloadWorkerBase):
             self._direct_available.set()
         else:
             self._input_queue.put_nowait(guild_id, media_request, priority=priority)
+        async with self._work_ready:
+            self._work_ready.notify_all()
+
+    def _has_queued_work(self) -> bool:
+        return bool(self._input_queue.total_size() or self._direct_input_queue.total_size())
+
+    async def _wait_for_work(self, timeout: float) -> None:
+        '''Wait on _work_ready until something is queued, the earliest deferred
+        retry is due, or timeout elapses.'''
+        if self._deferred_retries:
+            now = datetime.now(timezone.utc).timestamp()
+            timeout = min(timeout, min(ready_at for ready_at, _, _ in self._deferred_retries) - now)
+        if timeout <= 0:
+            return
+        async with self._work_ready:
+            try:
+                await asyncio.wait_for(self._work_ready.wait_for(self._has_queued_work), timeout)
+            except asyncio.TimeoutError:
+                pass
 
     async def _enqueue_deferred_request(self, guild_id: int, media_request: MediaRequest,
                                         ready_at: float) -> None:
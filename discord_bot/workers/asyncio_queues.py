@@ -1,15 +1,18 @@
 '''
-In-process asyncio implementations of BundleStore and WorkQueue.
+In-process asyncio implementations of BundleStore, WorkQueue and
+ChannelTailStore.
 
 Used when no Redis is configured (single-process / local-asyncio mode).
 Locking methods are no-ops: single-process deployments have no cross-pod
 contention so acquire_lock always succeeds and release_lock does nothing.
 '''
 import asyncio
+import bisect
 import itertools
 
-from discord_bot.interfaces.dispatch_protocols import BundleStore, WorkQueue
+from discord_bot.interfaces.dispatch_protocols import CHANNEL_TAIL_SIZE, BundleStore, ChannelTailStore, WorkQueue
 from discord_bot.interfaces.result_queue import DownloadResultQueue, SearchResultQueue
+from discord_bot.utils.dispatch_queue import payload_supersedes
 
 
 class AsyncioBundleStore(BundleStore):
@@ -35,6 +38,40 @@ class AsyncioBundleStore(BundleStore):
         return dict(self._store)
 
 
+class AsyncioChannelTailStore(ChannelTailStore):
+    '''
+    In-memory ChannelTailStore: a sorted list of the newest ids per channel.
+
+    Tails never expire; a single process sees every event it is handed.
+    '''
+
+    def __init__(self):
+        self._tails: dict[int, list[int]] = {}
+
+    async def add(self, channel_id: int, message_ids: list[int]) -> None:
+        tail = self._tails.setdefault(channel_id, [])
+        for message_id in message_ids:
+            index = bisect.bisect_left(tail, message_id)
+            if index == len(tail) or tail[index] != message_id:
+                tail.insert(index, message_id)
+        del tail[:-CHANNEL_TAIL_SIZE]
+
+    async def discard(self, channel_id: int, message_ids: list[int]) -> None:
+        tail = self._tails.get(channel_id)
+        if tail is None:
+            return
+        for message_id in message_ids:
+            index = bisect.bisect_left(tail, message_id)
+            if index < len(tail) and tail[index] == message_id:
+                del tail[index]
+
+    async def newest(self, channel_id: int, message_ids: list[int]) -> list[int] | None:
+        tail = self._tails.get(channel_id)
+        if not tail or not set(message_ids).issubset(tail):
+            return None
+        return tail[::-1][:len(message_ids)]
+
+
 class AsyncioWorkQueue(WorkQueue):
     '''
     In-process WorkQueue backed by asyncio.PriorityQueue.
@@ -61,8 +98,10 @@ class AsyncioWorkQueue(WorkQueue):
                              overwrite: bool = True) -> None:
         # Keep the newest payload (overwrite) unless this is a lock-retry re-enqueue
         # carrying a possibly-stale payload (overwrite=False), which must not clobber
-        # a newer update that arrived after the original dequeue.
-        if overwrite or member not in self._payloads:
+        # a newer update that arrived after the original dequeue. A sequenced
+        # payload never replaces one with a higher sequence number.
+        stored = self._payloads.get(member)
+        if stored is None or (overwrite and payload_supersedes(payload, stored)):
             self._payloads[member] = payload
         if member not in self._dedup:
             self._dedup.add(member)
@@ -101,9 +140,9 @@ class _AsyncioResultQueue:
     '''Shared asyncio.Queue backing for the bot-ready result queues.
 
     The download and search result queues are both FIFO asyncio.Queues that
-    differ only in element type, so the put / get_nowait / depth / raw_queue
-    plumbing lives here once and the two concrete queues just pin the ABC and
-    element type.  Used in single-process deployments; ``raw_queue`` exposes the
+    differ only in element type, so the put / get_nowait / get_batch / depth /
+    raw_queue plumbing lives here once and the two concrete queues just pin the
+    ABC and element type.  Used in single-process deployments; ``raw_queue`` exposes the
     underlying asyncio.Queue so the cog's metric callback can read ``qsize()``
     synchronously.
     '''
@@ -127,6 +166,19 @@ class _AsyncioResultQueue:
         except asyncio.QueueEmpty:
             return None
 
+    async def get_batch(self, max_items: int, timeout: float) -> list:
+        '''Wait up to timeout for the first item, then drain up to max_items.'''
+        try:
+            batch = [await asyncio.wait_for(self._queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
     async def depth(self) -> int:
         '''Return the number of items currently waiting in the queue.'''
         return self._queue.qsize()
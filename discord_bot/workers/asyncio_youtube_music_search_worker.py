@@ -7,6 +7,7 @@ the same process as the cog.  All the resolution / 429-backoff logic lives on th
 base; this class only supplies the queue surface.  A future
 RedisYoutubeMusicSearchWorker will supply the same surface backed by Redis for HA.
 '''
+import asyncio
 from typing import Callable
 
 from discord_bot.interfaces.youtube_music_search_protocols import YoutubeMusicSearchWorkerBase
@@ -20,7 +21,8 @@ class AsyncioYoutubeMusicSearchWorker(YoutubeMusicSearchWorkerBase):
 
     Search requests are lightweight, so a single per-guild queue (no DIRECT
     fast-path like the download worker) is enough; the cog sizes it larger than
-    the play queue.
+    the play queue.  _work_ready wakes an idle search loop when a request is
+    queued or answered from the cache.
     '''
     def __init__(self, *args, queue_max_size: int = 100, **kwargs):
         '''
@@ -31,11 +33,30 @@ class AsyncioYoutubeMusicSearchWorker(YoutubeMusicSearchWorkerBase):
         '''
         super().__init__(*args, **kwargs)
         self._input_queue: DistributedQueue[MediaRequest] = DistributedQueue(queue_max_size)
+        self._work_ready: asyncio.Condition = asyncio.Condition()
 
     async def _enqueue(self, guild_id: int, media_request: MediaRequest,
                        priority: int | None = None) -> None:
         '''Append a request to the guild's input queue.'''
         self._input_queue.put_nowait(guild_id, media_request, priority=priority)
+        await self._notify_cached_resolution()
+
+    async def _notify_cached_resolution(self) -> None:
+        async with self._work_ready:
+            self._work_ready.notify_all()
+
+    def _has_work(self) -> bool:
+        return bool(self._cached_resolutions or self._input_queue.total_size())
+
+    async def wait_for_work(self, timeout: float) -> None:
+        '''Wait on _work_ready until something is queued or cached, or timeout elapses.'''
+        if timeout <= 0:
+            return
+        async with self._work_ready:
+            try:
+                await asyncio.wait_for(self._work_ready.wait_for(self._has_work), timeout)
+            except asyncio.TimeoutError:
+                pass
 
     async def get_input_nowait(self) -> MediaRequest:
         '''Pop the next pending request, raising asyncio.QueueEmpty if none.'''
@@ -48,8 +69,9 @@ class AsyncioYoutubeMusicSearchWorker(YoutubeMusicSearchWorkerBase):
     async def clear_guild_queue(self, guild_id: int,
                                 preserve_predicate: Callable[[MediaRequest], bool] | None = None,
                                 ) -> list[MediaRequest]:
-        '''Clear the input queue for a guild, returning the dropped requests.'''
-        return self._input_queue.clear_queue(guild_id, preserve_predicate=preserve_predicate)
+        '''Clear the input queue and cached-resolution lane for a guild, returning the dropped requests.'''
+        dropped = self._drop_cached_resolutions(guild_id, preserve_predicate)
+        return dropped + self._input_queue.clear_queue(guild_id, preserve_predicate=preserve_predicate)
 
     async def queue_size(self, guild_id: int) -> int:
         '''Return the number of pending requests for a guild, or 0 if none.'''
@@ -1,8 +1,8 @@
 '''
 Redis-backed registry for MediaBroker state.
 
-Stores BrokerEntry data as JSON in Redis so that multiple broker pods can
-share the same state. Uses SET NX locks for atomic checkout transitions
+Stores BrokerEntry data as compact JSON in Redis (utils/wire_format) so that
+multiple broker pods can share the same state. Uses SET NX locks for atomic checkout transitions
 and a separate per-bundle lock for bundle read-modify-write serialization.
 
 Key schema:
@@ -10,16 +10,40 @@ Key schema:
     discord_bot:broker:lock:{uuid}         →  ephemeral SET NX checkout lock (10s TTL)
     discord_bot:broker:bundle:{uuid}       →  JSON BundleState (counters, requests, banner)
     discord_bot:broker:bundlelock:{uuid}   →  ephemeral SET NX bundle-mutation lock (10s TTL)
+
+Secondary indexes (SETs of uuids), so guild / URL lookups cost the size of
+their answer rather than a SCAN of every entry:
+    discord_bot:broker:idx:checked_out:{guild_id}  →  entries checked out by the guild
+    discord_bot:broker:idx:url:{sha256}            →  entries whose download has the URL
+    discord_bot:broker:idx:guild_bundles:{guild_id}  →  the guild's bundles
+
+Bundle values lead with a revision stamp (``{"_revision": "...", ...}``), a
+digest of the rest of the value.  read_bundle hands the revision a pod already
+holds to a small script that compares it against the stored value's leading
+bytes, so an unchanged bundle comes back as a one-integer reply instead of the
+whole state; set_bundle skips rewriting a value whose revision this pod last
+read or wrote, refreshing only its TTLs.  A value without the stamp (written
+by an older build) never matches and is always returned in full.
+
+Index membership is moved in the same MULTI as the write that changes it.
+Entry writes WATCH the entry key so the membership they remove is the one the
+replaced value held.  Keys expire on their own TTL without touching the index,
+so readers verify each member against its record and drop the ones that have
+gone; a stale member can make a lookup slower, never wrong.
 '''
 import asyncio
 import contextlib
-import json
+import hashlib
 import logging
 import uuid as uuid_module
 
+from collections import OrderedDict
+
 import redis.asyncio as aioredis
+from redis.exceptions import NoPermissionError, NoScriptError, ResponseError, WatchError
 
 from discord_bot.clients.redis_client import RedisManager
+from discord_bot.utils import wire_format
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +51,9 @@ ENTRY_KEY_PREFIX = 'discord_bot:broker:entry:'
 LOCK_KEY_PREFIX = 'discord_bot:broker:lock:'
 BUNDLE_KEY_PREFIX = 'discord_bot:broker:bundle:'
 BUNDLE_LOCK_KEY_PREFIX = 'discord_bot:broker:bundlelock:'
+CHECKED_OUT_INDEX_PREFIX = 'discord_bot:broker:idx:checked_out:'
+URL_INDEX_PREFIX = 'discord_bot:broker:idx:url:'
+GUILD_BUNDLES_INDEX_PREFIX = 'discord_bot:broker:idx:guild_bundles:'
 ENTRY_TTL_SECONDS = 86400  # 24h — stale cleanup if broker restarts without releasing
 # in_flight entries are transient (a request still downloading). Each lifecycle
 # status update rewrites the entry, refreshing this TTL — so it acts as an
@@ -50,9 +77,95 @@ SESSION_TTL_SECONDS = 86400  # 24h
 BUNDLE_LOCK_TTL_SECONDS = 10
 BUNDLE_LOCK_POLL_INTERVAL_SECONDS = 0.05
 BUNDLE_LOCK_WAIT_SECONDS = 5.0
+# Keys per SCAN step for whole-registry scans; the default of 10 costs a round
+# trip per ten keys.
+SCAN_COUNT = 1000
+# Refreshed on every add, so an index outlives the longest-lived record in it.
+INDEX_TTL_SECONDS = max(ENTRY_TTL_SECONDS, IN_FLIGHT_TTL_SECONDS, BUNDLE_TTL_SECONDS)
+# Leading key of a stored bundle; BundleState ignores it as an unknown field.
+BUNDLE_REVISION_FIELD = '_revision'
+# Bundle revisions remembered per pod, for the unchanged-read and skipped-write
+# checks.  A forgotten revision only costs a full read or write.
+BUNDLE_REVISION_CACHE_SIZE = 1024
+
+# Read a bundle unless it still carries the caller's revision.
+#   KEYS[1]  bundle key
+#   ARGV[1]  the stored value's expected leading bytes, or '' to always read
+# Returns 1 when the value starts with ARGV[1], the value otherwise, nil when absent.
+READ_BUNDLE_UNLESS_REVISION_LUA = '''
+local value = redis.call('GET', KEYS[1])
+if not value then
+  return false
+end
+if ARGV[1] ~= '' and string.sub(value, 1, string.len(ARGV[1])) == ARGV[1] then
+  return 1
+end
+return value
+'''
+READ_BUNDLE_UNLESS_REVISION_SHA = hashlib.sha1(  # nosec B324 - Redis script id
+    READ_BUNDLE_UNLESS_REVISION_LUA.encode('utf-8')).hexdigest()
+
+
+def _decode(raw: str | None) -> dict | None:
+    '''JSON-decode a stored value; None when absent or unparseable.'''
+    if not raw:
+        return None
+    try:
+        return wire_format.decode(raw)
+    except ValueError:
+        return None
+
+
+def _revision_prefix(revision: str) -> str:
+    '''The leading bytes of a bundle value stamped with revision.'''
+    return wire_format.encode({BUNDLE_REVISION_FIELD: revision})[:-1]
+
+
+def _stamp_bundle(data: dict) -> tuple[str, str]:
+    '''(revision, stored value) for a bundle: its encoding with the revision as the first key.'''
+    encoded = wire_format.encode(data)
+    revision = hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).hexdigest()
+    # encoded is the version byte then a JSON object; splice the revision in as
+    # its first member rather than encoding the whole bundle a second time.
+    body = encoded[len(wire_format.encode({})) - 1:]
+    separator = '' if body == '}' else ','
+    return revision, f'{_revision_prefix(revision)}{separator}{body}'
+
+
+def _unstamp_bundle(data: dict | None) -> tuple[str | None, dict | None]:
+    '''(revision, bundle) from a decoded bundle value; revision is None for an unstamped one.'''
+    if data is None:
+        return None, None
+    return data.pop(BUNDLE_REVISION_FIELD, None), data
+
 
+def _url_index_key(webpage_url: str) -> str:
+    # A digest rather than the URL itself keeps an arbitrarily long URL out of the key.
+    digest = hashlib.sha256(webpage_url.encode('utf-8')).hexdigest()
+    return f'{URL_INDEX_PREFIX}{digest}'
 
-class RedisBrokerRegistry:
+
+def _bundle_index_keys(data: dict | None) -> set[str]:
+    '''Index sets a bundle belongs to: its guild's, once it has one.'''
+    if not data or data.get('guild_id') is None:
+        return set()
+    return {f'{GUILD_BUNDLES_INDEX_PREFIX}{data.get("guild_id")}'}
+
+
+def _entry_index_keys(data: dict | None) -> set[str]:
+    '''Index sets an entry belongs to; none for a missing entry.'''
+    if not data:
+        return set()
+    keys = set()
+    if data.get('zone') == 'checked_out' and data.get('checked_out_by') is not None:
+        keys.add(f'{CHECKED_OUT_INDEX_PREFIX}{data.get("checked_out_by")}')
+    webpage_url = (data.get('download') or {}).get('webpage_url')
+    if webpage_url:
+        keys.add(_url_index_key(webpage_url))
+    return keys
+
+
+class RedisBrokerRegistry: #pylint:disable=too-many-public-methods
     '''
     Async CRUD for broker entries stored as JSON in Redis.
 
@@ -63,6 +176,11 @@ class RedisBrokerRegistry:
 
     def __init__(self, manager: RedisManager):
         self._manager = manager
+        # Last revision of each bundle this pod read or wrote, most recent last.
+        self._bundle_revisions: OrderedDict[str, str] = OrderedDict()
+        # Cleared for good the first time Redis refuses the read script;
+        # read_bundle then GETs the value and compares the revision locally.
+        self._read_script_enabled = True
 
     @property
     def _client(self) -> aioredis.Redis:
@@ -71,28 +189,111 @@ class RedisBrokerRegistry:
     async def get_entry(self, uuid: str) -> dict | None:
         '''Return the stored entry dict for uuid, or None if not present.'''
         raw = await self._client.get(f'{ENTRY_KEY_PREFIX}{uuid}')
-        return json.loads(raw) if raw else None
+        return wire_format.decode(raw) if raw else None
+
+    @staticmethod
+    def _entry_ttl(data: dict) -> int:
+        return IN_FLIGHT_TTL_SECONDS if data.get('zone') == 'in_flight' else ENTRY_TTL_SECONDS
 
     async def set_entry(self, uuid: str, data: dict) -> None:
         '''Upsert an entry. in_flight entries get a short TTL (inactivity
         timeout); anything past in_flight (available / checked_out) gets the
         full 24h.'''
-        ttl = IN_FLIGHT_TTL_SECONDS if data.get('zone') == 'in_flight' else ENTRY_TTL_SECONDS
-        await self._client.set(
-            f'{ENTRY_KEY_PREFIX}{uuid}', json.dumps(data), ex=ttl
-        )
+        await self._replace_entries({uuid: data})
 
     async def delete_entry(self, uuid: str) -> None:
         '''Remove an entry from Redis.'''
-        await self._client.delete(f'{ENTRY_KEY_PREFIX}{uuid}')
+        await self._replace_entries({uuid: None})
 
-    async def _scan_prefix(self, prefix: str, label: str) -> list[dict]:
-        '''SCAN every key with prefix and return their JSON-decoded values.
+    async def get_entries(self, uuids: list[str]) -> list[dict | None]:
+        '''MGET several entries in one round trip; None for each uuid not present.'''
+        if not uuids:
+            return []
+        values = await self._client.mget([f'{ENTRY_KEY_PREFIX}{uuid}' for uuid in uuids])
+        return [wire_format.decode(raw) if raw else None for raw in values]
+
+    async def write_entries(self, entries: dict[str, dict], deleted: list[str] | None = None) -> None:
+        '''Upsert entries and delete the deleted uuids in one transaction.
+
+        TTLs and index upkeep follow set_entry / delete_entry.
+        '''
+        writes: dict[str, dict | None] = dict(entries)
+        writes.update({uuid: None for uuid in deleted or []})
+        if writes:
+            await self._replace_entries(writes)
+
+    async def _replace_entries(self, writes: dict[str, dict | None]) -> None:
+        '''Write each entry (None deletes it) and move its index memberships in one MULTI.
+
+        The entry keys are WATCHed while their current values are read, so a
+        concurrent write between the read and the EXEC retries the whole batch
+        rather than leaving a membership the replaced value no longer had.
+        '''
+        keys = [f'{ENTRY_KEY_PREFIX}{uuid}' for uuid in writes]
+        async with self._client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(*keys)
+                    previous = await pipe.mget(keys)
+                    pipe.multi()
+                    for (uuid, data), key, raw in zip(writes.items(), keys, previous):
+                        if data is None:
+                            pipe.delete(key)
+                        else:
+                            pipe.set(key, wire_format.encode(data), ex=self._entry_ttl(data))
+                        self._queue_index_moves(pipe, uuid, _entry_index_keys(_decode(raw)),
+                                                _entry_index_keys(data))
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    @staticmethod
+    def _queue_index_moves(pipe, member: str, old_keys: set[str], new_keys: set[str]) -> None:
+        for index_key in old_keys - new_keys:
+            pipe.srem(index_key, member)
+        for index_key in new_keys:
+            pipe.sadd(index_key, member)
+            pipe.expire(index_key, INDEX_TTL_SECONDS)
+
+    async def _indexed(self, index_key: str, record_prefix: str) -> list[dict]:
+        '''Records whose uuids are in index_key, dropping members whose record is gone.'''
+        members = list(await self._client.smembers(index_key))
+        if not members:
+            return []
+        values = await self._client.mget([f'{record_prefix}{member}' for member in members])
+        found, gone = [], []
+        for member, raw in zip(members, values):
+            data = _decode(raw)
+            if data is None:
+                gone.append(member)
+            else:
+                found.append(data)
+        if gone:
+            await self._client.srem(index_key, *gone)
+        return found
+
+    async def checked_out_entries(self, guild_id: int) -> list[dict]:
+        '''Entries currently checked out by guild_id, from its index.'''
+        return [
+            data for data in await self._indexed(f'{CHECKED_OUT_INDEX_PREFIX}{guild_id}', ENTRY_KEY_PREFIX)
+            if data.get('zone') == 'checked_out' and data.get('checked_out_by') == guild_id
+        ]
+
+    async def entries_for_url(self, webpage_url: str) -> list[dict]:
+        '''Entries whose download came from webpage_url, from its index.'''
+        return [
+            data for data in await self._indexed(_url_index_key(webpage_url), ENTRY_KEY_PREFIX)
+            if (data.get('download') or {}).get('webpage_url') == webpage_url
+        ]
+
+    async def _scan_items(self, prefix: str, label: str) -> list[tuple[str, dict]]:
+        '''SCAN every key with prefix and return (key suffix, JSON-decoded value) pairs.
 
         Skips entries whose JSON is unparseable; the warning identifies which
         kind of record (entry / bundle) so logs are searchable.
         '''
-        keys = [k async for k in self._client.scan_iter(f'{prefix}*')]
+        keys = [k async for k in self._client.scan_iter(f'{prefix}*', count=SCAN_COUNT)]
         if not keys:
             return []
         values = await self._client.mget(*keys)
@@ -100,51 +301,154 @@ class RedisBrokerRegistry:
         for key, raw in zip(keys, values):
             if raw:
                 try:
-                    result.append(json.loads(raw))
-                except json.JSONDecodeError as e:
+                    result.append((key[len(prefix):], wire_format.decode(raw)))
+                except ValueError as e:
                     logger.warning('Skipping corrupt %s %s: %s', label, key, e)
         return result
 
+    async def _scan_prefix(self, prefix: str, label: str) -> list[dict]:
+        '''SCAN every key with prefix and return their JSON-decoded values.'''
+        return [data for _, data in await self._scan_items(prefix, label)]
+
     async def all_entries(self) -> list[dict]:
         '''
         Return all current broker entries.
 
-        Used for eviction scans (can_evict_base, get_checked_out_by). Result
+        A SCAN over every entry, for whole-registry views such as the broker
+        metrics; guild and URL lookups go through the indexes instead. Result
         is a point-in-time snapshot; entries may change between calls.
         '''
         return await self._scan_prefix(ENTRY_KEY_PREFIX, 'broker entry')
 
+    def _remember_revision(self, uuid: str, revision: str | None) -> None:
+        if revision is None:
+            self._bundle_revisions.pop(uuid, None)
+            return
+        self._bundle_revisions[uuid] = revision
+        self._bundle_revisions.move_to_end(uuid)
+        while len(self._bundle_revisions) > BUNDLE_REVISION_CACHE_SIZE:
+            self._bundle_revisions.popitem(last=False)
+
     async def get_bundle(self, uuid: str) -> dict | None:
         '''Return the stored bundle dict for uuid, or None if not present.'''
-        raw = await self._client.get(f'{BUNDLE_KEY_PREFIX}{uuid}')
-        return json.loads(raw) if raw else None
+        _revision, data = await self.read_bundle(uuid)
+        return data
 
-    async def set_bundle(self, uuid: str, data: dict) -> None:
-        '''Upsert a bundle with a 24h TTL.'''
-        await self._client.set(
-            f'{BUNDLE_KEY_PREFIX}{uuid}', json.dumps(data), ex=BUNDLE_TTL_SECONDS
-        )
+    async def _read_bundle_unless(self, key: str, prefix: str) -> str | int | None:
+        '''The read script\'s reply, or a plain GET once Redis has refused the script.'''
+        if self._read_script_enabled:
+            try:
+                try:
+                    return await self._client.evalsha(READ_BUNDLE_UNLESS_REVISION_SHA, 1, key, prefix)
+                except NoScriptError:
+                    return await self._client.eval(READ_BUNDLE_UNLESS_REVISION_LUA, 1, key, prefix)
+            except NoPermissionError as exc:
+                self._disable_read_script(exc)
+            except ResponseError as exc:
+                if not str(exc).lower().startswith('unknown command'):
+                    raise
+                self._disable_read_script(exc)
+        return await self._client.get(key)
+
+    def _disable_read_script(self, exc: Exception) -> None:
+        self._read_script_enabled = False
+        logger.warning('Redis rejected the bundle read script (%s); '
+                       'reading bundles with GET', exc)
+
+    async def read_bundle(self, uuid: str, known_revision: str | None = None) -> tuple[str | None, dict | None]:
+        '''
+        The stored bundle\'s revision and data, skipping the data when it is
+        still at known_revision.
+
+        Returns (known_revision, None) when the stored bundle is unchanged,
+        (None, None) when there is none, and otherwise (revision, data), where
+        revision is None for a value written without a stamp.
+        '''
+        prefix = _revision_prefix(known_revision) if known_revision else ''
+        raw = await self._read_bundle_unless(f'{BUNDLE_KEY_PREFIX}{uuid}', prefix)
+        if raw == 1 or (prefix and isinstance(raw, str) and raw.startswith(prefix)):
+            self._remember_revision(uuid, known_revision)
+            return known_revision, None
+        revision, data = _unstamp_bundle(_decode(raw))
+        self._remember_revision(uuid, revision)
+        return revision, data
+
+    async def set_bundle(self, uuid: str, data: dict) -> str:
+        '''Upsert a bundle with a 24h TTL, adding it to its guild\'s index.
+        Returns the revision written.
+
+        A bundle never changes guild, so there is no old membership to move.
+        When the revision matches the one this pod last read or wrote, the
+        value is already stored and only its TTLs are refreshed.  Callers
+        hold the bundle lock and read before writing, so no other pod can
+        have replaced it in between.
+        '''
+        revision, value = _stamp_bundle(data)
+        key = f'{BUNDLE_KEY_PREFIX}{uuid}'
+        pipe = self._client.pipeline(transaction=True)
+        if self._bundle_revisions.get(uuid) == revision:
+            pipe.expire(key, BUNDLE_TTL_SECONDS)
+            for index_key in _bundle_index_keys(data):
+                pipe.expire(index_key, INDEX_TTL_SECONDS)
+        else:
+            pipe.set(key, value, ex=BUNDLE_TTL_SECONDS)
+            self._queue_index_moves(pipe, uuid, set(), _bundle_index_keys(data))
+        await pipe.execute()
+        self._remember_revision(uuid, revision)
+        return revision
 
     async def delete_bundle(self, uuid: str) -> None:
-        '''Remove a bundle from Redis.'''
-        await self._client.delete(f'{BUNDLE_KEY_PREFIX}{uuid}')
+        '''Remove a bundle from Redis and from its guild\'s index.'''
+        data = await self.get_bundle(uuid)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(f'{BUNDLE_KEY_PREFIX}{uuid}')
+        self._queue_index_moves(pipe, uuid, _bundle_index_keys(data), set())
+        await pipe.execute()
+        self._remember_revision(uuid, None)
+
+    async def bundles_for_guild(self, guild_id: int) -> list[dict]:
+        '''Bundles belonging to guild_id, from its index.'''
+        return [
+            data for _revision, data in map(_unstamp_bundle, await self._indexed(
+                f'{GUILD_BUNDLES_INDEX_PREFIX}{guild_id}', BUNDLE_KEY_PREFIX))
+            if data.get('guild_id') == guild_id
+        ]
 
     async def all_bundles(self) -> list[dict]:
         '''Return every stored bundle dict — point-in-time snapshot.
 
-        Used for guild-scoped lookups (list bundles for a guild on cleanup).
+        A SCAN over every bundle, for whole-registry views such as the broker
+        metrics; bundles_for_guild answers guild-scoped lookups.
         '''
-        return await self._scan_prefix(BUNDLE_KEY_PREFIX, 'bundle')
+        return [data for _revision, data in map(_unstamp_bundle, await self._scan_prefix(BUNDLE_KEY_PREFIX, 'bundle'))]
+
+    async def rebuild_indexes(self) -> int:
+        '''Add every stored entry and bundle to the indexes it belongs in.
+
+        Run at broker startup, so records written by a build from before the
+        indexes are found by the indexed lookups.  Only adds members: a record
+        rewritten while this runs can keep a stale membership, which readers
+        filter out.  Returns the number of records scanned.
+        '''
+        entries = await self._scan_items(ENTRY_KEY_PREFIX, 'broker entry')
+        bundles = await self._scan_items(BUNDLE_KEY_PREFIX, 'bundle')
+        pipe = self._client.pipeline(transaction=False)
+        for uuid, data in entries:
+            self._queue_index_moves(pipe, uuid, set(), _entry_index_keys(data))
+        for uuid, data in bundles:
+            self._queue_index_moves(pipe, uuid, set(), _bundle_index_keys(data))
+        await pipe.execute()
+        return len(entries) + len(bundles)
 
     async def get_session(self, guild_id: int) -> dict | None:
         '''Return the stored player session for guild_id, or None if not present.'''
         raw = await self._client.get(f'{SESSION_KEY_PREFIX}{guild_id}')
-        return json.loads(raw) if raw else None
+        return wire_format.decode(raw) if raw else None
 
     async def set_session(self, guild_id: int, data: dict) -> None:
         '''Upsert a player session with a 24h TTL.'''
         await self._client.set(
-            f'{SESSION_KEY_PREFIX}{guild_id}', json.dumps(data), ex=SESSION_TTL_SECONDS
+            f'{SESSION_KEY_PREFIX}{guild_id}', wire_format.encode(data), ex=SESSION_TTL_SECONDS
         )
 
     async def delete_session(self, guild_id: int) -> None:
@@ -201,9 +505,19 @@ class RedisBrokerRegistry:
         '''
         Atomically transition an AVAILABLE entry to CHECKED_OUT.
 
+        Returns True if the checkout succeeded, False if the entry is absent,
+        not AVAILABLE, or the lock is contested.  See checkout_entry.
+        '''
+        return await self.checkout_entry(uuid, guild_id) is not None
+
+    async def checkout_entry(self, uuid: str, guild_id: int) -> dict | None:
+        '''
+        Atomically transition an AVAILABLE entry to CHECKED_OUT and return it.
+
         Acquires a short-lived SET NX lock, verifies zone == "available",
-        then writes the updated entry. Returns True if the checkout succeeded,
-        False if the entry is absent, not AVAILABLE, or the lock is contested.
+        then writes the updated entry. Returns the checked-out entry, or None
+        if the entry is absent, not AVAILABLE, or the lock is contested — so
+        the caller needs no second read to find the download.
         '''
         lock_key = f'{LOCK_KEY_PREFIX}{uuid}'
         entry_key = f'{ENTRY_KEY_PREFIX}{uuid}'
@@ -211,17 +525,17 @@ class RedisBrokerRegistry:
         acquired = await self._client.set(lock_key, '1', nx=True, ex=LOCK_TTL_SECONDS)
         if not acquired:
             logger.warning('atomic_checkout: could not acquire lock for %s', uuid)
-            return False
+            return None
         try:
             raw = await self._client.get(entry_key)
             if raw is None:
-                return False
-            data = json.loads(raw)
+                return None
+            data = wire_format.decode(raw)
             if data.get('zone') != 'available':
-                return False
+                return None
             data['zone'] = 'checked_out'
             data['checked_out_by'] = guild_id
-            await self._client.set(entry_key, json.dumps(data), ex=ENTRY_TTL_SECONDS)
-            return True
+            await self._replace_entries({uuid: data})
+            return data
         finally:
             await self._client.delete(lock_key)
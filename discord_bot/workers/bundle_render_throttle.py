@@ -0,0 +1,164 @@
+'''
+Per-bundle render throttling for the media broker.
+
+Every register_request, lifecycle push, register_download and release used to
+re-render its bundle on the spot: take the bundle lock, load the state,
+rebuild the table, save it twice and push update_mutable.  A 300-track
+playlist turns that into thousands of full renders in a few seconds, each a
+Discord edit the dispatcher then has to rate-limit.
+
+BundleRenderThrottle bounds that per bundle instead of per event.  The first
+event after a quiet interval renders at once, so a single-track request still
+updates immediately; events inside the interval only mark the bundle dirty,
+and one trailing render picks all of them up when the interval runs out.  A
+render is never skipped, only merged into a later one that loads the latest
+state.
+
+A bundle that is about to finish is not held back: each render records how
+many of its requests were still short of a terminal stage, and once that many
+terminal events have arrived since, the next one renders at once, so the
+final "Completed N/N" summary is not delayed by the interval.
+
+A bundle that sees no event for a whole interval after a render is forgotten,
+so one that stalls short of its terminal stages does not keep its
+bookkeeping for the life of the broker; its next event renders at once, as it
+would have anyway.
+
+The throttle is per process.  Broker pods behind a load balancer each bound
+their own renders of a bundle.
+'''
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Broker default for music.general.bundle_render_interval_seconds.
+BUNDLE_RENDER_INTERVAL_SECONDS_DEFAULT = 1.0
+
+
+@dataclass
+class _RenderSchedule:
+    '''Render bookkeeping for one bundle.'''
+    last_render: float
+    dirty: bool = False
+    flush_task: asyncio.Task | None = None
+    # Requests not yet in a terminal stage at the last render; None until the
+    # bundle has all of its requests.
+    outstanding: int | None = None
+    terminal_events: int = 0
+
+
+class BundleRenderThrottle:
+    '''
+    Decides, per event, whether a bundle renders now or in one trailing render.
+
+    interval_seconds <= 0 renders on every event, the behaviour without a
+    throttle.  flush is awaited with a bundle uuid for each trailing render and
+    must take the bundle lock itself.
+    '''
+
+    def __init__(self, interval_seconds: float, flush: Callable[[str], Awaitable[None]]):
+        self.interval_seconds = interval_seconds
+        self._flush = flush
+        self._schedules: dict[str, _RenderSchedule] = {}
+
+    def render_due(self, bundle_uuid: str, terminal_events: int = 0) -> bool:
+        '''
+        True when the caller should render bundle_uuid now; otherwise the
+        bundle is marked dirty and a trailing render is scheduled.
+
+        terminal_events is how many requests of the bundle this event moved to
+        a terminal stage (COMPLETED / FAILED / DISCARDED).
+        '''
+        if self.interval_seconds <= 0:
+            return True
+        schedule = self._schedules.get(bundle_uuid)
+        if schedule is None:
+            return True
+        schedule.terminal_events += terminal_events
+        now = asyncio.get_running_loop().time()
+        due_at = schedule.last_render + self.interval_seconds
+        finishing = schedule.outstanding is not None and schedule.terminal_events >= schedule.outstanding
+        if now >= due_at or finishing:
+            return True
+        schedule.dirty = True
+        if schedule.flush_task is None:
+            schedule.flush_task = asyncio.create_task(self._flush_later(bundle_uuid, due_at - now))
+        return False
+
+    def rendered(self, bundle_uuid: str, outstanding: int | None) -> None:
+        '''
+        Record a render of bundle_uuid that picked up every event so far.
+
+        outstanding is the number of its requests still short of a terminal
+        stage, or None while requests are still being added.  A bundle with
+        none outstanding is forgotten: a later event renders at once.  Any
+        other bundle is forgotten one interval later unless an event arrives
+        in between.
+        '''
+        if self.interval_seconds <= 0:
+            return
+        if outstanding == 0:
+            self.forget(bundle_uuid)
+            return
+        schedule = self._schedules.get(bundle_uuid)
+        now = asyncio.get_running_loop().time()
+        if schedule is None:
+            schedule = _RenderSchedule(last_render=now, outstanding=outstanding)
+            self._schedules[bundle_uuid] = schedule
+        else:
+            if schedule.flush_task is not None:
+                schedule.flush_task.cancel()
+            schedule.last_render = now
+            schedule.dirty = False
+            schedule.outstanding = outstanding
+            schedule.terminal_events = 0
+        # One task per bundle: it runs the trailing render if events arrive
+        # before the interval is out, and drops the bundle if none do.
+        schedule.flush_task = asyncio.create_task(self._flush_later(bundle_uuid, self.interval_seconds))
+
+    def forget(self, bundle_uuid: str) -> None:
+        '''Drop bundle_uuid's bookkeeping and any trailing render, e.g. once it is deleted.'''
+        schedule = self._schedules.pop(bundle_uuid, None)
+        if schedule is not None and schedule.flush_task is not None:
+            schedule.flush_task.cancel()
+
+    @property
+    def pending(self) -> int:
+        '''Bundles with a trailing render still to run.'''
+        return sum(1 for schedule in self._schedules.values() if schedule.dirty)
+
+    async def _flush_later(self, bundle_uuid: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        schedule = self._schedules.get(bundle_uuid)
+        if schedule is None:
+            return
+        # Cleared before rendering: the render calls rendered(), which may
+        # forget the bundle and must not cancel this task from inside it.
+        schedule.flush_task = None
+        if schedule.dirty:
+            await self._run_flush(bundle_uuid)
+        # A trailing render re-arms this task through rendered().  Without one,
+        # because no event arrived or the render failed, nothing is pending:
+        # drop the bundle so its next event renders at once.
+        if schedule.flush_task is None and self._schedules.get(bundle_uuid) is schedule:
+            del self._schedules[bundle_uuid]
+
+    async def _run_flush(self, bundle_uuid: str) -> None:
+        try:
+            await self._flush(bundle_uuid)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # A failed trailing render must not kill the task silently; the
+            # next event renders the bundle again.
+            logger.error('Trailing render of bundle %s failed: %s', bundle_uuid, exc, exc_info=True)
+
+    async def flush_all(self) -> None:
+        '''Run every pending trailing render now, e.g. before the process exits.'''
+        for bundle_uuid, schedule in list(self._schedules.items()):
+            if schedule.flush_task is not None:
+                schedule.flush_task.cancel()
+                schedule.flush_task = None
+            if schedule.dirty:
+                await self._run_flush(bundle_uuid)
@@ -0,0 +1,262 @@
+'''
+Per-route Discord rate-limit model for the message dispatcher.
+
+discord.py already honours rate limits: a request to an exhausted bucket
+sleeps inside HTTPClient.request until the bucket resets.  In the dispatcher
+that sleep happens inside a worker, so a burst to one channel ties up the
+whole pool while items for other channels wait in the queue behind it.
+
+DiscordRateLimiter keeps its own copy of the buckets the dispatcher spends --
+message send, edit, delete and bulk delete, each per channel -- so a worker can ask before
+it dispatches an item whether the item's bucket has room.  A bucket starts
+from DEFAULT_BUCKET_LIMITS and is corrected from the X-RateLimit-* headers
+of every response, read through an aiohttp TraceConfig handed to the bot's
+HTTP client.  reserve() takes a request from the bucket locally, so workers
+running at the same time do not all spend the one request the last response
+said was left.  A worker dispatches the item inside spending(), which gives
+back whatever the item reserved but sent no request on: an unchanged mutable,
+or a delete whose channel is already gone.
+
+ParkedWork holds items whose bucket is empty without tying up a worker, and
+hands each back through a release callback once its bucket resets.
+
+Both are per process.  Dispatcher pods sharing one bot token each learn the
+shared bucket state from the responses to their own requests.
+'''
+import asyncio
+import contextlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Mapping
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+ROUTE_SEND = 'send'
+ROUTE_EDIT = 'edit'
+ROUTE_DELETE = 'delete'
+ROUTE_BULK_DELETE = 'bulk_delete'
+
+# (limit, window seconds) assumed for a bucket until a response describes it.
+# Discord does not publish these; they are the commonly observed per-channel
+# limits, and the first response's headers replace them.
+DEFAULT_BUCKET_LIMITS = {
+    ROUTE_SEND: (5, 5.0),
+    ROUTE_EDIT: (5, 5.0),
+    ROUTE_DELETE: (5, 1.0),
+    ROUTE_BULK_DELETE: (1, 1.0),
+}
+
+# Prune buckets past their reset once the dict grows beyond this; an expired
+# bucket is a full one, so dropping it only forgets its learned limit.
+_BUCKET_PRUNE_THRESHOLD = 4096
+
+_MESSAGES_PATH = re.compile(r'/channels/(\d+)/messages(?:/(\d+|bulk-delete))?$')
+
+# (route kind, channel id)
+Route = tuple[str, int]
+
+# Routes reserved for the item the current task is dispatching that no
+# response has answered yet; set by DiscordRateLimiter.spending().  The trace
+# callbacks run in the task that sent the request, so they see its list.
+_UNSPENT: ContextVar[list[Route] | None] = ContextVar('discord_rate_limit_unspent', default=None)
+
+
+def route_for_request(method: str, path: str) -> Route | None:
+    '''Return the bucket a Discord REST request spends, or None for routes not modelled.'''
+    match = _MESSAGES_PATH.search(path)
+    if match is None:
+        return None
+    channel_id, message_id = int(match.group(1)), match.group(2)
+    method = method.upper()
+    if message_id is None:
+        return (ROUTE_SEND, channel_id) if method == 'POST' else None
+    if message_id == 'bulk-delete':
+        return (ROUTE_BULK_DELETE, channel_id) if method == 'POST' else None
+    if method == 'PATCH':
+        return (ROUTE_EDIT, channel_id)
+    if method == 'DELETE':
+        return (ROUTE_DELETE, channel_id)
+    return None
+
+
+@dataclass
+class _Bucket:
+    '''Local view of one rate-limit bucket.'''
+    limit: int
+    window: float
+    remaining: int
+    reset_at: float
+    # Requests reserved but not yet answered; the server's remaining count
+    # does not include them.
+    in_flight: int = 0
+
+
+class DiscordRateLimiter:
+    '''
+    Tracks per-route Discord buckets for the dispatcher's workers.
+
+    clock must be monotonic; it is injectable so tests can drive time.
+    '''
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._buckets: dict[Route, _Bucket] = {}
+
+    def _bucket(self, route: Route, now: float) -> _Bucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            if len(self._buckets) >= _BUCKET_PRUNE_THRESHOLD:
+                self._buckets = {key: value for key, value in self._buckets.items() if value.reset_at > now}
+            limit, window = DEFAULT_BUCKET_LIMITS[route[0]]
+            bucket = self._buckets[route] = _Bucket(limit=limit, window=window, remaining=limit,
+                                                    reset_at=now + window)
+        elif now >= bucket.reset_at:
+            bucket.remaining = bucket.limit
+            bucket.reset_at = now + bucket.window
+            bucket.in_flight = 0
+        return bucket
+
+    def reserve(self, routes: list[Route]) -> float:
+        '''
+        Take one request from each bucket in routes and return 0.
+
+        When any of them is empty nothing is taken, and the return value is
+        the seconds until the last empty one resets.
+        '''
+        now = self._clock()
+        buckets = [self._bucket(route, now) for route in routes]
+        delay = max((bucket.reset_at - now for bucket in buckets if bucket.remaining <= 0), default=0.0)
+        if delay > 0:
+            return delay
+        for bucket in buckets:
+            bucket.remaining -= 1
+            bucket.in_flight += 1
+        return 0.0
+
+    def release(self, routes: list[Route]) -> None:
+        '''Give back one reserved request to each bucket in routes, for an item that never sent it.'''
+        now = self._clock()
+        for route in routes:
+            bucket = self._bucket(route, now)
+            # A reset since the reserve already cleared it.
+            if bucket.in_flight > 0:
+                bucket.in_flight -= 1
+                bucket.remaining = min(bucket.remaining + 1, bucket.limit)
+
+    @contextlib.contextmanager
+    def spending(self, routes: list[Route]) -> Iterator[None]:
+        '''
+        Scope the dispatch of an item that reserve() took routes for.
+
+        The first response on each route answers its reservation; further
+        requests on that route are not counted against other workers'.  Routes
+        no request was sent on are released on exit.
+        '''
+        unspent = list(routes)
+        token = _UNSPENT.set(unspent)
+        try:
+            yield
+        finally:
+            _UNSPENT.reset(token)
+            self.release(unspent)
+
+    def observe(self, method: str, path: str, status: int, headers: Mapping[str, str]) -> None:
+        '''Update the bucket a finished request spent from its response status and headers.'''
+        route = route_for_request(method, path)
+        if route is None:
+            return
+        now = self._clock()
+        bucket = self._bucket(route, now)
+        unspent = _UNSPENT.get()
+        if unspent is None:
+            bucket.in_flight = max(bucket.in_flight - 1, 0)
+        elif route in unspent:
+            unspent.remove(route)
+            bucket.in_flight = max(bucket.in_flight - 1, 0)
+        try:
+            if status == 429:
+                retry_after = headers.get('Retry-After') or headers.get('X-RateLimit-Reset-After')
+                bucket.remaining = 0
+                bucket.reset_at = now + (float(retry_after) if retry_after else bucket.window)
+                return
+            if 'X-RateLimit-Limit' in headers:
+                bucket.limit = int(headers['X-RateLimit-Limit'])
+            if 'X-RateLimit-Reset-After' in headers:
+                reset_after = float(headers['X-RateLimit-Reset-After'])
+                bucket.reset_at = now + reset_after
+                # The first request of a window reports the whole window.
+                if int(headers.get('X-RateLimit-Remaining', -1)) == bucket.limit - 1:
+                    bucket.window = reset_after
+            if 'X-RateLimit-Remaining' in headers:
+                bucket.remaining = max(int(headers['X-RateLimit-Remaining']) - bucket.in_flight, 0)
+        except ValueError as exc:
+            logger.debug('Ignoring unparseable rate-limit headers for %s %s: %s', method, path, exc)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        '''An aiohttp TraceConfig that feeds every response to observe(); pass it as the Bot's http_trace.'''
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_end(_session, _context, params: aiohttp.TraceRequestEndParams):
+            self.observe(params.method, params.url.path, params.response.status, params.response.headers)
+
+        trace_config.on_request_end.append(on_request_end)
+        return trace_config
+
+
+@dataclass
+class _Parked:
+    payload: dict
+    release_task: asyncio.Task
+
+
+class ParkedWork:
+    '''
+    Work items held back until their rate-limit bucket resets.
+
+    Items are keyed by queue member.  Parking a member that is already parked
+    replaces its payload, so the newest content wins, and keeps its release
+    time.  release is awaited with (member, payload) for each item whose
+    delay has run out and must put it back on the work queue.
+    '''
+
+    def __init__(self, release: Callable[[str, dict], Awaitable[None]]):
+        self._release = release
+        self._parked: dict[str, _Parked] = {}
+
+    def park(self, member: str, payload: dict, delay: float) -> None:
+        '''Hold member for delay seconds, then release it.'''
+        parked = self._parked.get(member)
+        if parked is not None:
+            parked.payload = payload
+            return
+        self._parked[member] = _Parked(payload=payload,
+                                       release_task=asyncio.create_task(self._release_later(member, delay)))
+
+    @property
+    def pending(self) -> int:
+        '''Items currently parked.'''
+        return len(self._parked)
+
+    async def _release_later(self, member: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        parked = self._parked.pop(member, None)
+        if parked is not None:
+            await self._run_release(member, parked.payload)
+
+    async def _run_release(self, member: str, payload: dict) -> None:
+        try:
+            await self._release(member, payload)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.error('Releasing parked work item %s failed: %s', member, exc, exc_info=True)
+
+    async def release_all(self) -> None:
+        '''Release every parked item now, e.g. before the process exits.'''
+        parked_items, self._parked = self._parked, {}
+        for member, parked in parked_items.items():
+            parked.release_task.cancel()
+            await self._run_release(member, parked.payload)
@@ -12,10 +12,13 @@ in Redis, so we split the class into two halves:
 * BundleRenderer — wraps a BundleState with a transient DapperTable.  Methods
   match the old MultiMediaRequestBundle so the cog migration is mechanical.
   The table is rebuilt from BundleState on construction so a renderer can be
-  reanimated from a stored state without losing row positions.
+  reanimated from a stored state without losing row positions.  A renderer
+  kept alive across renders (see ``renders``) only edits the rows whose
+  lifecycle stage changed and only re-formats the pages holding them.
 
 The on-the-wire shape is BundleState; the renderer is purely process-local.
 '''
+from bisect import bisect_right
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 from uuid import uuid4
@@ -97,6 +100,11 @@ class BundleState(BaseModel):
     # duplicate summary instead of editing the existing one — this guards it to
     # a single dispatch.
     summary_dispatched: bool = False
+    # Row text the page layout was fixed from at all_requests_added.  Rows
+    # keep their page after that, even once they blank out, so a renderer
+    # rebuilt from this state paginates from these rows, not its current ones,
+    # and lands on the same pages as the renderer that fixed them.
+    layout_rows: Optional[List[str]] = None
 
     def sync_request(self, media_request: AnyMediaRequest) -> bool:
         '''Replace the stored copy of a bundled request (matched by uuid) with
@@ -182,7 +190,16 @@ class BundleRenderer:
             pagination_options=PaginationLength(state.pagination_length)
         )
         self._row_collections: list = []
+        # Text of every table row, so an edit that leaves a row unchanged is a
+        # no-op, and the table index each page of _row_collections starts at.
+        self._row_text: List[str] = []
+        self._page_starts: List[int] = []
+        # Formatted page strings from the last print(), and the pages edited
+        # since.  None means the whole table has to be formatted again.
+        self._pages: Optional[List[str]] = None
+        self._dirty_pages: set = set()
         self._rebuild_table()
+        self._layout = self._layout_key()
 
     @classmethod
     def new(cls, guild_id: int, channel_id: int,
@@ -208,28 +225,86 @@ class BundleRenderer:
         s = self.state
         finished = self._is_finished()
         if s.has_search_banner:
-            self._table.add_row(_search_banner_text(s, finished))
+            self._add_row(_search_banner_text(s, finished))
         elif s.input_string is not None:
             if s.all_requests_enqueued:
-                self._table.add_row('')
+                self._add_row('')
             else:
-                self._table.add_row(
+                self._add_row(
                     f'Processing search: "{discord_format_string_embed(s.input_string)}"'
                 )
         for req_state in s.bundled_requests:
             if req_state.table_index is None:
                 continue
             text = _request_row_text(req_state)
-            self._table.add_row(text)
+            self._add_row(text)
         if s.all_requests_enqueued:
-            self._row_collections = self._table.get_pages()
-            # Pagination depends on row text length, so the page layout
-            # changes as rows are blanked when items reach terminal stages.
-            # Without recomputing here, stored row_collection_index values
-            # carried over from a previous render can point past the now-
-            # smaller _row_collections — _edit_row_data crashes with
-            # IndexError on the next status push.
-            self._refresh_request_positions()
+            # Lay the pages out from state.layout_rows, as the renderer that
+            # called all_requests_added did, so the rebuilt renderer shows the
+            # same pages with the current row text on them.
+            self._paginate()
+
+    def _layout_key(self) -> tuple:
+        '''The parts of the state that decide which rows the table holds.'''
+        s = self.state
+        return (len(s.bundled_requests), s.has_search_banner, s.input_string,
+                s.all_requests_enqueued, s.is_shutdown, s.pagination_length)
+
+    def renders(self, state: BundleState) -> bool:
+        '''True when this renderer can render ``state`` without a rebuild.
+
+        That holds while ``state`` is the very object this renderer wraps and
+        nothing has added rows to it behind the renderer's back (another
+        renderer's add_media_request / all_requests_added).  Lifecycle changes
+        are fine: update_request_status picks them up row by row.  A state
+        reloaded from storage is a new object and needs a new renderer.
+        '''
+        return state is self.state and self._layout == self._layout_key()
+
+    def _add_row(self, text: str) -> int:
+        '''Append a table row and return its table index.'''
+        self._table.add_row(text)
+        self._row_text.append(text)
+        self._pages = None
+        return len(self._row_text) - 1
+
+    def _paginate(self) -> None:
+        '''Fix the page layout and map every bundled request onto it.
+
+        Pages are cut from state.layout_rows, recorded from the current rows
+        the first time (or when a state saved without them no longer matches
+        the table), then every row that has changed since is edited onto them.
+        '''
+        s = self.state
+        if s.layout_rows is None or len(s.layout_rows) != len(self._row_text):
+            s.layout_rows = list(self._row_text)
+        layout_table = DapperTable(pagination_options=PaginationLength(s.pagination_length))
+        for text in s.layout_rows:
+            layout_table.add_row(text)
+        self._row_collections = layout_table.get_pages()
+        self._page_starts = []
+        start = 0
+        for row_collection in self._row_collections:
+            self._page_starts.append(start)
+            start += len(row_collection)
+        for table_index, (text, layout_text) in enumerate(zip(self._row_text, s.layout_rows)):
+            position = self._row_position(table_index) if text != layout_text else None
+            if position is not None:
+                self._row_collections[position[0]][position[1]].edit(text)
+        self._pages = None
+        self._dirty_pages.clear()
+        self._refresh_request_positions()
+
+    def _row_position(self, table_index: int) -> Optional[Tuple[int, int]]:
+        '''(page, row within page) of a table row, or None when the row is
+        past the paginated layout.'''
+        collection_idx = bisect_right(self._page_starts, table_index) - 1
+        if collection_idx < 0:
+            return None
+        row_idx = table_index - self._page_starts[collection_idx]
+        if row_idx >= len(self._row_collections[collection_idx]):
+            return None
+        return collection_idx, row_idx
 
     def _is_finished(self) -> bool:
         '''True when nothing more will progress this bundle.'''
@@ -250,6 +325,14 @@ class BundleRenderer:
         '''Public read-only view of bundle completion (matches old API).'''
         return self._is_finished()
 
+    @property
+    def outstanding(self) -> int:
+        '''Bundled requests not yet in a terminal stage.'''
+        return sum(
+            1 for req in self.state.bundled_requests
+            if req.media_request.lifecycle_stage not in _TERMINAL_STAGES
+        )
+
     @property
     def finished_successfully(self) -> bool:
         '''All non-discarded requests reached COMPLETED.'''
@@ -261,13 +344,15 @@ class BundleRenderer:
     def shutdown(self) -> None:
         '''Mark bundle inert — print() will return [] until removed.'''
         self.state.is_shutdown = True
+        self._layout = self._layout_key()
 
     def set_initial_search(self, input_string: str) -> None:
         '''Add the "Processing search" placeholder row (single-track flow).'''
         self.state.input_string = shorten_string(input_string.replace(' shuffle', ''), 256)
-        self._table.add_row(
+        self._add_row(
             f'Processing search: "{discord_format_string_embed(self.state.input_string)}"'
         )
+        self._layout = self._layout_key()
 
     def set_multi_input_request(self, input_string: str) -> None:
         '''Mark this bundle as a multi-track search; sets has_search_banner.'''
@@ -277,7 +362,8 @@ class BundleRenderer:
             discord_format_string_embed(self.state.input_string)
             if self.state.input_string else self.state.input_string
         )
-        self._table.add_row(f'Processing "{multi_input}"')
+        self._add_row(f'Processing "{multi_input}"')
+        self._layout = self._layout_key()
 
     def _increment_counter_for_stage(self, stage: MediaRequestLifecycleStage,
                                      rejected: bool = False) -> None:
@@ -305,7 +391,7 @@ class BundleRenderer:
         elif media_request.lifecycle_stage in (
             MediaRequestLifecycleStage.QUEUED, MediaRequestLifecycleStage.SEARCHING
         ):
-            table_index = self._table.add_row(
+            table_index = self._add_row(
                 f'Media request queued for download: "{media_request.display_name}"'
             )
         elif media_request.lifecycle_stage == MediaRequestLifecycleStage.COMPLETED:
@@ -317,6 +403,7 @@ class BundleRenderer:
         ))
         s.total += 1
         media_request.bundle_uuid = s.uuid
+        self._layout = self._layout_key()
 
     def all_requests_added(self) -> None:
         '''Lock pagination and finalise the table layout.
@@ -334,33 +421,26 @@ class BundleRenderer:
         # input_string is set.  Empty bundles created with no input_string never
         # seed row 0 in the first place.
         if not s.has_search_banner and s.input_string is not None:
-            self._table.edit_row(0, '')
+            self._edit_row(0, '')
 
-        self._row_collections = self._table.get_pages()
-        self._refresh_request_positions()
+        self._paginate()
 
         if s.has_search_banner:
             self._edit_search_banner(_search_banner_text(s, self._is_finished()))
+        self._layout = self._layout_key()
 
     def _refresh_request_positions(self) -> None:
         '''Recompute (row_collection_index, row_index_in_collection) for each
         bundled request based on the current _row_collections.
 
-        Pagination is not stable across renders — when items reach terminal
-        stages their rows blank out and the same content fits in fewer pages.
-        Stale stored positions then index past the end of _row_collections
-        and _edit_row_data crashes.  Re-derive from the current layout.'''
-        s = self.state
-        table_index_to_position: dict[int, tuple[int, int]] = {}
-        current_table_index = 0
-        for collection_idx, row_collection in enumerate(self._row_collections):
-            for row_idx in range(len(row_collection)):
-                table_index_to_position[current_table_index] = (collection_idx, row_idx)
-                current_table_index += 1
-        for req_state in s.bundled_requests:
+        Stored positions can come from a state saved before layout_rows was
+        recorded, whose pages were cut from different row text; they would
+        index past the end of _row_collections and _edit_row_data would crash.
+        Re-derive from the current layout.'''
+        for req_state in self.state.bundled_requests:
             if req_state.table_index is None:
                 continue
-            position = table_index_to_position.get(req_state.table_index)
+            position = self._row_position(req_state.table_index)
             if position is not None:
                 req_state.row_collection_index = position[0]
                 req_state.row_index_in_collection = position[1]
@@ -368,39 +448,45 @@ class BundleRenderer:
                 req_state.row_collection_index = None
                 req_state.row_index_in_collection = None
 
+    def _edit_row(self, table_index: int, message: str) -> None:
+        '''Edit a row in both the live table and its page, marking that page
+        for re-formatting.
+
+        A row whose text is unchanged is left alone, so its page is not
+        re-formatted.  A table_index past the table (a stale saved state) or
+        past the paginated layout only edits what exists: the page edit is
+        skipped when the row doesn't fit the current layout.
+        '''
+        if table_index >= len(self._row_text) or self._row_text[table_index] == message:
+            return
+        self._row_text[table_index] = message
+        self._table.edit_row(table_index, message)
+        if not self._row_collections:
+            self._pages = None
+            return
+        position = self._row_position(table_index)
+        if position is None:
+            return
+        collection_idx, row_idx = position
+        self._row_collections[collection_idx][row_idx].edit(message)
+        self._dirty_pages.add(collection_idx)
+
     def _edit_row_data(self, req_state: BundledRequestState, message: str) -> bool:
         '''Edit a request's row in both the live table and any cached pages.
 
         Returns False when the request has no table_index (DISCARDED on arrival,
         etc.) so callers know the edit was a no-op.
-
-        Out-of-bounds position checks guard against the case where the bundle
-        was rebuilt from a saved state whose pagination collapsed (rows blanked
-        as items finished → fewer pages now).  Editing the live table is
-        always safe (it's keyed by table_index); only the cached page edit
-        is skipped when stale positions don't fit the new layout.
         '''
         if req_state.table_index is None:
             return False
-        self._table.edit_row(req_state.table_index, message)
-        if (self._row_collections
-                and req_state.row_collection_index is not None
-                and req_state.row_index_in_collection is not None
-                and req_state.row_collection_index < len(self._row_collections)
-                and req_state.row_index_in_collection
-                < len(self._row_collections[req_state.row_collection_index])):
-            self._row_collections[req_state.row_collection_index][
-                req_state.row_index_in_collection
-            ].edit(message)
+        self._edit_row(req_state.table_index, message)
         return True
 
     def _edit_search_banner(self, message: str) -> None:
         '''Update the row-0 banner — only meaningful when has_search_banner.'''
         if not self.state.has_search_banner:
             return
-        self._table.edit_row(0, message)
-        if self._row_collections and self._row_collections[0]:
-            self._row_collections[0][0].edit(message)
+        self._edit_row(0, message)
 
     def _check_finished(self) -> bool:
         '''Refresh the search-banner counters and (if ended) record finished_at.'''
@@ -450,14 +536,26 @@ class BundleRenderer:
         return True
 
     def print(self) -> List[str]:
-        '''Render to a list of Discord-ready message strings.'''
+        '''Render to a list of Discord-ready message strings.
+
+        Only the pages edited since the last print() are formatted again; the
+        rest are reused as they were.
+        '''
         if self.state.is_shutdown:
             return []
         self.update_request_status()
         if not self._row_collections:
-            return self._table.render()
-        result_strings = [self._table.format_page(rc) for rc in self._row_collections]
-        return [s for s in result_strings if s != '']
+            if self._pages is None:
+                self._pages = self._table.render()
+            return list(self._pages)
+        if self._pages is None:
+            self._pages = [self._table.format_page(rc) for rc in self._row_collections]
+        else:
+            for collection_idx in self._dirty_pages:
+                self._pages[collection_idx] = self._table.format_page(
+                    self._row_collections[collection_idx])
+        self._dirty_pages.clear()
+        return [s for s in self._pages if s != '']
 
     def get_failure_summary(self) -> Optional[List[str]]:
         '''Return error-summary messages for unsent terminal reasons, or None.
@@ -1,29 +1,33 @@
 import asyncio
 import contextlib
 import logging
+from collections import Counter
 from dataclasses import asdict, dataclass
 from enum import IntEnum
 from functools import cached_property, partial
 from typing import Callable, List
 import uuid
 
-from discord import Message
-from discord.errors import NotFound
+from discord import Message, Object
+from discord.errors import HTTPException, NotFound
 from discord.ext.commands import Bot
 
 from opentelemetry import trace
 
 from discord_bot.clients.dispatch_client_base import DispatchClientBase, DispatchRemoteError
 from discord_bot.exceptions import CogMissingRequiredArg
-from discord_bot.interfaces.dispatch_protocols import BundleStore, WorkQueue
+from discord_bot.interfaces.dispatch_protocols import BundleStore, ChannelTailStore, WorkQueue
 from discord_bot.types.fetched_message import FetchedMessage
-from discord_bot.types.dispatch_request import DeleteRequest, SendRequest
+from discord_bot.types.dispatch_request import BulkDeleteRequest, DeleteRequest, SendRequest
 from discord_bot.types.dispatch_result import encode_error
 from discord_bot.utils.discord_retry import async_retry_discord_message_command
+from discord_bot.utils.dispatch_queue import MUTABLE_SEQ_FIELD, next_mutable_seq
 from discord_bot.utils.loop_health import LOOP_HEALTH
 from discord_bot.utils.otel import (async_otel_span_wrapper, create_observable_gauge,
                                      DispatchNaming, loop_heartbeat_observations, METER_PROVIDER, MetricNaming,
                                      span_links_from_context)
+from discord_bot.workers.discord_rate_limits import (DiscordRateLimiter, ParkedWork, Route,
+                                                     ROUTE_BULK_DELETE, ROUTE_DELETE, ROUTE_EDIT, ROUTE_SEND)
 
 
 _DRAIN_TIMEOUT_SECONDS = 30
@@ -64,9 +68,27 @@ _MEMBER_MUTABLE = 'mutable:'
 _MEMBER_REMOVE = 'remove:'
 _MEMBER_SEND = 'send:'
 _MEMBER_DELETE = 'delete:'
+_MEMBER_BULK_DELETE = 'bulk_delete:'
 _MEMBER_UPDATE_CHANNEL = 'update_channel:'
 _MEMBER_FETCH_HISTORY = 'fetch_history:'
 _MEMBER_FETCH_EMOJIS = 'fetch_emojis:'
+_MEMBER_CHANNEL_EVENT = 'channel_event:'
+
+# Items parked by route, counted when a worker hands an item to ParkedWork
+# instead of dispatching it into an empty rate-limit bucket.
+DISPATCHER_PARKED_COUNTER = METER_PROVIDER.create_counter(
+    name=MetricNaming.DISPATCHER_PARKED.value,
+    description='Dispatcher work items parked until their Discord rate-limit bucket resets',
+    unit='1',
+)
+
+# Messages removed by each Discord delete call, by route: 1 for every single
+# delete, up to 100 for a bulk delete.
+DISPATCHER_MESSAGES_DELETED_HISTOGRAM = METER_PROVIDER.create_histogram(
+    name=MetricNaming.DISPATCHER_MESSAGES_DELETED.value,
+    description='Messages deleted per Discord API call',
+    unit='1',
+)
 
 
 class DispatchPriority(IntEnum):
@@ -117,6 +139,82 @@ class MessageContext:
         return True
 
 
+def _align_message_contents(existing: List[tuple], new: List[tuple]) -> List[int | None]:
+    '''
+    Decide which existing messages to keep for new content, minimising the
+    Discord operations needed.
+
+    existing and new are hashable message keys (content, delete_after).  A
+    kept message keeps its place in the channel, so the kept messages show a
+    prefix of new in order; every other existing message is deleted and the
+    rest of new is sent after them.  Each delete, send and edit (a kept
+    message whose key differs) costs one operation.
+
+    Returns, per existing message, the index in new it is kept as, or None to
+    delete it.
+
+    Keys are interned to ints through a dict, so each comparison is one int
+    compare.  A common prefix is kept outright.  A common suffix is not: once
+    it is kept, every new entry before it must be kept too, which can force
+    edits where a delete and a trailing send cost less.  The rest is aligned
+    by dynamic programming over diagonals, one per number of deletions,
+    stopping once no further diagonal can beat the best plan found.  That is O((m + n) * D) for D
+    deletions explored, close to linear when the contents mostly line up.
+    On a tie, the plan with fewer deletions wins, so messages are edited in
+    place rather than deleted and re-sent.
+    '''
+    ids: dict = {}
+    old = [ids.setdefault(key, len(ids)) for key in existing]
+    fresh = [ids.setdefault(key, len(ids)) for key in new]
+    m, n = len(old), len(fresh)
+    kept: List[int | None] = [None] * m
+
+    prefix = 0
+    while prefix < min(m, n) and old[prefix] == fresh[prefix]:
+        kept[prefix] = prefix
+        prefix += 1
+    old_mid = old[prefix:]
+    new_mid = fresh[prefix:]
+    a, b = len(old_mid), len(new_mid)
+    if not a or not b:
+        return kept
+    # Matches any plan could reach, for the bound that ends the search.
+    reachable = sum((Counter(old_mid) & Counter(new_mid)).values())
+
+    # rows[o][j]: most matches keeping old_mid entries as new_mid[:j] after o
+    # deletions among them (new_mid[j - 1] sits on old_mid[j - 1 + o]).
+    rows: List[List[int]] = []
+    best_ops, best_end = None, None
+    for o in range(a + 1):
+        j_max = min(b, a - o)
+        row = [0] * (j_max + 1)
+        previous = rows[-1] if rows else None
+        for j in range(j_max + 1):
+            value = previous[j] if previous is not None else 0
+            if j:
+                diagonal = row[j - 1] + (old_mid[j - 1 + o] == new_mid[j - 1])
+                value = max(value, diagonal)
+            row[j] = value
+        rows.append(row)
+        # What is not kept is sent at the end.
+        ops = a + b - j_max - row[j_max]
+        if best_ops is None or ops < best_ops:
+            best_ops, best_end = ops, (o, j_max)
+        j_next = min(b, a - o - 1)
+        if j_next < 0 or (best_ops is not None and a + b - j_next - min(j_next, reachable) >= best_ops):
+            break
+
+    o, j = best_end
+    while j:
+        row = rows[o]
+        if row[j] == row[j - 1] + (old_mid[j - 1 + o] == new_mid[j - 1]):
+            kept[prefix + j - 1 + o] = prefix + j - 1
+            j -= 1
+        else:
+            o -= 1
+    return kept
+
+
 class MessageMutableBundle:
     '''Collection of multiple mutable Discord messages.'''
 
@@ -125,6 +223,8 @@ class MessageMutableBundle:
         self.channel_id = channel_id
         self.sticky_messages = sticky_messages
         self.message_contexts: List[MessageContext] = []
+        # Sequence number of the last update rendered into these messages.
+        self.applied_seq: int | None = None
 
     async def should_clear_messages(self, check_last_message_func: Callable) -> bool:
         '''Check if messages should be cleared (sticky check).'''
@@ -135,30 +235,25 @@ class MessageMutableBundle:
         history_messages = await async_retry_discord_message_command(
             partial(check_last_message_func, len(self.message_contexts))
         )
-        for count, hist_message in enumerate(history_messages):
-            index = len(self.message_contexts) - 1 - count
-            if index < 0:
-                break
-            context = self.message_contexts[index]
-            if context.message_id is None or context.message_id != hist_message.id:
+        return self.should_clear_for_tail([hist_message.id for hist_message in history_messages])
+
+    def should_clear_for_tail(self, newest_message_ids: List[int]) -> bool:
+        '''Sticky check against the channel's newest message ids, newest first.'''
+        for context, message_id in zip(reversed(self.message_contexts), newest_message_ids):
+            if context.message_id is None or context.message_id != message_id:
                 return True
         return False
 
-    def _match_existing_message_content(self, message_content: List[str], delete_after: int | None) -> dict:
-        '''Find matching existing message contexts for new content.'''
-        mapping = {}
-        for (new_index, message) in enumerate(message_content):
-            for (existing_index, context) in enumerate(self.message_contexts):
-                if context.message_content == message and delete_after == context.delete_after:
-                    mapping[existing_index] = new_index
-                    break
-        return mapping
-
     def get_message_dispatch(self, message_content: List[str], send_function: Callable,
                              get_channel: Callable,
                              clear_existing: bool = False,
                              delete_after: int = None) -> List[Callable]:
-        '''Return list of callables to sync Discord messages with new content.'''
+        '''Return list of callables to sync Discord messages with new content.
+
+        Existing messages are matched to the new content by
+        _align_message_contents, which picks the fewest deletes, edits and
+        sends; messages whose content is unchanged are left alone.
+        '''
         dispatch_functions = []
 
         if clear_existing and self.message_contexts:
@@ -167,59 +262,27 @@ class MessageMutableBundle:
                     dispatch_functions.append(partial(context.delete_message, get_channel))
             self.message_contexts = []
 
-        if not self.message_contexts:
-            for content in message_content:
-                mc = MessageContext(self.guild_id, self.channel_id, message_content=content, delete_after=delete_after)
-                send_func = partial(send_function, content=content, delete_after=delete_after)
-                self.message_contexts.append(mc)
-                dispatch_functions.append(send_func)
-            return dispatch_functions
-
-        existing_count = len(self.message_contexts)
-        new_count = len(message_content)
-
-        if existing_count > new_count:
-            expected_delete_count = existing_count - new_count
-            existing_mapping = self._match_existing_message_content(message_content, delete_after)
-            delete_count = 0
-            new_contexts = []
-            for index, item in reversed(list(enumerate(self.message_contexts))):
-                if existing_mapping.get(index, None) is not None:
-                    new_contexts.insert(0, item)
-                    continue
-                if delete_count < expected_delete_count:
-                    dispatch_functions.append(partial(item.delete_message, get_channel))
-                    delete_count += 1
-                    continue
-                edit_func = partial(item.edit_message, get_channel, content=message_content[index], delete_after=delete_after)
-                item.delete_after = delete_after
-                item.message_content = message_content[index]
-                dispatch_functions.append(edit_func)
-                new_contexts.insert(0, item)
-            self.message_contexts = new_contexts
-            return dispatch_functions
-
-        existing_mapping = self._match_existing_message_content(message_content, delete_after)
+        kept = _align_message_contents(
+            [(context.message_content, context.delete_after) for context in self.message_contexts],
+            [(content, delete_after) for content in message_content],
+        )
         new_contexts = []
-        for index, item in enumerate(self.message_contexts):
-            if existing_mapping.get(index, None) == index:
-                new_contexts.append(item)
+        for context, new_index in zip(self.message_contexts, kept):
+            if new_index is None:
+                dispatch_functions.append(partial(context.delete_message, get_channel))
                 continue
-            edit_func = partial(item.edit_message, get_channel, content=message_content[index], delete_after=delete_after)
-            item.delete_after = delete_after
-            item.message_content = message_content[index]
-            dispatch_functions.append(edit_func)
-            new_contexts.append(item)
+            content = message_content[new_index]
+            if context.message_content != content or context.delete_after != delete_after:
+                dispatch_functions.append(partial(context.edit_message, get_channel, content=content, delete_after=delete_after))
+                context.delete_after = delete_after
+                context.message_content = content
+            new_contexts.append(context)
+        for content in message_content[len(new_contexts):]:
+            mc = MessageContext(self.guild_id, self.channel_id, message_content=content, delete_after=delete_after)
+            send_func = partial(send_function, content=content, delete_after=delete_after)
+            new_contexts.append(mc)
+            dispatch_functions.append(send_func)
         self.message_contexts = new_contexts
-
-        if new_count > existing_count:
-            for i in range(existing_count, new_count):
-                content = message_content[i]
-                mc = MessageContext(self.guild_id, self.channel_id, message_content=content, delete_after=delete_after)
-                send_func = partial(send_function, content=content, delete_after=delete_after)
-                self.message_contexts.append(mc)
-                dispatch_functions.append(send_func)
-
         return dispatch_functions
 
     def clear_all_messages(self, get_channel: Callable) -> List[Callable]:
@@ -245,6 +308,7 @@ class MessageMutableBundle:
             'channel_id': self.channel_id,
             'sticky_messages': self.sticky_messages,
             'message_contexts': [asdict(ctx) for ctx in self.message_contexts],
+            'applied_seq': self.applied_seq,
         }
 
     @classmethod
@@ -252,9 +316,37 @@ class MessageMutableBundle:
         '''Restore a bundle from the dict produced by :meth:`to_dict`.'''
         bundle = cls(data['guild_id'], data['channel_id'], data.get('sticky_messages', True))
         bundle.message_contexts = [MessageContext(**ctx) for ctx in data.get('message_contexts', [])]
+        bundle.applied_seq = data.get('applied_seq')
         return bundle
 
 
+def _message_ids(bundle: MessageMutableBundle) -> List[int]:
+    '''Ids of the messages *bundle* has sent.'''
+    return [ctx.message_id for ctx in bundle.message_contexts if ctx.message_id is not None]
+
+
+def _item_routes(member: str, payload: dict) -> List[Route]:
+    '''
+    Rate-limit buckets a work item spends, for the items the limiter models.
+
+    A mutable update is counted against its channel's edit bucket: most
+    updates edit a page in place, and the sends and deletes of a sticky
+    repost are corrected from their response headers.  Items for other
+    routes, and mutables whose payload names no channel, are never parked.
+    '''
+    if member.startswith(_MEMBER_SEND):
+        return [(ROUTE_SEND, payload['channel_id'])]
+    if member.startswith(_MEMBER_DELETE):
+        return [(ROUTE_DELETE, payload['channel_id'])]
+    if member.startswith(_MEMBER_BULK_DELETE):
+        # discord.py sends a single-message bulk delete as a plain delete.
+        route = ROUTE_BULK_DELETE if len(payload['message_ids']) > 1 else ROUTE_DELETE
+        return [(route, payload['channel_id'])]
+    if member.startswith(_MEMBER_MUTABLE) and payload.get('channel_id'):
+        return [(ROUTE_EDIT, payload['channel_id'])]
+    return []
+
+
 class MessageDispatcher(DispatchClientBase):
     '''
     App-wide Discord message dispatcher.
@@ -264,11 +356,25 @@ class MessageDispatcher(DispatchClientBase):
 
     Both work_queue and bundle_store are required; use AsyncioWorkQueue /
     AsyncioBundleStore for single-process deployments without Redis.
+
+    channel_tails is optional.  With it, the sticky check reads the newest
+    message ids of the bundle's channel from the tracker, which gateway events
+    (record_channel_event) and this dispatcher's own sends and deletes keep up
+    to date, and fetches channel history only while the tracker is cold.
+    Without it every sticky check fetches history.
+
+    rate_limiter is optional.  With it, a worker reserves an item's send, edit
+    or delete bucket before dispatching it, and gets it back if the item sends
+    no request; an item whose bucket is empty is parked in-process, without a
+    worker, and put back on the work queue when the bucket resets.  Without it workers dispatch everything at once and
+    wait out rate limits inside discord.py.
     '''
 
     def __init__(self, bot: Bot, settings: dict,
                  bundle_store: BundleStore,
-                 work_queue: WorkQueue):
+                 work_queue: WorkQueue,
+                 channel_tails: ChannelTailStore | None = None,
+                 rate_limiter: DiscordRateLimiter | None = None):
         if not settings.get('general', {}).get('include', {}).get('message_dispatcher', True):
             raise CogMissingRequiredArg('MessageDispatcher not enabled')
 
@@ -277,6 +383,9 @@ class MessageDispatcher(DispatchClientBase):
         self.logger = logging.getLogger('discord_bot.cogs.messagedispatcher')
         self._bundle_store = bundle_store
         self._work_queue = work_queue
+        self._channel_tails = channel_tails
+        self._rate_limiter = rate_limiter
+        self._parked = ParkedWork(self._requeue_parked)
 
         # DispatchClientBase: per-cog result delivery queues
         self._cog_queues: dict[str, asyncio.Queue] = {}
@@ -366,6 +475,12 @@ class MessageDispatcher(DispatchClientBase):
                 with contextlib.suppress(asyncio.CancelledError):
                     await asyncio.gather(*self._worker_tasks, return_exceptions=True)
             self._worker_tasks.clear()
+        # After the workers, which may park items while draining, and before
+        # the caller closes Redis: parked items go back on the queue for the
+        # next pod instead of dying with this process.
+        if self._parked.pending:
+            self.logger.info('MessageDispatcher :: re-queueing %d parked item(s)', self._parked.pending)
+            await self._parked.release_all()
         self.logger.info('MessageDispatcher :: shutdown complete')
 
     @cached_property
@@ -433,9 +548,21 @@ class MessageDispatcher(DispatchClientBase):
         self.delete_message(request.guild_id, request.channel_id, request.message_id,
                             span_context=request.span_context)
 
+    def _handle_bulk_delete(self, request: BulkDeleteRequest) -> None:
+        self.bulk_delete_messages(request.guild_id, request.channel_id, request.message_ids,
+                                  span_context=request.span_context)
+
     def update_mutable(self, key: str, guild_id: int, content: List[str],
-                       channel_id: int | None, sticky: bool = True, delete_after: int | None = None):
-        '''Enqueue a mutable bundle update at HIGH priority.'''
+                       channel_id: int | None, sticky: bool = True, delete_after: int | None = None,
+                       seq: int | None = None):
+        '''
+        Enqueue a mutable bundle update at HIGH priority.
+
+        seq orders updates for the same key (next_mutable_seq); HTTP callers
+        pass the one taken when the content was rendered, otherwise it is
+        taken here.  Pending updates collapse to the highest seq, and one
+        older than the last rendered is dropped.
+        '''
         if not content:
             self.logger.debug('update_mutable: empty content for key=%s, routing to remove_mutable', key)
             return self.remove_mutable(key)
@@ -445,7 +572,8 @@ class MessageDispatcher(DispatchClientBase):
         self._spawn_enqueue(self._work_queue.enqueue_unique(
             f'{_MEMBER_MUTABLE}{key}',
             {'key': key, 'guild_id': guild_id, 'content': content,
-             'channel_id': channel_id, 'sticky': sticky, 'delete_after': delete_after},
+             'channel_id': channel_id, 'sticky': sticky, 'delete_after': delete_after,
+             MUTABLE_SEQ_FIELD: seq if seq is not None else next_mutable_seq()},
             DispatchPriority.HIGH,
         ))
         return request_uuid
@@ -480,6 +608,21 @@ class MessageDispatcher(DispatchClientBase):
             DispatchPriority.NORMAL,
         ))
 
+    def bulk_delete_messages(self, guild_id: int, channel_id: int, message_ids: List[int],
+                             span_context: dict | None = None):
+        '''
+        Enqueue the deletion of up to 100 messages of one channel, in one API call, at NORMAL priority.
+
+        Discord refuses a bulk delete naming a message older than 14 days; when
+        it does, the worker enqueues a single delete for each message instead.
+        '''
+        self._spawn_enqueue(self._work_queue.enqueue(
+            f'{_MEMBER_BULK_DELETE}{uuid.uuid4()}',
+            {'guild_id': guild_id, 'channel_id': channel_id,
+             'message_ids': list(message_ids), 'span_context': span_context},
+            DispatchPriority.NORMAL,
+        ))
+
     async def fetch_object(self, guild_id: int, func: Callable,  # pylint: disable=unused-argument
                            max_retries: int = 3, allow_404: bool = False):
         '''
@@ -519,6 +662,23 @@ class MessageDispatcher(DispatchClientBase):
             DispatchPriority.HIGH,
         ))
 
+    def record_channel_event(self, guild_id: int, channel_id: int,
+                             added: List[int] | None = None, deleted: List[int] | None = None):
+        '''
+        Enqueue a gateway message create / delete for the channel tail tracker.
+
+        HIGH priority, so the event is applied ahead of the mutable updates
+        queued after it.  Dropped when this dispatcher has no tracker.
+        '''
+        if self._channel_tails is None or not (added or deleted):
+            return
+        self._spawn_enqueue(self._work_queue.enqueue(
+            f'{_MEMBER_CHANNEL_EVENT}{uuid.uuid4()}',
+            {'guild_id': guild_id, 'channel_id': channel_id,
+             'added': list(added or []), 'deleted': list(deleted or [])},
+            DispatchPriority.HIGH,
+        ))
+
     # ------------------------------------------------------------------
     # Worker loop
     # ------------------------------------------------------------------
@@ -544,7 +704,8 @@ class MessageDispatcher(DispatchClientBase):
                         self._worker_health.record_success()
                     continue
                 member, payload = result
-                await self._dispatch_item(member, payload)
+                if not self._park_if_throttled(member, payload):
+                    await self._dispatch_reserved(member, payload)
                 # Recorded after the dispatch, not after the dequeue: a worker
                 # that reads the queue fine but fails every item is not healthy.
                 if self._worker_health:
@@ -562,6 +723,38 @@ class MessageDispatcher(DispatchClientBase):
                         self._shutdown.wait(), timeout=_WORKER_ERROR_BACKOFF_SECONDS,
                     )
 
+    def _park_if_throttled(self, member: str, payload: dict) -> bool:
+        '''Reserve the item's rate-limit bucket; park the item and return True when it is empty.'''
+        if self._rate_limiter is None:
+            return False
+        routes = _item_routes(member, payload)
+        if not routes:
+            return False
+        delay = self._rate_limiter.reserve(routes)
+        if delay <= 0:
+            return False
+        self.logger.debug('MessageDispatcher :: parking %s for %.2fs, bucket %s is empty', member, delay, routes)
+        DISPATCHER_PARKED_COUNTER.add(1, {DispatchNaming.ROUTE.value: routes[0][0]})
+        self._parked.park(member, payload, delay)
+        return True
+
+    async def _dispatch_reserved(self, member: str, payload: dict) -> None:
+        '''Dispatch an item _park_if_throttled let through, giving back any reservation it sends no request on.'''
+        if self._rate_limiter is None:
+            await self._dispatch_item(member, payload)
+            return
+        with self._rate_limiter.spending(_item_routes(member, payload)):
+            await self._dispatch_item(member, payload)
+
+    async def _requeue_parked(self, member: str, payload: dict) -> None:
+        '''Put a parked item back on the work queue once its bucket has reset.'''
+        if member.startswith(_MEMBER_MUTABLE):
+            # overwrite=False, as on the lock-retry path: an update queued
+            # while this one was parked is newer and must win.
+            await self._work_queue.enqueue_unique(member, payload, DispatchPriority.HIGH, overwrite=False)
+        else:
+            await self._work_queue.enqueue(member, payload, DispatchPriority.NORMAL)
+
     async def _dispatch_item(self, member: str, payload: dict):
         '''Route a work queue item to the appropriate handler based on its member prefix.'''
         if member.startswith(_MEMBER_MUTABLE):
@@ -572,12 +765,16 @@ class MessageDispatcher(DispatchClientBase):
             await self._process_send(payload)
         elif member.startswith(_MEMBER_DELETE):
             await self._process_delete(payload)
+        elif member.startswith(_MEMBER_BULK_DELETE):
+            await self._process_bulk_delete(payload)
         elif member.startswith(_MEMBER_UPDATE_CHANNEL):
             await self._process_update_channel(member[len(_MEMBER_UPDATE_CHANNEL):], payload)
         elif member.startswith(_MEMBER_FETCH_HISTORY):
             await self._process_fetch_history(member[len(_MEMBER_FETCH_HISTORY):], payload)
         elif member.startswith(_MEMBER_FETCH_EMOJIS):
             await self._process_fetch_emojis(member[len(_MEMBER_FETCH_EMOJIS):], payload)
+        elif member.startswith(_MEMBER_CHANNEL_EVENT):
+            await self._process_channel_event(payload)
         else:
             self.logger.warning('MessageDispatcher :: unknown queue member: %s', member)
 
@@ -625,12 +822,23 @@ class MessageDispatcher(DispatchClientBase):
                         sticky_messages=payload.get('sticky', True),
                     )
 
+                seq = payload.get(MUTABLE_SEQ_FIELD)
+                if seq is not None and bundle.applied_seq is not None and seq <= bundle.applied_seq:
+                    # A lock-retry or parked re-enqueue, or an update that
+                    # reached the dispatcher late: a newer render is already
+                    # on screen, so rendering this one would step it back.
+                    self.logger.debug('MessageDispatcher :: dropping stale mutable for key=%s seq=%s applied_seq=%s',
+                                      key, seq, bundle.applied_seq)
+                    return
+
                 new_channel_id = payload.get('channel_id')
                 if new_channel_id and bundle.channel_id != new_channel_id:
+                    old_channel_id, old_message_ids = bundle.channel_id, _message_ids(bundle)
                     delete_funcs = bundle.update_text_channel(
                         payload['guild_id'], new_channel_id, self.bot.get_partial_messageable
                     )
                     await self._execute_funcs(delete_funcs)
+                    await self._track_channel_messages(old_channel_id, deleted=old_message_ids)
 
                 check_func, send_func = self._make_channel_funcs(bundle.channel_id)
                 content = payload['content']
@@ -638,9 +846,8 @@ class MessageDispatcher(DispatchClientBase):
 
                 should_clear = False
                 if bundle.sticky_messages or len(content) <= len(bundle.message_contexts):
-                    should_clear = await async_retry_discord_message_command(
-                        partial(bundle.should_clear_messages, check_func)
-                    )
+                    should_clear = await self._should_clear_messages(bundle, check_func)
+                previous_message_ids = _message_ids(bundle)
 
                 funcs = bundle.get_message_dispatch(
                     content, send_func, self.bot.get_partial_messageable,
@@ -664,7 +871,19 @@ class MessageDispatcher(DispatchClientBase):
                 for i, message in enumerate(results):
                     if i < len(contexts_needing_refs):
                         contexts_needing_refs[i].set_message(message)
+                # Recorded here rather than left to the gateway events, which
+                # trail the REST calls: the next sticky check must already see
+                # the messages just sent and not the ones just deleted.
+                remaining_message_ids = set(_message_ids(bundle))
+                await self._track_channel_messages(
+                    bundle.channel_id,
+                    added=[message.id for message in results],
+                    deleted=[message_id for message_id in previous_message_ids
+                             if message_id not in remaining_message_ids],
+                )
 
+                if seq is not None:
+                    bundle.applied_seq = seq
                 if delete_after is not None:
                     await self._delete_bundle_from_store(key)
                 else:
@@ -701,9 +920,11 @@ class MessageDispatcher(DispatchClientBase):
                     bundle = MessageMutableBundle.from_dict(bundle_dict)
                     # Read counts before clear_all_messages empties message_contexts.
                     had_message_id = any(ctx.message_id is not None for ctx in bundle.message_contexts)
+                    message_ids = _message_ids(bundle)
                     delete_funcs = bundle.clear_all_messages(self.bot.get_partial_messageable)
                     deleted_count = len(delete_funcs)
                     await self._execute_funcs(delete_funcs)
+                    await self._track_channel_messages(bundle.channel_id, deleted=message_ids)
                 await self._delete_bundle_from_store(key)
                 # Tombstone UNCONDITIONALLY (even when the store held nothing): the
                 # orphan case is remove-finds-nothing then a trailing mutable creates,
@@ -724,10 +945,12 @@ class MessageDispatcher(DispatchClientBase):
                                            attributes={'discord.channel': payload['channel_id'],
                                                        'discord.guild': payload['guild_id']},
                                            links=span_links_from_context(payload.get('span_context'))):
-            await async_retry_discord_message_command(
+            message = await async_retry_discord_message_command(
                 partial(channel.send, content=payload['content'], delete_after=payload.get('delete_after')),
                 allow_404=payload.get('allow_404', False),
             )
+            if message is not None and hasattr(message, 'id'):
+                await self._track_channel_messages(payload['channel_id'], added=[message.id])
 
     async def _process_delete(self, payload: dict):
         '''Execute a delete_message from queue payload.'''
@@ -739,8 +962,38 @@ class MessageDispatcher(DispatchClientBase):
                 channel = await self.bot.fetch_channel(payload['channel_id'])
                 msg = channel.get_partial_message(payload['message_id'])
                 await msg.delete()
+                DISPATCHER_MESSAGES_DELETED_HISTOGRAM.record(1, {DispatchNaming.ROUTE.value: ROUTE_DELETE})
+            except NotFound:
+                pass
+            await self._track_channel_messages(payload['channel_id'], deleted=[payload['message_id']])
+
+    async def _process_bulk_delete(self, payload: dict):
+        '''Execute a bulk_delete_messages from queue payload, falling back to single deletes on a 400.'''
+        message_ids = payload['message_ids']
+        async with async_otel_span_wrapper('message_dispatcher.bulk_delete',
+                                           attributes={'discord.channel': payload['channel_id'],
+                                                       'discord.guild': payload['guild_id']},
+                                           links=span_links_from_context(payload.get('span_context'))):
+            try:
+                channel = await self.bot.fetch_channel(payload['channel_id'])
+                await channel.delete_messages([Object(id=message_id) for message_id in message_ids])
+                DISPATCHER_MESSAGES_DELETED_HISTOGRAM.record(len(message_ids), {
+                    DispatchNaming.ROUTE.value: ROUTE_BULK_DELETE if len(message_ids) > 1 else ROUTE_DELETE,
+                })
             except NotFound:
                 pass
+            except HTTPException as exc:
+                # 400: a message crossed the 14 day limit after the caller
+                # checked, or the ids were otherwise refused as a batch.
+                if exc.status != 400:
+                    raise
+                self.logger.warning('MessageDispatcher :: bulk delete of %s messages in channel %s refused, '
+                                    'deleting one at a time: %s', len(message_ids), payload['channel_id'], exc)
+                for message_id in message_ids:
+                    self.delete_message(payload['guild_id'], payload['channel_id'], message_id,
+                                        span_context=payload.get('span_context'))
+                return
+            await self._track_channel_messages(payload['channel_id'], deleted=message_ids)
 
     async def _process_update_channel(self, key: str, payload: dict):
         '''Move a bundle to a new channel and save updated state to the store.'''
@@ -751,12 +1004,19 @@ class MessageDispatcher(DispatchClientBase):
             if not bundle_dict:
                 return
             bundle = MessageMutableBundle.from_dict(bundle_dict)
+            old_channel_id, old_message_ids = bundle.channel_id, _message_ids(bundle)
             delete_funcs = bundle.update_text_channel(
                 payload['guild_id'], payload['new_channel_id'], self.bot.get_partial_messageable
             )
             await self._execute_funcs(delete_funcs)
+            await self._track_channel_messages(old_channel_id, deleted=old_message_ids)
             await self._save_bundle_to_store(key, bundle)
 
+    async def _process_channel_event(self, payload: dict):
+        '''Apply a gateway message create / delete to the channel tail tracker.'''
+        await self._track_channel_messages(payload['channel_id'],
+                                           added=payload.get('added'), deleted=payload.get('deleted'))
+
     async def _process_fetch_history(self, request_id: str, payload: dict):
         '''Execute channel history fetch, store result, signal any in-process waiter.'''
         async with async_otel_span_wrapper('message_dispatcher.fetch_history',
@@ -844,7 +1104,11 @@ class MessageDispatcher(DispatchClientBase):
             channel = self.bot.get_partial_messageable(channel_id)
             async def fetch_messages():
                 return [m async for m in channel.history(limit=count)]
-            return await async_retry_discord_message_command(fetch_messages)
+            messages = await async_retry_discord_message_command(fetch_messages)
+            # Warms the tail tracker, so the next check for this channel can
+            # skip the fetch.
+            await self._track_channel_messages(channel_id, added=[m.id for m in messages])
+            return messages
 
         async def send_function(**kwargs):
             channel = self.bot.get_partial_messageable(channel_id)
@@ -852,6 +1116,48 @@ class MessageDispatcher(DispatchClientBase):
 
         return check_last_message_func, send_function
 
+    # ------------------------------------------------------------------
+    # Channel tail tracking
+    # ------------------------------------------------------------------
+
+    async def _should_clear_messages(self, bundle: MessageMutableBundle, check_func: Callable) -> bool:
+        '''
+        Sticky check for *bundle*: a local comparison against the channel tail
+        tracker when it holds every message of the bundle, otherwise a history
+        fetch through *check_func*.
+        '''
+        if self._channel_tails is not None and bundle.sticky_messages and bundle.message_contexts:
+            message_ids = [ctx.message_id for ctx in bundle.message_contexts]
+            if None not in message_ids:
+                try:
+                    newest = await self._channel_tails.newest(bundle.channel_id, message_ids)
+                except Exception as exc:
+                    # The tracker is an optimisation; history still answers.
+                    self.logger.warning('MessageDispatcher :: channel tail lookup failed for channel %s: %s',
+                                        bundle.channel_id, exc)
+                    newest = None
+                if newest is not None:
+                    return bundle.should_clear_for_tail(newest)
+        return await async_retry_discord_message_command(
+            partial(bundle.should_clear_messages, check_func)
+        )
+
+    async def _track_channel_messages(self, channel_id: int, added: List[int] | None = None,
+                                      deleted: List[int] | None = None) -> None:
+        '''Apply message creates / deletes to the channel tail tracker; logs and swallows any error.'''
+        if self._channel_tails is None:
+            return
+        try:
+            if deleted:
+                await self._channel_tails.discard(channel_id, deleted)
+            if added:
+                await self._channel_tails.add(channel_id, added)
+        except Exception as exc:
+            # A missed add leaves the tail cold (the next check fetches
+            # history); a missed discard costs at most one needless re-send.
+            self.logger.warning('MessageDispatcher :: failed to track messages for channel %s: %s',
+                                channel_id, exc)
+
     # ------------------------------------------------------------------
     # Utility
     # ------------------------------------------------------------------
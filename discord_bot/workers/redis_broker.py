@@ -7,21 +7,28 @@ local-disk mode will not work across separate pods.
 '''
 import asyncio
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import List
 
-from discord_bot.interfaces.broker_protocols import BrokerEntry, CheckoutResult, MediaBrokerBase, Zone
+from discord_bot.interfaces.broker_protocols import (
+    TERMINAL_LIFECYCLE_EVENTS, BrokerEntry, CheckoutResult, MediaBrokerBase, Zone,
+)
 from discord_bot.types.download import LifecycleEvent, DownloadResult, LifecycleStatusUpdate
 from discord_bot.types.media_download import MediaDownload
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.player_session import PlayerSession
 from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.utils.integrations.s3 import delete_file
+from discord_bot.utils.wire_format import compact_dump
 from discord_bot.workers.broker_registry import RedisBrokerRegistry
 from discord_bot.workers.media_bundle import BundleRenderer, BundleState
 
 logger = logging.getLogger(__name__)
 
+# Parsed bundle states kept per pod; see RedisBroker._load_bundle.
+BUNDLE_CACHE_SIZE = 256
+
 
 def _download_to_dict(media_download: MediaDownload) -> dict:
     return {
@@ -65,11 +72,12 @@ def _entry_from_dict(data: dict) -> BrokerEntry:
     )
 
 
-class RedisBroker(MediaBrokerBase):
+class RedisBroker(MediaBrokerBase): #pylint:disable=too-many-public-methods
     '''
     Media broker backed by RedisBrokerRegistry for HA multi-pod deployments.
 
-    All registry state lives in Redis; no local dict is maintained.
+    All registry state lives in Redis.  The only local state is a read-through
+    cache of parsed bundle states, checked against Redis on every load.
     '''
 
     def __init__(self, registry: RedisBrokerRegistry, **kwargs):
@@ -77,6 +85,9 @@ class RedisBroker(MediaBrokerBase):
         download_max_retries, search_max_retries) to MediaBrokerBase.'''
         super().__init__(**kwargs)
         self._registry = registry
+        # bundle uuid -> (revision, state) for states this pod saved, most
+        # recent last.
+        self._bundle_cache: OrderedDict[str, tuple[str, BundleState]] = OrderedDict()
 
     def _bundle_lock(self, bundle_uuid: str):
         '''Use the redis-backed bundle lock so multiple broker pods stay
@@ -89,16 +100,30 @@ class RedisBroker(MediaBrokerBase):
     # Registration
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _in_flight_entry(media_request: MediaRequest) -> dict:
+        '''Registry entry for a newly registered request.'''
+        return {
+            'zone': 'in_flight',
+            'checked_out_by': None,
+            'guild_file_path': None,
+            'request': compact_dump(media_request),
+            'download': None,
+        }
+
+    @staticmethod
+    def _group_by_bundle(media_requests: List[MediaRequest]) -> dict[str, List[MediaRequest]]:
+        '''Requests that belong to a bundle, keyed by bundle uuid, in order.'''
+        grouped: dict[str, List[MediaRequest]] = {}
+        for media_request in media_requests:
+            if media_request.bundle_uuid:
+                grouped.setdefault(media_request.bundle_uuid, []).append(media_request)
+        return grouped
+
     async def register_request(self, media_request: MediaRequest) -> None:
         uuid = str(media_request.uuid)
         if await self._registry.get_entry(uuid) is None:
-            await self._registry.set_entry(uuid, {
-                'zone': 'in_flight',
-                'checked_out_by': None,
-                'guild_file_path': None,
-                'request': media_request.model_dump(mode='json'),
-                'download': None,
-            })
+            await self._registry.set_entry(uuid, self._in_flight_entry(media_request))
         # Attach to its bundle if one exists.  Roundtrip through BundleRenderer
         # to mutate counters / bundled_requests, then persist — under the
         # per-bundle lock so concurrent register_request / lifecycle pushes
@@ -106,21 +131,45 @@ class RedisBroker(MediaBrokerBase):
         bundle_uuid = media_request.bundle_uuid
         if bundle_uuid:
             async with self._bundle_lock(bundle_uuid):
-                raw = await self._registry.get_bundle(bundle_uuid)
-                if raw is None:
+                state = await self._load_bundle(bundle_uuid)
+                if state is None:
                     return
-                renderer = BundleRenderer(BundleState.model_validate(raw))
+                renderer = BundleRenderer(state)
                 renderer.add_media_request(media_request)
-                await self._registry.set_bundle(
-                    bundle_uuid, renderer.state.model_dump(mode='json')
-                )
-                await self._render_and_dispatch_bundle_locked(bundle_uuid)
+                await self._save_bundle(renderer.state)
+                if self._render_throttle.render_due(bundle_uuid):
+                    await self._render_and_dispatch_bundle_locked(bundle_uuid)
 
-    async def update_request_status(self, request_uuid: str, update: LifecycleStatusUpdate) -> None:
-        data = await self._registry.get_entry(request_uuid)
-        if data is None:
-            logger.warning('update_request_status called for unknown uuid %s', request_uuid)
-            return
+    async def register_requests(self, media_requests: List[MediaRequest]) -> None:
+        '''
+        register_request for a batch.
+
+        New entries are found with one MGET and written in one pipeline, and each
+        bundle is loaded, extended and rendered once for all of its requests,
+        rather than once per request.
+        '''
+        uuids = [str(media_request.uuid) for media_request in media_requests]
+        existing = await self._registry.get_entries(uuids)
+        await self._registry.write_entries({
+            uuid: self._in_flight_entry(media_request)
+            for uuid, media_request, data in zip(uuids, media_requests, existing)
+            if data is None
+        })
+        for bundle_uuid, bundled in self._group_by_bundle(media_requests).items():
+            async with self._bundle_lock(bundle_uuid):
+                state = await self._load_bundle(bundle_uuid)
+                if state is None:
+                    continue
+                renderer = BundleRenderer(state)
+                for media_request in bundled:
+                    renderer.add_media_request(media_request)
+                await self._save_bundle(renderer.state)
+                if self._render_throttle.render_due(bundle_uuid):
+                    await self._render_and_dispatch_bundle_locked(bundle_uuid)
+
+    @staticmethod
+    def _apply_update(data: dict, update: LifecycleStatusUpdate) -> MediaRequest:
+        '''Apply update to the request stored in entry data, in place; returns the request.'''
         media_request = parse_media_request(data['request'])
         if update.event == LifecycleEvent.QUEUED:
             media_request.state_machine.mark_queued()
@@ -144,7 +193,15 @@ class RedisBroker(MediaBrokerBase):
             media_request.state_machine.mark_completed()
         elif update.event == LifecycleEvent.FAILED:
             media_request.state_machine.mark_failed(update.failure_reason, rejected=update.rejected)
-        data['request'] = media_request.model_dump(mode='json')
+        data['request'] = compact_dump(media_request)
+        return media_request
+
+    async def update_request_status(self, request_uuid: str, update: LifecycleStatusUpdate) -> None:
+        data = await self._registry.get_entry(request_uuid)
+        if data is None:
+            logger.warning('update_request_status called for unknown uuid %s', request_uuid)
+            return
+        media_request = self._apply_update(data, update)
         # A DISCARDED/FAILED request is terminal — it will never yield a playable
         # download — so drop its registry entry instead of leaving it parked in
         # the in_flight zone until the 24h TTL. (The download worker emits
@@ -160,12 +217,57 @@ class RedisBroker(MediaBrokerBase):
         # entry and bundled_requests share a Python reference; in Redis they
         # are independent JSON blobs and would otherwise drift forever.
         # Both the sync and the render run under the per-bundle lock so they
-        # don't clobber a concurrent register_request.
+        # don't clobber a concurrent register_request.  The sync always runs;
+        # the render only when the throttle has not merged it into a later one.
         bundle_uuid = media_request.bundle_uuid
         if bundle_uuid:
             async with self._bundle_lock(bundle_uuid):
                 await self._sync_request_into_bundle(media_request)
-                await self._render_and_dispatch_bundle_locked(bundle_uuid)
+                terminal_events = 1 if update.event in TERMINAL_LIFECYCLE_EVENTS else 0
+                if self._render_throttle.render_due(bundle_uuid, terminal_events):
+                    await self._render_and_dispatch_bundle_locked(bundle_uuid)
+
+    async def update_status_many(self, updates: List[tuple[str, LifecycleStatusUpdate]]) -> None:
+        '''
+        update_request_status for a batch of (request_uuid, update) pairs.
+
+        Updates apply in order, so a later update for the same uuid sees the
+        earlier one (and an update after a terminal one finds no entry, as it
+        would one call at a time).  The entries are read with one MGET and
+        written or deleted in one pipeline; each bundle then syncs every request
+        it holds and renders at most once.
+        '''
+        uuids = list(dict.fromkeys(request_uuid for request_uuid, _update in updates))
+        entries = dict(zip(uuids, await self._registry.get_entries(uuids)))
+        written: dict[str, dict] = {}
+        deleted: List[str] = []
+        updated: dict[str, MediaRequest] = {}
+        terminal_events: dict[str, int] = {}
+        for request_uuid, update in updates:
+            data = entries[request_uuid]
+            if data is None:
+                logger.warning('update_request_status called for unknown uuid %s', request_uuid)
+                continue
+            updated[request_uuid] = self._apply_update(data, update)
+            if update.event in TERMINAL_LIFECYCLE_EVENTS and updated[request_uuid].bundle_uuid:
+                bundle_uuid = updated[request_uuid].bundle_uuid
+                terminal_events[bundle_uuid] = terminal_events.get(bundle_uuid, 0) + 1
+            # Terminal updates drop the entry, as in update_request_status.
+            if update.event in (LifecycleEvent.DISCARDED, LifecycleEvent.FAILED):
+                entries[request_uuid] = None
+                written.pop(request_uuid, None)
+                deleted.append(request_uuid)
+            else:
+                written[request_uuid] = data
+        await self._registry.write_entries(written, deleted)
+        for bundle_uuid, bundled in self._group_by_bundle(list(updated.values())).items():
+            async with self._bundle_lock(bundle_uuid):
+                state = await self._load_bundle(bundle_uuid)
+                if state is not None:
+                    if [media_request for media_request in bundled if state.sync_request(media_request)]:
+                        await self._save_bundle(state)
+                if self._render_throttle.render_due(bundle_uuid, terminal_events.get(bundle_uuid, 0)):
+                    await self._render_and_dispatch_bundle_locked(bundle_uuid)
 
     async def _sync_request_into_bundle(self, media_request: MediaRequest) -> None:
         '''Replace the bundle's stored copy of this request with the latest one.
@@ -179,13 +281,12 @@ class RedisBroker(MediaBrokerBase):
         bundle_uuid = media_request.bundle_uuid
         if not bundle_uuid:
             return
-        raw = await self._registry.get_bundle(bundle_uuid)
-        if raw is None:
+        state = await self._load_bundle(bundle_uuid)
+        if state is None:
             return
-        state = BundleState.model_validate(raw)
         if not state.sync_request(media_request):
             return
-        await self._registry.set_bundle(bundle_uuid, state.model_dump(mode='json'))
+        await self._save_bundle(state)
 
     async def register_download_result(self, result: DownloadResult) -> MediaDownload:
         media_download = MediaDownload(result.file_name, result.ytdlp_data, result.media_request)
@@ -202,7 +303,7 @@ class RedisBroker(MediaBrokerBase):
                 'zone': 'available',
                 'checked_out_by': None,
                 'guild_file_path': None,
-                'request': media_download.media_request.model_dump(mode='json'),
+                'request': compact_dump(media_download.media_request),
                 'download': download_dict,
             })
         else:
@@ -214,7 +315,7 @@ class RedisBroker(MediaBrokerBase):
         # Render under the bundle lock so it doesn't race with concurrent
         # register_request / status pushes touching the same bundle.
         bundle_uuid = media_download.media_request.bundle_uuid
-        if bundle_uuid:
+        if bundle_uuid and self._render_throttle.render_due(bundle_uuid):
             async with self._bundle_lock(bundle_uuid):
                 await self._render_and_dispatch_bundle_locked(bundle_uuid)
 
@@ -231,10 +332,7 @@ class RedisBroker(MediaBrokerBase):
         staging is the caller's responsibility (the bot downloads from S3 via the
         returned s3_key + bucket_name).
         '''
-        succeeded = await self._registry.atomic_checkout(media_request_uuid, guild_id)
-        if not succeeded:
-            return None
-        data = await self._registry.get_entry(media_request_uuid)
+        data = await self._registry.checkout_entry(media_request_uuid, guild_id)
         if data is None or not data.get('download') or not data['download'].get('file_path'):
             return None
         return CheckoutResult(s3_key=data['download']['file_path'], bucket_name=self.bucket_name)
@@ -276,10 +374,9 @@ class RedisBroker(MediaBrokerBase):
         return data.get('zone') == 'available'
 
     async def can_evict_base(self, webpage_url: str) -> bool:
-        for data in await self._registry.all_entries():
-            if data.get('download') and data['download'].get('webpage_url') == webpage_url:
-                if data.get('zone') in ('available', 'checked_out'):
-                    return False
+        for data in await self._registry.entries_for_url(webpage_url):
+            if data.get('zone') in ('available', 'checked_out'):
+                return False
         return True
 
     # ------------------------------------------------------------------
@@ -298,18 +395,14 @@ class RedisBroker(MediaBrokerBase):
         return await self.video_cache.get_cache_count()
 
     async def get_checked_out_by(self, guild_id: int) -> List[BrokerEntry]:
-        entries = await self._registry.all_entries()
-        return [
-            _entry_from_dict(data) for data in entries
-            if data.get('checked_out_by') == guild_id and data.get('zone') == 'checked_out'
-        ]
+        return [_entry_from_dict(data) for data in await self._registry.checked_out_entries(guild_id)]
 
     # ------------------------------------------------------------------
     # Player sessions
     # ------------------------------------------------------------------
 
     async def save_player_session(self, session: PlayerSession) -> None:
-        await self._registry.set_session(session.guild_id, session.model_dump(mode='json'))
+        await self._registry.set_session(session.guild_id, compact_dump(session))
 
     async def list_player_sessions(self) -> List[PlayerSession]:
         return [PlayerSession.model_validate(data) for data in await self._registry.all_sessions()]
@@ -322,20 +415,34 @@ class RedisBroker(MediaBrokerBase):
     # ------------------------------------------------------------------
 
     async def _load_bundle(self, bundle_uuid: str) -> BundleState | None:
-        raw = await self._registry.get_bundle(bundle_uuid)
-        if raw is None:
-            return None
-        return BundleState.model_validate(raw)
+        '''
+        The stored bundle, reusing this pod's parsed copy while Redis still
+        holds the revision it was saved as.
+
+        A busy bundle is loaded and saved several times per lifecycle push, and
+        re-parsing a playlist's state costs milliseconds.  The cached copy is
+        taken out of the cache, not shared: the caller owns it, and it goes back
+        only when saved, so a state changed but never saved is never reused.
+        '''
+        cached = self._bundle_cache.pop(bundle_uuid, None)
+        revision, data = await self._registry.read_bundle(bundle_uuid, cached[0] if cached else None)
+        if data is None:
+            return cached[1] if cached and revision is not None else None
+        return BundleState.model_validate(data)
 
     async def _save_bundle(self, state: BundleState) -> None:
-        await self._registry.set_bundle(state.uuid, state.model_dump(mode='json'))
+        revision = await self._registry.set_bundle(state.uuid, compact_dump(state))
+        self._bundle_cache[state.uuid] = (revision, state)
+        self._bundle_cache.move_to_end(state.uuid)
+        while len(self._bundle_cache) > BUNDLE_CACHE_SIZE:
+            self._bundle_cache.popitem(last=False)
 
     async def _drop_bundle(self, bundle_uuid: str) -> None:
+        self._bundle_cache.pop(bundle_uuid, None)
         await self._registry.delete_bundle(bundle_uuid)
 
     async def list_bundles_for_guild(self, guild_id: int) -> list[str]:
-        bundles = await self._registry.all_bundles()
-        return [b['uuid'] for b in bundles if b.get('guild_id') == guild_id]
+        return [b['uuid'] for b in await self._registry.bundles_for_guild(guild_id)]
 
     async def get_bundle_state(self, bundle_uuid: str) -> BundleState | None:
         '''Test/inspection helper — return the stored BundleState or None.'''
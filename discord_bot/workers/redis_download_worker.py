@@ -18,19 +18,21 @@ Redis schema (all keys under ``discord_bot:download:``):
     youtube_wait_until:{egress}  STRING  epoch ts; shared per egress bucket
     failures:youtube:{egress}    ZSET    failure_uuid -> ts (ZCARD ~ backoff exponent)
     failures:direct              ZSET    same, informational only
+    deferred_retries            ZSET    '{gid}:{uuid}' -> ready_at (retry hold-off)
+    wakeup                      LIST    one token per enqueue; idle consumers BLPOP it
 
 The YouTube pool is subject to a per-egress backoff window (``youtube_wait_until``)
 so pods sharing an egress IP never hammer YouTube past its rate limit; the DIRECT
 pool has no backoff and drains in parallel.  Both round-robin across guilds by
-``last_popped_ts`` under a short-lived SET NX pop-lock so no guild starves another
-and no two pods pop the same request.
+``last_popped_ts`` so no guild starves another, and each pop is atomic — one
+server-side script, or a short-lived SET NX pop-lock where Redis has no scripting
+— so no two pods pop the same request.
 '''
 import asyncio
-import json
 import random
 import uuid as uuid_module
 from asyncio import QueueEmpty, sleep
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
 from time import time
 from typing import Callable, List
@@ -44,9 +46,13 @@ from discord_bot.interfaces.download_protocols import (
 from discord_bot.types.download import DownloadErrorType, DownloadResult
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.playlist_add_request import parse_media_request
+from discord_bot.types.queue import PutsBlocked
+from discord_bot.utils.otel import capture_span_context
+from discord_bot.utils import wire_format
 from discord_bot.workers.redis_guild_queue import (
-    RedisGuildBlockMixin,
-    build_status_snapshot, collect_queue_sizes, drain_guild_zset, redis_pop_lock,
+    RedisGuildBlockMixin, ScriptedRoundRobinPop, ScriptingUnavailable,
+    build_status_snapshot, collect_queue_sizes, drain_guild_zset, queue_wakeup, redis_pop_lock,
+    wait_for_wakeup,
 )
 
 REQUEST_KEY_PREFIX = 'discord_bot:download:request:'
@@ -55,6 +61,8 @@ GUILD_YOUTUBE_SUFFIX = ':youtube'
 GUILD_DIRECT_SUFFIX = ':direct'
 GUILDS_YOUTUBE_KEY = 'discord_bot:download:guilds:youtube'
 GUILDS_DIRECT_KEY = 'discord_bot:download:guilds:direct'
+# Shared by both pools: one consumer loop drains DIRECT and YouTube alike.
+WAKEUP_KEY = 'discord_bot:download:wakeup'
 # Per-egress-bucket prefixes: pods behind distinct egress IPs keep independent
 # YouTube backoff + failure state; the ':default' suffix is the single-bucket schema.
 YOUTUBE_WAIT_UNTIL_KEY_PREFIX = 'discord_bot:download:youtube_wait_until'
@@ -89,10 +97,11 @@ def youtube_failures_key(egress_key: str) -> str:
 
 
 # Per-pool pop lock.  The round-robin pop (pick oldest guild -> ZPOPMIN -> rotate)
-# and the YouTube check-wait-then-claim are multi-step read-modify-writes; the
-# shared redis_pop_lock (a token-tagged SET NX lock, mirroring RedisBrokerRegistry)
-# serialises them across pods.  (fakeredis on the pinned test stack has no Lua, so
-# this is the atomicity primitive rather than an EVAL script.)
+# and the YouTube check-wait-then-claim are multi-step read-modify-writes.  Where
+# Redis runs scripts they happen in one ScriptedRoundRobinPop call and need no
+# lock; on a server that rejects scripting the shared redis_pop_lock (a
+# token-tagged SET NX lock, mirroring RedisBrokerRegistry) serialises them
+# across pods instead.
 POP_LOCK_KEY_PREFIX = 'discord_bot:download:poplock:'
 
 
@@ -101,7 +110,8 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
     Multi-pod download engine backed by Redis ZSET queues.
 
     Supplies the DownloadWorkerBase queue surface with Redis: per-guild ZSETs
-    popped round-robin under a short-lived SET NX pop-lock, a shared per-egress
+    popped round-robin by one server-side script (or, without scripting, under a
+    short-lived SET NX pop-lock), a shared per-egress
     YouTube backoff window, and shared failure ZSETs.  The sync
     backoff_seconds_remaining / failure_summary properties read a per-pod cache the
     async hooks refresh from Redis; cross-pod correctness is enforced by the pop-lock
@@ -110,16 +120,19 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
 
     GUILD_KEY_PREFIX = GUILD_QUEUE_PREFIX
     def __init__(self, *args, redis_manager: RedisManager,
-                 youtube_egress_key: str = DEFAULT_YOUTUBE_EGRESS_KEY, **kwargs):
+                 youtube_egress_key: str = DEFAULT_YOUTUBE_EGRESS_KEY,
+                 scripted_pop: bool = True, **kwargs):
         '''
         Forward all yt-dlp / backoff / broker kwargs to DownloadWorkerBase, then
         wire the Redis client + per-egress keys.
 
         redis_manager : RedisManager whose .client is the shared aioredis handle
         youtube_egress_key : bucket for the shared YouTube wait/failure keys
+        scripted_pop : pop with one server-side script; False forces the pop-lock path
         '''
         super().__init__(*args, **kwargs)
         self._manager = redis_manager
+        self._pop_script = ScriptedRoundRobinPop(scripted_pop)
         self._youtube_egress_key = youtube_egress_key
         self._youtube_wait_until_key = youtube_wait_until_key(youtube_egress_key)
         self._youtube_failures_key = youtube_failures_key(youtube_egress_key)
@@ -181,7 +194,7 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         return datetime.now(timezone.utc).timestamp()
 
     # ------------------------------------------------------------------
-    # Lock-serialised atomic pops
+    # Atomic pops: one script where Redis allows it, else lock-serialised
     # ------------------------------------------------------------------
 
     @asynccontextmanager
@@ -228,8 +241,9 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         '''
         Lock-free "is there anything queued at all" check for one pool.
 
-        The consumer loop polls every _IDLE_POLL_BACKOFF_SECONDS whether or not work
-        exists, and an idle poll that goes straight into _pop_lock costs a SET NX +
+        The consumer loop used to poll every second whether or not work existed
+        (it now blocks on the wakeup list between polls), and an idle poll that
+        went straight into _pop_lock cost a SET NX +
         GET + DEL lock cycle per pool just to have _round_robin_pop discover an empty
         ZSET.  With a driver per egress exit that was the pod's dominant redis
         traffic (and ~98% of its trace spans).  Checking the round-robin ZSET first
@@ -244,10 +258,28 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         '''
         return not await self._manager.client.zcard(self._guilds_zset_key(direct=direct))
 
+    async def _scripted_pop(self, *, direct: bool, gated: bool = False) -> tuple | None:
+        '''
+        _round_robin_pop (plus, when gated, the fixed-mode wait check and
+        _claim_youtube_window) as one ScriptedRoundRobinPop call.  Same results
+        as the lock path; raises ScriptingUnavailable when Redis will not run it.
+        '''
+        suffix = GUILD_DIRECT_SUFFIX if direct else GUILD_YOUTUBE_SUFFIX
+        return await self._pop_script.pop(
+            self._manager.client, self._guilds_zset_key(direct=direct),
+            GUILD_QUEUE_PREFIX, suffix, REQUEST_KEY_PREFIX, self._now_seconds(),
+            wait_key=self._youtube_wait_until_key if gated else '',
+            wait_period=self._wait_period_minimum,
+            wait_ttl=max(1, int(self._wait_period_minimum) + 1),
+        )
+
     async def _atomic_pop_direct(self) -> tuple[int, str, str | None] | None:
-        '''Round-robin pop one DIRECT request under the direct-pool lock.'''
+        '''Round-robin pop one DIRECT request, scripted or under the direct-pool lock.'''
         if await self._pool_is_empty(direct=True):
             return None
+        if self._pop_script.enabled:
+            with suppress(ScriptingUnavailable):
+                return await self._scripted_pop(direct=True)
         async with self._pop_lock(direct=True):
             return await self._round_robin_pop(direct=True)
 
@@ -265,9 +297,14 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         with nothing queued reports "empty" rather than ('wait', ts).  Both raise
         QueueEmpty in _merged_get_nowait; the 'wait' signal only carries information
         when there is actually something queued behind the window.
+
+        The scripted pop does all of this in one call and skips the lock.
         '''
         if await self._pool_is_empty(direct=False):
             return None
+        if self._pop_script.enabled:
+            with suppress(ScriptingUnavailable):
+                return await self._scripted_pop(direct=False, gated=not self._egress.is_pool)
         async with self._pop_lock(direct=False):
             if self._egress.is_pool:
                 return await self._round_robin_pop(direct=False)
@@ -300,7 +337,7 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         '''Deserialize a popped request payload, raising QueueEmpty if it's gone.'''
         if not raw:
             raise QueueEmpty('Request payload missing')
-        return parse_media_request(json.loads(raw))
+        return parse_media_request(wire_format.decode(raw))
 
     # ------------------------------------------------------------------
     # Queue interface — backed by Redis
@@ -311,26 +348,63 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         '''Cached view of whether a DIRECT item is waiting (refreshed by the hooks).'''
         return self._direct_pending_cache
 
-    async def _enqueue_request(self, guild_id: int, media_request: MediaRequest,
-                               priority: int | None = None) -> None:
-        '''Persist the request and ZADD it onto the guild's pool + round-robin tracker.'''
+    def _queue_enqueue(self, pipe, guild_id: int, media_request: MediaRequest,
+                       priority: int | None = None) -> bool:
+        '''
+        Queue the payload SET and the guild-pool + round-robin ZADDs for one
+        request on pipe.  Returns whether it went to the DIRECT pool.
+        '''
         request_uuid = str(media_request.uuid)
         direct = self._is_direct(media_request)
         # Stamp the FIFO ordering key once, on first enqueue; a re-enqueued request
         # already carries it, so it keeps its original queue position.
         if media_request.queue_order is None:
             media_request.queue_order = self._now_seconds()
-        client = self._manager.client
-        await client.set(self._request_key(request_uuid),
-                         media_request.model_dump_json(), ex=REQUEST_TTL_SECONDS)
-        await client.zadd(self._guild_queue_key(guild_id, direct=direct),
-                          {request_uuid: self._build_score(priority, media_request.queue_order)})
+        pipe.set(self._request_key(request_uuid),
+                 wire_format.encode(media_request), ex=REQUEST_TTL_SECONDS)
+        pipe.zadd(self._guild_queue_key(guild_id, direct=direct),
+                  {request_uuid: self._build_score(priority, media_request.queue_order)})
         # ZADD NX so an already-listed guild keeps its round-robin position.
-        await client.zadd(self._guilds_zset_key(direct=direct),
-                          {str(guild_id): self._now_seconds()}, nx=True)
+        pipe.zadd(self._guilds_zset_key(direct=direct),
+                  {str(guild_id): self._now_seconds()}, nx=True)
+        return direct
+
+    async def _enqueue_request(self, guild_id: int, media_request: MediaRequest,
+                               priority: int | None = None) -> None:
+        '''
+        Persist the request and ZADD it onto the guild's pool + round-robin tracker,
+        in one MULTI: one round trip, and a pop never finds the uuid queued without
+        its payload.
+        '''
+        pipe = self._manager.client.pipeline(transaction=True)
+        direct = self._queue_enqueue(pipe, guild_id, media_request, priority)
+        queue_wakeup(pipe, WAKEUP_KEY)
+        await pipe.execute()
         if direct:
             self._direct_pending_cache = True
 
+    async def submit_many(self, guild_id: int, media_requests: List[MediaRequest],
+                          priority: int | None = None) -> List[Exception | None]:
+        '''
+        Submit a batch in one MULTI after a single block check.
+
+        Same outcomes as submitting one at a time: a blocked guild refuses every
+        request, and there is no queue cap to refuse some of them.
+        '''
+        if await self.guild_is_blocked(guild_id):
+            return [PutsBlocked(f'Puts blocked for guild {guild_id}')] * len(media_requests)
+        pipe = self._manager.client.pipeline(transaction=True)
+        direct = False
+        for media_request in media_requests:
+            if media_request.span_context is None:
+                media_request.span_context = capture_span_context()
+            direct = self._queue_enqueue(pipe, guild_id, media_request, priority) or direct
+        queue_wakeup(pipe, WAKEUP_KEY, len(media_requests))
+        await pipe.execute()
+        if direct:
+            self._direct_pending_cache = True
+        return [None] * len(media_requests)
+
     @staticmethod
     def _deferred_member(guild_id: int, request_uuid: str) -> str:
         return f'{guild_id}:{request_uuid}'
@@ -349,31 +423,59 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
         left to promote from otherwise.
         '''
         request_uuid = str(media_request.uuid)
-        client = self._manager.client
-        await client.set(self._request_key(request_uuid),
-                         media_request.model_dump_json(), ex=REQUEST_TTL_SECONDS)
-        await client.zadd(DEFERRED_RETRIES_KEY,
-                          {self._deferred_member(guild_id, request_uuid): ready_at})
+        pipe = self._manager.client.pipeline(transaction=True)
+        pipe.set(self._request_key(request_uuid),
+                 wire_format.encode(media_request), ex=REQUEST_TTL_SECONDS)
+        pipe.zadd(DEFERRED_RETRIES_KEY,
+                  {self._deferred_member(guild_id, request_uuid): ready_at})
+        await pipe.execute()
 
     async def _promote_ready_retries(self) -> None:
-        '''Move every deferred retry whose hold-off has elapsed onto its guild queue.'''
+        '''
+        Move every deferred retry whose hold-off has elapsed onto its guild queue.
+
+        Three round trips whatever the batch size — ZRANGEBYSCORE, one pipeline of
+        ZREM + GET per due member, one MULTI of the re-enqueues — and just the
+        first when nothing is due, since run() calls this every iteration.
+        '''
         client = self._manager.client
         due = await client.zrangebyscore(DEFERRED_RETRIES_KEY, '-inf', self._now_seconds(),
                                          start=0, num=DEFERRED_PROMOTE_BATCH)
+        if not due:
+            return
+        # ZREM is the claim: pods share this ZSET, and only the one whose ZREM
+        # removed the member may re-queue it. Without that, two pods promoting
+        # the same second would each enqueue the request and download it twice.
+        pipe = client.pipeline(transaction=False)
         for member in due:
-            # ZREM is the claim: pods share this ZSET, and only the one whose ZREM
-            # removed the member may re-queue it. Without that, two pods promoting
-            # the same second would each enqueue the request and download it twice.
-            if not await client.zrem(DEFERRED_RETRIES_KEY, member):
-                continue
-            _, request_uuid = self._split_deferred_member(member)
-            raw = await client.get(self._request_key(request_uuid))
-            if raw is None:
-                # Payload TTL'd out from under us (24h) — the claim is already
-                # released, so dropping it here is the whole cleanup.
-                continue
-            media_request = self._parse_raw(raw)
-            await self._enqueue_request(media_request.guild_id, media_request)
+            pipe.zrem(DEFERRED_RETRIES_KEY, member)
+            pipe.get(self._request_key(self._split_deferred_member(member)[1]))
+        replies = await pipe.execute()
+        # A payload TTL'd out from under us (24h) needs no cleanup beyond the
+        # claim's ZREM, which already released it.
+        ready = [self._parse_raw(raw) for claimed, raw in zip(replies[::2], replies[1::2])
+                 if claimed and raw is not None]
+        if not ready:
+            return
+        promote = client.pipeline(transaction=True)
+        direct = False
+        for media_request in ready:
+            direct = self._queue_enqueue(promote, media_request.guild_id, media_request) or direct
+        queue_wakeup(promote, WAKEUP_KEY, len(ready))
+        await promote.execute()
+        if direct:
+            self._direct_pending_cache = True
+
+    async def _wait_for_work(self, timeout: float) -> None:
+        '''
+        BLPOP a wakeup token, for at most timeout seconds or until the earliest
+        deferred retry is due — whichever pod's enqueue pushed it.
+        '''
+        client = self._manager.client
+        soonest = await client.zrange(DEFERRED_RETRIES_KEY, 0, 0, withscores=True)
+        if soonest:
+            timeout = min(timeout, soonest[0][1] - self._now_seconds())
+        await wait_for_wakeup(client, [WAKEUP_KEY], timeout)
 
     async def clear_guild_queue(self, guild_id: int,
                                 preserve_predicate: Callable[[MediaRequest], bool] | None = None,
@@ -405,7 +507,7 @@ class RedisDownloadWorker(RedisGuildBlockMixin, DownloadWorkerBase):
             if raw is None:
                 await client.zrem(DEFERRED_RETRIES_KEY, member)
                 continue
-            media_request = parse_media_request(json.loads(raw))
+            media_request = parse_media_request(wire_format.decode(raw))
             if preserve_predicate is not None and preserve_predicate(media_request):
                 continue
             await client.zrem(DEFERRED_RETRIES_KEY, member)
@@ -8,18 +8,33 @@ bot-pod poller over HTTP.  The download worker adds a DIRECT fast-path and
 per-egress bucketing on top; the search worker uses the single-pool subset.  The
 shared bits live here once so the two workers stay duplicate-code (R0801) clean.
 
-The pinned fakeredis test stack has no Lua, so the pop-lock is a token-tagged
-SET NX rather than an EVAL script — mirrors RedisBrokerRegistry.bundle_lock.
+The round-robin pop runs as one server-side script (ScriptedRoundRobinPop) where
+Redis allows scripting: the pick, ZPOPMIN, rotate and payload GET+DEL happen in
+one round trip with no lock.  On a Redis server that rejects scripting (an ACL
+denying EVALSHA, or a server without Lua) the worker falls back to the
+multi-command pop under a token-tagged SET NX pop-lock, mirroring
+RedisBrokerRegistry.bundle_lock.
+
+Idle consumers do not re-poll on a timer: each enqueue pushes a token onto the
+pool's wakeup list in the same MULTI, and an idle consumer blocks in BLPOP on
+that list (wait_for_wakeup) until one arrives.
 '''
 import asyncio
-import json
+import hashlib
+import logging
 import uuid as uuid_module
 from contextlib import asynccontextmanager
 from typing import Awaitable, Callable
 
+from opentelemetry.instrumentation.utils import suppress_instrumentation
+from redis.exceptions import NoPermissionError, NoScriptError, ResponseError
+
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.types.queue import PutsBlocked
+from discord_bot.utils import wire_format
+
+logger = logging.getLogger(__name__)
 
 GUILD_BLOCKED_SUFFIX = ':blocked'
 
@@ -114,6 +129,37 @@ class RedisGuildBlockMixin:
         await super().submit(guild_id, media_request, priority=priority)
 
 
+# Wakeup lists.  One token per enqueued request wakes at most one idle consumer
+# per request, across every pod sharing the pool.  Tokens pushed while every
+# consumer is busy are trimmed to the cap, so they cost at most that many spare
+# wakeups — each a cheap empty poll — once the consumers go idle.  The TTL only
+# reaps the list of a pool nobody enqueues to any more.
+WAKEUP_TOKEN_CAP = 64
+WAKEUP_TTL_SECONDS = 3600
+
+
+def queue_wakeup(pipe, wakeup_key: str, count: int = 1) -> None:
+    '''Queue count wakeup tokens (up to WAKEUP_TOKEN_CAP) for idle consumers on pipe.'''
+    pipe.lpush(wakeup_key, *['1'] * min(count, WAKEUP_TOKEN_CAP))
+    pipe.ltrim(wakeup_key, 0, WAKEUP_TOKEN_CAP - 1)
+    pipe.expire(wakeup_key, WAKEUP_TTL_SECONDS)
+
+
+async def wait_for_wakeup(client, wakeup_keys: list[str], timeout: float) -> bool:
+    '''
+    Block in BLPOP until a wakeup token arrives on any of wakeup_keys, for at
+    most timeout seconds.  Returns whether a token arrived.
+
+    BLPOP treats 0 as "forever", so a spent timeout returns without blocking.
+    Instrumentation is suppressed: these spans would only ever say "idle", as
+    with DownloadWorkerBase._peek_next_request.
+    '''
+    if timeout <= 0:
+        return False
+    with suppress_instrumentation():
+        return await client.blpop(wakeup_keys, timeout=timeout) is not None
+
+
 POP_LOCK_TTL_SECONDS = 10
 POP_LOCK_POLL_INTERVAL_SECONDS = 0.05
 POP_LOCK_WAIT_SECONDS = 5.0
@@ -145,6 +191,122 @@ async def redis_pop_lock(client, lock_key: str):
             await client.delete(lock_key)
 
 
+# One round-robin pop, atomically.  Same steps as the workers' _round_robin_pop,
+# plus the fixed-egress YouTube wait check and claim when KEYS[2] is set.  The
+# ZPOPMIN is a ZRANGE + ZREM: ZPOPMIN's reply shape inside a script differs
+# between Redis and fakeredis, ZRANGE's does not.
+#   KEYS[1]  round-robin guilds ZSET
+#   KEYS[2]  shared wait-until key, or '' for a pool with no window
+#   ARGV     guild queue key prefix, guild queue key suffix, request key prefix,
+#            now, wait period to claim, claim TTL seconds
+# Returns {guild_id, request_uuid, payload-or-nil}, {'wait', wait_until}, or nil.
+# Guild queue and request keys are built inside the script, so this needs a
+# single-node Redis (or Sentinel), not Cluster.
+ROUND_ROBIN_POP_LUA = '''
+local now = tonumber(ARGV[4])
+if KEYS[2] ~= '' then
+  local wait_until = redis.call('GET', KEYS[2])
+  if wait_until and now < tonumber(wait_until) then
+    return {'wait', wait_until}
+  end
+end
+while true do
+  local guilds = redis.call('ZRANGE', KEYS[1], 0, 0)
+  if #guilds == 0 then
+    return false
+  end
+  local guild_id = guilds[1]
+  local queue = ARGV[1] .. guild_id .. ARGV[2]
+  local popped = redis.call('ZRANGE', queue, 0, 0)
+  if #popped == 0 then
+    redis.call('ZREM', KEYS[1], guild_id)
+  else
+    redis.call('ZREM', queue, popped[1])
+    if redis.call('ZCARD', queue) == 0 then
+      redis.call('ZREM', KEYS[1], guild_id)
+    else
+      redis.call('ZADD', KEYS[1], ARGV[4], guild_id)
+    end
+    local request_key = ARGV[3] .. popped[1]
+    local raw = redis.call('GET', request_key)
+    redis.call('DEL', request_key)
+    if KEYS[2] ~= '' then
+      local new_wait = now + tonumber(ARGV[5])
+      local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+      if new_wait > current then
+        redis.call('SET', KEYS[2], string.format('%.6f', new_wait), 'EX', ARGV[6])
+      end
+    end
+    return {guild_id, popped[1], raw}
+  end
+end
+'''
+ROUND_ROBIN_POP_SHA = hashlib.sha1(ROUND_ROBIN_POP_LUA.encode('utf-8')).hexdigest()  # nosec B324 - Redis script id
+
+
+class ScriptingUnavailable(Exception):
+    '''Redis refused to run the pop script; use the pop-lock path instead.'''
+
+
+class ScriptedRoundRobinPop:
+    '''
+    Round-robin pop in one EVALSHA, with no pop-lock.
+
+    The lock path costs a SET NX, a ZRANGE, ZPOPMIN, ZCARD, ZADD/ZREM, GET and
+    DEL, then the lock GET and DEL — about eight round trips a pop, plus
+    POP_LOCK_POLL_INTERVAL_SECONDS sleeps whenever another consumer holds the
+    lock.  Redis runs a script without interleaving other commands, so the
+    script needs no lock at all.
+
+    enabled starts as configured and turns off for good the first time Redis
+    rejects scripting (an unknown EVALSHA, as on fakeredis without Lua, or an
+    ACL that denies it); pop then raises ScriptingUnavailable and the caller
+    takes the lock path from there on.
+    '''
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+    async def _run(self, client, keys: list[str], args: list) -> list | None:
+        try:
+            return await client.evalsha(ROUND_ROBIN_POP_SHA, len(keys), *keys, *args)
+        except NoScriptError:
+            return await client.eval(ROUND_ROBIN_POP_LUA, len(keys), *keys, *args)
+
+    async def pop(self, client, guilds_key: str, queue_key_prefix: str, queue_key_suffix: str,
+                  request_key_prefix: str, now: float, *, wait_key: str = '',
+                  wait_period: float = 0, wait_ttl: int = 0) -> tuple | None:
+        '''
+        Pop the next request, returning (guild_id, request_uuid, raw), ('wait',
+        wait_until) when wait_key is set and its window is still running, or None
+        when every queue is empty.
+        '''
+        if not self.enabled:
+            raise ScriptingUnavailable('Scripted pop disabled')
+        keys = [guilds_key, wait_key]
+        args = [queue_key_prefix, queue_key_suffix, request_key_prefix, now, wait_period, wait_ttl]
+        try:
+            result = await self._run(client, keys, args)
+        except NoPermissionError as exc:
+            raise self._disable(exc) from exc
+        except ResponseError as exc:
+            if not str(exc).lower().startswith('unknown command'):
+                raise
+            raise self._disable(exc) from exc
+        if not result:
+            return None
+        if len(result) == 2:
+            return ('wait', result[1])
+        guild_id, request_uuid, raw = result
+        return int(guild_id), request_uuid, raw
+
+    def _disable(self, exc: Exception) -> ScriptingUnavailable:
+        self.enabled = False
+        logger.warning('Redis rejected the round-robin pop script (%s); '
+                       'falling back to the pop-lock path', exc)
+        return ScriptingUnavailable(str(exc))
+
+
 async def drain_guild_zset(client, queue_key: str,
                            request_key: Callable[[str], str],
                            preserve_predicate: Callable[[MediaRequest], bool] | None,
@@ -164,7 +326,7 @@ async def drain_guild_zset(client, queue_key: str,
         if raw is None:
             await client.zrem(queue_key, request_uuid)
             continue
-        media_request = parse_media_request(json.loads(raw))
+        media_request = parse_media_request(wire_format.decode(raw))
         if preserve_predicate is not None and preserve_predicate(media_request):
             continue
         await client.zrem(queue_key, request_uuid)
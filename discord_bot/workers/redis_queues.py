@@ -1,19 +1,18 @@
 '''
-Redis-backed implementations of BundleStore and WorkQueue.
+Redis-backed implementations of BundleStore, WorkQueue and ChannelTailStore.
 
 These require the redis optional dependency and a running RedisManager.
 The inner RedisDispatchQueue is created lazily on first use so that
 RedisWorkQueue can be constructed before redis_manager.start() is called.
 '''
-import json
-
 import redis.asyncio as aioredis
 
 from discord_bot.clients.redis_client import RedisManager
-from discord_bot.interfaces.dispatch_protocols import BundleStore, WorkQueue
+from discord_bot.interfaces.dispatch_protocols import CHANNEL_TAIL_SIZE, BundleStore, ChannelTailStore, WorkQueue
 from discord_bot.interfaces.result_queue import DownloadResultQueue, SearchResultQueue
 from discord_bot.types.download import DownloadResult
 from discord_bot.types.search_resolution import SearchResolution
+from discord_bot.utils import wire_format
 from discord_bot.utils.dispatch_queue import RedisDispatchQueue
 
 BUNDLE_KEY_PREFIX = 'discord_bot:bundle:'
@@ -22,7 +21,7 @@ BUNDLE_TTL_SECONDS = 86400  # 1 day — fallback expiry for orphaned bundles
 
 async def save_bundle(client: aioredis.Redis, key: str, bundle_dict: dict) -> None:
     '''Persist *bundle_dict* under *key* in Redis with a 1-day TTL.'''
-    await client.set(f'{BUNDLE_KEY_PREFIX}{key}', json.dumps(bundle_dict), ex=BUNDLE_TTL_SECONDS)
+    await client.set(f'{BUNDLE_KEY_PREFIX}{key}', wire_format.encode(bundle_dict), ex=BUNDLE_TTL_SECONDS)
 
 
 async def delete_bundle(client: aioredis.Redis, key: str) -> None:
@@ -33,7 +32,7 @@ async def delete_bundle(client: aioredis.Redis, key: str) -> None:
 async def load_bundle(client: aioredis.Redis, key: str) -> dict | None:
     '''Return the bundle dict stored under *key*, or None if not found.'''
     raw = await client.get(f'{BUNDLE_KEY_PREFIX}{key}')
-    return json.loads(raw) if raw else None
+    return wire_format.decode(raw) if raw else None
 
 
 async def load_all_bundles(client: aioredis.Redis) -> dict[str, dict]:
@@ -43,7 +42,7 @@ async def load_all_bundles(client: aioredis.Redis) -> dict[str, dict]:
         return {}
     values = await client.mget(*keys)
     return {
-        key[len(BUNDLE_KEY_PREFIX):]: json.loads(raw)
+        key[len(BUNDLE_KEY_PREFIX):]: wire_format.decode(raw)
         for key, raw in zip(keys, values)
         if raw
     }
@@ -105,6 +104,57 @@ class RedisWorkQueue(WorkQueue):
         return await self._get_queue().get_result(request_id)
 
 
+CHANNEL_TAIL_KEY_PREFIX = 'discord_bot:channel_tail:'
+# Counted from the first id recorded for a channel and never refreshed, so a
+# tail that missed gateway events (bot pod restarting, a dropped POST) is
+# rebuilt from a history fetch within this long, however busy the channel is.
+CHANNEL_TAIL_TTL_SECONDS = 600
+
+
+def _tail_member(message_id: int) -> str:
+    '''Sorted-set member for *message_id*.
+
+    Snowflakes overflow the exact range of a double score, so every member
+    scores 0 and the zero-padded id orders them lexicographically.
+    '''
+    return f'{message_id:020d}'
+
+
+class RedisChannelTailStore(ChannelTailStore):
+    '''ChannelTailStore backed by one sorted set per channel, shared by every dispatcher pod.'''
+
+    def __init__(self, manager: RedisManager):
+        self._manager = manager
+
+    async def add(self, channel_id: int, message_ids: list[int]) -> None:
+        if not message_ids:
+            return
+        key = f'{CHANNEL_TAIL_KEY_PREFIX}{channel_id}'
+        async with self._manager.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(key, {_tail_member(message_id): 0 for message_id in message_ids})
+            pipe.zremrangebyrank(key, 0, -(CHANNEL_TAIL_SIZE + 1))
+            pipe.expire(key, CHANNEL_TAIL_TTL_SECONDS, nx=True)
+            await pipe.execute()
+
+    async def discard(self, channel_id: int, message_ids: list[int]) -> None:
+        if not message_ids:
+            return
+        await self._manager.client.zrem(f'{CHANNEL_TAIL_KEY_PREFIX}{channel_id}',
+                                        *(_tail_member(message_id) for message_id in message_ids))
+
+    async def newest(self, channel_id: int, message_ids: list[int]) -> list[int] | None:
+        if not message_ids:
+            return None
+        key = f'{CHANNEL_TAIL_KEY_PREFIX}{channel_id}'
+        async with self._manager.client.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(key, 0, len(message_ids) - 1)
+            pipe.zmscore(key, [_tail_member(message_id) for message_id in message_ids])
+            members, scores = await pipe.execute()
+        if any(score is None for score in scores):
+            return None
+        return [int(member) for member in members]
+
+
 RESULT_QUEUE_KEY = 'discord_bot:broker:results'
 SEARCH_RESULT_QUEUE_KEY = 'discord_bot:broker:search_results'
 
@@ -112,8 +162,8 @@ SEARCH_RESULT_QUEUE_KEY = 'discord_bot:broker:search_results'
 class _RedisResultQueue:
     '''Shared single-Redis-list backing for the bot-ready result queues.
 
-    Push -> LPUSH the JSON-serialised model.  Pop -> RPOP and deserialise via
-    the pinned model class.  Multiple broker pods share the same key so any pod
+    Push -> LPUSH the wire_format-encoded model.  Pop -> RPOP (BRPOP for a batch
+    that waits) and deserialise via the pinned model class.  Multiple broker pods share the same key so any pod
     can answer the matching GET, and a pod restart doesn't lose pending work.
     The download and search queues differ only in their list key and model, so
     that plumbing lives here once.
@@ -125,15 +175,33 @@ class _RedisResultQueue:
         self._model = model
 
     async def put(self, item) -> None:
-        '''LPUSH the JSON-serialised item onto the shared list.'''
-        await self._manager.client.lpush(self._key, item.model_dump_json())
+        '''LPUSH the encoded item onto the shared list.'''
+        await self._manager.client.lpush(self._key, wire_format.encode(item))
 
     async def get_nowait(self):
         '''RPOP and deserialise the oldest item, or None if the list is empty.'''
         raw = await self._manager.client.rpop(self._key)
         if raw is None:
             return None
-        return self._model.model_validate_json(raw)
+        return self._model.model_validate_json(wire_format.payload(raw))
+
+    async def get_batch(self, max_items: int, timeout: float) -> list:
+        '''BRPOP the oldest item, waiting up to timeout, then RPOP up to
+        max_items - 1 more in one call.
+
+        BRPOP treats a timeout of 0 as "forever", so a zero timeout takes the
+        non-blocking RPOP path instead.  The blocked connection comes from the
+        pool, so a long-poll ties up one connection per waiting caller.'''
+        client = self._manager.client
+        if timeout > 0:
+            popped = await client.brpop([self._key], timeout=timeout)
+            raw_items = [popped[1]] if popped else []
+        else:
+            raw = await client.rpop(self._key)
+            raw_items = [raw] if raw is not None else []
+        if raw_items and max_items > 1:
+            raw_items.extend(await client.rpop(self._key, max_items - 1) or [])
+        return [self._model.model_validate_json(wire_format.payload(raw)) for raw in raw_items]
 
     async def depth(self) -> int:
         '''LLEN the shared list — the true bot-ready backlog across pods.'''
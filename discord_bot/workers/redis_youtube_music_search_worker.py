@@ -21,16 +21,18 @@ Redis schema (all keys under ``discord_bot:ytmusic_search:``):
     guilds              ZSET    guild_id -> last_popped_ts (round-robin)
     wait_until          STRING  epoch ts; shared cross-pod 429 backoff window
     failures            ZSET    failure_uuid -> ts (ZCARD ~ backoff exponent)
+    wakeup              LIST    one token per enqueue; idle pods BLPOP it
+    wakeup:{pod}        LIST    per-pod token for the in-process cached lane
 
-Guilds round-robin by ``last_popped_ts`` under a short-lived token-tagged SET NX
-pop-lock so no guild starves another and no two pods pop the same request.  The
-pinned fakeredis test stack has no Lua, so SET NX is the atomicity primitive
-rather than an EVAL script — mirrors RedisBrokerRegistry / RedisDownloadWorker.
+Guilds round-robin by ``last_popped_ts`` so no guild starves another.  Each pop
+is one server-side script (ScriptedRoundRobinPop) so no two pods pop the same
+request; on a Redis server that rejects scripting it falls back to a
+short-lived token-tagged SET NX pop-lock, as RedisDownloadWorker does.
 '''
 import asyncio
-import json
 import uuid as uuid_module
 from asyncio import QueueEmpty
+from contextlib import suppress
 from datetime import datetime, timezone
 from random import randint, seed
 from time import time
@@ -41,9 +43,11 @@ from discord_bot.interfaces.youtube_music_search_protocols import YoutubeMusicSe
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.exceptions import YoutubeMusicRetryException
+from discord_bot.utils import wire_format
 from discord_bot.workers.redis_guild_queue import (
-    RedisGuildBlockMixin,
-    build_status_snapshot, collect_queue_sizes, drain_guild_zset, redis_pop_lock,
+    RedisGuildBlockMixin, ScriptedRoundRobinPop, ScriptingUnavailable,
+    build_status_snapshot, collect_queue_sizes, drain_guild_zset, queue_wakeup, redis_pop_lock,
+    wait_for_wakeup,
 )
 
 REQUEST_KEY_PREFIX = 'discord_bot:ytmusic_search:request:'
@@ -52,6 +56,7 @@ GUILDS_KEY = 'discord_bot:ytmusic_search:guilds'
 WAIT_UNTIL_KEY = 'discord_bot:ytmusic_search:wait_until'
 FAILURES_KEY = 'discord_bot:ytmusic_search:failures'
 POP_LOCK_KEY = 'discord_bot:ytmusic_search:poplock'
+WAKEUP_KEY = 'discord_bot:ytmusic_search:wakeup'
 
 REQUEST_TTL_SECONDS = 86400  # 24h fallback so abandoned items eventually expire
 WAIT_TTL_SECONDS_MULTIPLIER = 4  # wait_until expires after wait_period * 4 * multiplier
@@ -65,7 +70,8 @@ class RedisYoutubeMusicSearchWorker(RedisGuildBlockMixin, YoutubeMusicSearchWork
     Multi-pod YouTube-Music search engine backed by Redis ZSET queues.
 
     Supplies the YoutubeMusicSearchWorkerBase queue surface with Redis: a single
-    per-guild ZSET popped round-robin under a short-lived SET NX pop-lock, plus a
+    per-guild ZSET popped round-robin by one server-side script (or, without
+    scripting, under a short-lived SET NX pop-lock), plus a
     shared cross-pod 429 backoff window and a shared failure ZSET.  The sync
     ``failure_summary`` / ``backoff_seconds_remaining`` reads work off a per-pod
     cache the async hooks refresh from Redis; cross-pod correctness is enforced by
@@ -73,15 +79,19 @@ class RedisYoutubeMusicSearchWorker(RedisGuildBlockMixin, YoutubeMusicSearchWork
     '''
 
     GUILD_KEY_PREFIX = GUILD_QUEUE_PREFIX
-    def __init__(self, *args, redis_manager: RedisManager, **kwargs):
+    def __init__(self, *args, redis_manager: RedisManager, scripted_pop: bool = True, **kwargs):
         '''
         Forward the resolution / backoff kwargs to YoutubeMusicSearchWorkerBase,
         then wire the Redis client.
 
         redis_manager : RedisManager whose .client is the shared aioredis handle.
+        scripted_pop : Pop with one server-side script; False forces the pop-lock path.
         '''
         super().__init__(*args, **kwargs)
         self._manager = redis_manager
+        self._pop_script = ScriptedRoundRobinPop(scripted_pop)
+        # Cache hits are parked in this process only, so they wake this pod alone.
+        self._pod_wakeup_key = f'{WAKEUP_KEY}:{uuid_module.uuid4().hex}'
         # Per-pod caches for the sync properties, refreshed by the async hooks.
         self._failure_summary_cache = _DEFAULT_FAILURE_SUMMARY
         self._failure_count_cache = 0
@@ -108,7 +118,7 @@ class RedisYoutubeMusicSearchWorker(RedisGuildBlockMixin, YoutubeMusicSearchWork
         return float(prio) * 1_000_000_000 + self._now_seconds()
 
     # ------------------------------------------------------------------
-    # Lock-serialised atomic pop
+    # Atomic pop: one script where Redis allows it, else lock-serialised
     # ------------------------------------------------------------------
 
     async def _round_robin_pop(self) -> tuple[int, str, str | None] | None:
@@ -138,29 +148,53 @@ class RedisYoutubeMusicSearchWorker(RedisGuildBlockMixin, YoutubeMusicSearchWork
             await client.delete(request_key)
             return int(guild_id), request_uuid, raw
 
+    async def _atomic_pop(self) -> tuple[int, str, str | None] | None:
+        '''Round-robin pop one request, scripted or under the pop-lock.'''
+        if self._pop_script.enabled:
+            with suppress(ScriptingUnavailable):
+                return await self._pop_script.pop(self._manager.client, GUILDS_KEY, GUILD_QUEUE_PREFIX, '',
+                                                  REQUEST_KEY_PREFIX, self._now_seconds())
+        async with redis_pop_lock(self._manager.client, POP_LOCK_KEY):
+            return await self._round_robin_pop()
+
     # ------------------------------------------------------------------
     # Queue interface — backed by Redis
     # ------------------------------------------------------------------
 
     async def _enqueue(self, guild_id: int, media_request: MediaRequest,
                        priority: int | None = None) -> None:
-        '''Persist the request and ZADD it onto the guild's queue + round-robin tracker.'''
+        '''Persist the request, ZADD it onto the guild's queue + round-robin tracker
+        and push a wakeup token, in one MULTI.'''
         request_uuid = str(media_request.uuid)
-        client = self._manager.client
-        await client.set(self._request_key(request_uuid),
-                         media_request.model_dump_json(), ex=REQUEST_TTL_SECONDS)
-        await client.zadd(self._guild_queue_key(guild_id),
-                          {request_uuid: self._build_score(priority)})
+        pipe = self._manager.client.pipeline(transaction=True)
+        pipe.set(self._request_key(request_uuid),
+                 wire_format.encode(media_request), ex=REQUEST_TTL_SECONDS)
+        pipe.zadd(self._guild_queue_key(guild_id),
+                  {request_uuid: self._build_score(priority)})
         # ZADD NX so an already-listed guild keeps its round-robin position.
-        await client.zadd(GUILDS_KEY, {str(guild_id): self._now_seconds()}, nx=True)
+        pipe.zadd(GUILDS_KEY, {str(guild_id): self._now_seconds()}, nx=True)
+        queue_wakeup(pipe, WAKEUP_KEY)
+        await pipe.execute()
+
+    async def _notify_cached_resolution(self) -> None:
+        pipe = self._manager.client.pipeline(transaction=True)
+        queue_wakeup(pipe, self._pod_wakeup_key)
+        await pipe.execute()
+
+    async def wait_for_work(self, timeout: float) -> None:
+        '''BLPOP a token from the shared queue's wakeup list or this pod's
+        cached-lane list, for at most timeout seconds.'''
+        if self._cached_resolutions:
+            return
+        await wait_for_wakeup(self._manager.client, [self._pod_wakeup_key, WAKEUP_KEY], timeout)
 
     async def _queue_is_empty(self) -> bool:
         '''
         Lock-free "is anything queued at all" check.
 
-        The search loop polls every SEARCH_IDLE_POLL_BACKOFF_SECONDS (0.25 s)
-        whether or not work exists, and an idle poll that goes straight into
-        redis_pop_lock costs a SET NX + GET + DEL lock cycle just to have
+        The search loop used to poll every 0.25 s whether or not work existed (it
+        now blocks in wait_for_work between polls), and an idle poll that went
+        straight into redis_pop_lock cost a SET NX + GET + DEL lock cycle just to have
         _round_robin_pop discover an empty ZSET.  With one pod that was 20 of the
         ~23 redis commands/s this service issued, against roughly 0.03 searches/s
         — and because those spans are created outside any request context, each
@@ -180,26 +214,26 @@ class RedisYoutubeMusicSearchWorker(RedisGuildBlockMixin, YoutubeMusicSearchWork
         return not await self._manager.client.zcard(GUILDS_KEY)
 
     async def get_input_nowait(self) -> MediaRequest:
-        '''Round-robin pop the next request under the pop-lock, raising QueueEmpty
-        if nothing is queued (or the popped payload has already TTL'd away).'''
+        '''Round-robin pop the next request, raising QueueEmpty if nothing is
+        queued (or the popped payload has already TTL'd away).'''
         if await self._queue_is_empty():
             raise QueueEmpty('No search requests in queue')
-        async with redis_pop_lock(self._manager.client, POP_LOCK_KEY):
-            result = await self._round_robin_pop()
+        result = await self._atomic_pop()
         if result is None:
             raise QueueEmpty('No search requests in queue')
         _, _, raw = result
         if not raw:
             raise QueueEmpty('Search request payload missing')
-        return parse_media_request(json.loads(raw))
+        return parse_media_request(wire_format.decode(raw))
 
     async def clear_guild_queue(self, guild_id: int,
                                 preserve_predicate: Callable[[MediaRequest], bool] | None = None,
                                 ) -> list[MediaRequest]:
-        '''Clear the guild's queue, returning the dropped requests.'''
+        '''Clear the guild's queue and cached-resolution lane, returning the dropped requests.'''
         client = self._manager.client
         queue_key = self._guild_queue_key(guild_id)
-        dropped = await drain_guild_zset(client, queue_key, self._request_key, preserve_predicate)
+        dropped = self._drop_cached_resolutions(guild_id, preserve_predicate)
+        dropped += await drain_guild_zset(client, queue_key, self._request_key, preserve_predicate)
         # Drop the guild from the round-robin tracker if its queue is now empty.
         if await client.zcard(queue_key) == 0:
             await client.zrem(GUILDS_KEY, str(guild_id))
@@ -0,0 +1,268 @@
+'''
+Search-string -> videoId resolution cache for the YouTube-Music search tier.
+
+Playlists and repeat requests resolve the same "<artist> <song>" strings over and
+over, and every one of those used to cost a ytmusicapi call against the shared
+429 window.  The cache sits in front of YoutubeMusicSearchWorkerBase.resolve and
+its submit path, keyed by the normalized search string (case-folded, whitespace
+collapsed) so trivially different spellings of one query share an entry.
+
+Two layers, mirroring the worker pair:
+
+  SearchResolutionCache — an in-memory LRU with per-entry expiry.  On its own it
+  is the single-process cache; it is also the front of the Redis layer, so a hot
+  query does not cost a round-trip per lookup.
+
+  RedisSearchResolutionCache — adds the shared layer for the HA search pods, so a
+  query one pod resolved is a hit on every pod, plus a cross-pod in-flight claim
+  so two pods do not race the same query into ytmusicapi.
+
+A search that matched nothing is cached too (negative caching), under a shorter
+TTL than a match: "no result" is more likely to change as catalogues update, and
+a wrong miss costs a user a failed request rather than a slower one.
+
+Redis schema (under ``discord_bot:ytmusic_search:``):
+    resolution:{sha256}  STRING  JSON {"video_id": str | null, "expires": epoch ts}
+    inflight:{sha256}    STRING  token of the pod currently resolving the query
+
+The key is a digest of the normalized string rather than the string itself, so
+an arbitrarily long user query does not become an arbitrarily long Redis key.
+The in-flight claim is a token-tagged SET NX: one command, so it is atomic
+without a script and works on a Redis that rejects scripting, and the token
+keeps a pod from releasing a claim that expired and was re-taken — the same
+shape as redis_guild_queue.redis_pop_lock.
+'''
+import asyncio
+import hashlib
+import json
+import uuid as uuid_module
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from discord_bot.clients.redis_client import RedisManager
+from discord_bot.utils.otel import AttributeNaming, MetricNaming, METER_PROVIDER
+
+RESOLUTION_KEY_PREFIX = 'discord_bot:ytmusic_search:resolution:'
+INFLIGHT_KEY_PREFIX = 'discord_bot:ytmusic_search:inflight:'
+
+SEARCH_CACHE_TTL_SECONDS_DEFAULT = 7 * 86400  # a week; a song's canonical video rarely moves
+SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT = 3600
+SEARCH_CACHE_MAX_ENTRIES_DEFAULT = 1024
+
+# Longest a claim outlives a crashed holder; comfortably past one ytmusicapi call.
+INFLIGHT_TTL_SECONDS = 30
+# How long a pod that lost the claim waits for the holder's result before it
+# searches itself.  Read at call time so tests can monkeypatch them.
+INFLIGHT_WAIT_SECONDS = 10.0
+INFLIGHT_POLL_INTERVAL_SECONDS = 0.1
+
+# Lookups by outcome: 'hit' (a match), 'negative_hit' (a cached no-result),
+# 'miss', and 'coalesced' when resolve joined a search already in flight.
+SEARCH_RESOLUTION_CACHE_COUNTER = METER_PROVIDER.create_counter(
+    name=MetricNaming.SEARCH_RESOLUTION_CACHE.value,
+    description='YouTube Music search resolution cache lookups by outcome',
+    unit='1',
+)
+
+
+def normalize_search_string(search_string: str) -> str:
+    '''Case-fold and collapse whitespace so equivalent queries share an entry.'''
+    return ' '.join(search_string.casefold().split())
+
+
+def record_cache_outcome(outcome: str) -> None:
+    '''Count one resolution-cache lookup under outcome.'''
+    SEARCH_RESOLUTION_CACHE_COUNTER.add(1, {AttributeNaming.OUTCOME.value: outcome})
+
+
+@dataclass(frozen=True)
+class CachedResolution:
+    '''A cache hit.  video_id is None for a cached "nothing matched".'''
+    video_id: str | None
+
+
+class SearchResolutionCache:
+    '''
+    In-memory LRU of normalized search string -> CachedResolution.
+
+    Bounded by entry count; each entry carries an absolute expiry, so a positive
+    and a negative entry age out on their own TTLs.  Expired entries are dropped
+    lazily when looked up.  The claim / release / wait_for_peer hooks are no-ops
+    here — a single process coalesces in YoutubeMusicSearchWorkerBase.resolve —
+    and are overridden by the Redis layer to coalesce across pods.
+    '''
+
+    def __init__(self, ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS_DEFAULT,
+                 negative_ttl_seconds: int = SEARCH_CACHE_NEGATIVE_TTL_SECONDS_DEFAULT,
+                 max_entries: int = SEARCH_CACHE_MAX_ENTRIES_DEFAULT):
+        '''
+        ttl_seconds : Lifetime of a cached match.
+        negative_ttl_seconds : Lifetime of a cached no-result.
+        max_entries : In-memory entries kept before the least recently used go.
+        '''
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+
+    @staticmethod
+    def _now_seconds() -> float:
+        return datetime.now(timezone.utc).timestamp()
+
+    def _ttl_for(self, video_id: str | None) -> int:
+        return self.ttl_seconds if video_id else self.negative_ttl_seconds
+
+    def _get_local(self, key: str) -> CachedResolution | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, video_id = entry
+        if expires <= self._now_seconds():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return CachedResolution(video_id)
+
+    def _set_local(self, key: str, video_id: str | None, expires: float) -> None:
+        self._entries[key] = (expires, video_id)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_shared(self, key: str) -> tuple[float, str | None] | None:  # pylint:disable=unused-argument
+        '''(expires, video_id) from the shared layer, or None.  No shared layer here.'''
+        return None
+
+    async def _set_shared(self, key: str, video_id: str | None, expires: float) -> None:
+        '''Write an entry to the shared layer.  No shared layer here.'''
+
+    async def get(self, search_string: str, record: bool = True) -> CachedResolution | None:
+        '''
+        Cached resolution for search_string, or None on a miss.
+
+        Checks the in-memory front first, then the shared layer, promoting a
+        shared hit into the front with the expiry it was written with.  With
+        record=False the outcome is not counted, for a re-check of a lookup
+        already counted once.
+        '''
+        key = normalize_search_string(search_string)
+        cached = self._get_local(key)
+        if cached is None:
+            shared = await self._get_shared(key)
+            if shared is not None and shared[0] > self._now_seconds():
+                self._set_local(key, shared[1], shared[0])
+                cached = CachedResolution(shared[1])
+        if not record:
+            return cached
+        if cached is None:
+            record_cache_outcome('miss')
+        else:
+            record_cache_outcome('hit' if cached.video_id else 'negative_hit')
+        return cached
+
+    async def set(self, search_string: str, video_id: str | None) -> None:
+        '''Cache video_id (None for no match) for search_string under its TTL.'''
+        key = normalize_search_string(search_string)
+        expires = self._now_seconds() + self._ttl_for(video_id)
+        self._set_local(key, video_id, expires)
+        await self._set_shared(key, video_id, expires)
+
+    async def claim(self, search_string: str) -> str | None:  # pylint:disable=unused-argument
+        '''
+        Claim the right to search for search_string, returning a release token.
+
+        Returns None when another process already holds the claim.  Always
+        granted here: there is no other process to coordinate with.
+        '''
+        return ''
+
+    async def release(self, search_string: str, token: str) -> None:
+        '''Release a claim taken with claim().'''
+
+    async def wait_for_peer(self, search_string: str) -> CachedResolution | None:  # pylint:disable=unused-argument
+        '''Wait for whoever holds the claim to cache a result; None if they do not.'''
+        return None
+
+
+class RedisSearchResolutionCache(SearchResolutionCache):
+    '''
+    SearchResolutionCache with a Redis layer shared by every search pod.
+
+    Entries are written to Redis with a matching EX so they expire there on the
+    same schedule as in each pod's front.  A pod that misses both layers takes a
+    short in-flight claim on the query before searching; a pod that finds the
+    claim held polls for the holder's result instead, and falls back to its own
+    search if none appears within INFLIGHT_WAIT_SECONDS (a holder that hit a 429
+    or died caches nothing).
+    '''
+
+    def __init__(self, *args, redis_manager: RedisManager, **kwargs):
+        '''
+        Forward the TTL / size kwargs, then wire the Redis client.
+
+        redis_manager : RedisManager whose .client is the shared aioredis handle.
+        '''
+        super().__init__(*args, **kwargs)
+        self._manager = redis_manager
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _resolution_key(self, key: str) -> str:
+        return f'{RESOLUTION_KEY_PREFIX}{self._digest(key)}'
+
+    def _inflight_key(self, search_string: str) -> str:
+        return f'{INFLIGHT_KEY_PREFIX}{self._digest(normalize_search_string(search_string))}'
+
+    async def _get_shared(self, key: str) -> tuple[float, str | None] | None:
+        raw = await self._manager.client.get(self._resolution_key(key))
+        if not raw:
+            return None
+        payload = json.loads(raw)
+        return float(payload['expires']), payload['video_id']
+
+    async def _set_shared(self, key: str, video_id: str | None, expires: float) -> None:
+        await self._manager.client.set(
+            self._resolution_key(key),
+            json.dumps({'video_id': video_id, 'expires': expires}),
+            ex=self._ttl_for(video_id),
+        )
+
+    async def claim(self, search_string: str) -> str | None:
+        '''SET NX a token-tagged in-flight key; None if another pod holds it.'''
+        token = uuid_module.uuid4().hex
+        if await self._manager.client.set(self._inflight_key(search_string), token,
+                                          nx=True, ex=INFLIGHT_TTL_SECONDS):
+            return token
+        return None
+
+    async def release(self, search_string: str, token: str) -> None:
+        '''Delete the in-flight key, but only if it is still this claim's.'''
+        client = self._manager.client
+        inflight_key = self._inflight_key(search_string)
+        if await client.get(inflight_key) == token:
+            await client.delete(inflight_key)
+
+    async def wait_for_peer(self, search_string: str) -> CachedResolution | None:
+        '''
+        Poll the shared layer until the claim holder caches a result.
+
+        Stops early once the claim is released with nothing cached (the holder
+        was rate limited), so the caller falls back to its own search promptly.
+        '''
+        client = self._manager.client
+        inflight_key = self._inflight_key(search_string)
+        key = normalize_search_string(search_string)
+        deadline = asyncio.get_running_loop().time() + INFLIGHT_WAIT_SECONDS
+        while True:
+            shared = await self._get_shared(key)
+            if shared is not None and shared[0] > self._now_seconds():
+                self._set_local(key, shared[1], shared[0])
+                return CachedResolution(shared[1])
+            if not await client.exists(inflight_key):
+                return None
+            if asyncio.get_running_loop().time() >= deadline:
+                return None
+            await asyncio.sleep(INFLIGHT_POLL_INTERVAL_SECONDS)
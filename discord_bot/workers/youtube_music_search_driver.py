@@ -1,12 +1,14 @@
 '''
 Consumer loop body for the YouTube-Music search queue.
 
-One iteration is: wait out a slice of any active 429 window, pop the next queued
-MediaRequest, resolve it to a YouTube videoId, then hand the resolution back to
-the bot through the broker's search-result queue.  The per-request retry policy
-(retry_count, re-enqueue, the RETRY_SEARCH / FAILED lifecycle pushes) lives here
-too — it is request policy rather than queue mechanics, so it belongs with the
-loop that applies it, not with the queue implementation underneath.
+One iteration is: hand back a request the resolution cache answered at submit
+time if there is one; otherwise wait out a slice of any active 429 window, pop
+the next queued MediaRequest, resolve it to a YouTube videoId, then hand the
+resolution back to the bot through the broker's search-result queue.  The
+per-request retry policy (retry_count, re-enqueue, the RETRY_SEARCH / FAILED
+lifecycle pushes) lives here too — it is request policy rather than queue
+mechanics, so it belongs with the loop that applies it, not with the queue
+implementation underneath.
 
 This lives in its own module because it had two drivers, in two different
 processes: the music cog's ``search_youtube_music`` loop against an
@@ -56,9 +58,10 @@ SEARCH_SPAN_NAME = 'music.search_youtube_music'
 # restarts a pod over a rate limit a restart cannot fix.
 SEARCH_BACKOFF_SLICE_SECONDS = 30.0
 
-# Idle backoff when the queue is empty, so an idle pod doesn't busy-spin the
-# pop (which is a Redis round-trip per call in the HA shape).
-SEARCH_IDLE_POLL_BACKOFF_SECONDS = 0.25
+# Longest an idle iteration blocks in wait_for_work before re-polling.  An
+# enqueue wakes it straight away; the cap only bounds how stale loop health and
+# the shutdown check can get while nothing is queued.
+SEARCH_IDLE_WAIT_SECONDS = 5.0
 
 
 class YoutubeMusicSearchDriver:
@@ -66,8 +69,8 @@ class YoutubeMusicSearchDriver:
     Drives one YouTube-Music search per ``run_once`` call.
 
     search_client : anything with the pop/resolve half of the search surface —
-        ``backoff_wait`` / ``backoff_seconds_remaining`` / ``get_input_nowait`` /
-        ``resolve`` / ``submit``.  In-process that is an
+        ``backoff_wait`` / ``backoff_seconds_remaining`` / ``get_cached_nowait`` /
+        ``get_input_nowait`` / ``wait_for_work`` / ``resolve`` / ``submit``.  In-process that is an
         InMemoryYoutubeMusicSearchClient; in the pod it is the
         RedisYoutubeMusicSearchWorker itself (HttpYoutubeMusicSearchClient
         deliberately does NOT implement this half — under HA the loop runs where
@@ -82,7 +85,7 @@ class YoutubeMusicSearchDriver:
     def __init__(self, search_client, broker_client, logger: logging.Logger,
                  max_retries: int = 3, queue_priority: dict[int, int] | None = None,
                  backoff_slice_seconds: float = SEARCH_BACKOFF_SLICE_SECONDS,
-                 idle_sleep_seconds: float = SEARCH_IDLE_POLL_BACKOFF_SECONDS):
+                 idle_wait_seconds: float = SEARCH_IDLE_WAIT_SECONDS):
         '''Wire the driver to its queue, broker and retry policy.'''
         self.search_client = search_client
         self.broker_client = broker_client
@@ -90,7 +93,7 @@ class YoutubeMusicSearchDriver:
         self.max_retries = max_retries
         self.queue_priority = queue_priority or {}
         self.backoff_slice_seconds = backoff_slice_seconds
-        self.idle_sleep_seconds = idle_sleep_seconds
+        self.idle_wait_seconds = idle_wait_seconds
 
     async def _push_lifecycle(self, media_request: MediaRequest, event: LifecycleEvent,
                               **details) -> None:
@@ -136,6 +139,21 @@ class YoutubeMusicSearchDriver:
         concerned) and False when a request hit a 429 and was retried or failed.
         Raises ExitEarlyException, via backoff_wait, when shutdown fires mid-wait.
         '''
+        # Requests the resolution cache already answered at submit time never
+        # touch ytmusicapi, so they go back ahead of the queue and of any 429
+        # window rather than waiting behind searches that do need the API.
+        try:
+            media_request, youtube_music_result = await self.search_client.get_cached_nowait()
+        except QueueEmpty:
+            pass
+        else:
+            async with async_otel_span_wrapper(SEARCH_SPAN_NAME, kind=SpanKind.CLIENT,
+                                               attributes=media_request_attributes(media_request),
+                                               links=span_links_from_context(media_request.span_context)):
+                self.logger.debug(f'Youtube music search cache hit for input "{media_request.search_result.raw_search_string}"')
+                await self._register_resolution(media_request, youtube_music_result)
+            return True
+
         # Wait out any active 429 backoff BEFORE popping, one slice per iteration.
         # Popping first would hold a request in this process's memory for the whole
         # window — and the Redis-backed queue DELetes on pop, so a restart during
@@ -150,9 +168,9 @@ class YoutubeMusicSearchDriver:
         try:
             media_request = await self.search_client.get_input_nowait()
         except QueueEmpty:
-            # Idle: no search queued — back off before the caller re-runs rather
-            # than busy-spinning.
-            await asyncio.sleep(self.idle_sleep_seconds)
+            # Idle: no search queued — block until a submit wakes us (or the cap
+            # passes) before the caller re-runs, rather than busy-spinning.
+            await self.search_client.wait_for_work(self.idle_wait_seconds)
             return True
 
         # Default lifecycle_stage is already SEARCHING — register_request rendered
@@ -167,15 +185,20 @@ class YoutubeMusicSearchDriver:
                 await self._handle_retry(media_request, e)
                 span.set_status(StatusCode.ERROR)
                 return False
-            if youtube_music_result:
-                # This returns the raw id, make sure we add the proper prefix for caching bits
-                media_request.search_result.add_youtube_music_result(f'{YOUTUBE_VIDEO_PREFIX}{youtube_music_result}')
-
-            # Hand the resolved request back through the broker's search-result
-            # queue; the bot's process_search_results loop runs the bot-side tail
-            # (cache-check then download submit), which can only run where the
-            # download client and the cache live.  This is the seam that lets the
-            # search pod return resolutions to a bot it shares no memory with.
-            await self.broker_client.register_search_result(
-                SearchResolution(media_request=media_request, span_context=capture_span_context()))
+            await self._register_resolution(media_request, youtube_music_result)
         return True
+
+    async def _register_resolution(self, media_request: MediaRequest,
+                                   youtube_music_result: str | None) -> None:
+        '''Attach the videoId (if any) and hand the request back to the bot.'''
+        if youtube_music_result:
+            # This returns the raw id, make sure we add the proper prefix for caching bits
+            media_request.search_result.add_youtube_music_result(f'{YOUTUBE_VIDEO_PREFIX}{youtube_music_result}')
+
+        # Hand the resolved request back through the broker's search-result
+        # queue; the bot's process_search_results loop runs the bot-side tail
+        # (cache-check then download submit), which can only run where the
+        # download client and the cache live.  This is the seam that lets the
+        # search pod return resolutions to a bot it shares no memory with.
+        await self.broker_client.register_search_result(
+            SearchResolution(media_request=media_request, span_context=capture_span_context()))
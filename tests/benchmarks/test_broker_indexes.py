@@ -0,0 +1,95 @@
+'''Benchmark: RedisBroker guild / URL lookups at 10k registry entries.
+
+Fills a fakeredis-backed registry with ENTRIES entries spread over GUILDS
+guilds, a few of them checked out, plus a bundle per guild, then times
+get_checked_out_by, can_evict_base and list_bundles_for_guild through the
+secondary indexes. The scan variants reproduce the old approach — SCAN every
+entry or bundle and filter in Python — for comparison.
+
+Run with ``-s`` to see the numbers:
+
+    pytest tests/benchmarks/test_broker_indexes.py -s
+'''
+import time
+
+import fakeredis.aioredis
+import pytest
+
+from discord_bot.clients.redis_client import RedisManager
+from discord_bot.cogs.music_helpers.common import SearchType
+from discord_bot.types.media_request import MediaRequest
+from discord_bot.types.search import SearchResult
+from discord_bot.workers.broker_registry import RedisBrokerRegistry
+from discord_bot.workers.redis_broker import RedisBroker
+
+ENTRIES = 10_000
+GUILDS = 100
+CHECKED_OUT_PER_GUILD = 2
+LOOKUPS = 5
+
+
+def _request(guild_id: int) -> dict:
+    return MediaRequest(
+        guild_id=guild_id, channel_id=2, requester_name='bench', requester_id=9,
+        search_result=SearchResult(search_type=SearchType.DIRECT, raw_search_string='https://example.com'),
+    ).model_dump(mode='json')
+
+
+def _entry(n: int, requests: list[dict]) -> dict:
+    guild_id = n % GUILDS
+    checked_out = n < GUILDS * CHECKED_OUT_PER_GUILD
+    return {
+        'zone': 'checked_out' if checked_out else 'available',
+        'checked_out_by': guild_id if checked_out else None,
+        'guild_file_path': None,
+        'download': {'webpage_url': f'https://example.com/{n}', 'file_path': f'/s3/{n}.pcm'},
+        'request': requests[guild_id],
+    }
+
+
+async def _timed(lookup) -> float:
+    started = time.perf_counter()
+    for n in range(LOOKUPS):
+        await lookup(n)
+    return (time.perf_counter() - started) / LOOKUPS
+
+
+@pytest.mark.asyncio
+async def test_indexed_lookups_scale_with_result_size():
+    '''Indexed lookups return what the full scan returns, in a fraction of the time'''
+    registry = RedisBrokerRegistry(RedisManager.from_client(fakeredis.aioredis.FakeRedis(decode_responses=True)))
+    broker = RedisBroker(registry)
+    requests = [_request(guild_id) for guild_id in range(GUILDS)]
+    await registry.write_entries({f'uuid-{n}': _entry(n, requests) for n in range(ENTRIES)})
+    for guild_id in range(GUILDS):
+        await registry.set_bundle(f'bundle-{guild_id}', {'uuid': f'bundle-{guild_id}', 'guild_id': guild_id})
+
+    async def scan_checked_out(guild_id):
+        return [e for e in await registry.all_entries()
+                if e.get('zone') == 'checked_out' and e.get('checked_out_by') == guild_id]
+
+    async def scan_url(n):
+        return [e for e in await registry.all_entries()
+                if e['download']['webpage_url'] == f'https://example.com/{n}']
+
+    async def scan_bundles(guild_id):
+        return [b['uuid'] for b in await registry.all_bundles() if b.get('guild_id') == guild_id]
+
+    assert len(await broker.get_checked_out_by(3)) == len(await scan_checked_out(3)) == CHECKED_OUT_PER_GUILD
+    assert not await broker.can_evict_base('https://example.com/3')
+    assert await broker.list_bundles_for_guild(3) == await scan_bundles(3) == ['bundle-3']
+
+    timings = {
+        'get_checked_out_by': (await _timed(broker.get_checked_out_by), await _timed(scan_checked_out)),
+        'can_evict_base': (await _timed(lambda n: broker.can_evict_base(f'https://example.com/{n}')),
+                           await _timed(scan_url)),
+        'list_bundles_for_guild': (await _timed(broker.list_bundles_for_guild), await _timed(scan_bundles)),
+    }
+    print(f'\n{ENTRIES} entries, {GUILDS} guilds, mean per lookup:')
+    for name, (indexed, scanned) in timings.items():
+        print(f'  {name}: indexed {indexed * 1000:.2f} ms, scan {scanned * 1000:.2f} ms')
+
+    indexed, scanned = timings['get_checked_out_by']
+    assert indexed * 10 < scanned
+    indexed, scanned = timings['can_evict_base']
+    assert indexed * 10 < scanned
@@ -0,0 +1,70 @@
+'''Benchmark: rendering a 1,000-row bundle through a full lifecycle.
+
+Adds ROWS queued requests to a banner bundle, finalises it, then moves every
+request to IN_PROGRESS and then COMPLETED, rendering after each event -- once
+the way the brokers used to (a BundleRenderer rebuilt from the state for
+every render) and once through a renderer kept between renders.  Each render
+is fed to a MessageMutableBundle, as the dispatcher would, to count the
+Discord sends, edits and deletes it turns into.
+
+Run with ``-s`` to see the numbers:
+
+    pytest tests/benchmarks/test_bundle_render.py -s
+'''
+import time
+
+from discord_bot.cogs.music_helpers.common import SearchType
+from discord_bot.types.media_request import MediaRequest
+from discord_bot.types.search import SearchResult
+from discord_bot.workers.media_bundle import BundleRenderer
+from discord_bot.workers.message_dispatcher import MessageMutableBundle
+
+ROWS = 1_000
+
+
+async def _discord_call(*_args, **_kwargs):
+    '''Stand-in for the send / channel lookup the dispatcher binds; never awaited here.'''
+
+
+def _renderer() -> BundleRenderer:
+    renderer = BundleRenderer.new(1, 2)
+    renderer.set_multi_input_request('benchmark playlist')
+    for n in range(ROWS):
+        media_request = MediaRequest(
+            guild_id=1, channel_id=2, requester_name='bench', requester_id=3,
+            search_result=SearchResult(search_type=SearchType.SEARCH, raw_search_string=f'artist {n} - song {n}'),
+        )
+        media_request.state_machine.mark_queued()
+        renderer.add_media_request(media_request)
+    renderer.all_requests_added()
+    return renderer
+
+
+def _lifecycle(render) -> tuple[float, int]:
+    '''Seconds spent rendering and Discord operations dispatched over the lifecycle.'''
+    renderer = _renderer()
+    messages = MessageMutableBundle(1, 2, sticky_messages=False)
+    operations = len(messages.get_message_dispatch(renderer.print(), _discord_call, _discord_call))
+    elapsed = 0.0
+    for advance in ('mark_in_progress', 'mark_completed'):
+        for req_state in list(renderer.state.bundled_requests):
+            getattr(req_state.media_request.state_machine, advance)()
+            started = time.perf_counter()
+            content = render(renderer)
+            elapsed += time.perf_counter() - started
+            operations += len(messages.get_message_dispatch(content, _discord_call, _discord_call))
+    assert renderer.state.completed == ROWS
+    return elapsed, operations
+
+
+def test_kept_renderer_is_faster_and_edits_less():
+    '''Re-rendering only changed rows and pages beats a full rebuild per event'''
+    rebuilt_seconds, rebuilt_operations = _lifecycle(lambda renderer: BundleRenderer(renderer.state).print())
+    kept_seconds, kept_operations = _lifecycle(lambda renderer: renderer.print())
+    events = 2 * ROWS
+    print(f'\n{ROWS} rows, {events} lifecycle events:')
+    print(f'  rebuilt per render: {rebuilt_seconds / events * 1000:.3f} ms/render, {rebuilt_operations} Discord operations')
+    print(f'  kept renderer:      {kept_seconds / events * 1000:.3f} ms/render, {kept_operations} Discord operations')
+
+    assert kept_seconds * 5 < rebuilt_seconds
+    assert kept_operations <= rebuilt_operations
@@ -0,0 +1,106 @@
+'''Benchmark: markov relation ingestion rate for channel history batches.
+
+Feeds synthetic ChannelHistoryResult batches through the real
+``_process_history_result`` against the test postgres database. The per-pair
+variant reproduces the old path, which opened a session and committed once per
+word pair, so the two rates are directly comparable. Rates count relation
+occurrences, since repeated pairs collapse into one counted row per day.
+
+Run with ``-s`` to see the numbers:
+
+    pytest tests/benchmarks/test_markov_ingestion.py -s
+'''
+import time
+from datetime import datetime, timezone
+from random import Random
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.sql.functions import count as sql_count, sum as sql_sum
+
+from discord_bot.cogs.markov import Markov, clean_message, get_markov_channel_by_ids
+from discord_bot.database import MarkovRelation
+from discord_bot.types.dispatch_result import ChannelHistoryResult
+from discord_bot.types.fetched_message import FetchedMessage
+
+from tests.helpers import async_mock_session, fake_context, fake_engine #pylint:disable=unused-import
+
+BATCHES = 5
+MESSAGES_PER_BATCH = 16
+WORDS_PER_MESSAGE = 40
+VOCABULARY = [f'word{n}' for n in range(50)]
+
+CONFIG = {
+    'general': {
+        'include': {
+            'markov': True
+        }
+    },
+}
+
+
+def _history_batches(guild_id: int, channel_id: int) -> list[ChannelHistoryResult]:
+    '''Deterministic batches of chatty messages'''
+    rng = Random(0)
+    created_at = datetime(2024, 11, 30, tzinfo=timezone.utc)
+    batches = []
+    message_id = 1
+    for _ in range(BATCHES):
+        messages = []
+        for _ in range(MESSAGES_PER_BATCH):
+            content = ' '.join(rng.choice(VOCABULARY) for _ in range(WORDS_PER_MESSAGE))
+            messages.append(FetchedMessage(id=message_id, content=content, created_at=created_at, author_bot=False))
+            message_id += 1
+        batches.append(ChannelHistoryResult(guild_id=guild_id, channel_id=channel_id, messages=messages))
+    return batches
+
+
+async def _per_pair_ingest(cog: Markov, result: ChannelHistoryResult):
+    '''The pre-batching path: one session and commit per relation'''
+    async with cog.with_db_session() as db_session:
+        markov_channel = await get_markov_channel_by_ids(db_session, result.guild_id, result.channel_id)
+        for message in result.messages:
+            corpus = clean_message(message.content, [])
+            for relation in cog.build_relations(corpus, markov_channel.id, message.created_at):
+                async with cog.with_db_session() as relation_session:
+                    await cog.save_relations(relation_session, markov_channel.id, [relation], message.id)
+
+
+async def _relations(engine) -> int:
+    '''Relation occurrences stored so far, summed across the aggregated rows'''
+    async with async_mock_session(engine) as session:
+        return (await session.execute(select(sql_sum(MarkovRelation.count)))).scalar() or 0
+
+
+@pytest.mark.asyncio
+async def test_batched_ingestion_rate(fake_engine, fake_context): #pylint:disable=redefined-outer-name
+    '''Batched ingestion writes the same rows as the per-pair path, much faster'''
+    cog = Markov(fake_context['bot'], CONFIG, fake_context['dispatcher'], fake_engine)
+    await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
+    batches = _history_batches(fake_context['guild'].id, fake_context['channel'].id)
+
+    start = time.perf_counter()
+    for result in batches:
+        await _per_pair_ingest(cog, result)
+    per_pair_seconds = time.perf_counter() - start
+    per_pair_rows = await _relations(fake_engine)
+
+    start = time.perf_counter()
+    for result in batches:
+        await cog._process_history_result(result) #pylint:disable=protected-access
+    batched_seconds = time.perf_counter() - start
+    batched_rows = await _relations(fake_engine) - per_pair_rows
+
+    assert per_pair_rows == batched_rows == BATCHES * MESSAGES_PER_BATCH * WORDS_PER_MESSAGE
+    per_pair_rate = per_pair_rows / per_pair_seconds
+    batched_rate = batched_rows / batched_seconds
+    print(f'\n{batched_rows} relations in {BATCHES} batches of {MESSAGES_PER_BATCH} messages: '
+          f'batched {batched_rate:.0f} rows/s, per-pair {per_pair_rate:.0f} rows/s '
+          f'({batched_rate / per_pair_rate:.1f}x)')
+    assert batched_rate > per_pair_rate
+
+    async with async_mock_session(fake_engine) as session:
+        stored_rows = (await session.execute(select(sql_count()).select_from(MarkovRelation))).scalar()
+    # Both paths fed the same pairs on the same day, so they share one set of rows
+    print(f'{per_pair_rows + batched_rows} relation occurrences stored in {stored_rows} aggregated rows')
+    assert stored_rows < per_pair_rows
@@ -0,0 +1,93 @@
+'''Benchmark: matching a bundle's existing messages to new content.
+
+Builds 50-, 200- and 1,000-message bundles and re-dispatches them after an
+edit to one message, a message dropped from the front, a message dropped from
+the middle and a message appended -- once through the first-match matcher
+get_message_dispatch used before (kept here as a reference copy) and once
+through _align_message_contents -- and reports microseconds per match and the
+Discord operations each plan dispatches.
+
+Run with ``-s`` to see the numbers:
+
+    pytest tests/benchmarks/test_message_dispatch_diff.py -s
+'''
+import time
+
+from discord_bot.workers.message_dispatcher import MessageContext, MessageMutableBundle, _align_message_contents
+
+SIZES = (50, 200, 1_000)
+ITERATIONS = 20
+
+
+async def _discord_call(*_args, **_kwargs):
+    '''Stand-in for the send / channel lookup the dispatcher binds; never awaited here.'''
+
+
+def _first_match_operations(existing: list, new: list) -> int:
+    '''Operations the previous matcher dispatched for existing -> new (keys compared whole).'''
+    mapping = {}
+    for new_index, key in enumerate(new):
+        for existing_index, old_key in enumerate(existing):
+            if old_key == key:
+                mapping[existing_index] = new_index
+                break
+    if len(existing) > len(new):
+        expected_deletes, deletes, operations = len(existing) - len(new), 0, 0
+        for index in reversed(range(len(existing))):
+            if mapping.get(index) is not None:
+                continue
+            if deletes < expected_deletes:
+                deletes += 1
+            operations += 1
+        return operations
+    edits = sum(1 for index in range(len(existing)) if mapping.get(index) != index)
+    return edits + len(new) - len(existing)
+
+
+def _scenarios(size: int) -> dict:
+    existing = [f'row {n:04d} ' * 20 for n in range(size)]
+    edited = list(existing)
+    edited[size // 2] = 'edited ' + edited[size // 2]
+    return {
+        'edit one': edited,
+        'drop first': existing[1:],
+        'drop middle': existing[:size // 2] + existing[size // 2 + 1:],
+        'append': existing + ['appended'],
+    }, existing
+
+
+def _timed(operation) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        operation()
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+def _dispatched(existing: list, new: list) -> int:
+    bundle = MessageMutableBundle(1, 2)
+    bundle.message_contexts = [MessageContext(1, 2, message_id=index, message_content=content)
+                               for index, content in enumerate(existing)]
+    return len(bundle.get_message_dispatch(new, _discord_call, _discord_call))
+
+
+def test_alignment_is_faster_and_dispatches_no_more():
+    '''The alignment never dispatches more than first-match and wins on time at 1,000 messages'''
+    print('\nfirst-match vs alignment, us per match / Discord operations:')
+    for size in SIZES:
+        scenarios, existing = _scenarios(size)
+        old_keys = [(content, None) for content in existing]
+        old_total = new_total = 0.0
+        for name, new in scenarios.items():
+            new_keys = [(content, None) for content in new]
+            old_us = _timed(lambda: _first_match_operations(old_keys, new_keys))  # pylint: disable=cell-var-from-loop
+            new_us = _timed(lambda: _align_message_contents(old_keys, new_keys))  # pylint: disable=cell-var-from-loop
+            old_ops = _first_match_operations(old_keys, new_keys)
+            new_ops = _dispatched(existing, new)
+            print(f'  {size:>5} {name:<11}: first-match {old_us:>9.1f} us {old_ops:>5} ops, '
+                  f'alignment {new_us:>9.1f} us {new_ops:>5} ops')
+
+            assert new_ops <= old_ops
+            old_total += old_us
+            new_total += new_us
+        if size == SIZES[-1]:
+            assert new_total < old_total
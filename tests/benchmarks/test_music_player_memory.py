@@ -0,0 +1,117 @@
+'''Benchmark: resident memory with N guilds playing at once.
+
+Runs each player's real ``player_loop`` against a voice client that holds the
+audio source for the length of the "track" (as discord.py does) and pulls a few
+frames from it, then samples process RSS while every player is mid-track. The
+buffered variant swaps in the old ``PCMAudio(BytesIO(f.read()))`` source so the
+two numbers are directly comparable.
+
+Staged files are sparse, so the only pages that become resident are the ones a
+source actually reads. Run with ``-s`` to see the numbers:
+
+    pytest tests/benchmarks/test_music_player_memory.py -s
+'''
+import asyncio
+import gc
+from contextlib import ExitStack
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from discord import PCMAudio
+from psutil import Process
+import pytest
+
+from discord_bot.cogs.music_helpers.audio_source import PCM_BYTES_PER_SECOND
+from discord_bot.cogs.music_helpers.music_player import MusicPlayer
+from discord_bot.types.queue import Queue
+
+from tests.helpers import FakeVoiceClient, fake_media_download, generate_fake_context
+
+PLAYERS = 8
+TRACK_SECONDS = 60
+TRACK_BYTES = TRACK_SECONDS * PCM_BYTES_PER_SECOND
+FRAMES_READ = 50
+# Players start within milliseconds; this only bounds a broken run.
+SOURCE_WAIT_SECONDS = 30
+
+
+class HoldingVoiceClient(FakeVoiceClient):
+    '''
+    Voice client that keeps the source until finish(), like a track mid-play
+    '''
+    def __init__(self):
+        super().__init__()
+        self.source = None
+        self.after = None
+
+    def play(self, *args, after=None, **_kwargs):
+        source = args[0]
+        self.source = source
+        self.after = after
+        for _ in range(FRAMES_READ):
+            source.read()
+        return True
+
+    def finish(self):
+        '''End the track the way discord.py does once the source runs dry'''
+        self.after()
+
+
+def _buffered_source(file_path: Path, wait_for_bytes=None) -> PCMAudio:  # pylint: disable=unused-argument
+    '''The pre-streaming source: the whole staged file read into memory'''
+    with open(file_path, 'rb') as f:
+        return PCMAudio(BytesIO(f.read()))
+
+
+async def _wait_for_sources(voice_clients: list, tasks: list) -> None:
+    '''Wait until every player has a source, failing if a player loop dies first'''
+    while not all(vc.source for vc in voice_clients):
+        for task in tasks:
+            if task.done():
+                task.result()
+                raise AssertionError('player_loop exited before starting its track')
+        await asyncio.sleep(0.01)
+
+
+async def _rss_growth_while_playing(players: int) -> int:
+    '''Start *players* guilds on a TRACK_SECONDS track each; return RSS growth mid-track'''
+    gc.collect()
+    baseline = Process().memory_info().rss
+    with TemporaryDirectory() as tmp_dir, ExitStack() as stack:
+        voice_clients = []
+        tasks = []
+        for _ in range(players):
+            context = generate_fake_context()
+            voice_client = HoldingVoiceClient()
+            context['guild'].voice_client = voice_client
+            player = MusicPlayer(context['bot'], context['guild'], context['channel'], {}, 10, 1,
+                                 Path(tmp_dir), Mock(), None, Queue())
+            media_download = stack.enter_context(fake_media_download(Path(tmp_dir), fake_context=context))
+            with open(media_download.file_path, 'r+b') as f:
+                f.truncate(TRACK_BYTES)
+            player.add_to_play_queue(media_download)
+            voice_clients.append(voice_client)
+            tasks.append(asyncio.create_task(player.player_loop()))
+        await asyncio.wait_for(_wait_for_sources(voice_clients, tasks), timeout=SOURCE_WAIT_SECONDS)
+        growth = Process().memory_info().rss - baseline
+        for voice_client in voice_clients:
+            voice_client.finish()
+        await asyncio.gather(*tasks)
+    return growth
+
+
+@pytest.mark.asyncio
+async def test_rss_scales_with_players_not_track_length(mocker):
+    '''Streaming playback holds a few KB per player; buffering holds the track'''
+    streaming = await _rss_growth_while_playing(PLAYERS)
+
+    mocker.patch('discord_bot.cogs.music_helpers.music_player.FileBackedPCMAudio', side_effect=_buffered_source)
+    buffered = await _rss_growth_while_playing(PLAYERS)
+
+    total_track_bytes = PLAYERS * TRACK_BYTES
+    print(f'\n{PLAYERS} players x {TRACK_SECONDS}s tracks ({total_track_bytes / 2**20:.0f} MiB of PCM): '
+          f'streaming RSS +{streaming / 2**20:.1f} MiB, buffered RSS +{buffered / 2**20:.1f} MiB')
+    assert buffered > total_track_bytes // 2
+    assert streaming < total_track_bytes // 8
@@ -0,0 +1,139 @@
+'''Benchmark: peak memory and throughput of S3 transfers for large objects.
+
+Runs upload_file/get_file against an in-memory fake of the boto3 client that
+hashes bodies rather than storing them, so the only large allocations left are
+the ones the helpers make. The buffered variants reproduce the old
+read_bytes()/put_object and get_object/read() approach for comparison.
+
+Staged files are sparse and peak memory comes from tracemalloc. Run with ``-s``
+to see the numbers:
+
+    pytest tests/benchmarks/test_s3_streaming.py -s
+'''
+import hashlib
+import time
+import tracemalloc
+from pathlib import Path
+
+from discord_bot.utils.integrations.s3 import (
+    MULTIPART_PART_BYTES, MULTIPART_THRESHOLD_BYTES, TRANSFER_CHUNK_BYTES, get_file, upload_file,
+)
+
+OBJECT_BYTES = 2 * MULTIPART_THRESHOLD_BYTES
+
+
+class FakeBody():
+    '''
+    StreamingBody stand-in that produces *size* zero bytes
+    '''
+    def __init__(self, size: int):
+        self.size = size
+
+    def read(self) -> bytes:
+        '''Whole body at once, as the old get_file did'''
+        return bytes(self.size)
+
+    def iter_chunks(self, chunk_size: int):
+        '''Body in chunk_size pieces'''
+        remaining = self.size
+        while remaining > 0:
+            chunk = bytes(min(chunk_size, remaining))
+            remaining -= len(chunk)
+            yield chunk
+
+
+class FakeS3Client():
+    '''
+    Just enough of the boto3 S3 client for upload_file/get_file; keeps sizes, not bytes
+    '''
+    def __init__(self):
+        self.sizes = {}
+        self.parts = {}
+
+    @staticmethod
+    def _consume(body) -> int:
+        if isinstance(body, bytes):
+            return len(body)
+        size = 0
+        while chunk := body.read(1024 * 1024):
+            size += len(chunk)
+        return size
+
+    def put_object(self, Bucket, Key, Body, **_kwargs): #pylint:disable=invalid-name,unused-argument
+        '''Single-part upload'''
+        self.sizes[Key] = self._consume(Body)
+
+    def create_multipart_upload(self, Bucket, Key): #pylint:disable=invalid-name,unused-argument
+        '''Start a multipart upload'''
+        self.parts[Key] = 0
+        return {'UploadId': Key}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **_kwargs): #pylint:disable=invalid-name,unused-argument,too-many-arguments,too-many-positional-arguments
+        '''Upload one part'''
+        self.parts[Key] += self._consume(Body)
+        return {'ETag': f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload): #pylint:disable=invalid-name,unused-argument
+        '''Finish a multipart upload'''
+        self.sizes[Key] = self.parts.pop(Key)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId): #pylint:disable=invalid-name,unused-argument
+        '''Abort a multipart upload'''
+        self.parts.pop(Key, None)
+
+    def get_object(self, Bucket, Key): #pylint:disable=invalid-name,unused-argument
+        '''Download; the multipart-style ETag skips the checksum comparison'''
+        return {'Body': FakeBody(self.sizes[Key]), 'ETag': '"fake-1"'}
+
+
+def _buffered_upload(s3_client: FakeS3Client, file_path: Path, object_name: str):
+    '''The pre-streaming upload: whole file in memory, single put_object'''
+    data = file_path.read_bytes()
+    s3_client.put_object(Bucket='bucket', Key=object_name, Body=data,
+                         ContentMD5=hashlib.md5(data, usedforsecurity=False).hexdigest())
+
+
+def _buffered_download(s3_client: FakeS3Client, object_name: str, file_path: Path):
+    '''The pre-streaming download: whole body in memory, then written out'''
+    data = s3_client.get_object(Bucket='bucket', Key=object_name)['Body'].read()
+    hashlib.md5(data, usedforsecurity=False).hexdigest()
+    file_path.write_bytes(data)
+
+
+def _measure(func, *args) -> tuple[int, float]:
+    '''Run *func*; return its traced peak allocation in bytes and throughput in MiB/s'''
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, OBJECT_BYTES / 2**20 / elapsed
+
+
+def test_streaming_transfer_peak_memory(mocker, tmp_path):
+    '''Streaming transfers peak at a part or two; buffered transfers hold the whole object'''
+    s3_client = FakeS3Client()
+    mocker.patch('discord_bot.utils.integrations.s3.get_client', return_value=s3_client)
+    source = tmp_path / 'track.pcm'
+    with open(source, 'wb') as f:
+        f.truncate(OBJECT_BYTES)
+
+    upload_peak, upload_rate = _measure(upload_file, 'bucket', source, 'streamed')
+    download_peak, download_rate = _measure(get_file, 'bucket', 'streamed', tmp_path / 'streamed.pcm')
+    buffered_upload_peak, buffered_upload_rate = _measure(_buffered_upload, s3_client, source, 'buffered')
+    buffered_download_peak, buffered_download_rate = _measure(_buffered_download, s3_client, 'buffered',
+                                                              tmp_path / 'buffered.pcm')
+
+    assert s3_client.sizes == {'streamed': OBJECT_BYTES, 'buffered': OBJECT_BYTES}
+    assert (tmp_path / 'streamed.pcm').stat().st_size == OBJECT_BYTES
+    print(f'\n{OBJECT_BYTES / 2**20:.0f} MiB object: '
+          f'upload peak {upload_peak / 2**20:.1f} MiB at {upload_rate:.0f} MiB/s '
+          f'(buffered {buffered_upload_peak / 2**20:.1f} MiB at {buffered_upload_rate:.0f} MiB/s), '
+          f'download peak {download_peak / 2**20:.1f} MiB at {download_rate:.0f} MiB/s '
+          f'(buffered {buffered_download_peak / 2**20:.1f} MiB at {buffered_download_rate:.0f} MiB/s)')
+    # The part being sent and the next part being read overlap briefly
+    assert upload_peak <= 2 * MULTIPART_PART_BYTES + TRANSFER_CHUNK_BYTES
+    assert download_peak < OBJECT_BYTES // 16
+    assert buffered_upload_peak >= OBJECT_BYTES
+    assert buffered_download_peak >= OBJECT_BYTES
@@ -105,3 +105,19 @@ def test_default_message_delete_after_matches_music_config():
     yt-dlp into a slim pod). Pin them together so the copy cannot drift.'''
     assert (broker_cli.DEFAULT_MESSAGE_DELETE_AFTER
             == MusicGeneralConfig().message_delete_after)
+
+
+def test_run_passes_bundle_render_interval(mocker):
+    '''music.general.bundle_render_interval_seconds reaches the broker, defaulting
+    to the MusicGeneralConfig value; the broker itself goes to run_broker so
+    shutdown can flush the renders it is holding back.'''
+    mocks = _patch_collaborators(mocker)
+
+    broker_cli.run(_settings(), _GeneralConfig())
+    _, broker_kwargs = mocks['RedisBroker'].call_args
+    assert broker_kwargs['bundle_render_interval_seconds'] == MusicGeneralConfig().bundle_render_interval_seconds
+    assert mocks['run_broker'].call_args.kwargs['broker'] is mocks['RedisBroker'].return_value
+
+    broker_cli.run(_settings(music_general={'bundle_render_interval_seconds': 0}), _GeneralConfig())
+    _, broker_kwargs = mocks['RedisBroker'].call_args
+    assert broker_kwargs['bundle_render_interval_seconds'] == 0
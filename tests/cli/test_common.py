@@ -1,5 +1,6 @@
 import logging
 from tempfile import TemporaryDirectory
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from opentelemetry.instrumentation.logging.handler import LoggingHandler
@@ -7,10 +8,13 @@ import pytest
 
 from discord_bot.cli._lib.common import (
     setup_logging, setup_observability, setup_profiling, require_discord_token,
+    register_channel_event_forwarding,
 )
 from discord_bot.exceptions import DiscordBotException
 from discord_bot.utils.common import GeneralConfig
 
+from tests.helpers import fake_bot_yielder
+
 
 def test_require_discord_token_returns_token():
     '''A gateway process gets its token back when one is configured.'''
@@ -137,3 +141,25 @@ def test_setup_profiling_skips_gc_census_when_absent():
     with patch('discord_bot.cli._lib.common.GcCensusProfiler') as profiler_cls:
         setup_profiling(cfg, MagicMock())
     profiler_cls.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_channel_event_forwarding_sends_guild_message_events():
+    '''Guild message creates and deletes reach the dispatcher; DMs do not.'''
+    bot = fake_bot_yielder()()
+    dispatcher = MagicMock()
+    register_channel_event_forwarding(bot, dispatcher)
+    (on_message,) = bot.listeners['on_message']
+    (on_delete,) = bot.listeners['on_raw_message_delete']
+    (on_bulk_delete,) = bot.listeners['on_raw_bulk_message_delete']
+
+    await on_message(SimpleNamespace(id=30, guild=SimpleNamespace(id=1), channel=SimpleNamespace(id=2)))
+    await on_message(SimpleNamespace(id=31, guild=None, channel=SimpleNamespace(id=3)))
+    await on_delete(SimpleNamespace(guild_id=1, channel_id=2, message_id=30))
+    await on_bulk_delete(SimpleNamespace(guild_id=1, channel_id=2, message_ids={28, 29}))
+
+    assert [c.args + (c.kwargs,) for c in dispatcher.record_channel_event.call_args_list] == [
+        (1, 2, {'added': [30]}),
+        (1, 2, {'deleted': [30]}),
+        (1, 2, {'deleted': [28, 29]}),
+    ]
@@ -10,6 +10,7 @@ from discord_bot.cli._lib import common as cli_common
 # scaffolding now (cli/_lib/worker_pod.py), so that is where they are patched.
 from discord_bot.cli._lib import worker_pod
 from discord_bot.exceptions import DiscordBotException, ExitEarlyException
+from discord_bot.utils.audio import AudioFormat
 from discord_bot.utils.loop_health import LOOP_HEALTH, LoopHealth, LoopStatus
 
 
@@ -202,6 +203,22 @@ def test_run_forwards_pool_egress_config(mocker):
     assert kwargs['egress_exits'] == ['us-lax-wg-001', 'us-nyc-wg-301']
 
 
+def test_run_defaults_audio_format_to_pcm(mocker):
+    '''With no audio_format configured, downloads keep converting to raw PCM.'''
+    mocks = _patch_collaborators(mocker)
+    downloader_cli.run(_settings(), _GeneralConfig())
+    _, kwargs = mocks['RedisDownloadWorker'].call_args
+    assert kwargs['audio_format'] == AudioFormat.PCM
+
+
+def test_run_forwards_opus_audio_format(mocker):
+    '''music.download.audio_format selects the Opus cache format.'''
+    mocks = _patch_collaborators(mocker)
+    downloader_cli.run(_settings(extra_download={'audio_format': 'opus'}), _GeneralConfig())
+    _, kwargs = mocks['RedisDownloadWorker'].call_args
+    assert kwargs['audio_format'] == AudioFormat.OPUS
+
+
 def test_run_respects_configured_server_host_and_port(mocker):
     '''general.downloader_server overrides host/port.'''
     mocks = _patch_collaborators(mocker)
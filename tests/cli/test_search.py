@@ -123,6 +123,28 @@ def test_run_forwards_backoff_and_retry_config(mocker):
     assert mocks['YoutubeMusicSearchDriver'].call_args.kwargs['max_retries'] == 5
 
 
+def test_run_wires_the_shared_resolution_cache(mocker):
+    '''The worker gets a Redis-backed resolution cache built from music.download.'''
+    mocks = _patch_collaborators(mocker)
+    settings = _settings(extra_download={
+        'search_cache_ttl_seconds': 600,
+        'search_cache_negative_ttl_seconds': 60,
+        'search_cache_max_entries': 50,
+    })
+    search_cli.run(settings, _GeneralConfig())
+
+    cache = mocks['RedisYoutubeMusicSearchWorker'].call_args.kwargs['resolution_cache']
+    assert isinstance(cache, search_cli.RedisSearchResolutionCache)
+    assert (cache.ttl_seconds, cache.negative_ttl_seconds, cache.max_entries) == (600, 60, 50)
+
+
+def test_run_disables_resolution_cache_with_zero_ttl(mocker):
+    '''search_cache_ttl_seconds: 0 runs every search against the API, as before.'''
+    mocks = _patch_collaborators(mocker)
+    search_cli.run(_settings(extra_download={'search_cache_ttl_seconds': 0}), _GeneralConfig())
+    assert mocks['RedisYoutubeMusicSearchWorker'].call_args.kwargs['resolution_cache'] is None
+
+
 def test_run_forwards_server_queue_priority(mocker):
     '''
     Guild priorities reach the driver, so a retried request keeps its priority.
@@ -388,6 +388,81 @@ class TestHttpBrokerClient:
             assert await hc.check_cache(mr) is None
 
 
+@pytest.mark.asyncio
+class TestHttpBrokerClientResultBatches:
+    '''Long-poll batch result endpoints — broken out from TestHttpBrokerClient
+    so the parent class stays under pylint's too-many-public-methods limit.'''
+
+    async def test_next_results_returns_a_burst_in_one_round_trip(self, mocker):
+        '''next_results hands back every queued result up to max_results, in
+        order, with one span for the batch.'''
+        broker = _make_broker()
+        result_queue = AsyncioDownloadResultQueue()
+        server = BrokerHttpServer(broker, result_queue=result_queue)
+        requests = [_make_request() for _ in range(3)]
+        for mr in requests:
+            await result_queue.put(_dl_result(mr))
+        async with TestClient(TestServer(server.build_app())) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            span_spy = mocker.patch.object(
+                http_broker_client_module, 'async_otel_span_wrapper',
+                wraps=http_broker_client_module.async_otel_span_wrapper,
+            )
+            batch = await hc.next_results(2, 1)
+            rest = await hc.next_results(10, 1)
+        assert [str(r.media_request.uuid) for r in batch + rest] == [str(mr.uuid) for mr in requests]
+        assert len(batch) == 2
+        assert span_spy.call_count == 2
+
+    async def test_next_results_waits_for_a_result(self):
+        '''An empty long-poll is held open and answered when a result lands.'''
+        broker = _make_broker()
+        result_queue = AsyncioDownloadResultQueue()
+        server = BrokerHttpServer(broker, result_queue=result_queue)
+        mr = _make_request()
+        async with TestClient(TestServer(server.build_app())) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+
+            async def _put_later():
+                await asyncio.sleep(0.05)
+                await result_queue.put(_dl_result(mr))
+
+            putter = asyncio.create_task(_put_later())
+            batch = await hc.next_results(4, 5)
+            await putter
+        assert [str(r.media_request.uuid) for r in batch] == [str(mr.uuid)]
+
+    async def test_next_results_empty_after_wait(self, mocker):
+        '''A long-poll that times out returns [] and mints no span.'''
+        server = BrokerHttpServer(_make_broker())
+        async with TestClient(TestServer(server.build_app())) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            span_spy = mocker.patch.object(
+                http_broker_client_module, 'async_otel_span_wrapper',
+                wraps=http_broker_client_module.async_otel_span_wrapper,
+            )
+            assert await hc.next_results(4, 0.05) == []
+            assert await hc.next_search_results(4, 0.05) == []
+        span_spy.assert_not_called()
+
+    async def test_next_search_results_round_trip(self):
+        '''register_search_result then next_search_results returns it.'''
+        mr = _make_request()
+        server = BrokerHttpServer(_make_broker(), search_result_queue=AsyncioSearchResultQueue())
+        async with TestClient(TestServer(server.build_app())) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            await hc.register_search_result(SearchResolution(media_request=mr, span_context={'t': 1}))
+            batch = await hc.next_search_results(4, 1)
+        assert [str(r.media_request.uuid) for r in batch] == [str(mr.uuid)]
+
+    async def test_batch_route_clamps_and_validates_params(self):
+        '''?max= and ?wait= are clamped to the server caps; junk is a 422.'''
+        server = BrokerHttpServer(_make_broker())
+        async with TestClient(TestServer(server.build_app())) as tc:
+            assert (await tc.get('/results/batch', params={'max': 'lots'})).status == 422
+            assert (await tc.get('/results/batch', params={'max': '-5', 'wait': '-1'})).status == 204
+
+
 @pytest.mark.asyncio
 class TestHttpBrokerClientCacheAndQueue:
     '''Cache + result-queue endpoints — broken out from TestHttpBrokerClient
@@ -578,6 +653,17 @@ class TestInMemoryBrokerClientFullSurface:
         assert popped.media_request is mr
         assert await client.next_result() is None
 
+    async def test_next_results_and_next_search_results_batch(self):
+        broker = _make_broker()
+        client = InMemoryBrokerClient(broker, AsyncioDownloadResultQueue())
+        first, second = _make_request(), _make_request()
+        await client.register_download_result(_dl_result(first))
+        await client.register_download_result(_dl_result(second))
+        assert [r.media_request for r in await client.next_results(5, 0.01)] == [first, second]
+        assert await client.next_results(5, 0.01) == []
+        await client.register_search_result(SearchResolution(media_request=first, span_context={}))
+        assert [r.media_request for r in await client.next_search_results(5, 0.01)] == [first]
+
     async def test_register_download_remove_discard_delegate(self):
         broker = _make_broker()
         mr = _make_request()
@@ -592,6 +678,18 @@ class TestInMemoryBrokerClientFullSurface:
         await client.remove(str(mr.uuid))
         assert await broker.get_entry(str(mr.uuid)) is None
 
+    async def test_batch_lifecycle_methods_delegate(self):
+        broker = _make_broker()
+        requests = [_make_request(), _make_request()]
+        client = InMemoryBrokerClient(broker, AsyncioDownloadResultQueue())
+        await client.register_requests(requests)
+        await client.update_status_many([(str(requests[0].uuid), LifecycleStatusUpdate(event=LifecycleEvent.QUEUED))])
+        entry = await broker.get_entry(str(requests[0].uuid))
+        assert entry.request.lifecycle_stage == MediaRequestLifecycleStage.QUEUED
+        assert await broker.get_entry(str(requests[1].uuid)) is not None
+        broker.check_cache = AsyncMock(side_effect=['cached', None])
+        assert await client.check_cache_many(requests) == ['cached', None]
+
     async def test_cache_methods_delegate(self):
         broker = _make_broker()
         broker.check_cache = AsyncMock(return_value='cached')
@@ -603,6 +701,52 @@ class TestInMemoryBrokerClientFullSurface:
         assert await client.get_cache_count() == 5
 
 
+@pytest.mark.asyncio
+class TestHttpBrokerClientBatch:
+    '''The /batch lifecycle routes a playlist page is enqueued through.'''
+
+    async def test_register_and_update_a_page_in_one_request_each(self, mocker):
+        broker = _make_broker()
+        requests = [_make_request() for _ in range(3)]
+        server = BrokerHttpServer(broker)
+        async with TestClient(TestServer(server.build_app())) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            http_spy = mocker.spy(hc, '_http')
+            await hc.register_requests(requests)
+            await hc.update_status_many(
+                [(str(mr.uuid), LifecycleStatusUpdate(event=LifecycleEvent.QUEUED)) for mr in requests]
+                + [(str(requests[0].uuid), LifecycleStatusUpdate(event=LifecycleEvent.IN_PROGRESS))])
+            # Empty batches make no request at all
+            await hc.register_requests([])
+            await hc.update_status_many([])
+        assert http_spy.await_count == 2
+        stages = [(await broker.get_entry(str(mr.uuid))).request.lifecycle_stage for mr in requests]
+        assert stages == [MediaRequestLifecycleStage.IN_PROGRESS,
+                          MediaRequestLifecycleStage.QUEUED, MediaRequestLifecycleStage.QUEUED]
+
+    async def test_check_cache_many_answers_each_request_in_order(self):
+        broker = _make_broker()
+        hit_request, miss_request = _make_request(), _make_request()
+        with TemporaryDirectory() as tmp_dir:
+            with fake_media_download(tmp_dir, media_request=hit_request) as md:
+                broker.check_cache = AsyncMock(side_effect=[md, None])
+                server = BrokerHttpServer(broker)
+                async with TestClient(TestServer(server.build_app())) as tc:
+                    hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+                    hit, miss = await hc.check_cache_many([hit_request, miss_request])
+                    assert await hc.check_cache_many([]) == []
+                assert miss is None
+                assert hit.media_request is hit_request
+                assert str(hit.file_path) == str(md.file_path)
+
+    async def test_batch_routes_reject_malformed_bodies(self):
+        server = BrokerHttpServer(_make_broker())
+        async with TestClient(TestServer(server.build_app())) as tc:
+            assert (await tc.post('/batch/requests', json={'requests': [{'bogus': 1}]})).status == 422
+            assert (await tc.put('/batch/status', json={'updates': [{'uuid': 'x'}]})).status == 422
+            assert (await tc.post('/batch/cache/check', json={})).status == 422
+
+
 # ---------------------------------------------------------------------------
 # Player sessions
 # ---------------------------------------------------------------------------
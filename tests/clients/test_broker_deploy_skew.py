@@ -15,6 +15,7 @@ routes removed, standing in for the older peer.
 '''
 import asyncio
 import logging
+from unittest.mock import AsyncMock
 
 import pytest
 from aiohttp import web
@@ -22,7 +23,9 @@ from aiohttp.client_exceptions import ClientResponseError
 from aiohttp.test_utils import TestClient, TestServer
 
 from discord_bot.clients.broker_client import HttpBrokerClient
+from discord_bot.cogs.music_helpers.common import MediaRequestLifecycleStage
 from discord_bot.servers.broker_server import BrokerHttpServer
+from discord_bot.types.download import LifecycleEvent, LifecycleStatusUpdate
 from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.utils.common import return_loop_runner
 from discord_bot.utils.loop_health import LoopHealth
@@ -107,6 +110,48 @@ class TestSeamClientToleratesSkew:
             hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
             assert await hc.next_result() is None
 
+    async def test_next_results_falls_back_to_the_single_result_route(self, mocker):
+        # A broker from before the batch routes still serves /results/next; the
+        # client falls back to it, and paces an empty answer instead of spinning.
+        server = BrokerHttpServer(_make_broker())
+        app = server.build_app()
+        stripped = web.Application(middlewares=app.middlewares)
+        for route in app.router.routes():
+            if route.resource.canonical in ('/results/batch', '/search-results/batch'):
+                continue
+            stripped.router.add_route(route.method, route.resource.canonical, route.handler)
+        sleep_mock = mocker.patch('discord_bot.clients.http_broker_client.sleep', new=AsyncMock())
+        mr = _make_request()
+        async with TestClient(TestServer(stripped)) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            assert await hc.next_search_results(8, 10) == []
+            sleep_mock.assert_awaited_once_with(1.0)
+            await hc.register_search_result(SearchResolution(media_request=mr, span_context={'t': 1}))
+            batch = await hc.next_search_results(8, 10)
+        assert [str(r.media_request.uuid) for r in batch] == [str(mr.uuid)]
+
+    async def test_batch_lifecycle_calls_fall_back_to_one_request_each(self):
+        # A broker from before the /batch routes 404s them; the client sends
+        # the same work through the per-request routes instead.
+        broker = _make_broker()
+        server = BrokerHttpServer(broker)
+        app = server.build_app()
+        stripped = web.Application(middlewares=app.middlewares)
+        for route in app.router.routes():
+            if route.resource.canonical.startswith('/batch/'):
+                continue
+            stripped.router.add_route(route.method, route.resource.canonical, route.handler)
+        requests = [_make_request(), _make_request()]
+        async with TestClient(TestServer(stripped)) as tc:
+            hc = HttpBrokerClient(str(tc.make_url('')), session=tc.session)
+            await hc.register_requests(requests)
+            await hc.update_status_many([(str(mr.uuid), LifecycleStatusUpdate(event=LifecycleEvent.QUEUED))
+                                         for mr in requests])
+            assert await hc.check_cache_many(requests) == [None, None]
+        for mr in requests:
+            entry = await broker.get_entry(str(mr.uuid))
+            assert entry.request.lifecycle_stage == MediaRequestLifecycleStage.QUEUED
+
     async def test_register_search_result_still_raises_on_other_4xx(self):
         # 404 means "route not there yet"; any other client error is real and
         # must not be swallowed by the skew tolerance.
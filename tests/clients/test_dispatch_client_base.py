@@ -5,6 +5,7 @@ import pytest
 
 from discord_bot.clients.dispatch_client_base import DispatchClientBase, RESULT_QUEUE_MAX_SIZE
 from discord_bot.types.dispatch_request import (
+    BulkDeleteRequest,
     DeleteRequest,
     FetchChannelHistoryRequest,
     FetchGuildEmojisRequest,
@@ -19,6 +20,7 @@ class _ConcreteClient(DispatchClientBase):
         self._cog_queues = {}
         self.sent = []
         self.deleted = []
+        self.bulk_deleted = []
 
     def _handle_send(self, request):
         self.sent.append(request)
@@ -26,6 +28,9 @@ class _ConcreteClient(DispatchClientBase):
     def _handle_delete(self, request):
         self.deleted.append(request)
 
+    def _handle_bulk_delete(self, request):
+        self.bulk_deleted.append(request)
+
     async def _do_fetch_history(self, params: dict) -> dict:
         return {'guild_id': params['guild_id'], 'channel_id': params['channel_id'], 'messages': []}
 
@@ -67,6 +72,13 @@ def test_handle_delete_raises_not_implemented():
         base._handle_delete(DeleteRequest(guild_id=1, channel_id=2, message_id=3))  # pylint: disable=protected-access
 
 
+def test_handle_bulk_delete_raises_not_implemented():
+    '''_handle_bulk_delete raises NotImplementedError when not overridden by a subclass.'''
+    base = DispatchClientBase.__new__(DispatchClientBase)
+    with pytest.raises(NotImplementedError):
+        base._handle_bulk_delete(BulkDeleteRequest(guild_id=1, channel_id=2, message_ids=[3, 4]))  # pylint: disable=protected-access
+
+
 # ---------------------------------------------------------------------------
 # Unregistered cog queue early-return guards (lines 58, 82)
 # ---------------------------------------------------------------------------
@@ -5,10 +5,12 @@ import asyncio
 
 import aiohttp
 import pytest
+from aiohttp import web
 from aiohttp.test_utils import TestClient, TestServer
 
 from discord_bot.servers.dispatch_server import DispatchHttpServer
 from discord_bot.types.dispatch_request import (
+    BulkDeleteRequest,
     DeleteRequest,
     FetchChannelHistoryRequest,
     FetchGuildEmojisRequest,
@@ -16,7 +18,8 @@ from discord_bot.types.dispatch_request import (
 )
 from discord_bot.types.dispatch_result import ChannelHistoryResult, GuildEmojisResult
 from discord_bot.clients.dispatch_client_base import DispatchRemoteError
-from discord_bot.clients.http_dispatch_client import HttpDispatchClient
+from discord_bot.clients.http_dispatch_client import _BREAKER, HttpDispatchClient
+from discord_bot.utils.circuit_breaker import CircuitState
 from tests.helpers import FakeDispatchServer, FakeRedisDispatchQueue
 
 
@@ -119,7 +122,15 @@ async def test_update_mutable_posts_to_server():
     async with TestClient(TestServer(server.build_app())) as tc:
         client = HttpDispatchClient(str(tc.make_url('')), session=tc.session)
         client.update_mutable('k', 1, ['msg'], 2)
+        client.update_mutable('k', 1, ['msg 2'], 2)
         await _wait_for_call(dispatcher, 'update_mutable')
+        for _ in range(500):
+            if len([c for c in dispatcher.calls if c[0] == 'update_mutable']) == 2:
+                break
+            await asyncio.sleep(0.01)
+    # Each render is sequenced on the client, in the order it was made.
+    seqs = {call[3][0]: call[5] for call in dispatcher.calls if call[0] == 'update_mutable'}
+    assert seqs['msg'] < seqs['msg 2']
 
 
 @pytest.mark.asyncio
@@ -152,6 +163,34 @@ async def test_update_mutable_channel_posts_to_server():
         await _wait_for_call(dispatcher, 'update_mutable_channel')
 
 
+@pytest.mark.asyncio
+async def test_record_channel_event_posts_to_server():
+    '''record_channel_event fire-and-forget POSTs to /dispatch/channel_event.'''
+    dispatcher, server = _make_setup()
+    async with TestClient(TestServer(server.build_app())) as tc:
+        client = HttpDispatchClient(str(tc.make_url('')), session=tc.session)
+        client.record_channel_event(1, 2, added=[30])
+        await _wait_for_call(dispatcher, 'record_channel_event')
+    assert ('record_channel_event', 1, 2, [30], []) in dispatcher.calls
+
+
+@pytest.mark.asyncio
+async def test_record_channel_event_pauses_when_dispatcher_lacks_route(mocker):
+    '''A 404 from a not-yet-upgraded dispatcher pauses forwarding and leaves the breaker closed.'''
+    post = mocker.spy(HttpDispatchClient, '_post_channel_event')
+    async with TestClient(TestServer(web.Application())) as tc:
+        client = HttpDispatchClient(str(tc.make_url('')), session=tc.session)
+        client.record_channel_event(1, 2, added=[30])
+        for _ in range(500):
+            if client._channel_events_paused_until:  # pylint: disable=protected-access
+                break
+            await asyncio.sleep(0.01)
+        client.record_channel_event(1, 2, deleted=[30])
+        await asyncio.sleep(0.05)
+    assert post.call_count == 1
+    assert _BREAKER.state is CircuitState.CLOSED
+
+
 # ---------------------------------------------------------------------------
 # submit_request routing
 # ---------------------------------------------------------------------------
@@ -180,6 +219,38 @@ async def test_submit_request_delete():
         await _wait_for_call(dispatcher, 'delete_message')
 
 
+@pytest.mark.asyncio
+async def test_submit_request_bulk_delete():
+    '''submit_request routes a BulkDeleteRequest to bulk_delete_messages on the server.'''
+    dispatcher, server = _make_setup()
+    async with TestClient(TestServer(server.build_app())) as tc:
+        client = HttpDispatchClient(str(tc.make_url('')), session=tc.session)
+        await client.submit_request(BulkDeleteRequest(
+            guild_id=1, channel_id=2, message_ids=[3, 4],
+        ))
+        await _wait_for_call(dispatcher, 'bulk_delete_messages')
+    assert ('bulk_delete_messages', 1, 2, [3, 4]) in dispatcher.calls
+
+
+@pytest.mark.asyncio
+async def test_submit_request_bulk_delete_falls_back_without_route():
+    '''A dispatcher without /dispatch/bulk_delete gets single deletes, and the breaker stays closed.'''
+    dispatcher, server = _make_setup()
+    app = web.Application()
+    app.router.add_post('/dispatch/delete', server._handle_delete)  # pylint: disable=protected-access
+    async with TestClient(TestServer(app)) as tc:
+        client = HttpDispatchClient(str(tc.make_url('')), session=tc.session)
+        await client.submit_request(BulkDeleteRequest(
+            guild_id=1, channel_id=2, message_ids=[3, 4],
+        ))
+        for _ in range(500):
+            if len(dispatcher.calls) == 2:
+                break
+            await asyncio.sleep(0.01)
+    assert sorted(dispatcher.calls) == [('delete_message', 1, 2, 3), ('delete_message', 1, 2, 4)]
+    assert _BREAKER.state is CircuitState.CLOSED
+
+
 # ---------------------------------------------------------------------------
 # Awaitable fetch via submit_request
 # ---------------------------------------------------------------------------
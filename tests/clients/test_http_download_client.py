@@ -6,10 +6,11 @@ TestServer + TestClient; the RedisDownloadWorker is replaced by a small fake tha
 records calls + returns canned responses.  RedisDownloadWorker.status_snapshot
 itself is covered against fakeredis in tests/workers/test_redis_download_worker.py.
 '''
+from asyncio import QueueFull
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from aiohttp import ClientResponseError
+from aiohttp import ClientResponseError, web
 from aiohttp.test_utils import TestClient, TestServer
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
@@ -51,6 +52,7 @@ class _FakeWorker:
 
     def __init__(self, *, status=None, clear_items=None):
         self.submit = AsyncMock()
+        self.submit_many = AsyncMock(return_value=[])
         self.block_guild = AsyncMock(return_value=True)
         self.status_snapshot = AsyncMock(return_value=status or {
             'failure_summary': '0 failures in queue',
@@ -428,6 +430,62 @@ async def test_submit_rejection_leaves_both_seam_spans_ok():
         assert span.attributes['queue.submit_rejection'] == 'PutsBlocked'
 
 
+# ---------------------------------------------------------------------------
+# submit_many (one round trip per page)
+# ---------------------------------------------------------------------------
+
+def _pre_batch_app(server: DownloadHttpServer) -> web.Application:
+    '''The worker app as it was before the batch route, for deploy-skew tests.'''
+    live = server.build_app()
+    app = web.Application(middlewares=live.middlewares)
+    for route in live.router.routes():
+        if route.resource.canonical.endswith('/batch'):
+            continue
+        app.router.add_route(route.method, route.resource.canonical, route.handler)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_submit_many_decodes_outcomes_per_request():
+    '''submit_many is one POST; each outcome comes back as None or the rejection.'''
+    worker, server = _make_server()
+    worker.submit_many = AsyncMock(return_value=[None, QueueFull('full')])
+    async with TestClient(TestServer(server.build_app())) as tc:
+        client = HttpDownloadClient(str(tc.make_url('')), session=tc.session)
+        outcomes = await client.submit_many(7, [_media_request(guild_id=7), _media_request(guild_id=7)],
+                                            priority=2)
+    assert outcomes[0] is None
+    assert isinstance(outcomes[1], QueueFull)
+    args, kwargs = worker.submit_many.await_args
+    assert args[0] == 7
+    assert len(args[1]) == 2
+    assert kwargs['priority'] == 2
+    worker.submit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_submit_many_falls_back_to_submit_on_older_worker():
+    '''A worker without the batch route 404s; requests then go one submit each,
+    and the first refusal stands for the rest of the page.'''
+    worker, server = _make_server()
+    worker.submit = AsyncMock(side_effect=[None, PutsBlocked('blocked')])
+    async with TestClient(TestServer(_pre_batch_app(server))) as tc:
+        client = HttpDownloadClient(str(tc.make_url('')), session=tc.session)
+        outcomes = await client.submit_many(7, [_media_request(guild_id=7) for _ in range(3)])
+    assert outcomes[0] is None
+    assert all(isinstance(outcome, PutsBlocked) for outcome in outcomes[1:])
+    assert worker.submit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_many_endpoint_rejects_malformed_body():
+    '''Missing media_requests → 422 from /downloads/batch.'''
+    _, server = _make_server()
+    async with TestClient(TestServer(server.build_app())) as tc:
+        resp = await tc.post('/downloads/batch', json={'guild_id': 7})
+    assert resp.status == 422
+
+
 # ---------------------------------------------------------------------------
 # Status-poller span volume
 #
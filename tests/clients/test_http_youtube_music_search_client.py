@@ -119,8 +119,8 @@ def test_client_omits_the_pop_and_resolve_surface():
     back to the bot through the broker's search-result queue, not this client.  A
     call site that reaches for one is a wiring bug and should fail loudly.'''
     client = HttpYoutubeMusicSearchClient('http://localhost:9999')
-    for attribute in ('resolve', 'get_input_nowait', 'backoff_wait',
-                      'set_wait_timestamp', 'local_worker'):
+    for attribute in ('resolve', 'get_input_nowait', 'get_cached_nowait', 'wait_for_work',
+                      'backoff_wait', 'set_wait_timestamp', 'local_worker'):
         assert not hasattr(client, attribute)
 
 
@@ -127,3 +127,21 @@ async def test_backoff_wait_forwards_max_wait_seconds():
 
     # Slice elapsed but the window is untouched — still counting down.
     assert client.backoff_seconds_remaining > 0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_work_wakes_on_submit():
+    '''An idle wait_for_work returns as soon as a search is submitted.'''
+    client = _client()
+    waiter = asyncio.create_task(client.wait_for_work(5))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    await client.submit(1, _request())
+    await asyncio.wait_for(waiter, 1)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_work_times_out_when_idle():
+    '''With nothing submitted, wait_for_work gives up after its timeout.'''
+    client = _client()
+    await asyncio.wait_for(client.wait_for_work(0.01), 1)
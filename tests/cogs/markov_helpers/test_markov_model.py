@@ -0,0 +1,113 @@
+from discord_bot.cogs.markov_helpers.markov_model import MarkovModel, MarkovModelCache
+
+
+def _model(*pairs) -> MarkovModel:
+    model = MarkovModel()
+    for leader_word, follower_word, count in pairs:
+        model.add(leader_word, follower_word, count)
+    return model
+
+
+def test_next_word_weighted_by_count():
+    '''Followers are drawn by cumulative count, in first-seen order'''
+    model = _model(('hey', 'you', 1), ('hey', 'there', 3))
+    assert model.next_word('hey', 0.0) == 'you'
+    assert model.next_word('hey', 0.24) == 'you'
+    assert model.next_word('hey', 0.25) == 'there'
+    assert model.next_word('hey', 0.99) == 'there'
+    assert model.next_word('missing', 0.5) is None
+
+
+def test_random_leader_weighted_by_count():
+    '''Leaders are weighted by the total count of their pairs'''
+    model = _model(('a', 'b', 1), ('c', 'd', 2), ('c', 'e', 1))
+    assert model.random_leader(0.0) == 'a'
+    assert model.random_leader(0.3) == 'c'
+    assert MarkovModel().random_leader(0.5) is None
+
+
+def test_add_recompiles_only_changed_leader():
+    '''Adding counts after a draw is reflected in the next draw'''
+    model = _model(('hey', 'you', 1))
+    assert model.next_word('hey', 0.9) == 'you'
+    model.add('hey', 'there', 9)
+    assert model.next_word('hey', 0.9) == 'there'
+    assert model.random_leader(0.9) == 'hey'
+    assert model.size == 2
+    assert model.has_leader('hey')
+    assert not model.has_leader('there')
+
+
+def test_cache_hit_miss_and_lru_eviction():
+    '''The least recently used guild is evicted past max_guilds'''
+    cache = MarkovModelCache(max_guilds=2, max_transitions=100)
+    assert cache.get(1) is None
+    for guild_id in (1, 2):
+        assert cache.put(guild_id, _model(('a', 'b', 1)), cache.version(guild_id))
+    assert cache.get(1) is not None
+    cache.put(3, _model(('a', 'b', 1)), cache.version(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.transitions == 2
+
+
+def test_cache_transition_budget():
+    '''Models are evicted until the total transition count fits the budget'''
+    cache = MarkovModelCache(max_guilds=10, max_transitions=3)
+    cache.put(1, _model(('a', 'b', 1), ('b', 'c', 1)), cache.version(1))
+    cache.put(2, _model(('a', 'b', 1), ('b', 'c', 1)), cache.version(2))
+    assert cache.get(1) is None
+    assert cache.transitions == 2
+
+
+def test_cache_keeps_a_model_over_budget_on_its_own():
+    '''A model larger than the whole budget is kept, alone, instead of being rebuilt on every use'''
+    cache = MarkovModelCache(max_guilds=10, max_transitions=3)
+    cache.put(1, _model(('a', 'b', 1)), cache.version(1))
+    big = _model(('a', 'b', 1), ('b', 'c', 1), ('c', 'd', 1), ('d', 'e', 1))
+    assert cache.put(2, big, cache.version(2))
+    assert cache.get(2) is big
+    assert cache.get(1) is None
+    assert cache.transitions == 4
+    # The next model in pushes it out as usual
+    cache.put(3, _model(('a', 'b', 1)), cache.version(3))
+    assert cache.get(2) is None
+    assert cache.transitions == 1
+
+
+def test_cache_add_relations_updates_in_place():
+    '''Ingested relations are applied to a cached model and counted against the budget'''
+    cache = MarkovModelCache(max_guilds=10, max_transitions=100)
+    model = _model(('a', 'b', 1))
+    cache.put(1, model, cache.version(1))
+    cache.add_relations(1, [{'leader_word': 'b', 'follower_word': 'c'}, {'leader_word': 'a', 'follower_word': 'b'}])
+    assert model.next_word('b', 0.5) == 'c'
+    assert cache.transitions == 2
+    # Guilds without a cached model are left for the next build
+    cache.add_relations(2, [{'leader_word': 'x', 'follower_word': 'y'}])
+    assert cache.get(2) is None
+
+
+def test_cache_put_rejects_model_built_before_update():
+    '''A build that raced an ingest or invalidation is not cached'''
+    cache = MarkovModelCache(max_guilds=10, max_transitions=100)
+    version = cache.version(1)
+    cache.add_relations(1, [{'leader_word': 'a', 'follower_word': 'b'}])
+    assert not cache.put(1, _model(), version)
+    version = cache.version(1)
+    cache.invalidate()
+    assert not cache.put(1, _model(), version)
+    assert cache.put(1, _model(), cache.version(1))
+
+
+def test_cache_invalidate():
+    '''invalidate drops one guild, or every guild with no argument'''
+    cache = MarkovModelCache(max_guilds=10, max_transitions=100)
+    for guild_id in (1, 2, 3):
+        cache.put(guild_id, _model(('a', 'b', 1)), cache.version(guild_id))
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.transitions == 2
+    cache.invalidate()
+    assert cache.get(2) is None and cache.get(3) is None
+    assert cache.transitions == 0
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import select
+
+from discord_bot.cogs.markov_helpers.retention import RelationPruner, next_day_boundary
+from discord_bot.database import MarkovChannel, MarkovRelation
+
+from tests.helpers import async_mock_session, fake_engine #pylint:disable=unused-import
+
+
+def test_next_day_boundary():
+    '''A midnight is its own boundary; anything after it rounds up'''
+    midnight = datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert next_day_boundary(midnight) == midnight
+    assert next_day_boundary(midnight + timedelta(hours=5)) == midnight + timedelta(days=1)
+
+
+def test_pruner_due_only_after_a_day_boundary():
+    '''After a pass, the next one waits until the cutoff crosses another midnight'''
+    pruner = RelationPruner(MagicMock())
+    cutoff = datetime(2024, 12, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert pruner.due(cutoff)
+    pruner.watermark = cutoff
+    assert not pruner.due(cutoff + timedelta(hours=5))
+    assert not pruner.due(datetime(2024, 12, 2, tzinfo=timezone.utc))
+    assert pruner.due(datetime(2024, 12, 2, 0, 5, tzinfo=timezone.utc))
+
+
+@pytest.mark.asyncio
+async def test_pruner_deletes_expired_rows_in_batches(fake_engine, mocker):  #pylint:disable=redefined-outer-name
+    '''Expired rows go in batch_size chunks, fresh rows stay, and the pass is counted'''
+    counter = mocker.patch('discord_bot.cogs.markov_helpers.retention.RETENTION_PRUNED_COUNTER')
+    histogram = mocker.patch('discord_bot.cogs.markov_helpers.retention.RETENTION_DURATION_HISTOGRAM')
+    cutoff = datetime(2024, 12, 1, 12, 0, 0, tzinfo=timezone.utc)
+    async with async_mock_session(fake_engine) as session:
+        markov_channel = MarkovChannel(channel_id=1, server_id=1)
+        session.add(markov_channel)
+        await session.commit()
+        for day in range(5):
+            session.add(MarkovRelation(channel_id=markov_channel.id, leader_word=f'old{day}', follower_word='a',
+                                       created_at=datetime(2024, 11, 25 + day, tzinfo=timezone.utc)))
+        session.add(MarkovRelation(channel_id=markov_channel.id, leader_word='new', follower_word='a',
+                                   created_at=datetime(2024, 12, 2, tzinfo=timezone.utc)))
+        await session.commit()
+
+    pruner = RelationPruner(MagicMock(), batch_size=2)
+    assert await pruner.prune(partial(async_mock_session, fake_engine), cutoff) == 5
+    assert pruner.watermark == cutoff
+    counter.add.assert_called_once_with(5)
+    histogram.record.assert_called_once()
+
+    async with async_mock_session(fake_engine) as session:
+        assert (await session.execute(select(MarkovRelation.leader_word))).scalars().all() == ['new']
+
+    # Not due again until the cutoff crosses the next midnight
+    assert await pruner.prune(partial(async_mock_session, fake_engine), cutoff + timedelta(hours=6)) == 0
+    counter.add.assert_called_once()
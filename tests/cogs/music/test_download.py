@@ -388,20 +388,19 @@ async def test_ensure_video_download_result_none_pushes_failed(mocker, fake_cont
 
 @pytest.mark.asyncio()
 async def test_run_idle_empty_queue_backs_off(mocker):
-    """run() sleeps the idle backoff (not every iteration) when both input queues
-    are empty and no backoff is active — cutting idle busy-loop churn."""
-    sleep_mock = mocker.patch('discord_bot.interfaces.download_protocols.sleep')
+    """run() waits for work (not a busy re-poll) when both input queues are empty
+    and no backoff is active — cutting idle busy-loop churn."""
     worker = AsyncioDownloadWorker(None, Path('/tmp'))
+    wait_mock = mocker.patch.object(worker, '_wait_for_work', new=AsyncMock())
     assert worker.backoff_seconds_remaining is None  # else-branch (no backoff)
     await worker.run(asyncio.Event())
-    sleep_mock.assert_awaited_once_with(download_protocols._IDLE_POLL_BACKOFF_SECONDS)  # pylint: disable=protected-access
+    wait_mock.assert_awaited_once_with(download_protocols.IDLE_WAIT_SECONDS)
 
 
 @pytest.mark.asyncio()
 async def test_run_idle_backoff_active_empty_queue_backs_off(mocker):
     """With backoff active but nothing queued, run() reaches the merged-empty path
-    after the backoff wait and applies the idle backoff sleep before returning."""
-    sleep_mock = mocker.patch('discord_bot.interfaces.download_protocols.sleep')
+    after the backoff wait and waits for work before returning."""
     worker = AsyncioDownloadWorker(None, Path('/tmp'))
     # Future timestamp → backoff_seconds_remaining truthy → backoff branch taken.
     worker.wait_timestamp = datetime.now(timezone.utc).timestamp() + 3600
@@ -409,8 +408,30 @@ async def test_run_idle_backoff_active_empty_queue_backs_off(mocker):
     # backoff_wait has its own dedicated tests; stub it to "elapsed, no DIRECT item"
     # so control falls through to the real (empty) merged_get_nowait idle path.
     mocker.patch.object(worker, 'backoff_wait', new=AsyncMock(return_value=None))
+    wait_mock = mocker.patch.object(worker, '_wait_for_work', new=AsyncMock())
     await worker.run(asyncio.Event())
-    sleep_mock.assert_awaited_once_with(download_protocols._IDLE_POLL_BACKOFF_SECONDS)  # pylint: disable=protected-access
+    wait_mock.assert_awaited_once_with(download_protocols.IDLE_WAIT_SECONDS)
+
+
+@pytest.mark.asyncio()
+async def test_wait_for_work_wakes_on_enqueue(fake_context):  #pylint:disable=redefined-outer-name
+    """An idle worker blocked in _wait_for_work returns as soon as a request is
+    submitted, rather than after the idle cap."""
+    worker = AsyncioDownloadWorker(None, Path('/tmp'))
+    waiter = asyncio.create_task(worker._wait_for_work(5))  # pylint: disable=protected-access
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    await worker.submit(fake_context['guild'].id, fake_source_dict(fake_context))
+    await asyncio.wait_for(waiter, 1)
+
+
+@pytest.mark.asyncio()
+async def test_wait_for_work_ends_when_deferred_retry_is_due(fake_context):  #pylint:disable=redefined-outer-name
+    """A deferred retry caps the idle wait at its ready_at."""
+    worker = AsyncioDownloadWorker(None, Path('/tmp'))
+    ready_at = datetime.now(timezone.utc).timestamp() + 0.05
+    await worker._enqueue_deferred_request(fake_context['guild'].id, fake_source_dict(fake_context), ready_at)  # pylint: disable=protected-access
+    await asyncio.wait_for(worker._wait_for_work(5), 1)  # pylint: disable=protected-access
 
 
 def yield_download_worker_video_too_long():
@@ -125,8 +125,11 @@ def yield_download_worker_bot_flagged():
     return FakeDownloadWorker
 
 
+# real_asyncio: process_download_results long-polls the result queue, and a
+# retryable failure queues no result, so with the loop clock frozen the wait
+# would never time out.
 @pytest.mark.asyncio
-@pytest.mark.freeze_time
+@pytest.mark.freeze_time(real_asyncio=True)
 async def test_retryable_exception_adds_failure_to_queue(freezer, fake_context, mocker):  #pylint:disable=redefined-outer-name
     """Test that RetryableException adds a failure to the download failure queue"""
     mocker.patch('discord_bot.interfaces.download_protocols.random.randint', return_value=5000)
@@ -152,7 +155,7 @@ async def test_retryable_exception_adds_failure_to_queue(freezer, fake_context,
 
 
 @pytest.mark.asyncio
-@pytest.mark.freeze_time
+@pytest.mark.freeze_time(real_asyncio=True)
 async def test_retryable_exception_applies_exponential_backoff(freezer, fake_context, mocker):  #pylint:disable=redefined-outer-name
     """Test that RetryableException applies exponential backoff based on failure queue size"""
     mocker.patch('discord_bot.interfaces.download_protocols.random.randint', return_value=5000)
@@ -185,7 +188,7 @@ async def test_retryable_exception_applies_exponential_backoff(freezer, fake_con
     assert cog.download_client.local_worker.wait_timestamp == 1735733045
 
 @pytest.mark.asyncio
-@pytest.mark.freeze_time
+@pytest.mark.freeze_time(real_asyncio=True)
 async def test_bot_download_flagged_applies_backoff(freezer, fake_context, mocker):  #pylint:disable=redefined-outer-name
     """Test that BotDownloadFlagged (a RetryableException) applies proper backoff"""
     mocker.patch('discord_bot.interfaces.download_protocols.random.randint', return_value=5000)
@@ -213,7 +216,7 @@ async def test_bot_download_flagged_applies_backoff(freezer, fake_context, mocke
 
 
 @pytest.mark.asyncio
-@pytest.mark.freeze_time
+@pytest.mark.freeze_time(real_asyncio=True)
 async def test_successful_download_clears_failure_from_queue(freezer, fake_context, mocker):  #pylint:disable=redefined-outer-name
     """Test that successful download removes one item from failure queue"""
     mocker.patch('discord_bot.interfaces.download_protocols.random.randint', return_value=5000)
@@ -13,11 +13,13 @@ import pytest
 from discord_bot.cogs.music import Music
 from discord_bot.workers.youtube_music_search_driver import SEARCH_BACKOFF_SLICE_SECONDS
 from discord_bot.cogs.music_helpers.music_player import MusicPlayer
+from discord_bot.cogs.music_helpers.search_client import SearchException
 from discord_bot.exceptions import ExitEarlyException
 from discord_bot.cogs.music_helpers.common import SearchType, MediaRequestLifecycleStage, YOUTUBE_VIDEO_PREFIX
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.playlist_add_request import PlaylistAddRequest
 from discord_bot.types.search import SearchResult
+from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.utils.integrations.youtube_music import YoutubeMusicRetryException
 from discord_bot.utils.failure_queue import FailureStatus
 from discord_bot.types.queue import PutsBlocked
@@ -142,19 +144,46 @@ async def test_search_youtube_music_empty_queue(mocker, fake_context):  #pylint:
 
 @pytest.mark.asyncio()
 async def test_process_search_results_empty_idles(mocker, fake_context):  #pylint:disable=redefined-outer-name
-    """process_search_results sleeps (idles) when the broker has no resolution."""
-    mock_sleep = mocker.patch('discord_bot.cogs.music.sleep', return_value=True)
+    """process_search_results idles in the broker long-poll when there is no resolution."""
+    mocker.patch('discord_bot.cogs.music.sleep', return_value=True)
     mocker.patch.object(MusicPlayer, 'start_tasks')
 
     cog = Music(fake_context['bot'], BASE_MUSIC_CONFIG, fake_context['dispatcher'])
     attach_in_process_broker(cog)
+    long_poll = mocker.spy(cog.broker_client, 'next_search_results')
 
-    # Nothing on the broker search-result queue → idle backoff, no submit.
+    # Nothing on the broker search-result queue → the long-poll waits it out, no submit.
     await cog.process_search_results()
-    mock_sleep.assert_awaited()
+    long_poll.assert_awaited_once_with(16, 0.01)
     assert await cog.download_client.queue_size(fake_context['guild'].id) == 0
 
 
+@pytest.mark.asyncio()
+async def test_process_search_results_routes_whole_batch_past_a_failure(mocker, fake_context):  #pylint:disable=redefined-outer-name
+    """One resolution that fails to route does not drop the rest of its batch."""
+    mocker.patch('discord_bot.cogs.music.sleep', return_value=True)
+    mocker.patch.object(MusicPlayer, 'start_tasks')
+
+    cog = Music(fake_context['bot'], BASE_MUSIC_CONFIG, fake_context['dispatcher'])
+    attach_in_process_broker(cog)
+    attach_in_process_download(cog)
+    requests = [create_test_media_request(fake_context, f'search {i}') for i in range(3)]
+    for mr in requests:
+        await cog.broker_client.register_request(mr)
+        await cog.broker_client.register_search_result(SearchResolution(media_request=mr, span_context={}))
+    real_submit = cog.download_client.submit
+
+    async def _submit(guild_id, media_request, **kwargs):
+        if media_request is requests[0]:
+            raise RuntimeError('boom')
+        await real_submit(guild_id, media_request, **kwargs)
+
+    mocker.patch.object(cog.download_client, 'submit', side_effect=_submit)
+    with pytest.raises(RuntimeError):
+        await cog.process_search_results()
+    assert await cog.download_client.queue_size(fake_context['guild'].id) == 2
+
+
 @pytest.mark.asyncio()
 async def test_process_search_results_bot_shutdown(mocker, fake_context):  #pylint:disable=redefined-outer-name
     """process_search_results exits early once the bot is shutting down."""
@@ -1227,8 +1256,7 @@ async def test_enqueue_media_requests_download_queue_blocked_deletes_bundle(mock
         fake_context['guild'].id, fake_context['channel'].id, has_search_banner=True,
     )
     direct = create_test_media_request(fake_context, 'https://direct.url', search_type=SearchType.DIRECT)
-    mocker.patch.object(cog, '_enqueue_media_download_from_cache', new=AsyncMock(return_value=False))
-    mocker.patch.object(cog.download_client, 'submit', side_effect=PutsBlocked())
+    mocker.patch.object(cog.download_client, 'submit_many', new=AsyncMock(return_value=[PutsBlocked()]))
     mock_player = MagicMock()
     mocker.patch.object(cog, 'get_player', return_value=mock_player)
 
@@ -1248,8 +1276,7 @@ async def test_enqueue_media_requests_download_queue_full_discards_request(mocke
         fake_context['guild'].id, fake_context['channel'].id, has_search_banner=True,
     )
     direct = create_test_media_request(fake_context, 'https://direct.url', search_type=SearchType.DIRECT)
-    mocker.patch.object(cog, '_enqueue_media_download_from_cache', new=AsyncMock(return_value=False))
-    mocker.patch.object(cog.download_client, 'submit', side_effect=QueueFull())
+    mocker.patch.object(cog.download_client, 'submit_many', new=AsyncMock(return_value=[QueueFull()]))
     mock_player = MagicMock()
     mocker.patch.object(cog, 'get_player', return_value=mock_player)
 
@@ -1293,7 +1320,12 @@ async def test_generate_media_requests_collection_creates_multitrack_bundle(mock
         collection_name='Mock Album',
         search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string='track one')],
     )
-    mocker.patch.object(cog.search_client, 'check_source', new=AsyncMock(return_value=collection))
+
+
+    async def _stream(*_args, **_kwargs):
+        yield collection
+
+    mocker.patch.object(cog.search_client, 'stream_source', new=_stream)
     mock_player = MagicMock()
 
     await cog._generate_media_requests_from_search(fake_context['context'], 'some album', player=mock_player)  # pylint: disable=protected-access
@@ -1303,6 +1335,70 @@ async def test_generate_media_requests_collection_creates_multitrack_bundle(mock
     assert cog.broker_client.local_broker.get_bundle_state(bundles[0]).has_search_banner is True
 
 
+@pytest.mark.asyncio()
+async def test_generate_media_requests_queues_first_page_before_the_rest(mocker, fake_context):  #pylint:disable=redefined-outer-name
+    """Tracks from the first catalog page are submitted before the next page is fetched."""
+    from types import SimpleNamespace  # pylint: disable=import-outside-toplevel
+    mocker.patch('discord_bot.cogs.music.sleep', return_value=True)
+    mocker.patch.object(MusicPlayer, 'start_tasks')
+    cog = Music(fake_context['bot'], BASE_MUSIC_CONFIG, fake_context['dispatcher'])
+    attach_in_process_broker(cog)
+    attach_in_process_search(cog)
+    submitted = []
+
+    async def _submit_many(_guild_id, media_requests, **_kw):
+        submitted.extend(mr.search_result.raw_search_string for mr in media_requests)
+        return [None] * len(media_requests)
+
+    mocker.patch.object(cog.youtube_music_search_client, 'submit_many', new=_submit_many)
+    finalize = mocker.patch.object(cog.broker_client, 'finalize_bundle', new=AsyncMock())
+    queued_before_second_page = []
+
+    async def _stream(*_args, **_kwargs):
+        yield SimpleNamespace(collection_name='Mock Playlist',
+                              search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string='track one')])
+        queued_before_second_page.extend(submitted)
+        yield SimpleNamespace(collection_name='Mock Playlist',
+                              search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string='track two')])
+
+    mocker.patch.object(cog.search_client, 'stream_source', new=_stream)
+
+    await cog._generate_media_requests_from_search(fake_context['context'], 'some playlist', player=MagicMock())  # pylint: disable=protected-access
+
+    assert queued_before_second_page == ['track one']
+    assert submitted == ['track one', 'track two']
+    bundles = await cog.broker_client.list_bundles_for_guild(fake_context['guild'].id)
+    assert len(bundles) == 1
+    finalize.assert_awaited_once_with(bundles[0])
+
+
+@pytest.mark.asyncio()
+async def test_generate_media_requests_keeps_first_page_when_later_page_fails(mocker, fake_context):  #pylint:disable=redefined-outer-name
+    """A later page failing keeps what was queued, reports it, and still finalizes the bundle."""
+    from types import SimpleNamespace  # pylint: disable=import-outside-toplevel
+    mocker.patch('discord_bot.cogs.music.sleep', return_value=True)
+    mocker.patch.object(MusicPlayer, 'start_tasks')
+    cog = Music(fake_context['bot'], BASE_MUSIC_CONFIG, fake_context['dispatcher'])
+    attach_in_process_broker(cog)
+    attach_in_process_search(cog)
+    submit_many = mocker.patch.object(cog.youtube_music_search_client, 'submit_many', new=AsyncMock(return_value=[None]))
+    finalize = mocker.patch.object(cog.broker_client, 'finalize_bundle', new=AsyncMock())
+    cog.dispatcher = MagicMock()
+
+    async def _stream(*_args, **_kwargs):
+        yield SimpleNamespace(collection_name='Mock Playlist',
+                              search_results=[SearchResult(search_type=SearchType.SEARCH, raw_search_string='track one')])
+        raise SearchException('boom', user_message='Issue fetching playlist')
+
+    mocker.patch.object(cog.search_client, 'stream_source', new=_stream)
+
+    await cog._generate_media_requests_from_search(fake_context['context'], 'some playlist', player=MagicMock())  # pylint: disable=protected-access
+
+    assert submit_many.await_count == 1
+    finalize.assert_awaited_once()
+    assert 'Issue fetching playlist' in cog.dispatcher.send_message.call_args[0][2]
+
+
 @pytest.mark.asyncio()
 async def test_search_youtube_music_waits_in_slices_before_popping(mocker, fake_context):  #pylint:disable=redefined-outer-name
     """An open backoff window ends the iteration WITHOUT popping a request.
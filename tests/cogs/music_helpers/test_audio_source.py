@@ -0,0 +1,177 @@
+import struct
+import subprocess  # nosec B404 - test-only ffmpeg invocation, fixed argv
+
+from discord.opus import Encoder as OpusEncoder
+import pytest
+
+from discord_bot.cogs.music_helpers.audio_source import (
+    FileBackedPCMAudio, OggOpusAudio, PCM_BYTES_PER_SECOND, StagingFileReader,
+)
+from discord_bot.utils.audio import AudioFormat, edit_audio_file
+
+
+@pytest.fixture
+def pcm_file(tmp_path):
+    '''Five frames of PCM, each frame filled with its own index byte.'''
+    path = tmp_path / 'track.pcm'
+    path.write_bytes(b''.join(bytes([i]) * OpusEncoder.FRAME_SIZE for i in range(5)))
+    return path
+
+
+def test_pcm_bytes_per_second():
+    '''s16le stereo at 48 kHz is 192 kB/s, 50 frames a second'''
+    assert PCM_BYTES_PER_SECOND == 192000
+    assert PCM_BYTES_PER_SECOND // OpusEncoder.FRAME_SIZE == 50
+
+
+def test_read_returns_frames_in_order(pcm_file): #pylint:disable=redefined-outer-name
+    '''Each read() is one 20ms frame, then b'' at end of file'''
+    source = FileBackedPCMAudio(pcm_file)
+    frames = [source.read() for _ in range(5)]
+    assert [frame[0] for frame in frames] == [0, 1, 2, 3, 4]
+    assert all(len(frame) == OpusEncoder.FRAME_SIZE for frame in frames)
+    assert source.read() == b''
+    source.cleanup()
+
+
+def test_read_drops_trailing_partial_frame(tmp_path):
+    '''A short trailing frame ends playback rather than being sent'''
+    path = tmp_path / 'short.pcm'
+    path.write_bytes(bytes(OpusEncoder.FRAME_SIZE + 100))
+    source = FileBackedPCMAudio(path)
+    assert len(source.read()) == OpusEncoder.FRAME_SIZE
+    assert source.read() == b''
+    source.cleanup()
+
+
+def test_seek_aligns_to_frame(pcm_file): #pylint:disable=redefined-outer-name
+    '''Seeking lands on the frame containing the offset'''
+    source = FileBackedPCMAudio(pcm_file)
+    assert source.seek(0.065) == pytest.approx(0.06)
+    assert source.position == pytest.approx(0.06)
+    assert source.read()[0] == 3
+    source.cleanup()
+
+
+def test_seek_clamps_to_file(pcm_file): #pylint:disable=redefined-outer-name
+    '''Offsets outside the file clamp to its start or end'''
+    source = FileBackedPCMAudio(pcm_file)
+    assert source.seek(60) == pytest.approx(0.1)
+    assert source.read() == b''
+    assert source.seek(-5) == 0
+    assert source.read()[0] == 0
+    source.cleanup()
+
+
+def test_cleanup_closes_file_and_is_idempotent(pcm_file): #pylint:disable=redefined-outer-name
+    '''After cleanup reads end playback and seek/position are inert'''
+    source = FileBackedPCMAudio(pcm_file)
+    source.cleanup()
+    source.cleanup()
+    assert source.stream.closed
+    assert source.read() == b''
+    assert source.position == 0.0
+    assert source.seek(0.04) == 0.0
+
+
+def test_missing_file_raises(tmp_path):
+    '''A missing file raises on construction without a noisy __del__'''
+    with pytest.raises(FileNotFoundError):
+        FileBackedPCMAudio(tmp_path / 'missing.pcm')
+
+
+def _ogg_page(packets: list[bytes], pagenum: int) -> bytes:
+    '''One Ogg page carrying *packets*, each under 255 bytes (CRC is not checked on read)'''
+    header = b'OggS' + struct.pack('<BBQIIIB', 0, 0, 0, 1, pagenum, 0, len(packets))
+    return header + bytes(len(packet) for packet in packets) + b''.join(packets)
+
+
+@pytest.fixture
+def opus_file(tmp_path):
+    '''An Ogg/Opus file: the two RFC 7845 header packets, then three audio packets.'''
+    path = tmp_path / 'track.opus'
+    path.write_bytes(
+        _ogg_page([b'OpusHead' + bytes(11)], 0)
+        + _ogg_page([b'OpusTags' + bytes(8)], 1)
+        + _ogg_page([b'\x01audio', b'\x02audio'], 2)
+        + _ogg_page([b'\x03audio'], 3)
+    )
+    return path
+
+
+def test_ogg_opus_reads_audio_packets(opus_file): #pylint:disable=redefined-outer-name
+    '''Header packets are skipped; audio packets come back as-is, then an empty read'''
+    source = OggOpusAudio(opus_file)
+    assert source.is_opus()
+    assert [source.read() for _ in range(3)] == [b'\x01audio', b'\x02audio', b'\x03audio']
+    assert source.read() == b''
+    source.cleanup()
+
+
+def test_ogg_opus_cleanup_closes_file(opus_file): #pylint:disable=redefined-outer-name
+    '''After cleanup reads end playback; cleanup is idempotent'''
+    source = OggOpusAudio(opus_file)
+    source.cleanup()
+    source.cleanup()
+    assert source.stream.closed
+    assert source.read() == b''
+
+
+def test_ogg_opus_real_encode(tmp_path):
+    '''A file from the real Opus conversion yields 20ms packets'''
+    source_file = tmp_path / 'tone.mp3'
+    try:
+        subprocess.run(['ffmpeg', '-y', '-f', 'lavfi', '-i', 'sine=frequency=440:duration=1', str(source_file)],
+                       capture_output=True, check=True)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        pytest.skip('ffmpeg not available')
+    source = OggOpusAudio(edit_audio_file(source_file, False, None, AudioFormat.OPUS))
+    packets = []
+    while packet := source.read():
+        packets.append(packet)
+    source.cleanup()
+    # One second of audio, plus the encoder's pre-skip frames
+    assert 50 <= len(packets) <= 55
+
+
+class FakeStaging():
+    '''wait_for_bytes stand-in: bytes up to *available* have landed, nothing past it ever will'''
+    def __init__(self, available: int):
+        self.available = available
+        self.offsets = []
+
+    def wait_for_bytes(self, offset: float) -> bool:
+        '''Record the offset asked for'''
+        self.offsets.append(offset)
+        return offset <= self.available
+
+
+def test_staging_reader_waits_before_each_read(pcm_file): #pylint:disable=redefined-outer-name
+    '''Every read asks for the bytes up to its end; a False ends the source cleanly'''
+    staging = FakeStaging(2 * OpusEncoder.FRAME_SIZE)
+    source = FileBackedPCMAudio(pcm_file, wait_for_bytes=staging.wait_for_bytes)
+    assert source.read()[0] == 0
+    assert source.read()[0] == 1
+    assert source.read() == b''
+    assert staging.offsets == [OpusEncoder.FRAME_SIZE * n for n in (1, 2, 3)]
+    source.cleanup()
+    assert source.stream.closed
+
+
+def test_staging_reader_unbounded_read_waits_for_everything(pcm_file): #pylint:disable=redefined-outer-name
+    '''read() with no size waits for the whole download'''
+    staging = FakeStaging(5 * OpusEncoder.FRAME_SIZE)
+    reader = StagingFileReader(pcm_file, staging.wait_for_bytes)
+    assert reader.seek(OpusEncoder.FRAME_SIZE) == OpusEncoder.FRAME_SIZE
+    assert reader.read() == b''
+    assert staging.offsets == [float('inf')]
+    reader.close()
+    assert reader.closed
+
+
+def test_ogg_opus_truncated_staging_ends_track(opus_file): #pylint:disable=redefined-outer-name
+    '''A download that stops mid-page ends the Opus source rather than raising on the audio thread'''
+    staging = FakeStaging(opus_file.stat().st_size - 3)
+    source = OggOpusAudio(opus_file, wait_for_bytes=staging.wait_for_bytes)
+    assert [source.read() for _ in range(3)] == [b'\x01audio', b'\x02audio', b'']
+    source.cleanup()
@@ -21,7 +21,7 @@ from discord_bot.workers.asyncio_download_worker import AsyncioDownloadWorker
 from discord_bot.interfaces import download_protocols
 from discord_bot.utils.integrations.egress_pool import (
     DownloadEgress, HttpProxyEgress, PoolEgress, ExitPool, ExitClients, MullvadSocks5Resolver)
-from discord_bot.utils.audio import AudioProcessingError
+from discord_bot.utils.audio import AudioFormat, AudioProcessingError
 from discord_bot.exceptions import DiscordBotException, ExitEarlyException
 from discord_bot.types.download import DownloadErrorType, LifecycleEvent, DownloadResult, DownloadStatus as DlStatus
 from discord_bot.utils.failure_queue import FailureQueue as DownloadFailureQueue, FailureStatus as DownloadStatus
@@ -329,6 +329,26 @@ async def test_prepare_source_single_video_no_entries():
         assert result.ytdlp_data['webpage_url'] == 'https://example.single.com'
         assert result.file_name == pcm_path
 
+@pytest.mark.asyncio(loop_scope="session")
+async def test_prepare_source_s3_mode_opus_format():
+    '''The configured audio format reaches edit_audio_file and the .opus is what gets cached'''
+    with NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
+        download_path = Path(tmp_file.name)
+    opus_path = download_path.with_suffix('.opus')
+    opus_path.write_bytes(b'OggS opus data')
+    fake_context = generate_fake_context()
+    x = make_download_client(MockYTDLP(fake_file_path=download_path),
+                             bucket_name='test-bucket', audio_format=AudioFormat.OPUS)
+    y = fake_source_dict(fake_context)
+    with patch('discord_bot.interfaces.download_protocols.upload_file', return_value=True) as upload_mock:
+        with patch('discord_bot.interfaces.download_protocols.edit_audio_file', return_value=opus_path) as edit_mock:
+            result = await x.create_source(y, 3)
+    assert result.status.success
+    assert edit_mock.call_args[0][3] == AudioFormat.OPUS
+    assert str(upload_mock.call_args[0][2]) == f'cache/{opus_path.name}'
+    assert result.file_name == Path(f'cache/{opus_path.name}')
+    assert result.file_size_bytes == len(b'OggS opus data')
+
 @pytest.mark.asyncio(loop_scope="session")
 async def test_prepare_source_s3_mode():
     '''In S3 mode, PCM conversion runs first on the local file, then the PCM is uploaded to S3'''
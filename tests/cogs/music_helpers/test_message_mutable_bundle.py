@@ -1,8 +1,10 @@
+import itertools
+import random
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from discord_bot.workers.message_dispatcher import MessageMutableBundle
+from discord_bot.workers.message_dispatcher import MessageContext, MessageMutableBundle
 
 from tests.helpers import fake_context, generate_fake_context  # pylint: disable=unused-import
 
@@ -948,3 +950,104 @@ async def test_should_clear_messages_history_longer_than_contexts(message_bundle
     # Key question: Was the original D message preserved or was it recreated?
     # Optimal behavior: original D message should be untouched
     # Suboptimal behavior: D message was edited from the second B
+
+
+# ---------------------------------------------------------------------------
+# Content alignment: randomised checks against the previous matcher and an
+# exhaustive search for the fewest operations
+# ---------------------------------------------------------------------------
+
+def _legacy_plan(existing, new, delete_after):
+    """The first-match matcher get_message_dispatch used before the alignment
+    diff: returns the resulting (content, delete_after) list and its operation count."""
+    contexts = [list(key) for key in existing]
+    mapping = {}
+    for new_index, content in enumerate(new):
+        for existing_index, (old_content, old_delete_after) in enumerate(contexts):
+            if old_content == content and old_delete_after == delete_after:
+                mapping[existing_index] = new_index
+                break
+    operations = 0
+    if len(contexts) > len(new):
+        expected_deletes, deletes, result = len(contexts) - len(new), 0, []
+        for index, context in reversed(list(enumerate(contexts))):
+            if mapping.get(index) is not None:
+                result.insert(0, context)
+            elif deletes < expected_deletes:
+                deletes += 1
+                operations += 1
+            else:
+                result.insert(0, [new[index], delete_after])
+                operations += 1
+        return [tuple(context) for context in result], operations
+    result = []
+    for index, context in enumerate(contexts):
+        if mapping.get(index) == index:
+            result.append(tuple(context))
+        else:
+            result.append((new[index], delete_after))
+            operations += 1
+    result.extend((content, delete_after) for content in new[len(contexts):])
+    operations += len(new) - len(contexts)
+    return result, operations
+
+
+def _fewest_operations(existing, new, delete_after):
+    """Exhaustive minimum: keep any in-order subset of existing as a prefix of
+    new, delete the rest and send what is left over."""
+    best = None
+    for size in range(min(len(existing), len(new)) + 1):
+        for kept in itertools.combinations(range(len(existing)), size):
+            edits = sum(existing[old] != (new[index], delete_after) for index, old in enumerate(kept))
+            operations = (len(existing) - size) + (len(new) - size) + edits
+            best = operations if best is None else min(best, operations)
+    return best
+
+
+def test_alignment_is_correct_minimal_and_never_worse_than_first_match():
+    """Random old/new pairs with repeated content: the bundle ends up showing
+    exactly the new content, kept messages stay in channel order, the plan
+    uses the fewest operations possible, and never more than the old matcher.
+    The fixed cases share a suffix whose keeping would force extra edits."""
+    rng = random.Random(20261017)
+    cases = [
+        ([(content, None) for content in 'abaca'], list('aacaa'), None),
+        ([(content, None) for content in 'abab'], list('babb'), None),
+        ([(content, 60) for content in 'abaab'], list('baabb'), 60),
+    ]
+    for _ in range(600):
+        cases.append(([(rng.choice('abcd'), rng.choice((None, None, 60))) for _ in range(rng.randint(1, 7))],
+                      [rng.choice('abcde') for _ in range(rng.randint(0, 7))],
+                      rng.choice((None, None, 60))))
+    for existing, new, delete_after in cases:
+        bundle = MessageMutableBundle(1, 2)
+        bundle.message_contexts = [
+            MessageContext(1, 2, message_id=index, message_content=content, delete_after=after)
+            for index, (content, after) in enumerate(existing)
+        ]
+
+        funcs = bundle.get_message_dispatch(new, AsyncMock(), MagicMock(), delete_after=delete_after)
+
+        assert [context.message_content for context in bundle.message_contexts] == new
+        assert all(context.delete_after == delete_after for context in bundle.message_contexts)
+        kept_ids = [context.message_id for context in bundle.message_contexts if context.message_id is not None]
+        assert kept_ids == sorted(kept_ids)
+        assert len(funcs) == _fewest_operations(existing, new, delete_after)
+        legacy_result, legacy_operations = _legacy_plan(existing, new, delete_after)
+        if legacy_result == [(content, delete_after) for content in new]:
+            assert len(funcs) <= legacy_operations
+
+
+def test_alignment_deletes_a_leading_message_instead_of_shifting_every_edit():
+    """[A, B, C, D] -> [B, C, D, E]: one delete and one send, B..D untouched."""
+    bundle = MessageMutableBundle(1, 2)
+    bundle.message_contexts = [MessageContext(1, 2, message_id=index, message_content=content)
+                               for index, content in enumerate('ABCD')]
+
+    funcs = bundle.get_message_dispatch(list('BCDE'), AsyncMock(), MagicMock())
+
+    assert len(funcs) == 2
+    assert funcs[0].func.__name__ == 'delete_message'
+    assert funcs[0].func.__self__.message_content == 'A'
+    assert funcs[1].keywords['content'] == 'E'
+    assert [context.message_id for context in bundle.message_contexts] == [1, 2, 3, None]
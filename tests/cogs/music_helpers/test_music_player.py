@@ -2,17 +2,21 @@ import asyncio
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from threading import Thread
 from unittest.mock import Mock, patch, AsyncMock
 
+from botocore.exceptions import ClientError
 import pytest
 
 from discord.errors import ClientException
 
 from discord_bot.exceptions import ExitEarlyException
 
+from discord_bot.cogs.music_helpers.audio_source import FileBackedPCMAudio, OggOpusAudio
 from discord_bot.cogs.music_helpers.music_player import MusicPlayer, cleanup_source
 from discord_bot.interfaces.broker_protocols import CheckoutResult
 from discord_bot.types.queue import Queue
+from discord_bot.utils.integrations.s3 import PROGRESSIVE_HEAD_BYTES
 from discord_bot.workers.asyncio_broker import AsyncioBroker
 
 from tests.helpers import FakeChannel, fake_context, fake_media_download, FakeVoiceClient #pylint:disable=unused-import
@@ -362,8 +366,8 @@ async def test_music_player_cleans_up_on_voice_exception(fake_context): #pylint:
     fake_context['guild'].voice_client = None
     with with_music_player(fake_context) as player:
         with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
-            # Patch FFmpegPCMAudio to track cleanup calls
-            with patch('discord_bot.cogs.music_helpers.music_player.PCMAudio') as mock_ffmpeg:
+            # Patch FileBackedPCMAudio to track cleanup calls
+            with patch('discord_bot.cogs.music_helpers.music_player.FileBackedPCMAudio') as mock_ffmpeg:
                 mock_audio_source = Mock()
                 mock_audio_source.cleanup = Mock()
                 mock_ffmpeg.return_value = mock_audio_source
@@ -380,6 +384,41 @@ async def test_music_player_cleans_up_on_voice_exception(fake_context): #pylint:
                 mock_audio_source.cleanup.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_music_player_streams_from_staged_file(fake_context): #pylint:disable=redefined-outer-name
+    """The voice client gets a file-backed source, closed once the track ends"""
+    voice_client = FakeVoiceClient()
+    voice_client.play = Mock(side_effect=lambda *_args, after=None, **_kwargs: after())
+    fake_context['guild'].voice_client = voice_client
+    with with_music_player(fake_context) as player:
+        with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
+            player.add_to_play_queue(media_download)
+            await player.player_loop()
+            audio_source = voice_client.play.call_args[0][0]
+            assert isinstance(audio_source, FileBackedPCMAudio)
+            assert audio_source.file_path == media_download.file_path
+            assert audio_source.stream.closed
+
+
+@pytest.mark.asyncio
+async def test_music_player_sends_opus_cache_entries_pre_encoded(fake_context): #pylint:disable=redefined-outer-name
+    """A .opus file plays through the pre-encoded Opus source"""
+    voice_client = FakeVoiceClient()
+    voice_client.play = Mock(side_effect=lambda *_args, after=None, **_kwargs: after())
+    fake_context['guild'].voice_client = voice_client
+    with with_music_player(fake_context) as player:
+        with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
+            opus_path = media_download.file_path.with_suffix('.opus')
+            media_download.file_path.rename(opus_path)
+            media_download.file_path = opus_path
+            player.add_to_play_queue(media_download)
+            await player.player_loop()
+            audio_source = voice_client.play.call_args[0][0]
+            assert isinstance(audio_source, OggOpusAudio)
+            assert audio_source.is_opus()
+            assert audio_source.stream.closed
+
+
 @pytest.mark.asyncio
 async def test_music_player_current_media_download(fake_context): #pylint:disable=redefined-outer-name
     """Test that current_media_download is properly set during playback"""
@@ -402,8 +441,8 @@ async def test_music_player_cleanup_calls_audio_cleanup(fake_context): #pylint:d
     fake_context['guild'].voice_client = FakeVoiceClient()
     with with_music_player(fake_context) as player:
         with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
-            # Patch FFmpegPCMAudio to track cleanup
-            with patch('discord_bot.cogs.music_helpers.music_player.PCMAudio') as mock_ffmpeg:
+            # Patch FileBackedPCMAudio to track cleanup
+            with patch('discord_bot.cogs.music_helpers.music_player.FileBackedPCMAudio') as mock_ffmpeg:
                 mock_audio_source = Mock()
                 mock_audio_source.cleanup = Mock()
                 mock_audio_source.volume = 0.5
@@ -440,7 +479,7 @@ async def test_player_cleanup_with_active_source(fake_context): #pylint:disable=
     fake_context['guild'].voice_client = FakeVoiceClient()
     with with_music_player(fake_context) as player:
         with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
-            with patch('discord_bot.cogs.music_helpers.music_player.PCMAudio') as mock_ffmpeg:
+            with patch('discord_bot.cogs.music_helpers.music_player.FileBackedPCMAudio') as mock_ffmpeg:
                 mock_audio_source = Mock()
                 mock_audio_source.cleanup = Mock()
                 mock_audio_source.volume = 0.5
@@ -827,3 +866,83 @@ async def test_player_loop_fast_staging_logs_debug_not_warning(fake_context): #p
                 await player.player_loop()
             assert not [c for c in player.logger.warning.call_args_list if 'Play staging' in c.args[0]]
             assert [c for c in player.logger.debug.call_args_list if 'Play staging' in c.args[0]]
+
+
+def _ranged_s3_client(data: bytes):
+    '''boto3 client stand-in whose get_object serves byte ranges of *data*.'''
+    def _get_object(Bucket, Key, Range): #pylint:disable=invalid-name,unused-argument
+        start, _, end = Range.removeprefix('bytes=').partition('-')
+        end = min(int(end), len(data) - 1) if end else len(data) - 1
+        body = Mock()
+        body.iter_chunks.return_value = iter([data[int(start):end + 1]])
+        return {'Body': body, 'ContentRange': f'bytes {start}-{end}/{len(data)}'}
+    s3_client = Mock()
+    s3_client.get_object.side_effect = _get_object
+    return s3_client
+
+
+@pytest.mark.asyncio
+async def test_player_loop_progressive_staging(fake_context): #pylint:disable=redefined-outer-name
+    """With progressive staging the player fetches only the head range before play()
+    and the rest of the track streams in behind it."""
+    data = bytes(PROGRESSIVE_HEAD_BYTES * 2)
+    played = []
+
+    class _ReadingVoiceClient(FakeVoiceClient):
+        '''Reads the source to the end on its own thread, as discord.py's AudioPlayer does'''
+        def play(self, *args, after=None, **_kwargs):
+            source = args[0]
+            loop = asyncio.get_running_loop()
+            # Only the head GET has happened when playback starts
+            played.append(s3_client.get_object.call_count)
+
+            def _read_all():
+                while source.read():
+                    played.append(source.stream.tell())
+                loop.call_soon_threadsafe(after)
+            Thread(target=_read_all).start()
+
+    fake_context['guild'].voice_client = _ReadingVoiceClient()
+    s3_client = _ranged_s3_client(data)
+    with with_broker_player(fake_context) as player:
+        player.progressive_staging = True
+        with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
+            player.broker.checkout = AsyncMock(
+                return_value=CheckoutResult(s3_key='cache/track.pcm', bucket_name='my-bucket')
+            )
+            with patch('discord_bot.utils.integrations.s3.get_client', return_value=s3_client), \
+                 patch('discord_bot.cogs.music_helpers.music_player.get_file') as mock_get:
+                player.add_to_play_queue(media_download)
+                await player.player_loop()
+            mock_get.assert_not_called()
+            assert played[0] == 1
+            # Every frame of the track played, including those fetched after play() started
+            assert played[-1] == len(data)
+            assert s3_client.get_object.call_args_list[0].kwargs['Range'] == f'bytes=0-{PROGRESSIVE_HEAD_BYTES - 1}'
+            assert s3_client.get_object.call_args_list[1].kwargs['Range'] == f'bytes={PROGRESSIVE_HEAD_BYTES}-'
+            assert player.current_staging is None
+            player.broker.release.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_player_loop_progressive_staging_failure_logged(fake_context): #pylint:disable=redefined-outer-name
+    """A remainder fetch that fails ends the track early and is logged, not raised."""
+    fake_context['guild'].voice_client = FakeVoiceClient()
+    s3_client = _ranged_s3_client(bytes(PROGRESSIVE_HEAD_BYTES * 2))
+    head_get = s3_client.get_object.side_effect
+    s3_client.get_object.side_effect = [head_get(Bucket='my-bucket', Key='cache/track.pcm',
+                                                 Range=f'bytes=0-{PROGRESSIVE_HEAD_BYTES - 1}'),
+                                        ClientError({'Error': {'Code': '500', 'Message': 'boom'}}, 'GetObject')]
+    with with_broker_player(fake_context) as player:
+        player.progressive_staging = True
+        player.logger = Mock()
+        with fake_media_download(player.file_dir, fake_context=fake_context) as media_download:
+            player.broker.checkout = AsyncMock(
+                return_value=CheckoutResult(s3_key='cache/track.pcm', bucket_name='my-bucket')
+            )
+            with patch('discord_bot.utils.integrations.s3.get_client', return_value=s3_client):
+                player.add_to_play_queue(media_download)
+                await player.player_loop()
+            failures = [c for c in player.logger.warning.call_args_list if 'Progressive staging failed' in c.args[0]]
+            assert len(failures) == 1
+            assert player._history.get_nowait() == media_download #pylint:disable=protected-access
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 
 from googleapiclient.errors import HttpError
 import pytest
@@ -7,7 +8,7 @@ from spotipy.exceptions import SpotifyException, SpotifyOauthError
 from discord_bot.cogs.music_helpers.common import SearchType
 from discord_bot.cogs.music_helpers.search_client import SearchClient, InvalidSearchURL, ThirdPartyException, check_youtube_video
 from discord_bot.types.search import SearchResult, SearchCollection
-from discord_bot.types.catalog import CatalogResponse, CatalogItem
+from discord_bot.types.catalog import CatalogPage, CatalogResponse, CatalogItem
 from discord_bot.utils.integrations.common import YOUTUBE_VIDEO_PREFIX
 
 from tests.helpers import fake_engine, fake_source_dict #pylint:disable=unused-import
@@ -17,11 +18,11 @@ class MockSpotifyClient():
     def __init__(self):
         pass
 
-    def album_get(self, _album_id):
-        return CatalogResponse(items=[CatalogItem(search_string='foo track foo artists', title='foo track')], collection_name='Mock Album Name')
+    def album_page(self, _album_id, _offset=0):
+        return CatalogPage(items=[CatalogItem(search_string='foo track foo artists', title='foo track')], collection_name='Mock Album Name')
 
-    def playlist_get(self, _playlist_id):
-        return CatalogResponse(items=[CatalogItem(search_string='foo track foo artists', title='foo track')], collection_name='Mock Playlist Name')
+    def playlist_page(self, _playlist_id, _offset=0):
+        return CatalogPage(items=[CatalogItem(search_string='foo track foo artists', title='foo track')], collection_name='Mock Playlist Name')
 
     def track_get(self, _track_id):
         return CatalogResponse(items=[CatalogItem(search_string='foo track foo artists', title='foo track')])
@@ -30,22 +31,22 @@ class MockSpotifyRaise():
     def __init__(self):
         pass
 
-    def album_get(self, _album_id):
+    def album_page(self, _album_id, _offset=0):
         raise SpotifyException(404, -1, 'foo exception')
 
 class MockSpotifyRaiseUnauth():
     def __init__(self):
         pass
 
-    def album_get(self, _album_id):
+    def album_page(self, _album_id, _offset=0):
         raise SpotifyException(403, -1, 'foo exception')
 
 class MockYoutubeClient():
     def __init__(self):
         pass
 
-    def playlist_get(self, _playlist_id):
-        return CatalogResponse(items=[CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}aaaaaaaaaaaaaa', title='foo title')], collection_name='Mock YouTube Playlist')
+    def playlist_page(self, _playlist_id, _page_token=None):
+        return CatalogPage(items=[CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}aaaaaaaaaaaaaa', title='foo title')], collection_name='Mock YouTube Playlist')
 
 class MockResponse():
     def __init__(self):
@@ -55,7 +56,7 @@ class MockYoutubeRaise():
     def __init__(self):
         pass
 
-    def playlist_get(self, _playlist_id):
+    def playlist_page(self, _playlist_id, _page_token=None):
         raise HttpError(MockResponse(), 'foo'.encode('utf-8'))
 
 
@@ -379,10 +380,10 @@ class MockSpotifyOauth:
     def __init__(self):
         pass
 
-    def album_get(self, _album_id):
+    def album_page(self, _album_id, _offset=0):
         raise SpotifyOauthError(400, -1, 'foo exception')
 
-    def playlist_get(self, _playlist_id):
+    def playlist_page(self, _playlist_id, _offset=0):
         raise SpotifyOauthError(400, -1, 'foo exception')
 
     def track_get(self, _track_id):
@@ -472,7 +473,108 @@ async def test_youtube_playlist_regex_no_dot_wildcard():
 
 
 def test_check_spotify_source_requires_id():
-    '''__check_spotify_source raises ValueError when none of playlist/album/track id is given.'''
+    '''__spotify_page_fetcher raises ValueError when none of playlist/album/track id is given.'''
     x = SearchClient(spotify_client=MockSpotifyClient())
     with pytest.raises(ValueError, match='Playlist, album, or track id must be passed'):
-        x._SearchClient__check_spotify_source()  # pylint: disable=protected-access
+        x._SearchClient__spotify_page_fetcher()  # pylint: disable=protected-access
+
+
+# ---------------------------------------------------------------------------
+# Streaming catalog pages
+# ---------------------------------------------------------------------------
+
+class MockSpotifyPaged():
+    '''Playlist of `total` tracks served in pages of 2, recording the offsets asked for.'''
+    def __init__(self, total=7, gate=None):
+        self.total = total
+        self.gate = gate
+        self.offsets = []
+
+    def playlist_page(self, _playlist_id, offset=0, pagination_limit=2):
+        self.offsets.append(offset)
+        if offset and self.gate:
+            self.gate.wait(timeout=5)
+        end = min(offset + pagination_limit, self.total)
+        items = [CatalogItem(search_string=f'track {i}', title=f'track {i}') for i in range(offset, end)]
+        return CatalogPage(items=items, collection_name='Paged Playlist' if offset == 0 else None,
+                           total=self.total, next_cursor=end if end < self.total else None)
+
+
+@pytest.mark.asyncio
+async def test_stream_source_yields_first_page_before_the_rest():
+    '''The first page is handed over while the remaining pages are still in flight.'''
+    gate = threading.Event()
+    spotify = MockSpotifyPaged(total=7, gate=gate)
+    x = SearchClient(spotify_client=spotify)
+    stream = x.stream_source('https://open.spotify.com/playlist/1111', asyncio.get_running_loop(), 100)
+    first = await anext(stream)
+    assert [r.raw_search_string for r in first.search_results] == ['track 0', 'track 1']
+    assert first.collection_name == 'Paged Playlist'
+
+    gate.set()
+    rest = [page async for page in stream]
+    assert [r.raw_search_string for page in rest for r in page.search_results] == [f'track {i}' for i in range(2, 7)]
+    assert all(page.collection_name == 'Paged Playlist' for page in rest)
+    assert sorted(spotify.offsets) == [0, 2, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_stream_source_fetches_only_pages_within_max_results():
+    '''Offsets past max_results are never requested, and the last page is trimmed.'''
+    spotify = MockSpotifyPaged(total=20)
+    x = SearchClient(spotify_client=spotify)
+    result = await x.check_source('https://open.spotify.com/playlist/1111', asyncio.get_running_loop(), 5)
+    assert [r.raw_search_string for r in result.search_results] == [f'track {i}' for i in range(5)]
+    assert sorted(spotify.offsets) == [0, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_stream_source_shuffle_gathers_every_page():
+    '''A shuffled playlist is yielded once, with every track, after all pages land.'''
+    spotify = MockSpotifyPaged(total=7)
+    x = SearchClient(spotify_client=spotify)
+    pages = [page async for page in x.stream_source('https://open.spotify.com/playlist/1111 shuffle',
+                                                    asyncio.get_running_loop(), 100)]
+    assert len(pages) == 1
+    assert sorted(r.raw_search_string for r in pages[0].search_results) == sorted(f'track {i}' for i in range(7))
+
+
+@pytest.mark.asyncio
+async def test_stream_source_youtube_walks_page_tokens():
+    '''Token-paged playlists are streamed one page at a time, following the tokens.'''
+    class MockYoutubePaged():
+        '''Two token-chained pages, recording the tokens asked for.'''
+        def __init__(self):
+            self.tokens = []
+
+        def playlist_page(self, _playlist_id, page_token=None):
+            self.tokens.append(page_token)
+            if page_token is None:
+                return CatalogPage(items=[CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}a', title='a')],
+                                   collection_name='Paged YouTube', next_cursor='second')
+            return CatalogPage(items=[CatalogItem(search_string=f'{YOUTUBE_VIDEO_PREFIX}b', title='b')])
+
+    youtube = MockYoutubePaged()
+    x = SearchClient(youtube_client=youtube)
+    pages = [page async for page in x.stream_source('https://www.youtube.com/playlist?list=11111',
+                                                    asyncio.get_running_loop(), 10)]
+    assert youtube.tokens == [None, 'second']
+    assert [page.collection_name for page in pages] == ['Paged YouTube', 'Paged YouTube']
+    assert [page.search_results[0].proper_name for page in pages] == ['a', 'b']
+
+
+@pytest.mark.asyncio
+async def test_stream_source_error_on_later_page_raises_third_party():
+    '''A page failing after the first is still reported as a ThirdPartyException.'''
+    class MockSpotifyFailsLater(MockSpotifyPaged):
+        '''Serves the first page, fails every other.'''
+        def playlist_page(self, _playlist_id, offset=0, pagination_limit=2):
+            if offset:
+                raise SpotifyException(500, -1, 'boom')
+            return super().playlist_page(_playlist_id, offset, pagination_limit)
+
+    x = SearchClient(spotify_client=MockSpotifyFailsLater(total=7))
+    stream = x.stream_source('https://open.spotify.com/playlist/1111', asyncio.get_running_loop(), 100)
+    assert len((await anext(stream)).search_results) == 2
+    with pytest.raises(ThirdPartyException):
+        await anext(stream)
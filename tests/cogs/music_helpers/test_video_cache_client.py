@@ -1,4 +1,5 @@
 from functools import partial
+from pathlib import Path
 from tempfile import TemporaryDirectory
 
 import pytest
@@ -56,6 +57,43 @@ async def test_iterate_file_stores_file_size(fake_engine):  #pylint:disable=rede
                 query = (await session.execute(select(VideoCache))).scalars().first()
                 assert query.file_size_bytes == 12345
 
+@pytest.mark.asyncio
+async def test_iterate_file_records_audio_format(fake_engine):  #pylint:disable=redefined-outer-name
+    '''PCM and Opus entries each record their own format and both serve cache hits.'''
+    with TemporaryDirectory() as tmp_dir:
+        fake_context = generate_fake_context()
+        x = VideoCacheClient(10, partial(async_mock_session, fake_engine))
+        with fake_media_download(tmp_dir, fake_context=fake_context, is_direct_search=True) as pcm:
+            with fake_media_download(tmp_dir, fake_context=fake_context, is_direct_search=True) as opus:
+                pcm.file_path = Path('cache/first.pcm')
+                opus.file_path = Path('cache/second.opus')
+                await x.iterate_file(pcm)
+                await x.iterate_file(opus)
+                async with async_mock_session(fake_engine) as session:
+                    rows = (await session.execute(select(VideoCache).order_by(asc(VideoCache.id)))).scalars().all()
+                    assert [row.audio_format for row in rows] == ['pcm', 'opus']
+                result = await x.get_webpage_url_item(opus.media_request)
+                assert result.file_path == Path('cache/second.opus')
+
+
+@pytest.mark.asyncio
+async def test_iterate_file_backfills_audio_format(fake_engine):  #pylint:disable=redefined-outer-name
+    '''A row cached before the column existed gets its format on the next iterate.'''
+    with TemporaryDirectory() as tmp_dir:
+        fake_context = generate_fake_context()
+        x = VideoCacheClient(10, partial(async_mock_session, fake_engine))
+        with fake_media_download(tmp_dir, fake_context=fake_context) as s:
+            await x.iterate_file(s)
+            async with async_mock_session(fake_engine) as session:
+                row = (await session.execute(select(VideoCache))).scalars().first()
+                row.audio_format = None
+                await session.commit()
+            await x.iterate_file(s)
+            async with async_mock_session(fake_engine) as session:
+                row = (await session.execute(select(VideoCache))).scalars().first()
+                assert row.audio_format == 'pcm'
+
+
 @pytest.mark.asyncio
 async def test_cache_hit_propagates_file_size(fake_engine):  #pylint:disable=redefined-outer-name
     with TemporaryDirectory() as tmp_dir:
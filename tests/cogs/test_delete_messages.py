@@ -139,6 +139,35 @@ async def test_delete_messages_process_result_skips_recent(fake_context):  #pyli
     assert fake_message.deleted is False
 
 
+@pytest.mark.asyncio
+@freeze_time('2025-12-01 12:00:00', tz_offset=0)
+async def test_delete_messages_process_result_bulk_deletes_recent(fake_context):  #pylint:disable=redefined-outer-name
+    '''Messages younger than 14 days go out in bulk deletes of up to 100; older ones and a lone remainder singly'''
+    recent_created_at = datetime(2025, 11, 20, 0, 0, 0, tzinfo=timezone.utc)
+    old_created_at = datetime(2025, 11, 1, 0, 0, 0, tzinfo=timezone.utc)
+    recent = [FakeMessage(channel=fake_context['channel'], created_at=recent_created_at) for _ in range(101)]
+    old = [FakeMessage(channel=fake_context['channel'], created_at=old_created_at) for _ in range(2)]
+    fake_context['channel'].messages = recent + old
+    config = {
+        'delete_messages': {
+            'loop_sleep_interval': 5,
+            'discord_channels': [
+                {'server_id': fake_context['guild'].id, 'channel_id': fake_context['channel'].id, 'delete_after': 1},
+            ]
+        }
+    } | BASE_CONFIG
+    cog = DeleteMessages(fake_context['bot'], config, fake_context['dispatcher'])
+    result = ChannelHistoryResult(
+        guild_id=fake_context['guild'].id,
+        channel_id=fake_context['channel'].id,
+        messages=[FetchedMessage(id=message.id, content=message.content, created_at=message.created_at, author_bot=False)
+                  for message in recent + old],
+    )
+    await cog._process_delete_result(result)  #pylint:disable=protected-access
+    assert fake_context['dispatcher'].bulk_deletes == [[message.id for message in recent[:100]]]
+    assert all(message.deleted for message in recent + old)
+
+
 @pytest.mark.asyncio
 async def test_delete_messages_process_result_handles_error(fake_context):  #pylint:disable=redefined-outer-name
     '''_process_delete_result logs an error and returns when result has an error'''
@@ -4,9 +4,9 @@ from datetime import datetime, timedelta, timezone
 from freezegun import freeze_time
 import pytest
 from sqlalchemy import select
-from sqlalchemy.sql.functions import count as sql_count
+from sqlalchemy.sql.functions import count as sql_count, sum as sql_sum
 
-from discord_bot.cogs.markov import clean_message, Markov, get_markov_channel_by_ids, LOOP_MARKOV_CHECK, LOOP_MARKOV_RESULT, MARKOV_HISTORY_RETENTION_DAYS_DEFAULT
+from discord_bot.cogs.markov import clean_message, Markov, get_guild_transitions, get_markov_channel_by_ids, LOOP_MARKOV_CHECK, LOOP_MARKOV_RESULT, MARKOV_HISTORY_RETENTION_DAYS_DEFAULT
 from discord_bot.utils.loop_health import LOOP_HEALTH
 from discord_bot.utils.otel import loop_heartbeat_observations
 from discord_bot.clients.dispatch_client_base import DispatchRemoteError
@@ -183,7 +183,7 @@ async def test_turn_on_and_sync_no_messages(mocker, fake_engine, fake_context):
 
 @pytest.mark.asyncio
 async def test_turn_on_and_sync_multiple_times(mocker, fake_engine, freezer, fake_context):  #pylint:disable=redefined-outer-name
-    '''Running the loop twice accumulates relations from both runs'''
+    '''Running the loop twice accumulates relation counts from both runs'''
     freezer.move_to('2024-12-01 12:00:00')
     fake_message = FakeMessage(content='this is a basic test', channel=fake_context['channel'],
                                created_at=datetime(2024, 11, 30, 0, 0, 0, tzinfo=timezone.utc))
@@ -200,7 +200,7 @@ async def test_turn_on_and_sync_multiple_times(mocker, fake_engine, freezer, fak
     freezer.move_to('2024-12-02 12:00:00')
     await _run_markov_request_and_result(cog, mocker)
     async with async_mock_session(fake_engine) as session:
-        assert (await session.execute(select(sql_count()).select_from(MarkovRelation))).scalar() == 13
+        assert (await session.execute(select(sql_sum(MarkovRelation.count)))).scalar() == 13
 
 @pytest.mark.asyncio
 async def test_turn_on_and_sync_message_dissapears(mocker, fake_engine, freezer, fake_context):  #pylint:disable=redefined-outer-name
@@ -263,9 +263,9 @@ async def test_turn_on_and_sync_too_long_words(mocker, fake_engine, fake_context
     async with async_mock_session(fake_engine) as session:
         assert (await session.execute(select(sql_count()).select_from(MarkovRelation))).scalar() == 4
 
-def mock_random(input_list):
-    '''Return the first element of the list (deterministic for tests).'''
-    return input_list[0]
+def mock_random():
+    '''Always draw 0, which picks the first-seen candidate (deterministic for tests).'''
+    return 0.0
 
 @pytest.mark.asyncio
 @freeze_time('2024-12-01 12:00:00', tz_offset=0)
@@ -278,7 +278,7 @@ async def test_turn_on_sync_and_speak(mocker, fake_engine, fake_context):  #pyli
     cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
     cog.register_result_queue()
     await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
-    mocker.patch('discord_bot.cogs.markov.choice', side_effect=mock_random)
+    mocker.patch('discord_bot.cogs.markov.random', side_effect=mock_random)
     await _run_markov_request_and_result(cog, mocker)
     result = await cog.speak(cog, fake_context['context'])
     assert result == 'this is an example message, an example message, an example message, an example message, an example message, an example message, an example message, an example message, an example message, an example message,'
@@ -296,7 +296,7 @@ async def test_turn_on_sync_speak_invalid_first_word(mocker, fake_engine, fake_c
     cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
     cog.register_result_queue()
     await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
-    mocker.patch('discord_bot.cogs.markov.choice', side_effect=mock_random)
+    mocker.patch('discord_bot.cogs.markov.random', side_effect=mock_random)
     await _run_markov_request_and_result(cog, mocker)
     result = await cog.speak(cog, fake_context['context'], 'non-existing')
     assert result == 'No markov word matching "non-existing"'
@@ -312,7 +312,7 @@ async def test_turn_on_sync_speak_multi_first_word(mocker, fake_engine, fake_con
     cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
     cog.register_result_queue()
     await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
-    mocker.patch('discord_bot.cogs.markov.choice', side_effect=mock_random)
+    mocker.patch('discord_bot.cogs.markov.random', side_effect=mock_random)
     await _run_markov_request_and_result(cog, mocker)
     result = await cog.speak(cog, fake_context['context'], 'funny you want an example')
     assert len(result.split(' ')) == 32
@@ -328,7 +328,7 @@ async def test_turn_on_sync_speak_sentence_length(mocker, fake_engine, fake_cont
     cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
     cog.register_result_queue()
     await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
-    mocker.patch('discord_bot.cogs.markov.choice', side_effect=mock_random)
+    mocker.patch('discord_bot.cogs.markov.random', side_effect=mock_random)
     await _run_markov_request_and_result(cog, mocker)
     result = await cog.speak(cog, fake_context['context'], sentence_length=5)
     assert len(result.split(' ')) == 5
@@ -870,3 +870,106 @@ async def test_process_emojis_result_success_caches_emojis(fake_engine, fake_con
     cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
     await cog._process_emojis_result(GuildEmojisResult(guild_id=99, emojis=['a']))  #pylint:disable=protected-access
     assert cog._emoji_cache[99] == ['a']  #pylint:disable=protected-access
+
+
+@pytest.mark.asyncio
+@freeze_time('2024-12-01 12:00:00', tz_offset=0)
+async def test_process_history_result_saves_batch_in_one_commit(fake_engine, fake_context, mocker):  #pylint:disable=redefined-outer-name
+    '''A whole history batch is written in one transaction that also advances last_message_id'''
+    created_at = datetime(2024, 11, 30, 0, 0, 0, tzinfo=timezone.utc)
+    cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
+    await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
+
+    result = ChannelHistoryResult(
+        guild_id=fake_context['guild'].id,
+        channel_id=fake_context['channel'].id,
+        messages=[
+            FetchedMessage(id=101, content='this is a basic test', created_at=created_at, author_bot=False),
+            FetchedMessage(id=102, content='another basic message', created_at=created_at, author_bot=False),
+            # Skipped messages still move the cursor past them
+            FetchedMessage(id=103, content='!play something', created_at=created_at, author_bot=False),
+        ],
+    )
+    save_spy = mocker.spy(cog, 'save_relations')
+    await cog._process_history_result(result)  #pylint:disable=protected-access
+
+    assert save_spy.call_count == 1
+    async with async_mock_session(fake_engine) as session:
+        assert (await session.execute(select(sql_count()).select_from(MarkovRelation))).scalar() == 8
+        markov_channel = await get_markov_channel_by_ids(session, fake_context['guild'].id, fake_context['channel'].id)
+        assert markov_channel.last_message_id == 103
+
+
+def test_build_relations_wraps_and_skips_long_words(fake_engine, fake_context):  #pylint:disable=redefined-outer-name
+    '''build_relations loops the last word back to the first and drops pairs with oversized words'''
+    created_at = datetime(2024, 11, 30, 0, 0, 0, tzinfo=timezone.utc)
+    cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
+    relations = cog.build_relations(['foo', 'bar', 'a' * 300], 7, created_at)
+    assert relations == [{'channel_id': 7, 'leader_word': 'foo', 'follower_word': 'bar', 'created_at': created_at}]
+
+
+@pytest.mark.asyncio
+async def test_save_relations_aggregates_counts_per_day(fake_engine, fake_context):  #pylint:disable=redefined-outer-name
+    '''Repeated pairs collapse into one row per day bucket, within a batch and across batches'''
+    cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
+    await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
+    day_one = datetime(2024, 11, 30, 8, 0, 0, tzinfo=timezone.utc)
+    day_two = datetime(2024, 12, 1, 8, 0, 0, tzinfo=timezone.utc)
+    async with async_mock_session(fake_engine) as session:
+        markov_channel = await get_markov_channel_by_ids(session, fake_context['guild'].id, fake_context['channel'].id)
+        relations = cog.build_relations(['foo', 'bar'], markov_channel.id, day_one) * 2
+        await cog.save_relations(session, markov_channel.id, relations, 1)
+        relations = cog.build_relations(['foo', 'bar'], markov_channel.id, day_one + timedelta(hours=4)) + \
+            cog.build_relations(['foo', 'bar'], markov_channel.id, day_two)
+        await cog.save_relations(session, markov_channel.id, relations, 2)
+
+    async with async_mock_session(fake_engine) as session:
+        rows = (await session.execute(
+            select(MarkovRelation.leader_word, MarkovRelation.created_at, MarkovRelation.count)
+            .order_by(MarkovRelation.created_at, MarkovRelation.leader_word)
+        )).all()
+    midnight = datetime(2024, 11, 30, tzinfo=timezone.utc)
+    assert [tuple(row) for row in rows] == [
+        ('bar', midnight, 3), ('foo', midnight, 3),
+        ('bar', midnight + timedelta(days=1), 1), ('foo', midnight + timedelta(days=1), 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_speak_builds_model_once_and_applies_new_batches(mocker, fake_engine, fake_context):  #pylint:disable=redefined-outer-name
+    '''speak builds the guild model on first use, then ingestion updates it in place'''
+    created_at = datetime(2024, 11, 30, 0, 0, 0, tzinfo=timezone.utc)
+    cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
+    await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
+    mocker.patch('discord_bot.cogs.markov.random', side_effect=mock_random)
+    await cog._process_history_result(ChannelHistoryResult(  #pylint:disable=protected-access
+        guild_id=fake_context['guild'].id, channel_id=fake_context['channel'].id,
+        messages=[FetchedMessage(id=101, content='hello there', created_at=created_at, author_bot=False)],
+    ))
+    build_spy = mocker.spy(cog, 'get_markov_model')
+    load_spy = mocker.patch('discord_bot.cogs.markov.get_guild_transitions', wraps=get_guild_transitions)
+
+    assert await cog.speak(cog, fake_context['context'], sentence_length=3) == 'hello there hello'
+    await cog._process_history_result(ChannelHistoryResult(  #pylint:disable=protected-access
+        guild_id=fake_context['guild'].id, channel_id=fake_context['channel'].id,
+        messages=[FetchedMessage(id=102, content='general kenobi', created_at=created_at, author_bot=False)],
+    ))
+    assert await cog.speak(cog, fake_context['context'], 'general', sentence_length=3) == 'general kenobi general' #pylint: disable=redundant-keyword-arg
+
+    assert build_spy.call_count == 2
+    assert load_spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_turn_off_invalidates_model(fake_engine, fake_context):  #pylint:disable=redefined-outer-name
+    '''Turning markov off drops the guild's cached model along with its relations'''
+    created_at = datetime(2024, 11, 30, 0, 0, 0, tzinfo=timezone.utc)
+    cog = Markov(fake_context['bot'], GENERIC_CONFIG, fake_context['dispatcher'], fake_engine)
+    await cog.on(cog, fake_context['context']) #pylint: disable=too-many-function-args
+    await cog._process_history_result(ChannelHistoryResult(  #pylint:disable=protected-access
+        guild_id=fake_context['guild'].id, channel_id=fake_context['channel'].id,
+        messages=[FetchedMessage(id=101, content='hello there', created_at=created_at, author_bot=False)],
+    ))
+    await cog.get_markov_model(fake_context['guild'].id)
+    await cog.off(cog, fake_context['context']) #pylint: disable=too-many-function-args
+    assert await cog.speak(cog, fake_context['context']) == 'No markov words to pick from'
@@ -1,11 +1,12 @@
 import asyncio
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import redis
 
-from discord.errors import NotFound
+from discord.errors import HTTPException, NotFound
 
 from discord_bot.workers.message_dispatcher import (
     MessageDispatcher, MessageMutableBundle, MessageContext, DispatchPriority,
@@ -13,11 +14,12 @@ from discord_bot.workers.message_dispatcher import (
 )
 from discord_bot.utils.loop_health import LOOP_HEALTH
 from discord_bot.utils.otel import loop_heartbeat_observations
-from discord_bot.workers.asyncio_queues import AsyncioBundleStore, AsyncioWorkQueue
+from discord_bot.workers.asyncio_queues import AsyncioBundleStore, AsyncioChannelTailStore, AsyncioWorkQueue
+from discord_bot.workers.discord_rate_limits import DiscordRateLimiter
 from discord_bot.exceptions import CogMissingRequiredArg
 from discord_bot.types.fetched_message import FetchedMessage
 from discord_bot.types.dispatch_request import (
-    FetchChannelHistoryRequest, FetchGuildEmojisRequest, SendRequest, DeleteRequest,
+    BulkDeleteRequest, FetchChannelHistoryRequest, FetchGuildEmojisRequest, SendRequest, DeleteRequest,
 )
 from discord_bot.clients.dispatch_client_base import DispatchRemoteError
 from discord_bot.types.dispatch_result import ChannelHistoryResult, GuildEmojisResult
@@ -28,10 +30,11 @@ from tests.helpers import (
 )
 
 
-def make_dispatcher(channels=None, settings=None):
+def make_dispatcher(channels=None, settings=None, channel_tails=None, rate_limiter=None):
     '''Return a fresh MessageDispatcher backed by AsyncioBundleStore + AsyncioWorkQueue.'''
     bot = fake_bot_yielder(channels=channels or [])()
-    return MessageDispatcher(bot, settings or {}, AsyncioBundleStore(), AsyncioWorkQueue())
+    return MessageDispatcher(bot, settings or {}, AsyncioBundleStore(), AsyncioWorkQueue(),
+                             channel_tails=channel_tails, rate_limiter=rate_limiter)
 
 
 async def drain_dispatcher(dispatcher, timeout=5.0):
@@ -472,6 +475,24 @@ async def test_submit_request_delete_enqueues(fake_context):  # pylint: disable=
     assert payload['message_id'] == msg.id
 
 
+@pytest.mark.asyncio
+async def test_submit_request_bulk_delete_enqueues(fake_context):  # pylint: disable=redefined-outer-name
+    '''submit_request(BulkDeleteRequest) enqueues one bulk_delete: item for all the messages.'''
+    channel = fake_context['channel']
+    dispatcher = make_dispatcher(channels=[channel])
+
+    await dispatcher.submit_request(BulkDeleteRequest(
+        guild_id=fake_context['guild'].id, channel_id=channel.id, message_ids=[1, 2, 3],
+    ))
+    await asyncio.sleep(0)
+
+    q = dispatcher._work_queue._queue  # pylint: disable=protected-access
+    _pri, _seq, member, payload = q.get_nowait()
+    assert member.startswith('bulk_delete:')
+    assert payload['message_ids'] == [1, 2, 3]
+    assert q.empty()
+
+
 @pytest.mark.asyncio
 async def test_submit_request_history_creates_task(fake_context):  # pylint: disable=redefined-outer-name
     '''submit_request(FetchChannelHistoryRequest) starts a background task.'''
@@ -545,6 +566,118 @@ async def test_delete_item_not_found_silently_ignored(fake_context):  # pylint:
     await dispatcher.stop()
 
 
+@pytest.mark.asyncio
+async def test_bulk_delete_messages_executes_via_worker(fake_context):  # pylint: disable=redefined-outer-name
+    '''bulk_delete_messages deletes every listed message in one channel call.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    doomed = [FakeMessage(channel=channel) for _ in range(3)]
+    kept = FakeMessage(channel=channel)
+    channel.messages = doomed + [kept]
+    dispatcher = make_dispatcher(channels=[channel])
+
+    await dispatcher.start()
+    dispatcher.bulk_delete_messages(guild_id, channel.id, [message.id for message in doomed])
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert all(message.deleted for message in doomed)
+    assert channel.messages == [kept]
+
+
+@pytest.mark.asyncio
+async def test_refused_bulk_delete_falls_back_to_single_deletes(fake_context):  # pylint: disable=redefined-outer-name
+    '''A 400 from the bulk delete (a message past 14 days) re-enqueues each message as a single delete.'''
+    channel = fake_context['channel']
+    mock_channel = MagicMock()
+    mock_channel.id = channel.id
+    mock_channel.delete_messages = AsyncMock(side_effect=HTTPException(
+        SimpleNamespace(status=400, reason='Bad Request'), 'Message too old'))
+    mock_channel.get_partial_message.return_value = AsyncMock()
+
+    dispatcher = make_dispatcher(channels=[mock_channel])
+    await dispatcher.start()
+    dispatcher.bulk_delete_messages(fake_context['guild'].id, channel.id, [11, 12])
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    mock_channel.delete_messages.assert_awaited_once()
+    assert [call.args[0] for call in mock_channel.get_partial_message.call_args_list] == [11, 12]
+    assert mock_channel.get_partial_message.return_value.delete.await_count == 2
+
+
+def _exhausted_send_limiter(channel_id, reset_after):
+    '''A DiscordRateLimiter whose send bucket for channel_id is empty for reset_after seconds.'''
+    limiter = DiscordRateLimiter()
+    limiter.observe('POST', f'/api/v10/channels/{channel_id}/messages', 200,
+                    {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': str(reset_after)})
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_throttled_send_is_parked_until_bucket_resets(fake_context):  # pylint: disable=redefined-outer-name
+    '''A send into an empty bucket waits parked, off the workers, and is sent after the reset.'''
+    channel = fake_context['channel']
+    dispatcher = make_dispatcher(channels=[channel], rate_limiter=_exhausted_send_limiter(channel.id, 0.2))
+
+    await dispatcher.start()
+    dispatcher.send_message(fake_context['guild'].id, channel.id, 'later')
+    await drain_dispatcher(dispatcher)
+    assert not channel.messages
+    assert dispatcher._parked.pending == 1  # pylint: disable=protected-access
+
+    await asyncio.sleep(0.3)
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+    assert [message.content for message in channel.messages] == ['later']
+
+
+@pytest.mark.asyncio
+async def test_stop_requeues_parked_items(fake_context):  # pylint: disable=redefined-outer-name
+    '''Items still parked at shutdown go back on the work queue instead of being dropped.'''
+    channel = fake_context['channel']
+    dispatcher = make_dispatcher(channels=[channel], rate_limiter=_exhausted_send_limiter(channel.id, 60))
+
+    await dispatcher.start()
+    dispatcher.send_message(fake_context['guild'].id, channel.id, 'later')
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert not channel.messages
+    assert dispatcher._parked.pending == 0  # pylint: disable=protected-access
+    member, payload = await dispatcher._work_queue.dequeue(timeout=0.1)  # pylint: disable=protected-access
+    assert member.startswith('send:')
+    assert payload['content'] == 'later'
+
+
+@pytest.mark.asyncio
+async def test_item_sending_no_request_releases_its_reservation(fake_context):  # pylint: disable=redefined-outer-name
+    '''A delete whose channel is already gone gives its reserved request back to the bucket.'''
+    channel = fake_context['channel']
+    limiter = DiscordRateLimiter()
+    dispatcher = make_dispatcher(channels=[channel], rate_limiter=limiter)
+    dispatcher.bot.fetch_channel = AsyncMock(side_effect=NotFound(FakeResponse(), 'unknown channel'))
+
+    await dispatcher.start()
+    dispatcher.delete_message(fake_context['guild'].id, channel.id, 99999)
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    bucket = limiter._buckets[('delete', channel.id)]  # pylint: disable=protected-access
+    assert bucket.in_flight == 0
+    assert bucket.remaining == bucket.limit
+
+
+@pytest.mark.asyncio
+async def test_parked_mutable_does_not_clobber_a_newer_update(fake_context):  # pylint: disable=redefined-outer-name
+    '''A released mutable is re-queued with overwrite=False, so an update queued meanwhile wins.'''
+    dispatcher = make_dispatcher(channels=[fake_context['channel']])
+    await dispatcher._work_queue.enqueue_unique('mutable:key', {'content': ['new']},  # pylint: disable=protected-access
+                                                DispatchPriority.HIGH)
+    await dispatcher._requeue_parked('mutable:key', {'content': ['old']})  # pylint: disable=protected-access
+    assert await dispatcher._work_queue.dequeue(timeout=0.1) == ('mutable:key', {'content': ['new']})  # pylint: disable=protected-access
+
+
 @pytest.mark.asyncio
 async def test_update_mutable_dispatches_message(fake_context):  # pylint: disable=redefined-outer-name
     '''update_mutable causes the worker to send a message to the channel.'''
@@ -638,6 +771,115 @@ async def test_process_mutable_sticky_check_edits_in_place(fake_context):  # pyl
     assert channel.messages[0].content == 'second'
 
 
+@pytest.mark.asyncio
+async def test_burst_of_updates_renders_only_the_last(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''Updates queued before a worker picks the key up collapse into one render of the latest content.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    dispatcher = make_dispatcher(channels=[channel])
+    send = mocker.spy(channel, 'send')
+
+    for n in range(20):
+        dispatcher.update_mutable('burst', guild_id, [f'update {n}'], channel.id, sticky=False)
+    await dispatcher.start()
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert send.call_count == 1
+    assert [message.content for message in channel.messages] == ['update 19']
+
+
+@pytest.mark.asyncio
+async def test_stale_update_is_dropped_after_a_newer_render(fake_context):  # pylint: disable=redefined-outer-name
+    '''A payload older than the last rendered seq (late retry or reordered POST) is not rendered.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    dispatcher = make_dispatcher(channels=[channel])
+    payload = {'guild_id': guild_id, 'channel_id': channel.id, 'sticky': False}
+
+    await dispatcher._process_mutable('k', {**payload, 'content': ['newer'], 'seq': 2})  # pylint: disable=protected-access
+    await dispatcher._process_mutable('k', {**payload, 'content': ['older'], 'seq': 1})  # pylint: disable=protected-access
+
+    assert [message.content for message in channel.messages] == ['newer']
+    assert (await dispatcher._bundle_store.load('k'))['applied_seq'] == 2  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_sticky_check_uses_channel_tail_instead_of_history(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''With a warm tail tracker, repeated sticky updates edit in place without fetching history.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    key = f'sticky-tail-{guild_id}'
+    dispatcher = make_dispatcher(channels=[channel], channel_tails=AsyncioChannelTailStore())
+    history = mocker.spy(channel, 'history')
+
+    await dispatcher.start()
+    for content in ('first', 'second', 'third'):
+        dispatcher.update_mutable(key, guild_id, [content], channel.id, sticky=True)
+        await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert [m.content for m in channel.messages] == ['third']
+    history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sticky_check_reposts_after_gateway_message_event(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''A newer message reported by the gateway moves the bundle to the bottom, still without history.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    key = f'sticky-event-{guild_id}'
+    dispatcher = make_dispatcher(channels=[channel], channel_tails=AsyncioChannelTailStore())
+    history = mocker.spy(channel, 'history')
+
+    await dispatcher.start()
+    dispatcher.update_mutable(key, guild_id, ['status'], channel.id, sticky=True)
+    await drain_dispatcher(dispatcher)
+    first_id = channel.messages[0].id
+    # Snowflakes grow with time: anything posted later has a larger id.
+    dispatcher.record_channel_event(guild_id, channel.id, added=[10 ** 13])
+    await drain_dispatcher(dispatcher)
+    dispatcher.update_mutable(key, guild_id, ['status'], channel.id, sticky=True)
+    await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert len(channel.messages) == 1
+    assert channel.messages[0].id != first_id
+    history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sticky_check_fetches_history_once_while_tail_is_cold(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''A bundle whose messages the tracker has not seen fetches history, which warms the tail.'''
+    channel = fake_context['channel']
+    guild_id = fake_context['guild'].id
+    key = f'sticky-cold-{guild_id}'
+    message = await channel.send(content='status')
+    dispatcher = make_dispatcher(channels=[channel], channel_tails=AsyncioChannelTailStore())
+    bundle = MessageMutableBundle(guild_id, channel.id)
+    bundle.message_contexts = [MessageContext(guild_id, channel.id, message_id=message.id, message_content='status')]
+    await dispatcher._bundle_store.save(key, bundle.to_dict())  # pylint: disable=protected-access
+    history = mocker.spy(channel, 'history')
+
+    await dispatcher.start()
+    for content in ('second', 'third'):
+        dispatcher.update_mutable(key, guild_id, [content], channel.id, sticky=True)
+        await drain_dispatcher(dispatcher)
+    await dispatcher.stop()
+
+    assert [(m.id, m.content) for m in channel.messages] == [(message.id, 'third')]
+    assert history.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_record_channel_event_without_tracker_enqueues_nothing():
+    '''A dispatcher without a tail tracker drops channel events instead of queueing them.'''
+    dispatcher = make_dispatcher()
+    dispatcher.record_channel_event(1, 2, added=[3])
+    await asyncio.sleep(0)
+    assert dispatcher._work_queue._queue.empty()  # pylint: disable=protected-access
+
+
 @pytest.mark.asyncio
 async def test_process_mutable_migrates_channel_when_payload_has_new_channel_id(fake_context):  # pylint: disable=redefined-outer-name
     '''_process_mutable migrates the bundle when payload carries a different channel_id.'''
@@ -851,6 +1093,17 @@ async def test_dispatch_item_routes_delete(mocker):
     mock_handler.assert_called_once_with(payload)
 
 
+@pytest.mark.asyncio
+async def test_dispatch_item_routes_bulk_delete(mocker):
+    '''_dispatch_item with bulk_delete: prefix calls _process_bulk_delete.'''
+    dispatcher = make_dispatcher()
+    mock_handler = AsyncMock()
+    mocker.patch.object(dispatcher, '_process_bulk_delete', new=mock_handler)
+    payload = {'guild_id': 1, 'message_ids': [1, 2]}
+    await dispatcher._dispatch_item('bulk_delete:uuid', payload)  # pylint: disable=protected-access
+    mock_handler.assert_called_once_with(payload)
+
+
 @pytest.mark.asyncio
 async def test_dispatch_item_routes_update_channel(mocker):
     '''_dispatch_item with update_channel: prefix calls _process_update_channel.'''
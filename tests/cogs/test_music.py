@@ -58,7 +58,9 @@ BASE_MUSIC_CONFIG = {
         }
     },
     'music': {
-        'broker_client': {'url': 'http://broker-host:8081'},
+        # A short long-poll window: tests drain the in-process result queues
+        # directly, and an empty call should not hold the test for 10 s.
+        'broker_client': {'url': 'http://broker-host:8081', 'result_wait_seconds': 0.01},
         'download_client': {'url': 'http://downloader-host:8083'},
         'youtube_music_search_client': {'url': 'http://search-host:8084'},
     },
@@ -99,6 +101,9 @@ def yield_fake_search_client(media_request: MediaRequest = None):
                 return SearchCollection(search_results=[search_result])
             return SearchCollection(search_results=[])
 
+        async def stream_source(self, *args, **kwargs):
+            yield await self.check_source(*args, **kwargs)
+
     return FakeSearchClient
 
 def yield_fake_download_worker(media_download: MediaDownload):
@@ -186,6 +191,9 @@ def yield_search_client_check_source(source_dict_list: List[MediaRequest]):
                 search_results.append(search_result)
             return SearchCollection(search_results=search_results)
 
+        async def stream_source(self, *args, **kwargs):
+            yield await self.check_source(*args, **kwargs)
+
     return FakeSearchClient
 
 def yield_search_client_check_source_raises():
@@ -196,6 +204,9 @@ def yield_search_client_check_source_raises():
         async def check_source(self, *_args, **_kwargs):
             raise SearchException('foo', user_message='woopsie')
 
+        async def stream_source(self, *args, **kwargs):
+            yield await self.check_source(*args, **kwargs)
+
     return FakeSearchClient
 
 @pytest.mark.asyncio
@@ -29,6 +29,7 @@ from discord_bot.types.dispatch_request import (
     FetchGuildEmojisRequest,
     SendRequest,
     DeleteRequest,
+    BulkDeleteRequest,
 )
 from discord_bot.clients.dispatch_client_base import DispatchRemoteError
 from discord_bot.types.dispatch_result import ChannelHistoryResult, GuildEmojisResult, encode_error
@@ -235,6 +236,7 @@ def attach_in_process_download(cog: Any, worker_cls: Optional[type] = None) -> I
         wait_period_max_variance=cog.config.download.youtube_wait_period_max_variance,
         bucket_name=bucket_name,
         normalize_audio=cog.config.download.normalize_audio,
+        audio_format=cog.config.download.audio_format,
         broker=cog.broker_client,
         max_retries=cog.config.download.max_download_retries,
         retry_backoff_seconds_minimum=cog.config.download.retry_backoff_seconds_minimum,
@@ -410,6 +412,12 @@ class FakeChannel():
                 return message
         raise NotFound(FakeResponse(), 'Unable to find message')
 
+    async def delete_messages(self, messages: list[Any]) -> None:
+        message_ids = {message.id for message in messages}
+        for message in list(self.messages):
+            if message.id in message_ids:
+                await message.delete()
+
     async def connect(self, reconnect: bool = False) -> bool: #pylint:disable=unused-argument
         self.guild.voice_client = FakeVoiceClient()
         await self.guild.voice_client.move_to(self)
@@ -449,6 +457,7 @@ def fake_bot_yielder(start_sleep: int = 0, user: Optional[Any] = None, guilds: O
     class FakeBot():
         def __init__(self, *_args: Any, **_kwargs: Any) -> None:
             self.startup_functions = []
+            self.listeners = {}
             self.user = user or FakeBotUser()
             self.cogs = []
             self.guilds = guilds or []
@@ -497,6 +506,9 @@ def fake_bot_yielder(start_sleep: int = 0, user: Optional[Any] = None, guilds: O
         def event(self, func: Callable) -> None:
             self.startup_functions.append(func)
 
+        def add_listener(self, func: Callable, name: Optional[str] = None) -> None:
+            self.listeners.setdefault(name or func.__name__, []).append(func)
+
         def get_cog(self, name: str) -> Optional[Any]:
             if name == 'MessageDispatcher':
                 return FakeMessageDispatcher(self)
@@ -570,6 +582,7 @@ class FakeMessageDispatcher():
     def __init__(self, bot: Any) -> None:
         self.bot = bot
         self._cog_result_queues: dict = {}
+        self.bulk_deletes: list[list[int]] = []
 
     def register_cog_queue(self, cog_name: str) -> asyncio.Queue:
         '''Create and return a result queue for the named cog.'''
@@ -629,6 +642,10 @@ class FakeMessageDispatcher():
                               delete_after=request.delete_after)
         elif isinstance(request, DeleteRequest):
             self.delete_message(request.guild_id, request.channel_id, request.message_id)
+        elif isinstance(request, BulkDeleteRequest):
+            self.bulk_deletes.append(list(request.message_ids))
+            for message_id in request.message_ids:
+                self.delete_message(request.guild_id, request.channel_id, message_id)
 
     def send_message(self, _guild_id: int, channel_id: int, content: str, **_kwargs: Any) -> None:
         '''Add content to channel.messages_sent.'''
@@ -677,8 +694,11 @@ class FakeDispatchServer:
     def delete_message(self, guild_id, channel_id, message_id, **_):
         self.calls.append(('delete_message', guild_id, channel_id, message_id))
 
-    def update_mutable(self, key, guild_id, content, channel_id, **_):
-        self.calls.append(('update_mutable', key, guild_id, content, channel_id))
+    def bulk_delete_messages(self, guild_id, channel_id, message_ids, **_):
+        self.calls.append(('bulk_delete_messages', guild_id, channel_id, message_ids))
+
+    def update_mutable(self, key, guild_id, content, channel_id, seq=None, **_):
+        self.calls.append(('update_mutable', key, guild_id, content, channel_id, seq))
 
     def remove_mutable(self, key):
         self.calls.append(('remove_mutable', key))
@@ -686,6 +706,9 @@ class FakeDispatchServer:
     def update_mutable_channel(self, key, _guild_id, _new_channel_id):
         self.calls.append(('update_mutable_channel', key))
 
+    def record_channel_event(self, guild_id, channel_id, added=None, deleted=None):
+        self.calls.append(('record_channel_event', guild_id, channel_id, added, deleted))
+
     async def enqueue_fetch_history(self, request_id, guild_id, channel_id,
                                     after_message_id=None, **_):
         self.calls.append(('enqueue_fetch_history', request_id, guild_id, channel_id))
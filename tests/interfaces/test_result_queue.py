@@ -40,3 +40,27 @@ async def test_concrete_subclass_round_trips():
     assert await queue.depth() == 1
     assert await queue.get_nowait() is sentinel
     assert await queue.get_nowait() is None
+
+
+@pytest.mark.asyncio
+async def test_default_get_batch_polls_get_nowait():
+    '''A subclass that only implements get_nowait still gets a working get_batch.'''
+    class _MemQueue(DownloadResultQueue):
+        def __init__(self):
+            self._items = []
+
+        async def put(self, result):
+            self._items.append(result)
+
+        async def get_nowait(self):
+            return self._items.pop(0) if self._items else None
+
+        async def depth(self):
+            return len(self._items)
+
+    queue = _MemQueue()
+    assert await queue.get_batch(3, 0.05) == []
+    for item in ('a', 'b', 'c', 'd'):
+        await queue.put(item)
+    assert await queue.get_batch(3, 0.05) == ['a', 'b', 'c']
+    assert await queue.get_batch(3, 0.05) == ['d']
@@ -148,6 +148,31 @@ class TestDelete:
             assert resp.status == 422
 
 
+@pytest.mark.asyncio
+class TestBulkDelete:
+    async def test_valid_body_calls_dispatcher(self):
+        dispatcher, server = _make_server()
+        async with TestClient(TestServer(server.build_app())) as client:
+            resp = await client.post('/dispatch/bulk_delete', json={
+                'guild_id': 1, 'channel_id': 2, 'message_ids': [3, '4'],
+            })
+            assert resp.status == 202
+        assert ('bulk_delete_messages', 1, 2, [3, 4]) in dispatcher.calls
+
+    async def test_more_than_discord_allows_returns_422(self):
+        dispatcher, server = _make_server()
+        async with TestClient(TestServer(server.build_app())) as client:
+            resp = await client.post('/dispatch/bulk_delete', json={
+                'guild_id': 1, 'channel_id': 2, 'message_ids': list(range(1, 102)),
+            })
+            assert resp.status == 422
+            resp = await client.post('/dispatch/bulk_delete', json={
+                'guild_id': 1, 'channel_id': 2, 'message_ids': [],
+            })
+            assert resp.status == 422
+        assert not dispatcher.calls
+
+
 @pytest.mark.asyncio
 class TestUpdateMutable:
     async def test_valid_body_calls_dispatcher(self):
@@ -165,6 +190,15 @@ class TestUpdateMutable:
             resp = await client.post('/dispatch/update_mutable', json={'key': 'k'})
             assert resp.status == 422
 
+    async def test_seq_is_forwarded(self):
+        dispatcher, server = _make_server()
+        async with TestClient(TestServer(server.build_app())) as client:
+            resp = await client.post('/dispatch/update_mutable', json={
+                'key': 'k', 'guild_id': 1, 'content': ['msg'], 'channel_id': 2, 'seq': 42,
+            })
+            assert resp.status == 202
+        assert ('update_mutable', 'k', 1, ['msg'], 2, 42) in dispatcher.calls
+
 
 @pytest.mark.asyncio
 class TestRemoveMutable:
@@ -200,6 +234,24 @@ class TestUpdateMutableChannel:
             assert resp.status == 422
 
 
+@pytest.mark.asyncio
+class TestChannelEvent:
+    async def test_valid_body_returns_202(self):
+        dispatcher, server = _make_server()
+        async with TestClient(TestServer(server.build_app())) as client:
+            resp = await client.post('/dispatch/channel_event', json={
+                'guild_id': 1, 'channel_id': 2, 'added': [30], 'deleted': ['20'],
+            })
+            assert resp.status == 202
+        assert ('record_channel_event', 1, 2, [30], [20]) in dispatcher.calls
+
+    async def test_missing_required_field_returns_422(self):
+        _, server = _make_server()
+        async with TestClient(TestServer(server.build_app())) as client:
+            resp = await client.post('/dispatch/channel_event', json={'guild_id': 1, 'added': [30]})
+            assert resp.status == 422
+
+
 @pytest.mark.asyncio
 class TestFetchHistory:
     async def test_valid_body_returns_request_id(self):
@@ -75,6 +75,8 @@ def test_run_constructs_broker_with_dispatcher_and_health(mocker):
         m['result_queue'].return_value, m['registry'].return_value,
         search_result_queue=m['search_result_queue'].return_value)
     assert m['run_broker'].call_args.args[3] is m['metrics'].return_value
+    # The registry goes along so main_loop can rebuild its indexes before serving.
+    assert m['run_broker'].call_args.kwargs['registry'] is m['registry'].return_value
 
 
 def test_run_without_dispatcher_or_health(mocker):
@@ -163,6 +165,29 @@ async def test_main_loop_drains_on_signal(mocker):
     broker_metrics.run.assert_called_once()  # metrics poller was started
 
 
+@pytest.mark.asyncio
+async def test_main_loop_rebuilds_registry_indexes_before_serving(mocker):
+    captured = {}
+    mocker.patch('discord_bot.cli.broker.signal.signal', side_effect=captured.__setitem__)
+    broker_server = MagicMock()
+    broker_server.serve = AsyncMock()
+    broker_server.drain_and_stop = AsyncMock()
+    redis_manager = MagicMock()
+    redis_manager.start = AsyncMock()
+    redis_manager.close = AsyncMock()
+    broker_metrics = MagicMock()
+    broker_metrics.run = AsyncMock()
+    registry = MagicMock()
+    registry.rebuild_indexes = AsyncMock(return_value=3)
+
+    task = asyncio.create_task(
+        broker_cli.main_loop(broker_server, None, redis_manager, broker_metrics, registry=registry))
+    await asyncio.sleep(0)
+    registry.rebuild_indexes.assert_awaited_once()
+    captured[_signal.SIGTERM](_signal.SIGTERM, None)
+    await task
+
+
 def test_run_broker_invokes_run_loop(mocker):
     mock_run_loop = mocker.patch('discord_bot.cli.broker.run_loop')
     sentinel = object()
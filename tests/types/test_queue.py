@@ -1,8 +1,9 @@
 from asyncio import QueueFull
+from unittest.mock import AsyncMock
 
 import pytest
 
-from discord_bot.types.queue import (Queue, PutsBlocked, submit_rejection_status,
+from discord_bot.types.queue import (Queue, PutsBlocked, submit_in_order, submit_rejection_status,
                                       SUBMIT_REJECTION_BY_STATUS)
 
 @pytest.mark.asyncio
@@ -80,3 +81,14 @@ def test_submit_rejection_status_ignores_other_errors():
     '''Anything outside the queue contract is a genuine fault and must keep
     travelling as a 500, not get quietly downgraded to a refusal.'''
     assert submit_rejection_status(RuntimeError('boom')) is None
+
+@pytest.mark.asyncio
+async def test_submit_in_order_first_rejection_stands_for_the_rest():
+    '''Submits stop at the first refusal, which is the outcome of every later request.'''
+    submit = AsyncMock(side_effect=[None, QueueFull('full')])
+    outcomes = await submit_in_order(submit, 7, ['a', 'b', 'c'], priority=3)
+    assert outcomes[0] is None
+    assert isinstance(outcomes[1], QueueFull)
+    assert outcomes[2] is outcomes[1]
+    assert submit.await_count == 2
+    submit.assert_awaited_with(7, 'b', priority=3)
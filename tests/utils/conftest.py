@@ -1,6 +1,7 @@
 import pytest
 
 from discord_bot.utils.dispatch_queue import RedisDispatchQueue
+from discord_bot.utils.integrations.s3 import reset_client
 
 
 @pytest.fixture
@@ -8,3 +9,11 @@ def dispatch_queue(request):
     '''RedisDispatchQueue wired to the shared fakeredis client.'''
     redis = request.getfixturevalue('redis_client')
     return RedisDispatchQueue(redis, shard_id=0, pod_id='test-pod')
+
+
+@pytest.fixture(autouse=True)
+def reset_s3_client():
+    '''Drop the cached S3 client so each test's patched boto3 client is picked up.'''
+    reset_client()
+    yield
+    reset_client()
@@ -1,12 +1,17 @@
 
+import base64
 import hashlib
 from unittest.mock import patch, MagicMock
 from pathlib import Path
+from threading import Thread
 
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ResponseStreamingError
 import pytest
 
-from discord_bot.utils.integrations.s3 import upload_file, get_file, delete_file, ObjectStorageException
+from discord_bot.utils.integrations.s3 import (
+    upload_file, get_file, delete_file, get_client, reset_client, ObjectStorageException, ProgressiveDownload,
+    MAX_POOL_CONNECTIONS, TRANSFER_CHUNK_BYTES,
+)
 
 @pytest.fixture
 def mock_s3_client():
@@ -81,7 +86,7 @@ def test_download_file_success(mock_s3_client, tmp_path): #pylint:disable=redefi
 
     # Mock get_object to return a body that can be read
     mock_body = MagicMock()
-    mock_body.read.return_value = fake_data
+    mock_body.iter_chunks.return_value = [fake_data]
     mock_s3_client.get_object.return_value = {
         "Body": mock_body
     }
@@ -101,7 +106,7 @@ def test_get_file_matching_etag_no_warning(mock_s3_client, tmp_path, mocker): #p
     correct_md5 = hashlib.md5(fake_data).hexdigest()
 
     mock_body = MagicMock()
-    mock_body.read.return_value = fake_data
+    mock_body.iter_chunks.return_value = [fake_data]
     mock_s3_client.get_object.return_value = {'Body': mock_body, 'ETag': f'"{correct_md5}"'}
 
     get_file('my-bucket', 'test.txt', tmp_path / 'out.txt')
@@ -115,7 +120,7 @@ def test_get_file_mismatched_etag_logs_warning(mock_s3_client, tmp_path, mocker)
     wrong_etag = 'deadbeef000000000000000000000000'
 
     mock_body = MagicMock()
-    mock_body.read.return_value = fake_data
+    mock_body.iter_chunks.return_value = [fake_data]
     mock_s3_client.get_object.return_value = {'Body': mock_body, 'ETag': f'"{wrong_etag}"'}
 
     get_file('my-bucket', 'test.txt', tmp_path / 'out.txt')
@@ -131,7 +136,7 @@ def test_get_file_multipart_etag_no_warning(mock_s3_client, tmp_path, mocker): #
     fake_data = b'downloaded content'
 
     mock_body = MagicMock()
-    mock_body.read.return_value = fake_data
+    mock_body.iter_chunks.return_value = [fake_data]
     mock_s3_client.get_object.return_value = {'Body': mock_body, 'ETag': '"abc123deadbeef-5"'}
 
     get_file('my-bucket', 'test.txt', tmp_path / 'out.txt')
@@ -155,3 +160,241 @@ def test_download_file_failure(mock_s3_client, tmp_path): #pylint:disable=redefi
 
     with pytest.raises(ObjectStorageException, match="Error downloading file"):
         get_file("my-bucket", object_name, destination_path)
+
+
+def test_client_is_built_once_and_shared():
+    '''Every helper reuses one pooled client instead of calling client('s3') per operation'''
+    with patch("discord_bot.utils.integrations.s3.client") as mock_client_constructor:
+        assert get_client() is get_client()
+        delete_file("my-bucket", "a.txt")
+        delete_file("my-bucket", "b.txt")
+        mock_client_constructor.assert_called_once()
+        config = mock_client_constructor.call_args[1]['config']
+        assert config.max_pool_connections == MAX_POOL_CONNECTIONS
+        reset_client()
+        get_client()
+        assert mock_client_constructor.call_count == 2
+
+
+def test_upload_file_streams_body_with_md5(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''Small files are sent as an open handle with the Content-MD5 of the whole file'''
+    file_path = tmp_path / "test.txt"
+    file_path.write_bytes(b"x" * 2500)
+    seen = {}
+
+    def _put_object(**kwargs):
+        seen['body'] = kwargs['Body'].read()
+        seen['md5'] = kwargs['ContentMD5']
+
+    mock_s3_client.put_object.side_effect = _put_object
+    with patch("discord_bot.utils.integrations.s3.TRANSFER_CHUNK_BYTES", 1000):
+        upload_file("my-bucket", file_path, "test.txt")
+    assert seen['body'] == b"x" * 2500
+    assert seen['md5'] == base64.b64encode(hashlib.md5(b"x" * 2500).digest()).decode('utf-8')
+    mock_s3_client.create_multipart_upload.assert_not_called()
+
+
+def test_upload_file_multipart(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''Files at the threshold go up in parts, each with its own Content-MD5'''
+    file_path = tmp_path / "big.pcm"
+    file_path.write_bytes(b"a" * 10 + b"b" * 10 + b"c" * 5)
+    mock_s3_client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    mock_s3_client.upload_part.side_effect = [{'ETag': '"e1"'}, {'ETag': '"e2"'}, {'ETag': '"e3"'}]
+
+    with patch("discord_bot.utils.integrations.s3.MULTIPART_THRESHOLD_BYTES", 20), \
+            patch("discord_bot.utils.integrations.s3.MULTIPART_PART_BYTES", 10):
+        assert upload_file("my-bucket", file_path, "big.pcm") is True
+
+    mock_s3_client.put_object.assert_not_called()
+    calls = mock_s3_client.upload_part.call_args_list
+    assert [c[1]['Body'] for c in calls] == [b"a" * 10, b"b" * 10, b"c" * 5]
+    assert [c[1]['PartNumber'] for c in calls] == [1, 2, 3]
+    assert calls[1][1]['ContentMD5'] == base64.b64encode(hashlib.md5(b"b" * 10).digest()).decode('utf-8')
+    mock_s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="my-bucket", Key="big.pcm", UploadId='upload-1',
+        MultipartUpload={'Parts': [
+            {'PartNumber': 1, 'ETag': '"e1"'},
+            {'PartNumber': 2, 'ETag': '"e2"'},
+            {'PartNumber': 3, 'ETag': '"e3"'},
+        ]},
+    )
+    mock_s3_client.abort_multipart_upload.assert_not_called()
+
+
+def test_upload_file_multipart_failure_aborts(mock_s3_client, tmp_path, mocker): #pylint:disable=redefined-outer-name
+    '''A failed part aborts the upload; a failed abort is logged, not raised over the original error'''
+    mock_logger = mocker.patch('discord_bot.utils.integrations.s3.logger')
+    file_path = tmp_path / "big.pcm"
+    file_path.write_bytes(b"a" * 30)
+    mock_s3_client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+    mock_s3_client.upload_part.side_effect = ClientError({'Error': {'Code': '500', 'Message': 'boom'}}, 'UploadPart')
+    mock_s3_client.abort_multipart_upload.side_effect = ClientError({'Error': {'Code': '500', 'Message': 'boom'}},
+                                                                    'AbortMultipartUpload')
+
+    with patch("discord_bot.utils.integrations.s3.MULTIPART_THRESHOLD_BYTES", 20), \
+            patch("discord_bot.utils.integrations.s3.MULTIPART_PART_BYTES", 10):
+        with pytest.raises(ObjectStorageException, match="Error uploading file"):
+            upload_file("my-bucket", file_path, "big.pcm")
+
+    mock_s3_client.abort_multipart_upload.assert_called_once_with(Bucket="my-bucket", Key="big.pcm",
+                                                                  UploadId='upload-1')
+    mock_s3_client.complete_multipart_upload.assert_not_called()
+    mock_logger.warning.assert_called_once()
+
+
+def test_get_file_streams_chunks(mock_s3_client, tmp_path, mocker): #pylint:disable=redefined-outer-name
+    '''Chunks are written as they arrive and hashed incrementally against the ETag'''
+    mock_logger = mocker.patch('discord_bot.utils.integrations.s3.logger')
+    chunks = [b"one-", b"two-", b"three"]
+    mock_body = MagicMock()
+    mock_body.iter_chunks.return_value = iter(chunks)
+    etag = hashlib.md5(b"".join(chunks)).hexdigest()
+    mock_s3_client.get_object.return_value = {'Body': mock_body, 'ETag': f'"{etag}"'}
+
+    destination_path = tmp_path / "nested" / "out.pcm"
+    get_file("my-bucket", "out.pcm", destination_path)
+
+    assert destination_path.read_bytes() == b"one-two-three"
+    assert not (tmp_path / "nested" / "out.pcm.part").exists()
+    mock_body.iter_chunks.assert_called_once_with(TRANSFER_CHUNK_BYTES)
+    mock_logger.warning.assert_not_called()
+
+
+def test_get_file_failure_mid_stream_leaves_no_file(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''A body that breaks part way leaves neither a partial file nor the .part file'''
+    def _chunks(_size):
+        yield b"partial"
+        raise ResponseStreamingError(error='connection reset')
+
+    mock_body = MagicMock()
+    mock_body.iter_chunks.side_effect = _chunks
+    mock_s3_client.get_object.return_value = {'Body': mock_body}
+
+    destination_path = tmp_path / "out.pcm"
+    with pytest.raises(ObjectStorageException, match="Error downloading file"):
+        get_file("my-bucket", "out.pcm", destination_path)
+    assert not destination_path.exists()
+    assert not (tmp_path / "out.pcm.part").exists()
+
+
+def _ranged_get_object(data: bytes, etag: str | None = None):
+    '''get_object side effect serving byte ranges of *data* the way S3 does'''
+    def _get_object(Bucket, Key, Range=None): #pylint:disable=invalid-name,unused-argument
+        start, _, end = Range.removeprefix('bytes=').partition('-')
+        end = min(int(end), len(data) - 1) if end else len(data) - 1
+        body = MagicMock()
+        body.iter_chunks.return_value = iter([data[int(start):end + 1]])
+        return {'Body': body, 'ContentRange': f'bytes {start}-{end}/{len(data)}',
+                'ETag': f'"{etag or hashlib.md5(data).hexdigest()}"'}
+    return _get_object
+
+
+def test_progressive_download_head_then_remainder(mock_s3_client, tmp_path, mocker): #pylint:disable=redefined-outer-name
+    '''The head range lands first and is readable; the remainder is appended behind it'''
+    mock_logger = mocker.patch('discord_bot.utils.integrations.s3.logger')
+    data = bytes(range(256)) * 4
+    mock_s3_client.get_object.side_effect = _ranged_get_object(data)
+    destination_path = tmp_path / "nested" / "track.pcm"
+
+    download = ProgressiveDownload("my-bucket", "track.pcm", destination_path, head_bytes=100)
+    download.fetch_head()
+    assert destination_path.read_bytes() == data[:100]
+    assert download.total_bytes == len(data)
+    assert not download.finished
+    assert mock_s3_client.get_object.call_args[1]['Range'] == 'bytes=0-99'
+
+    download.fetch_remainder()
+    assert mock_s3_client.get_object.call_args[1]['Range'] == 'bytes=100-'
+    assert destination_path.read_bytes() == data
+    assert download.finished and not download.failed
+    assert download.wait_for_bytes(len(data) + 1)
+    mock_logger.warning.assert_not_called()
+
+
+def test_progressive_download_small_object_finishes_in_head(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''An object no bigger than the head is complete after fetch_head, and fetch_remainder is a no-op'''
+    mock_s3_client.get_object.side_effect = _ranged_get_object(b'short')
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm", head_bytes=100)
+    download.fetch_head()
+    download.fetch_remainder()
+    assert download.finished
+    assert mock_s3_client.get_object.call_count == 1
+    assert (tmp_path / "track.pcm").read_bytes() == b'short'
+
+
+def test_progressive_download_empty_object(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''S3 answers a range on an empty object with InvalidRange; that is an empty file, not an error'''
+    mock_s3_client.get_object.side_effect = ClientError({'Error': {'Code': 'InvalidRange', 'Message': 'bad'}},
+                                                        'GetObject')
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm")
+    download.fetch_head()
+    assert download.finished
+    assert download.total_bytes == 0
+    assert (tmp_path / "track.pcm").read_bytes() == b''
+
+
+def test_progressive_download_head_failure(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''A failed head GET raises the same exception as get_file'''
+    mock_s3_client.get_object.side_effect = ClientError({'Error': {'Code': '500', 'Message': 'boom'}}, 'GetObject')
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm")
+    with pytest.raises(ObjectStorageException, match="Error downloading file"):
+        download.fetch_head()
+
+
+def test_progressive_download_remainder_failure_releases_reader(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''A failed remainder marks the download failed: bytes already written stay readable, later ones never arrive'''
+    data = b'x' * 300
+    mock_s3_client.get_object.side_effect = _ranged_get_object(data)
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm", head_bytes=100)
+    download.fetch_head()
+    mock_s3_client.get_object.side_effect = ClientError({'Error': {'Code': '500', 'Message': 'boom'}}, 'GetObject')
+    with pytest.raises(ObjectStorageException, match="Error downloading file"):
+        download.fetch_remainder()
+    assert download.failed
+    assert download.wait_for_bytes(100)
+    assert not download.wait_for_bytes(101)
+
+
+def test_progressive_download_reader_waits_for_writer(mock_s3_client, tmp_path): #pylint:disable=redefined-outer-name
+    '''wait_for_bytes blocks a reader thread until the remainder lands'''
+    data = b'y' * 300
+    mock_s3_client.get_object.side_effect = _ranged_get_object(data)
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm", head_bytes=100)
+    download.fetch_head()
+    results = []
+    reader = Thread(target=lambda: results.append(download.wait_for_bytes(250)))
+    reader.start()
+    reader.join(0.05)
+    assert reader.is_alive()
+    download.fetch_remainder()
+    reader.join(5)
+    assert results == [True]
+
+
+def test_progressive_download_stall_and_cancel(mock_s3_client, tmp_path, mocker): #pylint:disable=redefined-outer-name
+    '''A reader gives up after stall_seconds without progress; cancel() stops the remainder'''
+    mock_logger = mocker.patch('discord_bot.utils.integrations.s3.logger')
+    data = b'z' * 300
+    mock_s3_client.get_object.side_effect = _ranged_get_object(data)
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm", head_bytes=100,
+                                   stall_seconds=0.01)
+    download.fetch_head()
+    assert not download.wait_for_bytes(200)
+    mock_logger.warning.assert_called_once()
+
+    download.cancel()
+    download.fetch_remainder()
+    assert download.finished and download.failed
+    assert (tmp_path / "track.pcm").read_bytes() == data[:100]
+    assert not download.wait_for_bytes(200)
+
+
+def test_progressive_download_checksum_mismatch(mock_s3_client, tmp_path, mocker): #pylint:disable=redefined-outer-name
+    '''The MD5 is built across the head and remainder and checked against the ETag at the end'''
+    mock_logger = mocker.patch('discord_bot.utils.integrations.s3.logger')
+    mock_s3_client.get_object.side_effect = _ranged_get_object(b'q' * 300, etag='deadbeef')
+    download = ProgressiveDownload("my-bucket", "track.pcm", tmp_path / "track.pcm", head_bytes=100)
+    download.fetch_head()
+    download.fetch_remainder()
+    mock_logger.warning.assert_called_once()
+    assert 'deadbeef' in mock_logger.warning.call_args[0][1]
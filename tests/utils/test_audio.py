@@ -6,7 +6,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from discord_bot.utils.audio import get_editing_path, get_finished_path, edit_audio_file, AudioProcessingError
+from discord_bot.utils.audio import (
+    get_editing_path, get_finished_path, edit_audio_file, audio_format_from_path, AudioFormat, AudioProcessingError,
+)
 
 
 @contextmanager
@@ -39,6 +41,21 @@ def test_file_paths():
         assert '.pcm' in str(get_finished_path(Path(temp_file.name)).resolve())
 
 
+def test_file_paths_opus():
+    '''Opus conversion writes .opus, via an .edited.opus scratch file.'''
+    path = Path('/tmp/audio.mp3')
+    assert get_editing_path(path, AudioFormat.OPUS) == Path('/tmp/audio.edited.opus')
+    assert get_finished_path(path, AudioFormat.OPUS) == Path('/tmp/audio.opus')
+
+
+def test_audio_format_from_path():
+    '''The suffix decides the format, for local paths and S3 keys alike.'''
+    assert audio_format_from_path(Path('/tmp/audio.opus')) == AudioFormat.OPUS
+    assert audio_format_from_path('cache/audio.opus') == AudioFormat.OPUS
+    assert audio_format_from_path(Path('/tmp/audio.pcm')) == AudioFormat.PCM
+    assert audio_format_from_path('cache/audio.mp3') == AudioFormat.PCM
+
+
 def test_edit_audio_file():
     '''Integration test: real ffmpeg converts audio and produces a non-empty PCM file.'''
     with temp_audio_file() as tmp_audio:
@@ -57,6 +74,14 @@ def test_edit_audio_file_with_normalize():
         assert new_path.stat().st_size > 0
 
 
+def test_edit_audio_file_opus():
+    '''Integration test: real ffmpeg produces an Ogg/Opus file.'''
+    with temp_audio_file() as tmp_audio:
+        new_path = edit_audio_file(Path(tmp_audio), False, None, AudioFormat.OPUS)
+        assert new_path.suffix == '.opus'
+        assert new_path.read_bytes()[:4] == b'OggS'
+
+
 def test_edit_audio_file_converts_to_pcm(mocker, tmp_path):
     '''Successful conversion writes pcm, renames editing file, deletes original.'''
     audio_file = tmp_path / 'audio.mp3'
@@ -171,3 +196,29 @@ def test_edit_audio_file_subprocess_error_records_otel_span(mocker, tmp_path):
             edit_audio_file(audio_file, False, None)
     mock_span.record_exception.assert_called_once()
     mock_span.set_status.assert_called_once()
+
+
+def test_edit_audio_file_opus_args(mocker, tmp_path):
+    '''Opus output encodes with libopus in 20ms packets and skips the PCM size check.'''
+    audio_file = tmp_path / 'audio.mp3'
+    audio_file.touch()
+    editing_path = tmp_path / 'audio.edited.opus'
+
+    captured = {}
+
+    def capture_args(*args, **_kwargs):
+        captured['args'] = args[0]
+        editing_path.write_bytes(bytes(3))
+
+    mocker.patch('discord_bot.utils.audio.subprocess.run', side_effect=capture_args)
+    result = edit_audio_file(audio_file, True, None, AudioFormat.OPUS)
+
+    assert result == tmp_path / 'audio.opus'
+    assert result.exists()
+    assert not audio_file.exists()
+    args = captured['args']
+    assert args[args.index('-c:a') + 1] == 'libopus'
+    assert args[args.index('-f') + 1] == 'opus'
+    assert args[args.index('-frame_duration') + 1] == '20'
+    assert 'loudnorm' in args
+    assert 's16le' not in args
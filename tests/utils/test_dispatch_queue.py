@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from discord_bot.utils.dispatch_queue import RedisDispatchQueue, dispatch_request_id
+from discord_bot.utils.dispatch_queue import RedisDispatchQueue, dispatch_request_id, next_mutable_seq
 
 _QUEUE_KEY = 'discord_bot:dispatch:queue:0'
 
@@ -106,6 +106,60 @@ async def test_enqueue_unique_no_overwrite_restores_absent_payload(dispatch_queu
     assert json.loads(raw) == {'v': 'retried'}
 
 
+def test_next_mutable_seq_strictly_increases():
+    '''Sequence numbers never repeat within a process, even inside one microsecond.'''
+    seqs = [next_mutable_seq() for _ in range(1000)]
+    assert all(later > earlier for earlier, later in zip(seqs, seqs[1:]))
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unique_sequenced_keeps_highest_seq(dispatch_queue, redis_client):
+    '''A sequenced update arriving after a newer one does not replace it; a newer one does.'''
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'second', 'seq': 2}, priority=0)
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'first', 'seq': 1}, priority=0)
+    raw = await redis_client.get(RedisDispatchQueue.payload_key('mutable:k'))
+    assert json.loads(raw) == {'v': 'second', 'seq': 2}
+    assert await redis_client.zcard(_QUEUE_KEY) == 1
+
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'third', 'seq': 3}, priority=0)
+    assert await dispatch_queue.dequeue(timeout=0.1) == ('mutable:k', {'v': 'third', 'seq': 3})
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unique_sequenced_replaces_unsequenced(dispatch_queue, redis_client):
+    '''A payload written before sequencing (no seq) is replaced by a sequenced update.'''
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'legacy'}, priority=0)
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'new', 'seq': 1}, priority=0)
+    raw = await redis_client.get(RedisDispatchQueue.payload_key('mutable:k'))
+    assert json.loads(raw) == {'v': 'new', 'seq': 1}
+
+
+@pytest.mark.asyncio
+async def test_enqueue_unique_sequenced_retries_when_raced(dispatch_queue, redis_client, mocker):
+    '''A newer update written between the WATCHed read and the EXEC retries the compare and is kept.'''
+    real_pipeline = redis_client.pipeline
+    raced = []
+
+    def racing_pipeline(*args, **kwargs):
+        pipe = real_pipeline(*args, **kwargs)
+        real_get = pipe.get
+
+        async def get(key):
+            raw = await real_get(key)
+            if not raced:
+                raced.append(key)
+                await redis_client.set(key, json.dumps({'v': 'newer', 'seq': 5}))
+            return raw
+        pipe.get = get
+        return pipe
+
+    mocker.patch.object(redis_client, 'pipeline', side_effect=racing_pipeline)
+    await dispatch_queue.enqueue_unique('mutable:k', {'v': 'older', 'seq': 2}, priority=0)
+    raw = await redis_client.get(RedisDispatchQueue.payload_key('mutable:k'))
+    assert json.loads(raw) == {'v': 'newer', 'seq': 5}
+    assert await redis_client.zcard(_QUEUE_KEY) == 1
+
+
 # ---------------------------------------------------------------------------
 # enqueue (lines 90-93)
 # ---------------------------------------------------------------------------
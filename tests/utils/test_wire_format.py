@@ -0,0 +1,73 @@
+'''Tests for the compact Redis / HTTP wire format.
+
+Models compare by model_dump: each carries its own state machine, so two
+equal requests are never == to each other.
+'''
+import json
+
+import pytest
+
+from discord_bot.cogs.music_helpers.common import SearchType
+from discord_bot.types.download import DownloadResult, DownloadStatus
+from discord_bot.types.media_request import MediaRequest
+from discord_bot.types.playlist_add_request import PlaylistAddRequest, parse_media_request
+from discord_bot.types.search import SearchResult
+from discord_bot.utils import wire_format
+
+
+def _request(**kwargs) -> MediaRequest:
+    return MediaRequest(
+        guild_id=1, channel_id=2, requester_name='tester', requester_id=3,
+        search_result=SearchResult(search_type=SearchType.SEARCH, raw_search_string='some song'),
+        **kwargs,
+    )
+
+
+def test_encode_omits_defaults_and_round_trips():
+    '''Default-valued fields stay off the wire and come back as the same model.'''
+    media_request = _request(span_context={'trace_id': 2 ** 120, 'span_id': 2 ** 60, 'trace_flags': 1})
+    raw = wire_format.encode(media_request)
+    assert len(raw) < len(media_request.model_dump_json())
+    assert 'lifecycle_stage' not in raw and 'retry_count' not in raw
+    assert parse_media_request(wire_format.decode(raw)).model_dump() == media_request.model_dump()
+
+
+def test_discriminator_survives_a_compact_dump():
+    '''download_file is kept at its default, so the AnyMediaRequest union still resolves.'''
+    playlist_add = PlaylistAddRequest(
+        guild_id=1, channel_id=2, requester_name='tester', requester_id=3, playlist_id=4,
+        search_result=SearchResult(search_type=SearchType.SEARCH, raw_search_string='some song'),
+    )
+    assert wire_format.compact_dump(_request())['download_file'] is True
+    assert wire_format.compact_dump(playlist_add)['download_file'] is False
+    assert isinstance(parse_media_request(wire_format.decode(wire_format.encode(playlist_add))),
+                      PlaylistAddRequest)
+
+
+def test_nested_models_validate_from_payload():
+    '''payload() hands model_validate_json the JSON text for a one-pass decode.'''
+    result = DownloadResult(status=DownloadStatus(success=True), media_request=_request(),
+                            ytdlp_data={'id': 'abc', 'formats': ['dropped']}, file_name=None)
+    decoded = DownloadResult.model_validate_json(wire_format.payload(wire_format.encode(result)))
+    assert decoded.model_dump() == result.model_dump()
+    assert decoded.ytdlp_data == {'id': 'abc'}
+
+
+def test_plain_data_and_legacy_values_decode():
+    '''Dicts encode too, and a value written as plain JSON before the version byte still reads.'''
+    data = {'zone': 'available', 'request': wire_format.compact_dump(_request())}
+    assert wire_format.decode(wire_format.encode(data)) == data
+    assert wire_format.decode(json.dumps(data)) == data
+    assert wire_format.decode(json.dumps(data).encode()) == data
+
+
+def test_versioned_value_reads_as_json_to_a_legacy_reader():
+    '''The version 1 byte is whitespace to json.loads, so pods on the old code keep reading.'''
+    media_request = _request()
+    assert parse_media_request(json.loads(wire_format.encode(media_request))).model_dump() == media_request.model_dump()
+
+
+def test_unknown_version_is_rejected():
+    '''A value from a newer format raises rather than being misread.'''
+    with pytest.raises(ValueError, match='version 2'):
+        wire_format.decode('\x02{}')
@@ -19,6 +19,7 @@ from discord_bot.types.download import LifecycleEvent, LifecycleStatusUpdate
 from discord_bot.types.player_session import PlayerSession
 from discord_bot.types.playlist_add_request import parse_media_request
 from discord_bot.workers.asyncio_broker import AsyncioBroker
+from discord_bot.workers.media_bundle import BundleRenderer
 
 from tests.helpers import fake_context, fake_media_download, fake_source_dict  # pylint: disable=unused-import
 
@@ -304,3 +305,55 @@ async def test_player_session_delete_absent_is_noop():
     broker = AsyncioBroker()
     await broker.delete_player_session(4242)
     assert await broker.list_player_sessions() == []
+
+
+@pytest.mark.asyncio
+async def test_bundle_render_interval_coalesces_registrations(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''With a render interval, a burst of register_request calls renders the
+    bundle once up front, and flush_bundle_renders renders the rest in one go.'''
+    broker = AsyncioBroker(dispatcher=MagicMock(), bundle_render_interval_seconds=60)
+    bundle_uuid = await broker.create_bundle(fake_context['guild'].id, fake_context['channel'].id)
+    render = mocker.spy(broker, '_render_and_dispatch_bundle_locked')
+    for _ in range(20):
+        media_request = fake_source_dict(fake_context)
+        media_request.bundle_uuid = bundle_uuid
+        await broker.register_request(media_request)
+    render.assert_not_called()
+    assert len(broker.get_bundle_state(bundle_uuid).bundled_requests) == 20
+
+    await broker.flush_bundle_renders()
+    render.assert_called_once_with(bundle_uuid)
+    await broker.flush_bundle_renders()
+    render.assert_called_once_with(bundle_uuid)
+
+
+@pytest.mark.asyncio
+async def test_bundle_renderer_kept_between_renders(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''Lifecycle pushes reuse the bundle's renderer instead of rebuilding its
+    table.'''
+    dispatcher = MagicMock()
+    broker = AsyncioBroker(dispatcher=dispatcher)
+    bundle_uuid = await broker.create_bundle(fake_context['guild'].id, fake_context['channel'].id)
+    media_requests = []
+    for _ in range(3):
+        media_request = fake_source_dict(fake_context)
+        media_request.bundle_uuid = bundle_uuid
+        media_request.state_machine.mark_queued()
+        await broker.register_request(media_request)
+        media_requests.append(media_request)
+    await broker.finalize_bundle(bundle_uuid)
+    dispatched = dispatcher.update_mutable.call_count
+    rebuild = mocker.spy(BundleRenderer, '_rebuild_table')
+
+    await broker.update_request_status(
+        str(media_requests[0].uuid), LifecycleStatusUpdate(event=LifecycleEvent.IN_PROGRESS))
+    assert dispatcher.update_mutable.call_count == dispatched + 1
+    assert 'Downloading and processing' in str(dispatcher.update_mutable.call_args.args[2])
+    # Unchanged content is still dispatched: only the dispatcher knows whether
+    # the last update landed, and it skips messages that already match.
+    content = dispatcher.update_mutable.call_args.args[2]
+    await broker.update_request_status(
+        str(media_requests[1].uuid), LifecycleStatusUpdate(event=LifecycleEvent.QUEUED))
+    assert dispatcher.update_mutable.call_count == dispatched + 2
+    assert dispatcher.update_mutable.call_args.args[2] == content
+    rebuild.assert_not_called()
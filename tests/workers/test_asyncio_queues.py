@@ -3,10 +3,12 @@ import asyncio
 
 import pytest
 
+from discord_bot.interfaces.dispatch_protocols import CHANNEL_TAIL_SIZE
 from discord_bot.types.download import DownloadResult, DownloadStatus
 from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.workers.asyncio_queues import (
     AsyncioBundleStore,
+    AsyncioChannelTailStore,
     AsyncioDownloadResultQueue,
     AsyncioSearchResultQueue,
     AsyncioWorkQueue,
@@ -69,6 +71,39 @@ async def test_bundle_store_load_all_outer_dict_is_copy():
     assert 'new_key' not in await store.load_all()
 
 
+# ---------------------------------------------------------------------------
+# AsyncioChannelTailStore
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_channel_tail_store_returns_newest_ids_first():
+    '''newest returns the newest ids in the channel, newest first, in id order whatever the add order.'''
+    store = AsyncioChannelTailStore()
+    await store.add(1, [30, 10])
+    await store.add(1, [20, 30])
+    assert await store.newest(1, [20, 30]) == [30, 20]
+    await store.discard(1, [30])
+    assert await store.newest(1, [20]) == [20]
+
+
+@pytest.mark.asyncio
+async def test_channel_tail_store_is_cold_for_untracked_ids():
+    '''An id the store has not seen, or an unknown channel, reads as cold (None).'''
+    store = AsyncioChannelTailStore()
+    assert await store.newest(1, [10]) is None
+    await store.add(1, [20])
+    assert await store.newest(1, [10, 20]) is None
+
+
+@pytest.mark.asyncio
+async def test_channel_tail_store_keeps_only_the_newest_ids():
+    '''Only CHANNEL_TAIL_SIZE ids are kept per channel; older ones fall off.'''
+    store = AsyncioChannelTailStore()
+    await store.add(1, list(range(CHANNEL_TAIL_SIZE + 10)))
+    assert await store.newest(1, [0]) is None
+    assert await store.newest(1, [CHANNEL_TAIL_SIZE + 9]) == [CHANNEL_TAIL_SIZE + 9]
+
+
 # ---------------------------------------------------------------------------
 # AsyncioWorkQueue
 # ---------------------------------------------------------------------------
@@ -126,6 +161,16 @@ async def test_work_queue_enqueue_unique_no_overwrite_restores_when_absent():
     assert await q.dequeue(timeout=0.1) == ('mutable:k', {'v': 'retried'})
 
 
+@pytest.mark.asyncio
+async def test_work_queue_enqueue_unique_keeps_highest_seq():
+    '''Sequenced updates collapse to the highest seq, whatever order they arrive in.'''
+    q = AsyncioWorkQueue()
+    await q.enqueue_unique('mutable:k', {'v': 'second', 'seq': 2}, priority=0)
+    await q.enqueue_unique('mutable:k', {'v': 'first', 'seq': 1}, priority=0)
+    assert await q.dequeue(timeout=0.1) == ('mutable:k', {'v': 'second', 'seq': 2})
+    assert await q.dequeue(timeout=0.05) is None
+
+
 @pytest.mark.asyncio
 async def test_work_queue_dequeue_timeout_returns_none():
     '''dequeue returns None when the queue is empty and timeout expires.'''
@@ -220,6 +265,29 @@ async def test_download_result_queue_raw_queue_is_underlying_queue():
     assert raw.qsize() == 1
 
 
+@pytest.mark.asyncio
+async def test_download_result_queue_get_batch():
+    '''get_batch drains up to max_items in order without waiting for more.'''
+    q = AsyncioDownloadResultQueue()
+    results = [_result() for _ in range(3)]
+    for r in results:
+        await q.put(r)
+    assert await q.get_batch(2, 1) == results[:2]
+    assert await q.get_batch(5, 1) == results[2:]
+    assert await q.get_batch(5, 0.01) == []
+
+
+@pytest.mark.asyncio
+async def test_download_result_queue_get_batch_wakes_on_put():
+    '''A waiting get_batch returns as soon as a result is put.'''
+    q = AsyncioDownloadResultQueue()
+    r = _result()
+    waiter = asyncio.create_task(q.get_batch(4, 5))
+    await asyncio.sleep(0)
+    await q.put(r)
+    assert await asyncio.wait_for(waiter, 1) == [r]
+
+
 # ---------------------------------------------------------------------------
 # AsyncioSearchResultQueue
 # ---------------------------------------------------------------------------
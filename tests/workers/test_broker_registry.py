@@ -1,13 +1,17 @@
 '''Tests for RedisBrokerRegistry.'''
 import asyncio
+import json
 
 import fakeredis.aioredis
 import pytest
+from redis.exceptions import ResponseError
 
 from discord_bot.clients.redis_client import RedisManager
 from discord_bot.workers import broker_registry
 from discord_bot.workers.broker_registry import (
+    BUNDLE_KEY_PREFIX,
     BUNDLE_LOCK_KEY_PREFIX,
+    CHECKED_OUT_INDEX_PREFIX,
     ENTRY_KEY_PREFIX,
     LOCK_KEY_PREFIX,
     RedisBrokerRegistry,
@@ -78,6 +82,27 @@ async def test_delete_entry_missing_is_noop():
     await reg.delete_entry('no-such-uuid')  # should not raise
 
 
+@pytest.mark.asyncio
+async def test_get_entries_returns_none_for_missing():
+    '''get_entries answers in uuid order with None for absent entries.'''
+    reg = _registry()
+    await reg.set_entry('uuid-1', {'zone': 'in_flight'})
+    assert await reg.get_entries(['uuid-1', 'no-such-uuid']) == [{'zone': 'in_flight'}, None]
+    assert await reg.get_entries([]) == []
+
+
+@pytest.mark.asyncio
+async def test_write_entries_sets_with_ttl_and_deletes():
+    '''write_entries upserts with the set_entry TTLs and removes deleted uuids.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    await reg.set_entry('gone', {'zone': 'in_flight'})
+    await reg.write_entries({'a': {'zone': 'in_flight'}, 'b': {'zone': 'available'}}, deleted=['gone'])
+    assert await reg.get_entry('gone') is None
+    assert 0 < await client.ttl(f'{ENTRY_KEY_PREFIX}a') <= broker_registry.IN_FLIGHT_TTL_SECONDS
+    assert 0 < await client.ttl(f'{ENTRY_KEY_PREFIX}b') <= broker_registry.ENTRY_TTL_SECONDS
+
+
 # ---------------------------------------------------------------------------
 # all_entries
 # ---------------------------------------------------------------------------
@@ -103,6 +128,138 @@ async def test_all_entries_returns_stored_entries():
     assert uuids == {'a', 'b'}
 
 
+# ---------------------------------------------------------------------------
+# Secondary indexes
+# ---------------------------------------------------------------------------
+
+def _downloaded(zone: str, url: str = 'https://example.com/a', guild_id: int | None = None) -> dict:
+    return {'zone': zone, 'checked_out_by': guild_id, 'download': {'webpage_url': url}, 'request': {}}
+
+
+@pytest.mark.asyncio
+async def test_checked_out_index_follows_checkout_and_release():
+    '''An entry joins its guild's checked-out index on checkout and leaves it on delete.'''
+    reg = _registry()
+    await reg.set_entry('uuid-1', _downloaded('available'))
+    assert await reg.checked_out_entries(5) == []
+    assert await reg.atomic_checkout('uuid-1', 5)
+    assert [e['checked_out_by'] for e in await reg.checked_out_entries(5)] == [5]
+    assert await reg.checked_out_entries(6) == []
+    await reg.delete_entry('uuid-1')
+    assert await reg.checked_out_entries(5) == []
+
+
+@pytest.mark.asyncio
+async def test_entries_for_url_moves_when_download_changes():
+    '''A rewrite that changes the URL moves the entry to the new URL's index.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    await reg.set_entry('uuid-1', _downloaded('available', 'https://example.com/a'))
+    await reg.write_entries({'uuid-1': _downloaded('available', 'https://example.com/b')})
+    assert await reg.entries_for_url('https://example.com/a') == []
+    assert len(await reg.entries_for_url('https://example.com/b')) == 1
+    old_index = broker_registry._url_index_key('https://example.com/a')  # pylint: disable=protected-access
+    assert await client.smembers(old_index) == set()
+
+
+@pytest.mark.asyncio
+async def test_index_drops_members_whose_entry_expired():
+    '''An entry that expired without a delete is skipped and pruned from the index.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    await reg.set_entry('uuid-1', _downloaded('checked_out', guild_id=5))
+    await client.delete(f'{ENTRY_KEY_PREFIX}uuid-1')  # stands in for the TTL running out
+    assert await reg.checked_out_entries(5) == []
+    assert await client.smembers(f'{CHECKED_OUT_INDEX_PREFIX}5') == set()
+
+
+@pytest.mark.asyncio
+async def test_bundles_for_guild_tracks_set_and_delete():
+    '''Bundles are listed per guild and leave the index when deleted.'''
+    reg = _registry()
+    await reg.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1})
+    await reg.set_bundle('b2', {'uuid': 'b2', 'guild_id': 2})
+    assert [b['uuid'] for b in await reg.bundles_for_guild(1)] == ['b1']
+    await reg.delete_bundle('b1')
+    assert await reg.bundles_for_guild(1) == []
+
+
+@pytest.mark.asyncio
+async def test_read_bundle_skips_an_unchanged_value():
+    '''A known revision reads back as unchanged until another pod rewrites the bundle.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    other_pod = RedisBrokerRegistry(RedisManager.from_client(client))
+    revision = await reg.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1, 'completed': 0})
+    assert await reg.read_bundle('b1', revision) == (revision, None)
+
+    newer = await other_pod.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1, 'completed': 1})
+    assert newer != revision
+    assert await reg.read_bundle('b1', revision) == (newer, {'uuid': 'b1', 'guild_id': 1, 'completed': 1})
+    await other_pod.delete_bundle('b1')
+    assert await reg.read_bundle('b1', newer) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_read_bundle_without_scripting_compares_locally(mocker):
+    '''When Redis refuses the read script, a plain GET still recognises an unchanged value.'''
+    reg = _registry()
+    revision = await reg.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1})
+    mocker.patch.object(reg._client, 'evalsha', side_effect=ResponseError("unknown command 'evalsha'"))  # pylint: disable=protected-access
+    assert await reg.read_bundle('b1', revision) == (revision, None)
+    assert reg._read_script_enabled is False  # pylint: disable=protected-access
+    assert await reg.get_bundle('b1') == {'uuid': 'b1', 'guild_id': 1}
+
+
+@pytest.mark.asyncio
+async def test_unstamped_bundle_is_always_read_in_full():
+    '''A bundle written without a revision (an older build) never matches a known revision.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    revision = await reg.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1})
+    await client.set(f'{BUNDLE_KEY_PREFIX}b1', json.dumps({'uuid': 'b1', 'guild_id': 1}))
+    assert await reg.read_bundle('b1', revision) == (None, {'uuid': 'b1', 'guild_id': 1})
+
+
+@pytest.mark.asyncio
+async def test_set_bundle_unchanged_only_refreshes_ttl():
+    '''Rewriting the revision this pod last wrote skips the SET but keeps the TTLs fresh.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    data = {'uuid': 'b1', 'guild_id': 1}
+    revision = await reg.set_bundle('b1', data)
+    key = f'{BUNDLE_KEY_PREFIX}b1'
+    # Trailing whitespace marks the stored value without changing what it decodes to.
+    await client.set(key, await client.get(key) + ' ', ex=10)
+    assert await reg.set_bundle('b1', dict(data)) == revision
+    assert (await client.get(key)).endswith(' ')
+    assert await client.ttl(key) > 10
+    assert await reg.get_bundle('b1') == data
+
+
+@pytest.mark.asyncio
+async def test_bundle_listings_drop_the_revision():
+    '''The revision stamp stays a storage detail of the bundle value.'''
+    reg = _registry()
+    await reg.set_bundle('b1', {'uuid': 'b1', 'guild_id': 1})
+    assert await reg.bundles_for_guild(1) == [{'uuid': 'b1', 'guild_id': 1}]
+    assert await reg.all_bundles() == [{'uuid': 'b1', 'guild_id': 1}]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_covers_records_written_before_the_indexes():
+    '''Records written straight to their keys (an older build) are indexed by rebuild_indexes.'''
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    reg = RedisBrokerRegistry(RedisManager.from_client(client))
+    await client.set(f'{ENTRY_KEY_PREFIX}uuid-1', json.dumps(_downloaded('checked_out', guild_id=5)))
+    await client.set(f'{BUNDLE_KEY_PREFIX}b1', json.dumps({'uuid': 'b1', 'guild_id': 5}))
+    assert await reg.checked_out_entries(5) == []
+    assert await reg.rebuild_indexes() == 2
+    assert len(await reg.checked_out_entries(5)) == 1
+    assert len(await reg.entries_for_url('https://example.com/a')) == 1
+    assert [b['uuid'] for b in await reg.bundles_for_guild(5)] == ['b1']
+
+
 # ---------------------------------------------------------------------------
 # atomic_checkout
 # ---------------------------------------------------------------------------
@@ -0,0 +1,106 @@
+'''Tests for the per-bundle render throttle.'''
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from discord_bot.workers.bundle_render_throttle import BundleRenderThrottle
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_renders_every_event():
+    '''interval_seconds <= 0 never holds a render back.'''
+    flush = AsyncMock()
+    throttle = BundleRenderThrottle(0, flush)
+    throttle.rendered('bundle', 5)
+    assert all(throttle.render_due('bundle') for _ in range(10))
+    assert throttle.pending == 0
+    flush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_events_inside_the_interval_coalesce_into_one_trailing_render():
+    '''The first event renders at once; the rest mark the bundle dirty for one trailing render.'''
+    flush = AsyncMock()
+    throttle = BundleRenderThrottle(0.05, flush)
+    assert throttle.render_due('bundle')
+    throttle.rendered('bundle', None)
+    assert not any(throttle.render_due('bundle') for _ in range(20))
+    assert throttle.pending == 1
+    await asyncio.sleep(0.1)
+    flush.assert_awaited_once_with('bundle')
+
+
+@pytest.mark.asyncio
+async def test_last_terminal_event_renders_at_once():
+    '''Once every outstanding request has gone terminal the bundle renders without waiting.'''
+    flush = AsyncMock()
+    throttle = BundleRenderThrottle(60, flush)
+    throttle.rendered('bundle', 2)
+    assert not throttle.render_due('bundle', terminal_events=1)
+    assert throttle.render_due('bundle', terminal_events=1)
+    throttle.rendered('bundle', 0)
+    assert throttle.pending == 0
+    await asyncio.sleep(0)
+    flush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_forget_cancels_the_trailing_render():
+    '''A deleted bundle is not rendered again by its trailing task.'''
+    flush = AsyncMock()
+    throttle = BundleRenderThrottle(0.02, flush)
+    throttle.rendered('bundle', 3)
+    assert not throttle.render_due('bundle')
+    throttle.forget('bundle')
+    await asyncio.sleep(0.05)
+    flush.assert_not_called()
+    assert throttle.render_due('bundle')
+
+
+@pytest.mark.asyncio
+async def test_flush_all_runs_pending_renders():
+    '''flush_all renders dirty bundles now and leaves clean ones alone.'''
+    flush = AsyncMock()
+    throttle = BundleRenderThrottle(60, flush)
+    throttle.rendered('dirty', 3)
+    throttle.rendered('clean', 3)
+    assert not throttle.render_due('dirty')
+    await throttle.flush_all()
+    flush.assert_awaited_once_with('dirty')
+
+
+@pytest.mark.asyncio
+async def test_failed_trailing_render_is_logged(caplog):
+    '''An exception from the flush is logged instead of escaping the task.'''
+    throttle = BundleRenderThrottle(60, AsyncMock(side_effect=RuntimeError('boom')))
+    throttle.rendered('bundle', 3)
+    assert not throttle.render_due('bundle')
+    await throttle.flush_all()
+    assert 'Trailing render of bundle bundle failed' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_idle_bundle_is_forgotten_after_its_trailing_render():
+    '''A bundle that stalls short of its terminal stages does not keep its schedule.'''
+    flush = AsyncMock(side_effect=lambda bundle_uuid: throttle.rendered(bundle_uuid, 3))
+    throttle = BundleRenderThrottle(0.02, flush)
+    throttle.rendered('bundle', 3)
+    assert not throttle.render_due('bundle')
+    await asyncio.sleep(0.03)
+    flush.assert_awaited_once_with('bundle')
+    assert 'bundle' in throttle._schedules  # pylint: disable=protected-access
+    await asyncio.sleep(0.03)
+    assert not throttle._schedules  # pylint: disable=protected-access
+    assert throttle.render_due('bundle')
+
+
+@pytest.mark.asyncio
+async def test_failed_trailing_render_forgets_the_bundle():
+    '''A trailing render that raises does not leave the bundle scheduled.'''
+    throttle = BundleRenderThrottle(0.02, AsyncMock(side_effect=RuntimeError('boom')))
+    throttle.rendered('bundle', 3)
+    assert not throttle.render_due('bundle')
+    await asyncio.sleep(0.05)
+    assert not throttle._schedules  # pylint: disable=protected-access
+    assert throttle.pending == 0
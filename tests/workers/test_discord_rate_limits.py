@@ -0,0 +1,138 @@
+'''Tests for the dispatcher's per-route Discord rate-limit model.'''
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from yarl import URL
+
+from discord_bot.workers.discord_rate_limits import (
+    DiscordRateLimiter, ParkedWork, ROUTE_BULK_DELETE, ROUTE_DELETE, ROUTE_EDIT, ROUTE_SEND, route_for_request,
+)
+
+
+class FakeClock:
+    '''Monotonic clock the test advances by hand.'''
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_route_for_request():
+    '''Message create, edit, delete and bulk delete map to per-channel buckets; other routes are not modelled.'''
+    assert route_for_request('POST', '/api/v10/channels/12/messages') == (ROUTE_SEND, 12)
+    assert route_for_request('PATCH', '/api/v10/channels/12/messages/34') == (ROUTE_EDIT, 12)
+    assert route_for_request('DELETE', '/api/v10/channels/12/messages/34') == (ROUTE_DELETE, 12)
+    assert route_for_request('POST', '/api/v10/channels/12/messages/bulk-delete') == (ROUTE_BULK_DELETE, 12)
+    assert route_for_request('GET', '/api/v10/channels/12/messages') is None
+    assert route_for_request('GET', '/api/v10/guilds/12/emojis') is None
+
+
+def test_reserve_spends_default_bucket_then_waits_for_reset():
+    '''An unseen bucket starts from the defaults; once empty, reserve reports the time to its reset.'''
+    clock = FakeClock()
+    limiter = DiscordRateLimiter(clock=clock)
+    assert all(limiter.reserve([(ROUTE_SEND, 1)]) == 0 for _ in range(5))
+    assert limiter.reserve([(ROUTE_SEND, 1)]) == pytest.approx(5.0)
+    # Another channel, and another route on the same channel, have their own buckets.
+    assert limiter.reserve([(ROUTE_SEND, 2)]) == 0
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    clock.now += 5.0
+    assert limiter.reserve([(ROUTE_SEND, 1)]) == 0
+
+
+def test_headers_replace_the_defaults():
+    '''Limit, remaining and reset come from the response headers, less requests still in flight.'''
+    clock = FakeClock()
+    limiter = DiscordRateLimiter(clock=clock)
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    limiter.observe('PATCH', '/api/v10/channels/1/messages/9', 200, {
+        'X-RateLimit-Limit': '2', 'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset-After': '0.5',
+    })
+    # The second reserved edit has not answered yet, so nothing is left.
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    # The learned window is reused when the bucket refills without a response.
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == pytest.approx(0.5)
+
+
+def test_429_empties_the_bucket_until_retry_after():
+    '''A 429 empties the bucket for Retry-After; unparseable headers are ignored.'''
+    clock = FakeClock()
+    limiter = DiscordRateLimiter(clock=clock)
+    limiter.observe('POST', '/api/v10/channels/1/messages', 429, {'Retry-After': '2.5'})
+    assert limiter.reserve([(ROUTE_SEND, 1)]) == pytest.approx(2.5)
+    limiter.observe('POST', '/api/v10/channels/2/messages', 200, {'X-RateLimit-Remaining': 'many'})
+    assert limiter.reserve([(ROUTE_SEND, 2)]) == 0
+
+
+def test_spending_releases_reservations_no_request_used():
+    '''A reservation no response answers inside spending() goes back to the bucket on exit.'''
+    clock = FakeClock()
+    limiter = DiscordRateLimiter(clock=clock)
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    with limiter.spending([(ROUTE_EDIT, 1)]):
+        pass
+    assert all(limiter.reserve([(ROUTE_EDIT, 1)]) == 0 for _ in range(5))
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) > 0
+
+
+def test_spending_counts_one_response_per_reservation():
+    '''Inside spending() only the first response on a route answers its reservation.'''
+    clock = FakeClock()
+    limiter = DiscordRateLimiter(clock=clock)
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) == 0
+    headers = {'X-RateLimit-Limit': '5', 'X-RateLimit-Remaining': '3', 'X-RateLimit-Reset-After': '5'}
+    with limiter.spending([(ROUTE_EDIT, 1)]):
+        limiter.observe('PATCH', '/api/v10/channels/1/messages/9', 200, headers)
+        limiter.observe('PATCH', '/api/v10/channels/1/messages/9', 200, headers)
+    # The other worker's edit is still in flight: 3 left, less 1.
+    assert all(limiter.reserve([(ROUTE_EDIT, 1)]) == 0 for _ in range(2))
+    assert limiter.reserve([(ROUTE_EDIT, 1)]) > 0
+
+
+@pytest.mark.asyncio
+async def test_trace_config_observes_responses():
+    '''The TraceConfig handed to discord.py feeds each response to the limiter.'''
+    limiter = DiscordRateLimiter()
+    trace_config = limiter.trace_config()
+    params = SimpleNamespace(
+        method='POST', url=URL('https://discord.com/api/v10/channels/7/messages'),
+        response=SimpleNamespace(status=200, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '3'}),
+    )
+    for callback in trace_config.on_request_end:
+        await callback(None, None, params)
+    assert limiter.reserve([(ROUTE_SEND, 7)]) == pytest.approx(3, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_parked_work_releases_after_delay_with_latest_payload():
+    '''Re-parking a member keeps its release time and replaces its payload.'''
+    release = AsyncMock()
+    parked = ParkedWork(release)
+    parked.park('mutable:key', {'content': ['old']}, 0.02)
+    parked.park('mutable:key', {'content': ['new']}, 5)
+    assert parked.pending == 1
+    await asyncio.sleep(0.05)
+    release.assert_awaited_once_with('mutable:key', {'content': ['new']})
+    assert parked.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_release_all_hands_back_everything_now(caplog):
+    '''release_all releases every item at once; a failed release is logged.'''
+    release = AsyncMock(side_effect=[None, RuntimeError('redis down')])
+    parked = ParkedWork(release)
+    parked.park('send:a', {'n': 1}, 60)
+    parked.park('send:b', {'n': 2}, 60)
+    await parked.release_all()
+    assert release.await_count == 2
+    assert parked.pending == 0
+    assert 'Releasing parked work item send:b failed' in caplog.text
@@ -411,11 +411,12 @@ def test_edit_row_data_returns_false_for_rowless_entry(fake_context):  # pylint:
 
 
 def test_bundle_pagination_shrink_does_not_crash_edit(fake_context):  # pylint: disable=redefined-outer-name
-    '''After items reach terminal stages their rows blank out and the table
-    re-paginates to fewer pages.  Stored row_collection_index values from the
-    earlier (larger) layout would otherwise index past the end of
-    _row_collections — _edit_row_data crashes with IndexError on the next
-    status push.  _rebuild_table must refresh those positions.'''
+    '''A renderer rebuilt from saved state keeps the pages the original fixed
+    at all_requests_added, even once every row has blanked out, so it renders
+    the same messages as a renderer kept across renders.  A state saved before
+    layout_rows existed re-paginates from its current rows; its stored
+    row_collection_index values from the earlier (larger) layout must not
+    crash _edit_row_data on the next status push.'''
     # Use a tiny pagination_length so we can force multi-page layout with
     # only a handful of QUEUED-text rows.
     state = BundleState(
@@ -438,18 +439,21 @@ def test_bundle_pagination_shrink_does_not_crash_edit(fake_context):  # pylint:
     # Mark every request COMPLETED so the next render blanks every row.
     for mr in requests:
         mr.state_machine.mark_completed()
+    kept_pages = renderer.print()
 
     # Round-trip through Pydantic so the renderer rebuilds from saved state.
     payload = renderer.state.model_dump(mode='json')
     restored_state = BundleState.model_validate(json.loads(json.dumps(payload)))
     rebuilt = BundleRenderer(restored_state)
+    assert rebuilt._page_starts == renderer._page_starts  # pylint: disable=protected-access
+    assert rebuilt.print() == kept_pages
 
-    # Pagination collapsed; stored positions on the bundled requests now
-    # need to match the new layout, otherwise update_request_status raises
-    # IndexError on the first row_collections lookup.
-    rebuilt.update_request_status()
-    # No exception means the fix is in place; verify pagination did shrink.
-    assert len(rebuilt._row_collections) < len(renderer._row_collections)  # pylint: disable=protected-access
+    # Without layout_rows the pages are cut from the blanked rows and shrink;
+    # the stale stored positions are refreshed rather than raising IndexError.
+    payload['layout_rows'] = None
+    legacy = BundleRenderer(BundleState.model_validate(json.loads(json.dumps(payload))))
+    legacy.update_request_status()
+    assert len(legacy._row_collections) < len(renderer._row_collections)  # pylint: disable=protected-access
 
 
 def test_bundle_state_preserves_playlist_add_request_subclass(fake_context):  # pylint: disable=redefined-outer-name
@@ -702,3 +706,60 @@ def test_get_failure_summary_splits_rejections_from_failures(fake_context):  # p
     assert 'Reason: Video duration 1176 seconds exceeds max duration of 900 seconds' in joined
     # Both groups are marked sent.
     assert renderer.get_failure_summary() is None
+
+
+# ---------------------------------------------------------------------------
+# Incremental rendering
+# ---------------------------------------------------------------------------
+
+def _paginated_renderer(fake_context, count=12):  # pylint: disable=redefined-outer-name
+    '''A finalised multi-page banner bundle of QUEUED requests.'''
+    renderer = BundleRenderer(BundleState(
+        guild_id=fake_context['guild'].id, channel_id=fake_context['channel'].id,
+        input_string='multi-track input', has_search_banner=True, pagination_length=200,
+    ))
+    requests = []
+    for _ in range(count):
+        mr = fake_source_dict(fake_context)
+        mr.state_machine.mark_queued()
+        renderer.add_media_request(mr)
+        requests.append(mr)
+    renderer.all_requests_added()
+    return renderer, requests
+
+
+def test_print_reformats_only_edited_pages(fake_context, mocker):  # pylint: disable=redefined-outer-name
+    '''A lifecycle change re-formats the page holding its row and nothing else.'''
+    renderer, requests = _paginated_renderer(fake_context)
+    first = renderer.print()
+    assert len(first) > 2
+    format_page = mocker.spy(renderer._table, 'format_page')  # pylint: disable=protected-access
+
+    assert renderer.print() == first
+    format_page.assert_not_called()
+
+    last = renderer.state.bundled_requests[-1]
+    requests[-1].state_machine.mark_in_progress()
+    pages = renderer.print()
+    format_page.assert_called_once_with(renderer._row_collections[last.row_collection_index])  # pylint: disable=protected-access
+    changed = [index for index, (old, new) in enumerate(zip(first, pages)) if old != new]
+    assert changed == [last.row_collection_index]
+    assert 'Downloading and processing media request' in pages[last.row_collection_index]
+
+
+def test_renders_detects_rows_added_by_another_renderer(fake_context):  # pylint: disable=redefined-outer-name
+    '''A kept renderer is only reusable for its own state object, and only
+    until rows are added behind its back.'''
+    renderer = BundleRenderer.new(fake_context['guild'].id, fake_context['channel'].id)
+    assert renderer.renders(renderer.state)
+    restored = BundleState.model_validate(renderer.state.model_dump(mode='json'))
+    assert not renderer.renders(restored)
+
+    mr = fake_source_dict(fake_context)
+    mr.state_machine.mark_queued()
+    BundleRenderer(renderer.state).add_media_request(mr)
+    assert not renderer.renders(renderer.state)
+
+    rebuilt = BundleRenderer(renderer.state)
+    rebuilt.all_requests_added()
+    assert rebuilt.renders(rebuilt.state)
@@ -16,6 +16,7 @@ from discord_bot.types.player_session import PlayerSession
 from discord_bot.types.playlist_add_request import PlaylistAddRequest
 from discord_bot.types.search import SearchResult
 from discord_bot.workers.broker_registry import RedisBrokerRegistry
+from discord_bot.workers.media_bundle import BundleState
 from discord_bot.workers.redis_broker import RedisBroker, _download_from_dict, _download_to_dict, _entry_from_dict
 
 
@@ -740,6 +741,23 @@ async def test_delete_bundle_removes_from_redis():
     assert await broker.get_bundle_state(bundle_uuid) is None
 
 
+@pytest.mark.asyncio
+async def test_saved_bundle_is_reused_until_it_changes(mocker):
+    '''A bundle this pod saved loads without re-parsing; a state taken but not saved is not reused.'''
+    broker = _make_broker()
+    bundle_uuid = await broker.create_bundle(100, 200, input_string='x', has_search_banner=True)
+    validate = mocker.spy(BundleState, 'model_validate')
+    state = await broker.get_bundle_state(bundle_uuid)
+    assert state is not None
+    validate.assert_not_called()
+
+    state.input_string = 'changed but never saved'
+    reloaded = await broker.get_bundle_state(bundle_uuid)
+    assert reloaded is not state
+    assert reloaded.input_string == 'x'
+    validate.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_list_bundles_for_guild_scans_redis():
     '''list_bundles_for_guild SCANs every bundle and filters by guild_id.'''
@@ -824,6 +842,54 @@ async def test_concurrent_register_requests_all_land_in_bundle():
     assert stored_uuids == {str(mr.uuid) for mr in requests}
 
 
+@pytest.mark.asyncio
+async def test_register_requests_attaches_page_and_keeps_existing_entries():
+    '''register_requests lands a whole page in its bundle without resetting known entries.'''
+    registry = _make_registry()
+    broker = _make_broker(registry=registry)
+    bundle_uuid = await broker.create_bundle(guild_id=1, channel_id=2)
+    requests = [_make_request() for _ in range(3)]
+    for mr in requests:
+        mr.bundle_uuid = bundle_uuid
+    await registry.set_entry(str(requests[0].uuid), {
+        'zone': 'available', 'checked_out_by': None, 'guild_file_path': None,
+        'request': requests[0].model_dump(mode='json'), 'download': None,
+    })
+
+    await broker.register_requests(requests)
+
+    assert (await broker.get_entry(str(requests[0].uuid))).zone == Zone.AVAILABLE
+    assert (await broker.get_entry(str(requests[2].uuid))).zone == Zone.IN_FLIGHT
+    state = await broker.get_bundle_state(bundle_uuid)
+    assert state.total == 3
+
+
+@pytest.mark.asyncio
+async def test_update_status_many_applies_in_order_and_deletes_terminal():
+    '''update_status_many syncs every bundle copy and drops discarded entries.'''
+    broker = _make_broker()
+    bundle_uuid = await broker.create_bundle(guild_id=1, channel_id=2)
+    kept, dropped = _make_request(), _make_request()
+    for mr in (kept, dropped):
+        mr.bundle_uuid = bundle_uuid
+    await broker.register_requests([kept, dropped])
+    await broker.finalize_bundle(bundle_uuid)
+
+    await broker.update_status_many([
+        (str(kept.uuid), LifecycleStatusUpdate(event=LifecycleEvent.QUEUED)),
+        (str(kept.uuid), LifecycleStatusUpdate(event=LifecycleEvent.COMPLETED)),
+        (str(dropped.uuid), LifecycleStatusUpdate(event=LifecycleEvent.DISCARDED)),
+        ('no-such-uuid', LifecycleStatusUpdate(event=LifecycleEvent.COMPLETED)),
+    ])
+
+    assert await broker.get_entry(str(dropped.uuid)) is None
+    entry = await broker.get_entry(str(kept.uuid))
+    assert entry.request.lifecycle_stage.value == 'completed'
+    state = await broker.get_bundle_state(bundle_uuid)
+    assert state.completed == 1
+    assert state.discarded == 1
+
+
 # ---------------------------------------------------------------------------
 # Bundle edge branches
 # ---------------------------------------------------------------------------
@@ -22,6 +22,7 @@ from discord_bot.cogs.music_helpers.common import SearchType
 from discord_bot.types.download import LifecycleEvent, LifecycleStatusUpdate
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.search import SearchResult
+from discord_bot.workers import broker_registry
 from discord_bot.workers.broker_registry import RedisBrokerRegistry
 from discord_bot.workers.media_bundle import BundleRenderer
 from discord_bot.workers.redis_broker import RedisBroker
@@ -151,6 +152,56 @@ async def test_two_pods_register_into_one_bundle_no_counter_drift():
         assert {str(br.media_request.uuid) for br in state.bundled_requests} == expected
 
 
+@pytest.mark.asyncio
+async def test_indexed_lookups_agree_across_pods():
+    '''Checkouts, releases and bundles written by either pod land in the shared
+    secondary indexes, so each pod's guild / URL lookups see the other's writes
+    without a SCAN.'''
+    broker_a, reg_a, broker_b, reg_b = _two_pods()
+    for uuid, url in (('item-1', 'https://example.com/1'), ('item-2', 'https://example.com/2')):
+        await reg_a.set_entry(uuid, {
+            'zone': 'available', 'checked_out_by': None, 'guild_file_path': None,
+            'download': {'file_path': f'/tmp/{uuid}.mp4', 'webpage_url': url},
+            'request': _make_request().model_dump(mode='json'),
+        })
+
+    await asyncio.gather(
+        reg_a.atomic_checkout('item-1', guild_id=11),
+        reg_b.atomic_checkout('item-2', guild_id=11),
+    )
+    assert len(await broker_a.get_checked_out_by(11)) == 2
+    await broker_b.release('item-1')
+    assert len(await broker_a.get_checked_out_by(11)) == 1
+    assert await broker_a.can_evict_base('https://example.com/1')
+    assert not await broker_a.can_evict_base('https://example.com/2')
+
+    bundle_uuid = await broker_b.create_bundle(guild_id=11, channel_id=2)
+    assert await broker_a.list_bundles_for_guild(11) == [bundle_uuid]
+    await broker_a.delete_bundle(bundle_uuid)
+    assert await broker_b.list_bundles_for_guild(11) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_rewrites_leave_one_url_membership():
+    '''Both pods rewrite one entry with different URLs at once.  Whichever write
+    lands last, the entry is indexed under its URL only — the WATCHed write
+    retries instead of removing the membership of a value it never saw.'''
+    _broker_a, reg_a, _broker_b, reg_b = _two_pods()
+    urls = [f'https://example.com/{n}' for n in range(4)]
+
+    def _entry(url):
+        return {'zone': 'available', 'checked_out_by': None, 'download': {'webpage_url': url}, 'request': {}}
+
+    await asyncio.gather(*(
+        (reg_a if n % 2 else reg_b).set_entry('item-1', _entry(url)) for n, url in enumerate(urls)
+    ))
+    final_url = (await reg_a.get_entry('item-1'))['download']['webpage_url']
+    client = reg_b._client  # pylint: disable=protected-access
+    for url in urls:
+        members = await client.smembers(broker_registry._url_index_key(url))  # pylint: disable=protected-access
+        assert members == ({'item-1'} if url == final_url else set())
+
+
 @pytest.mark.asyncio
 async def test_cross_pod_status_update_is_visible():
     '''Pod A registers a request; pod B advances it to COMPLETED.  Pod A then
@@ -172,6 +223,17 @@ async def test_cross_pod_status_update_is_visible():
     assert state.bundled_requests[0].media_request.lifecycle_stage.value == 'completed'
 
 
+@pytest.mark.asyncio
+async def test_cached_bundle_is_replaced_after_another_pod_writes():
+    '''Pod A's parsed copy of a bundle stops being used the moment pod B rewrites it.'''
+    broker_a, _reg_a, broker_b, _reg_b = _two_pods()
+    bundle_uuid = await broker_a.create_bundle(guild_id=1, channel_id=2, input_string='x')
+    await broker_b.register_request(_queued_request(bundle_uuid))
+
+    state = await broker_a.get_bundle_state(bundle_uuid)
+    assert len(state.bundled_requests) == 1
+
+
 @pytest.mark.asyncio
 async def test_full_lifecycle_split_across_pods_finishes_coherently():
     '''A bundle whose registers and per-request completions are driven
@@ -18,6 +18,7 @@ from opentelemetry.instrumentation.redis import RedisInstrumentor
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from redis.exceptions import ResponseError
 
 from discord_bot.clients.redis_client import RedisManager
 from discord_bot.cogs.music_helpers.common import SearchType
@@ -26,11 +27,11 @@ from discord_bot.types.download import DownloadErrorType, DownloadResult, Downlo
 from discord_bot.types.media_request import MediaRequest
 from discord_bot.types.search import SearchResult
 from discord_bot.types.queue import PutsBlocked
-from discord_bot.workers.redis_guild_queue import GUILD_BLOCK_TTL_SECONDS
+from discord_bot.workers.redis_guild_queue import GUILD_BLOCK_TTL_SECONDS, WAKEUP_TOKEN_CAP
 from discord_bot.workers.redis_download_worker import (
     RedisDownloadWorker, DirectItemAvailableException,
-    DEFERRED_RETRIES_KEY, FAILURES_DIRECT_KEY, GUILDS_DIRECT_KEY, GUILDS_YOUTUBE_KEY,
-    youtube_failures_key, youtube_wait_until_key,
+    DEFERRED_PROMOTE_BATCH, DEFERRED_RETRIES_KEY, FAILURES_DIRECT_KEY, GUILDS_DIRECT_KEY, GUILDS_YOUTUBE_KEY, POP_LOCK_KEY_PREFIX,
+    WAKEUP_KEY, youtube_failures_key, youtube_wait_until_key,
 )
 
 
@@ -326,6 +327,51 @@ async def test_youtube_pop_claims_window_with_ttl():
     assert 0 < ttl <= w._wait_period_minimum * 4
 
 
+@pytest.mark.asyncio
+async def test_scripted_youtube_pop_waits_then_claims_without_the_lock():
+    '''The scripted fixed-mode pop reports ('wait', ts) inside the window and
+    otherwise pops and re-claims it, as the lock path does, with no pop-lock.'''
+    w = _worker()
+    client = w._manager.client
+    await w.submit(7, _mk(guild_id=7))
+    await client.set(w._youtube_wait_until_key, '1005.0')
+    w._now_seconds = lambda: 1000.0
+    assert await w._atomic_pop_youtube() == ('wait', '1005.0')
+    w._now_seconds = lambda: 1006.0
+    popped = await w._atomic_pop_youtube()
+    assert popped is not None and popped[0] == 7 and popped[2]
+    assert float(await client.get(w._youtube_wait_until_key)) == 1016.0
+    assert 0 < await client.ttl(w._youtube_wait_until_key) <= w._wait_period_minimum + 1
+    assert not await client.keys(f'{POP_LOCK_KEY_PREFIX}*')
+    assert w._pop_script.enabled
+
+
+@pytest.mark.asyncio
+async def test_pop_falls_back_to_the_lock_when_scripting_is_unavailable(mocker):
+    '''A Redis that rejects EVALSHA turns the scripted pop off; the pop still
+    succeeds, through the pop-lock path.'''
+    w = _worker()
+    client = w._manager.client
+    mocker.patch.object(client, 'evalsha', side_effect=ResponseError("unknown command 'evalsha'"))
+    lock = mocker.spy(w, '_pop_lock')
+    await w.submit(7, _mk(guild_id=7, direct=True))
+    got = await w._dequeue_direct()
+    assert got.guild_id == 7
+    assert w._pop_script.enabled is False
+    lock.assert_called_once_with(direct=True)
+
+
+@pytest.mark.asyncio
+async def test_scripted_pop_disabled_uses_the_lock(mocker):
+    '''scripted_pop=False never tries the script.'''
+    w = RedisDownloadWorker(None, Path('/tmp'), redis_manager=_manager(), scripted_pop=False,
+                            wait_period_minimum=10, wait_period_max_variance=2)
+    evalsha = mocker.spy(w._manager.client, 'evalsha')
+    await w.submit(7, _mk(guild_id=7, direct=True))
+    assert (await w._dequeue_direct()).guild_id == 7
+    evalsha.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_round_robin_rotates_across_guilds_direct():
     w = _worker()
@@ -871,6 +917,77 @@ async def test_promote_ready_retries_drops_expired_payload():
         await w._merged_get_nowait()
 
 
+def _spy_round_trips(mocker, w):
+    '''Spy the worker client's single commands and the pipelines it opens.'''
+    client = w._manager.client
+    return mocker.spy(client, 'execute_command'), mocker.spy(client, 'pipeline')
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_one_round_trip(mocker):
+    '''The payload SET and both ZADDs go out as one MULTI.'''
+    w = _worker()
+    commands, pipelines = _spy_round_trips(mocker, w)
+    await w._enqueue_request(7, _mk(guild_id=7))
+    commands.assert_not_called()
+    pipelines.assert_called_once_with(transaction=True)
+    assert await w.queue_size(7) == 1
+
+
+@pytest.mark.asyncio
+async def test_promote_sweep_round_trips_do_not_grow_with_the_batch(mocker):
+    '''A full batch of due retries promotes in one ZRANGEBYSCORE and two pipelines.'''
+    w = _worker()
+    requests = [_mk(guild_id=7 + n % 3, direct=n % 2 == 0) for n in range(DEFERRED_PROMOTE_BATCH)]
+    for request in requests:
+        await w._enqueue_deferred_request(request.guild_id, request, w._now_seconds() - 1)
+    commands, pipelines = _spy_round_trips(mocker, w)
+
+    await w._promote_ready_retries()
+
+    assert commands.call_count == 1
+    assert pipelines.call_count == 2
+    assert await w._manager.client.zcard(DEFERRED_RETRIES_KEY) == 0
+    assert w.has_direct_pending
+    sizes = [await w.queue_size(guild_id) for guild_id in (7, 8, 9)]
+    assert sum(sizes) == DEFERRED_PROMOTE_BATCH
+
+
+@pytest.mark.asyncio
+async def test_promote_sweep_with_nothing_due_is_one_round_trip(mocker):
+    '''The idle sweep run() makes every iteration costs only the ZRANGEBYSCORE.'''
+    w = _worker()
+    request = _mk()
+    await w._enqueue_deferred_request(request.guild_id, request, w._now_seconds() + 3600)
+    commands, pipelines = _spy_round_trips(mocker, w)
+    await w._promote_ready_retries()
+    assert commands.call_count == 1
+    pipelines.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_submit_many_is_one_block_check_and_one_multi(mocker):
+    '''A batch is queued in order after one block check, in one MULTI.'''
+    w = _worker()
+    requests = [_mk(guild_id=7, direct=True) for _ in range(5)]
+    commands, pipelines = _spy_round_trips(mocker, w)
+    assert await w.submit_many(7, requests) == [None] * 5
+    assert commands.call_count == 1
+    pipelines.assert_called_once_with(transaction=True)
+    popped = [str((await w._merged_get_nowait()).uuid) for _ in requests]
+    assert popped == [str(request.uuid) for request in requests]
+
+
+@pytest.mark.asyncio
+async def test_submit_many_refuses_the_whole_batch_for_a_blocked_guild():
+    '''A blocked guild refuses every request in the batch and queues none.'''
+    w = _worker()
+    await w.block_guild(7)
+    outcomes = await w.submit_many(7, [_mk(guild_id=7), _mk(guild_id=7)])
+    assert len(outcomes) == 2 and all(isinstance(outcome, PutsBlocked) for outcome in outcomes)
+    assert await w.queue_size(7) == 0
+
+
 @pytest.mark.asyncio
 async def test_deferred_retry_claimed_once_across_pods():
     '''Two pods sharing the ZSET promote a due retry exactly once.
@@ -943,7 +1060,15 @@ async def test_promote_ready_retries_skips_member_another_pod_claimed(mocker):
     w = _worker()
     request = _mk()
     await w._enqueue_deferred_request(request.guild_id, request, w._now_seconds() - 1)
-    mocker.patch.object(w._manager.client, 'zrem', AsyncMock(return_value=0))
+    client = w._manager.client
+    real_zrangebyscore = client.zrangebyscore
+
+    async def _read_then_lose_the_race(*args, **kwargs):
+        due = await real_zrangebyscore(*args, **kwargs)
+        await client.zrem(DEFERRED_RETRIES_KEY, *due)
+        return due
+
+    mocker.patch.object(client, 'zrangebyscore', _read_then_lose_the_race)
 
     await w._promote_ready_retries()
 
@@ -1056,3 +1181,57 @@ async def test_internal_requeue_is_not_blocked():
     await w.block_guild(7)
     await w._enqueue_request(7, _mk(guild_id=7))
     assert await w.queue_size(7) == 1
+
+
+# ---------------------------------------------------------------------------
+# Idle wakeups
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_enqueue_on_another_pod_wakes_an_idle_worker():
+    '''A worker blocked in _wait_for_work returns as soon as any pod enqueues,
+    well inside its idle cap.'''
+    server = fakeredis.FakeServer()
+    idle = _worker(RedisManager.from_client(fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)))
+    producer = _worker(RedisManager.from_client(fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)))
+    loop = asyncio.get_running_loop()
+    waiter = asyncio.create_task(idle._wait_for_work(5))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    enqueued_at = loop.time()
+    await producer.submit(7, _mk(guild_id=7, direct=True))
+    await asyncio.wait_for(waiter, 1)
+    assert loop.time() - enqueued_at < 0.5
+    assert (await idle.get_input_nowait()).guild_id == 7
+
+
+@pytest.mark.asyncio
+async def test_idle_wait_costs_two_commands(mocker):
+    '''An idle wait with nothing queued is one deferred-ZSET read and one BLPOP,
+    however long it blocks.'''
+    w = _worker()
+    commands = mocker.spy(w._manager.client, 'execute_command')
+    await w._wait_for_work(0.2)
+    assert [c.args[0] for c in commands.call_args_list] == ['ZRANGE', 'BLPOP']
+
+
+@pytest.mark.asyncio
+async def test_idle_wait_ends_when_a_deferred_retry_is_due(mocker):
+    '''A deferred retry becomes work on the clock, not on an enqueue, so the
+    wait is capped at its ready_at.'''
+    w = _worker()
+    await w._enqueue_deferred_request(7, _mk(guild_id=7), w._now_seconds() + 0.1)
+    blpop = mocker.spy(w._manager.client, 'blpop')
+    await w._wait_for_work(5)
+    assert blpop.call_args.kwargs['timeout'] <= 0.1
+
+
+@pytest.mark.asyncio
+async def test_wakeup_tokens_are_capped():
+    '''A playlist page pushes one token per request, trimmed to the cap, so a
+    burst nobody was idle for leaves a bounded number of spare wakeups.'''
+    w = _worker()
+    results = await w.submit_many(7, [_mk(guild_id=7, direct=True) for _ in range(100)])
+    assert results == [None] * 100
+    assert await w._manager.client.llen(WAKEUP_KEY) == WAKEUP_TOKEN_CAP
@@ -1,14 +1,19 @@
 '''Tests for RedisBundleStore, RedisWorkQueue, and RedisDownloadResultQueue.'''
+import asyncio
+
 import pytest
 import fakeredis.aioredis
 
 from discord_bot.clients.redis_client import RedisManager
+from discord_bot.interfaces.dispatch_protocols import CHANNEL_TAIL_SIZE
 from discord_bot.types.download import DownloadResult, DownloadStatus
 from discord_bot.types.search_resolution import SearchResolution
 from discord_bot.workers.redis_queues import (
     load_bundle,
     save_bundle,
+    CHANNEL_TAIL_TTL_SECONDS,
     RedisBundleStore,
+    RedisChannelTailStore,
     RedisDownloadResultQueue,
     RedisSearchResultQueue,
     RedisWorkQueue,
@@ -84,6 +89,36 @@ async def test_redis_bundle_store_load_all():
     assert result == {'a': b1, 'b': b2}
 
 
+# ---------------------------------------------------------------------------
+# RedisChannelTailStore
+# ---------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_redis_channel_tail_store_orders_snowflakes_exactly():
+    '''Ids past the exact range of a double still order correctly and round-trip.'''
+    store = RedisChannelTailStore(_manager())
+    newer, older = 2 ** 62 + 1, 2 ** 62
+    await store.add(1, [newer, older])
+    assert await store.newest(1, [older, newer]) == [newer, older]
+    await store.discard(1, [newer])
+    assert await store.newest(1, [older]) == [older]
+    assert await store.newest(1, [newer]) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_channel_tail_store_trims_and_expires_from_first_write():
+    '''The set is trimmed to CHANNEL_TAIL_SIZE, and its TTL is set once rather than refreshed.'''
+    manager = _manager()
+    store = RedisChannelTailStore(manager)
+    key = 'discord_bot:channel_tail:1'
+    await store.add(1, list(range(1, CHANNEL_TAIL_SIZE + 11)))
+    assert await manager.client.zcard(key) == CHANNEL_TAIL_SIZE
+    assert await store.newest(1, [1]) is None
+    await manager.client.expire(key, 5)
+    await store.add(1, [CHANNEL_TAIL_SIZE + 20])
+    assert 0 < await manager.client.ttl(key) <= 5 < CHANNEL_TAIL_TTL_SECONDS
+
+
 # ---------------------------------------------------------------------------
 # RedisWorkQueue
 # ---------------------------------------------------------------------------
@@ -220,6 +255,44 @@ async def test_redis_download_result_queue_shared_across_instances():
     assert str(popped.media_request.uuid) == str(r.media_request.uuid)
 
 
+@pytest.mark.asyncio
+async def test_redis_download_result_queue_get_batch_drains_in_order():
+    '''get_batch pops up to max_items, oldest first, and leaves the rest.'''
+    q = RedisDownloadResultQueue(_manager())
+    results = [_download_result() for _ in range(3)]
+    for r in results:
+        await q.put(r)
+    batch = await q.get_batch(2, 0.1)
+    assert [str(r.media_request.uuid) for r in batch] == [str(r.media_request.uuid) for r in results[:2]]
+    assert await q.depth() == 1
+    assert len(await q.get_batch(5, 0)) == 1
+    assert await q.get_batch(5, 0) == []
+
+
+@pytest.mark.asyncio
+async def test_redis_download_result_queue_get_batch_wakes_on_put():
+    '''A waiting get_batch returns as soon as another pod pushes a result.'''
+    manager = _manager()
+    waiter = RedisDownloadResultQueue(manager)
+    r = _download_result()
+
+    async def _put_later():
+        await asyncio.sleep(0.05)
+        await RedisDownloadResultQueue(manager).put(r)
+
+    putter = asyncio.create_task(_put_later())
+    batch = await waiter.get_batch(4, 5)
+    await putter
+    assert [str(item.media_request.uuid) for item in batch] == [str(r.media_request.uuid)]
+
+
+@pytest.mark.asyncio
+async def test_redis_download_result_queue_get_batch_times_out_empty():
+    '''get_batch returns an empty list once the wait runs out.'''
+    q = RedisDownloadResultQueue(_manager())
+    assert await q.get_batch(4, 0.05) == []
+
+
 # ---------------------------------------------------------------------------
 # RedisSearchResultQueue
 # ---------------------------------------------------------------------------
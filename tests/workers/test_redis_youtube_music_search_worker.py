@@ -10,10 +10,12 @@ test_redis_youtube_music_search_worker_multipod.py.
 # inspect its Redis client directly, so protected-access is expected here.
 # pylint: disable=protected-access
 import asyncio
+import time as time_module
 from asyncio import QueueEmpty
 
 import fakeredis.aioredis
 import pytest
+from redis.exceptions import ResponseError
 
 from discord_bot.clients.redis_client import RedisManager
 from discord_bot.cogs.music_helpers.common import SearchType
@@ -24,8 +26,9 @@ from discord_bot.utils.failure_queue import FailureQueue
 from discord_bot.workers.redis_guild_queue import GUILD_BLOCK_TTL_SECONDS
 from discord_bot.utils.integrations.youtube_music import YoutubeMusicRetryException
 from discord_bot.workers.redis_youtube_music_search_worker import (
-    RedisYoutubeMusicSearchWorker, FAILURES_KEY, GUILDS_KEY, POP_LOCK_KEY, WAIT_UNTIL_KEY,
+    RedisYoutubeMusicSearchWorker, FAILURES_KEY, GUILDS_KEY, POP_LOCK_KEY, WAIT_UNTIL_KEY, WAKEUP_KEY,
 )
+from discord_bot.workers.search_resolution_cache import RedisSearchResolutionCache
 
 
 class _FakeYoutubeMusicClient:
@@ -47,21 +50,25 @@ def _manager() -> RedisManager:
     return RedisManager.from_client(fakeredis.aioredis.FakeRedis(decode_responses=True))
 
 
-def _worker(manager=None, *, client=None, wait_min=10, variance=2) -> RedisYoutubeMusicSearchWorker:
+def _worker(manager=None, *, client=None, wait_min=10, variance=2,
+            cached=False, scripted_pop=True) -> RedisYoutubeMusicSearchWorker:
+    manager = manager or _manager()
     return RedisYoutubeMusicSearchWorker(
         None,
         client or _FakeYoutubeMusicClient(),
         FailureQueue(max_size=10, max_age_seconds=600),
         wait_min,
         variance,
-        redis_manager=manager or _manager(),
+        resolution_cache=RedisSearchResolutionCache(redis_manager=manager) if cached else None,
+        redis_manager=manager,
+        scripted_pop=scripted_pop,
     )
 
 
-def _mk(*, guild_id=7) -> MediaRequest:
+def _mk(*, guild_id=7, search_string='song name') -> MediaRequest:
     return MediaRequest(
         guild_id=guild_id, channel_id=2, requester_name='tester', requester_id=9,
-        search_result=SearchResult(search_type=SearchType.SEARCH, raw_search_string='song name'),
+        search_result=SearchResult(search_type=SearchType.SEARCH, raw_search_string=search_string),
     )
 
 
@@ -468,12 +475,8 @@ async def test_idle_pop_takes_no_lock():
     assert not writes
 
 
-@pytest.mark.asyncio
-async def test_non_empty_queue_still_pops_under_the_lock():
-    '''The pre-check is not trusted in the other direction: a non-empty ZSET still
-    takes the pop-lock, so concurrent pods cannot pop the same request.'''
-    w = _worker()
-    await w.submit(7, _mk(guild_id=7))
+def _spy_pop_lock(w) -> list:
+    '''Record every SET of the pop-lock key on w's client.'''
     locked = []
     client = w._manager.client
     real_set = client.set
@@ -484,6 +487,17 @@ async def test_non_empty_queue_still_pops_under_the_lock():
         return await real_set(*args, **kwargs)
 
     client.set = _spy_set
+    return locked
+
+
+@pytest.mark.asyncio
+async def test_non_empty_queue_still_pops_under_the_lock():
+    '''The pre-check is not trusted in the other direction: on the lock path a
+    non-empty ZSET still takes the pop-lock, so concurrent pods cannot pop the
+    same request.'''
+    w = _worker(scripted_pop=False)
+    await w.submit(7, _mk(guild_id=7))
+    locked = _spy_pop_lock(w)
 
     assert await w.get_input_nowait() is not None
     assert locked == [POP_LOCK_KEY]
@@ -500,3 +514,180 @@ async def test_stale_guild_entry_is_reaped_under_the_lock():
     with pytest.raises(QueueEmpty):
         await w.get_input_nowait()
     assert await w._queue_is_empty() is True
+
+
+@pytest.mark.asyncio
+async def test_scripted_pop_round_robins_without_the_lock():
+    '''With scripting available the pop is one script call: same round-robin
+    order and stale-guild reaping as the lock path, and no pop-lock taken.'''
+    w = _worker()
+    locked = _spy_pop_lock(w)
+    await w._manager.client.zadd(GUILDS_KEY, {'6': 0.5})
+    await w.submit(7, _mk(guild_id=7, search_string='a'))
+    await w.submit(7, _mk(guild_id=7, search_string='b'))
+    await w.submit(8, _mk(guild_id=8, search_string='c'))
+    popped = [(await w.get_input_nowait()).guild_id for _ in range(3)]
+    assert sorted(popped[:2]) == [7, 8] and popped[2] == 7
+    assert not locked
+    assert w._pop_script.enabled
+    assert await w._queue_is_empty() is True
+
+
+@pytest.mark.asyncio
+async def test_pop_falls_back_to_the_lock_when_scripting_is_unavailable():
+    '''A Redis that rejects EVALSHA turns the scripted pop off for good; that pop
+    and every later one take the pop-lock path instead.'''
+    w = _worker()
+    locked = _spy_pop_lock(w)
+
+    async def _no_scripting(*_args, **_kwargs):
+        raise ResponseError("unknown command 'evalsha'")
+
+    w._manager.client.evalsha = _no_scripting
+    await w.submit(7, _mk(guild_id=7))
+    await w.submit(7, _mk(guild_id=7))
+    assert (await w.get_input_nowait()).guild_id == 7
+    assert w._pop_script.enabled is False
+    assert (await w.get_input_nowait()).guild_id == 7
+    assert locked == [POP_LOCK_KEY, POP_LOCK_KEY]
+
+
+# --------------------------------------------------------------------------- #
+# Resolution cache
+# --------------------------------------------------------------------------- #
+
+@pytest.mark.asyncio
+async def test_resolve_caches_matches_and_no_results():
+    '''A resolved string, or one that matched nothing, is not searched again.'''
+    yt = _FakeYoutubeMusicClient(video_id='abc')
+    w = _worker(client=yt, cached=True)
+    assert await w.resolve(_mk(search_string='Song  Name')) == 'abc'
+    assert await w.resolve(_mk(search_string='song name')) == 'abc'
+    assert yt.calls == ['Song  Name']
+
+    yt._video_id = None
+    assert await w.resolve(_mk(search_string='nothing here')) is None
+    assert await w.resolve(_mk(search_string='nothing here')) is None
+    assert yt.calls == ['Song  Name', 'nothing here']
+
+
+@pytest.mark.asyncio
+async def test_resolve_429_is_not_cached():
+    '''A rate-limited search caches nothing, so the retry searches again.'''
+    yt = _FakeYoutubeMusicClient(raise_retry=True)
+    w = _worker(client=yt, cached=True)
+    with pytest.raises(YoutubeMusicRetryException):
+        await w.resolve(_mk())
+    yt._raise_retry = False
+    yt._video_id = 'abc'
+    assert await w.resolve(_mk()) == 'abc'
+    assert len(yt.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_resolves_share_one_search():
+    '''Identical searches in flight together cost one API call.'''
+    class _SlowClient(_FakeYoutubeMusicClient):
+        def search(self, raw_search_string):
+            time_module.sleep(0.05)
+            return super().search(raw_search_string)
+
+    yt = _SlowClient(video_id='abc')
+    w = _worker(client=yt, cached=True)
+    results = await asyncio.gather(*(w.resolve(_mk(search_string='Song Name')) for _ in range(3)))
+    assert results == ['abc'] * 3
+    assert yt.calls == ['Song Name']
+    assert not w._inflight
+
+
+@pytest.mark.asyncio
+async def test_cache_is_shared_across_pods():
+    '''A string one pod resolved is a hit on another pod sharing the Redis.'''
+    manager = _manager()
+    yt = _FakeYoutubeMusicClient(video_id='abc')
+    assert await _worker(manager, client=yt, cached=True).resolve(_mk()) == 'abc'
+    other = _FakeYoutubeMusicClient(video_id='other')
+    assert await _worker(manager, client=other, cached=True).resolve(_mk()) == 'abc'
+    assert not other.calls
+
+
+@pytest.mark.asyncio
+async def test_submit_cache_hit_skips_the_queue():
+    '''A cached string goes to the cached-resolution lane, not the Redis queue.'''
+    w = _worker(client=_FakeYoutubeMusicClient(video_id='abc'), cached=True)
+    await w.resolve(_mk())
+    request = _mk()
+    await w.submit(7, request)
+    assert await w.queue_size(7) == 0
+    assert await w._queue_is_empty() is True
+    popped, video_id = await w.get_cached_nowait()
+    assert popped.uuid == request.uuid
+    assert video_id == 'abc'
+    with pytest.raises(QueueEmpty):
+        await w.get_cached_nowait()
+
+    # A miss still queues as before
+    await w.submit(7, _mk(search_string='something else'))
+    assert await w.queue_size(7) == 1
+
+
+@pytest.mark.asyncio
+async def test_submitted_miss_is_counted_once(mocker):
+    '''A miss counted at submit is not counted again when the loop resolves it.'''
+    outcomes = mocker.patch('discord_bot.workers.search_resolution_cache.record_cache_outcome')
+    w = _worker(client=_FakeYoutubeMusicClient(video_id='abc'), cached=True)
+    request = _mk()
+    await w.submit(7, request)
+    assert await w.resolve(request) == 'abc'
+    assert [call.args for call in outcomes.call_args_list] == [('miss',)]
+
+
+@pytest.mark.asyncio
+async def test_submit_cache_hit_still_honours_guild_block():
+    '''The block check runs before the cache lookup, so a blocked guild is refused either way.'''
+    w = _worker(client=_FakeYoutubeMusicClient(video_id='abc'), cached=True)
+    await w.resolve(_mk())
+    await w.block_guild(7)
+    with pytest.raises(PutsBlocked):
+        await w.submit(7, _mk())
+
+
+@pytest.mark.asyncio
+async def test_clear_guild_queue_drops_cached_resolutions():
+    '''A clear covers requests that skipped the queue, honouring the predicate.'''
+    w = _worker(client=_FakeYoutubeMusicClient(video_id='abc'), cached=True)
+    await w.resolve(_mk())
+    dropped_request, kept_request, other_guild = _mk(), _mk(), _mk(guild_id=8)
+    for request in (dropped_request, kept_request, other_guild):
+        await w.submit(request.guild_id, request)
+    dropped = await w.clear_guild_queue(7, preserve_predicate=lambda r: r.uuid == kept_request.uuid)
+    assert [r.uuid for r in dropped] == [dropped_request.uuid]
+    remaining = [(await w.get_cached_nowait())[0].uuid for _ in range(2)]
+    assert remaining == [kept_request.uuid, other_guild.uuid]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_work_wakes_on_enqueue_from_another_pod():
+    '''An idle pod blocked in wait_for_work returns once any pod queues a search.'''
+    manager = _manager()
+    idle, producer = _worker(manager), _worker(manager)
+    waiter = asyncio.create_task(idle.wait_for_work(5))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    await producer.submit(7, _mk())
+    await asyncio.wait_for(waiter, 1)
+    assert (await idle.get_input_nowait()).guild_id == 7
+
+
+@pytest.mark.asyncio
+async def test_wait_for_work_wakes_on_cache_hit():
+    '''A submit answered from the cache wakes this pod's loop, not the shared list.'''
+    w = _worker(client=_FakeYoutubeMusicClient(video_id='abc'), cached=True)
+    await w.resolve(_mk())
+    waiter = asyncio.create_task(w.wait_for_work(5))
+    await asyncio.sleep(0.05)
+    await w.submit(7, _mk())
+    await asyncio.wait_for(waiter, 1)
+    assert not await w._manager.client.exists(WAKEUP_KEY)
+    # A lane that still holds answers does not block at all.
+    await asyncio.wait_for(w.wait_for_work(5), 1)
@@ -0,0 +1,145 @@
+'''
+Unit tests for the search resolution cache.
+
+Covers key normalization, the in-memory LRU + per-entry expiry, and the Redis
+layer's sharing and in-flight claim.  How the worker uses the cache (the
+submit fast lane, coalescing in resolve) is covered in
+test_redis_youtube_music_search_worker.py.
+'''
+# White-box tests: they inspect the in-memory front and the Redis keys directly.
+# pylint: disable=protected-access
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+
+from discord_bot.clients.redis_client import RedisManager
+from discord_bot.workers import search_resolution_cache
+from discord_bot.workers.search_resolution_cache import (
+    CachedResolution, RedisSearchResolutionCache, SearchResolutionCache, normalize_search_string,
+)
+
+
+def _manager() -> RedisManager:
+    return RedisManager.from_client(fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+
+def _advance_clock(mocker, cache, seconds):
+    '''Move the cache's wall clock forward by seconds.'''
+    now = cache._now_seconds()
+    mocker.patch.object(cache, '_now_seconds', return_value=now + seconds)
+
+
+def test_normalize_search_string():
+    '''Case and whitespace differences share one key.'''
+    assert normalize_search_string('  Artist   -  SONG\tName ') == 'artist - song name'
+
+
+@pytest.mark.asyncio
+async def test_get_set_and_negative_entries():
+    '''A match and a no-result are both hits; an unknown string is a miss.'''
+    cache = SearchResolutionCache()
+    assert await cache.get('song') is None
+    await cache.set('song', 'abc')
+    await cache.set('nothing', None)
+    assert await cache.get('SONG') == CachedResolution('abc')
+    assert await cache.get('nothing') == CachedResolution(None)
+
+
+@pytest.mark.asyncio
+async def test_get_without_record_counts_nothing(mocker):
+    '''record=False looks up the same entry without counting an outcome.'''
+    outcomes = mocker.patch.object(search_resolution_cache, 'record_cache_outcome')
+    cache = SearchResolutionCache()
+    await cache.set('song', 'abc')
+    assert await cache.get('song', record=False) == CachedResolution('abc')
+    assert await cache.get('other', record=False) is None
+    outcomes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_on_their_own_ttl(mocker):
+    '''A no-result ages out on the shorter negative TTL, a match on the full TTL.'''
+    cache = SearchResolutionCache(ttl_seconds=100, negative_ttl_seconds=10)
+    await cache.set('song', 'abc')
+    await cache.set('nothing', None)
+    _advance_clock(mocker, cache, 11)
+    assert await cache.get('nothing') is None
+    assert await cache.get('song') == CachedResolution('abc')
+    _advance_clock(mocker, cache, 101)
+    assert await cache.get('song') is None
+    assert not cache._entries
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    '''Past max_entries the least recently looked-up entry goes first.'''
+    cache = SearchResolutionCache(max_entries=2)
+    await cache.set('a', '1')
+    await cache.set('b', '2')
+    await cache.get('a')
+    await cache.set('c', '3')
+    assert await cache.get('b') is None
+    assert await cache.get('a') == CachedResolution('1')
+
+
+@pytest.mark.asyncio
+async def test_redis_layer_is_shared_and_expires():
+    '''An entry written by one pod is read (and fronted) by another, with a Redis TTL.'''
+    manager = _manager()
+    writer = RedisSearchResolutionCache(ttl_seconds=100, negative_ttl_seconds=10, redis_manager=manager)
+    reader = RedisSearchResolutionCache(ttl_seconds=100, negative_ttl_seconds=10, redis_manager=manager)
+    await writer.set('Song', 'abc')
+    await writer.set('nothing', None)
+    assert await reader.get('song') == CachedResolution('abc')
+    assert 'song' in reader._entries
+    assert await reader.get('nothing') == CachedResolution(None)
+
+    client = manager.client
+    assert 0 < await client.ttl(writer._resolution_key('song')) <= 100
+    assert 0 < await client.ttl(writer._resolution_key('nothing')) <= 10
+
+
+@pytest.mark.asyncio
+async def test_claim_is_exclusive_and_release_is_token_checked():
+    '''Only one pod holds a query's claim; a stale token cannot release a newer claim.'''
+    manager = _manager()
+    first = RedisSearchResolutionCache(redis_manager=manager)
+    second = RedisSearchResolutionCache(redis_manager=manager)
+    token = await first.claim('Song')
+    assert token
+    assert await second.claim('song') is None
+    await second.release('song', 'not-the-token')
+    assert await second.claim('song') is None
+    await first.release('Song', token)
+    assert await second.claim('song')
+
+
+@pytest.mark.asyncio
+async def test_wait_for_peer_returns_the_holders_result(monkeypatch):
+    '''A pod that lost the claim picks up the holder's result once cached.'''
+    monkeypatch.setattr(search_resolution_cache, 'INFLIGHT_POLL_INTERVAL_SECONDS', 0.01)
+    manager = _manager()
+    holder = RedisSearchResolutionCache(redis_manager=manager)
+    waiter = RedisSearchResolutionCache(redis_manager=manager)
+    token = await holder.claim('song')
+
+    async def _finish():
+        await asyncio.sleep(0.03)
+        await holder.set('song', 'abc')
+        await holder.release('song', token)
+
+    finisher = asyncio.create_task(_finish())
+    assert await waiter.wait_for_peer('song') == CachedResolution('abc')
+    await finisher
+
+
+@pytest.mark.asyncio
+async def test_wait_for_peer_gives_up_when_claim_released_empty(monkeypatch):
+    '''A holder that cached nothing (a 429) releases the waiter straight away.'''
+    monkeypatch.setattr(search_resolution_cache, 'INFLIGHT_POLL_INTERVAL_SECONDS', 0.01)
+    manager = _manager()
+    holder = RedisSearchResolutionCache(redis_manager=manager)
+    token = await holder.claim('song')
+    await holder.release('song', token)
+    assert await RedisSearchResolutionCache(redis_manager=manager).wait_for_peer('song') is None
@@ -34,9 +34,11 @@ def _media_request(guild_id=1234, search_string='test search') -> MediaRequest:
 
 class FakeSearchClient:
     '''Pop/resolve half of the search surface, scripted per test.'''
-    def __init__(self, *, queued=None, resolve_result='video-id', resolve_error=None,
+    def __init__(self, *, queued=None, cached=None, resolve_result='video-id', resolve_error=None,
                  backoff_remaining=None, backoff_after_error=None):
         self.queued = list(queued or [])
+        # (request, videoId) pairs the resolution cache answered at submit time
+        self.cached = list(cached or [])
         self.resolve_result = resolve_result
         self.resolve_error = resolve_error
         # Pre-armed window (a slice left over from an earlier iteration).
@@ -45,6 +47,7 @@ class FakeSearchClient:
         # side effect of the failing resolve, not a precondition of it.
         self.backoff_after_error = backoff_after_error
         self.backoff_waits = []
+        self.work_waits = []
         self.submitted = []
         self.resolved = []
 
@@ -52,6 +55,16 @@ class FakeSearchClient:
         '''Record the slice cap the driver asked for.'''
         self.backoff_waits.append((shutdown_event, max_wait_seconds))
 
+    async def get_cached_nowait(self):
+        '''Pop the next scripted cache hit, or raise QueueEmpty.'''
+        if not self.cached:
+            raise QueueEmpty('empty')
+        return self.cached.pop(0)
+
+    async def wait_for_work(self, timeout):
+        '''Record the idle wait cap the driver asked for.'''
+        self.work_waits.append(timeout)
+
     async def get_input_nowait(self):
         '''Pop the next scripted request, or raise QueueEmpty.'''
         if not self.queued:
@@ -125,6 +138,34 @@ async def test_run_once_handles_no_match(mocker):
     assert broker.search_results[0].media_request.search_result.youtube_music_search_string is None
 
 
+@pytest.mark.asyncio
+async def test_run_once_hands_back_cache_hits_ahead_of_backoff(mocker):
+    '''
+    A request the resolution cache answered at submit is registered straight away.
+
+    It never needs the API, so neither the 429 window nor the queued searches
+    ahead of it hold it up, and no resolve is attempted.
+    '''
+    cached = _media_request(search_string='cached search')
+    missed = _media_request(search_string='no result')
+    queued = _media_request()
+    client = FakeSearchClient(queued=[queued], cached=[(cached, 'cached-id'), (missed, None)],
+                              backoff_remaining=90)
+    broker = FakeBroker()
+    driver = _driver(client, broker, mocker)
+
+    assert await driver.run_once(asyncio.Event()) is True
+    assert await driver.run_once(asyncio.Event()) is True
+
+    assert not client.backoff_waits
+    assert not client.resolved
+    assert client.queued == [queued]
+    assert [r.media_request.uuid for r in broker.search_results] == [cached.uuid, missed.uuid]
+    assert broker.search_results[0].media_request.search_result.youtube_music_search_string == \
+        f'{YOUTUBE_VIDEO_PREFIX}cached-id'
+    assert broker.search_results[1].media_request.search_result.youtube_music_search_string is None
+
+
 @pytest.mark.asyncio
 async def test_run_once_waits_a_backoff_slice_before_popping(mocker):
     '''
@@ -149,17 +190,15 @@ async def test_run_once_waits_a_backoff_slice_before_popping(mocker):
 
 
 @pytest.mark.asyncio
-async def test_run_once_idle_sleeps_when_queue_empty(mocker):
-    '''An empty queue sleeps the idle backoff and reports a completed iteration.'''
+async def test_run_once_idle_waits_for_work_when_queue_empty(mocker):
+    '''An empty queue blocks in wait_for_work up to the idle cap and reports a completed iteration.'''
     client = FakeSearchClient(queued=[])
     broker = FakeBroker()
-    sleep_mock = mocker.patch('discord_bot.workers.youtube_music_search_driver.asyncio.sleep',
-                              new=mocker.AsyncMock())
-    driver = _driver(client, broker, mocker, idle_sleep_seconds=0.25)
+    driver = _driver(client, broker, mocker, idle_wait_seconds=0.25)
 
     assert await driver.run_once(asyncio.Event()) is True
 
-    sleep_mock.assert_awaited_once_with(0.25)
+    assert client.work_waits == [0.25]
     assert not broker.search_results
 
 